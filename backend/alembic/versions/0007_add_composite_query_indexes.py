@@ -0,0 +1,116 @@
+"""Add composite and partial indexes for the hot tenant query shapes."""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy import inspect
+
+# revision identifiers, used by Alembic.
+revision = "0007_add_composite_query_indexes"
+down_revision = "0006_add_business_timezone_and_gcalendar_watch_fields"
+branch_labels = None
+depends_on = None
+
+ACTIVE_STATUS_PREDICATE = "status IN ('SCHEDULED', 'CONFIRMED')"
+
+# (index name, table, columns, partial-index predicate or None)
+INDEX_SPECS: list[tuple[str, str, list[str], str | None]] = [
+    ("ix_customers_business_phone", "customers", ["business_id", "phone"], None),
+    (
+        "ix_customers_business_created_at",
+        "customers",
+        ["business_id", "created_at"],
+        None,
+    ),
+    (
+        "ix_appointments_business_start",
+        "appointments",
+        ["business_id", "start_time", "id"],
+        None,
+    ),
+    (
+        "ix_appointments_customer_business_start",
+        "appointments",
+        ["customer_id", "business_id", "start_time"],
+        None,
+    ),
+    (
+        "ix_appointments_business_active_start",
+        "appointments",
+        ["business_id", "start_time"],
+        ACTIVE_STATUS_PREDICATE,
+    ),
+    (
+        "ix_conversations_business_created_at",
+        "conversations",
+        ["business_id", "created_at"],
+        None,
+    ),
+    (
+        "ix_conversations_customer_business",
+        "conversations",
+        ["customer_id", "business_id"],
+        None,
+    ),
+    (
+        "ix_conversation_messages_conversation_timestamp",
+        "conversation_messages",
+        ["conversation_id", "timestamp"],
+        None,
+    ),
+]
+
+
+def _table_names(inspector: sa.Inspector) -> set[str]:
+    return set(inspector.get_table_names())
+
+
+def _index_names(inspector: sa.Inspector, table_name: str) -> set[str]:
+    try:
+        return {idx["name"] for idx in inspector.get_indexes(table_name)}
+    except sa.exc.NoSuchTableError:
+        return set()
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    tables = _table_names(inspector)
+
+    if "appointments" in tables:
+        # The partial index and repository filters match statuses exactly;
+        # normalise any legacy mixed-case rows first.
+        op.execute(
+            "UPDATE appointments SET status = UPPER(status) "
+            "WHERE status <> UPPER(status)"
+        )
+
+    existing: dict[str, set[str]] = {}
+    for name, table, cols, predicate in INDEX_SPECS:
+        if table not in tables:
+            continue
+        if table not in existing:
+            existing[table] = _index_names(inspector, table)
+        if name in existing[table]:
+            continue
+        where = sa.text(predicate) if predicate else None
+        op.create_index(
+            name,
+            table,
+            cols,
+            postgresql_where=where,
+            sqlite_where=where,
+        )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    tables = _table_names(inspector)
+
+    for name, table, _cols, _predicate in reversed(INDEX_SPECS):
+        if table not in tables:
+            continue
+        if name in _index_names(inspector, table):
+            op.drop_index(name, table_name=table)
@@ -0,0 +1,66 @@
+"""Add pg_trgm and phone-number indexes for customer search (Postgres only)."""
+
+from __future__ import annotations
+
+import logging
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy import inspect
+
+# revision identifiers, used by Alembic.
+revision = "0008_add_customer_search_indexes"
+down_revision = "0007_add_composite_query_indexes"
+branch_labels = None
+depends_on = None
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+PHONE_DIGITS = "regexp_replace(phone, '[^0-9]', '', 'g')"
+
+INDEX_STATEMENTS: list[tuple[str, str]] = [
+    (
+        "ix_customers_name_trgm",
+        "CREATE INDEX IF NOT EXISTS ix_customers_name_trgm "
+        "ON customers USING gin (lower(name) gin_trgm_ops)",
+    ),
+    (
+        "ix_customers_phone_digits_trgm",
+        "CREATE INDEX IF NOT EXISTS ix_customers_phone_digits_trgm "
+        f"ON customers USING gin (({PHONE_DIGITS}) gin_trgm_ops)",
+    ),
+    (
+        "ix_customers_business_phone_national",
+        "CREATE INDEX IF NOT EXISTS ix_customers_business_phone_national "
+        f"ON customers (business_id, right({PHONE_DIGITS}, 10))",
+    ),
+]
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    # SQLite and in-memory deployments use the in-process search index.
+    if bind.dialect.name != "postgresql":
+        return
+    if "customers" not in set(inspect(bind).get_table_names()):
+        return
+
+    try:
+        with bind.begin_nested():
+            bind.exec_driver_sql("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    except sa.exc.DBAPIError:
+        # Managed databases may not grant CREATE EXTENSION; customer search
+        # then falls back to the in-process index.
+        logger.warning("pg_trgm unavailable; skipping customer search indexes")
+        return
+
+    for _name, statement in INDEX_STATEMENTS:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+    for name, _statement in reversed(INDEX_STATEMENTS):
+        op.execute(f"DROP INDEX IF EXISTS {name}")
@@ -0,0 +1,59 @@
+"""Add geocode_cache table for persistent address geocoding results."""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy import inspect
+
+# revision identifiers, used by Alembic.
+revision = "0009_add_geocode_cache_table"
+down_revision = "0008_add_customer_search_indexes"
+branch_labels = None
+depends_on = None
+
+
+def _table_names(inspector: sa.Inspector) -> set[str]:
+    return set(inspector.get_table_names())
+
+
+def _index_names(inspector: sa.Inspector, table_name: str) -> set[str]:
+    try:
+        return {idx["name"] for idx in inspector.get_indexes(table_name)}
+    except sa.exc.NoSuchTableError:
+        return set()
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = inspect(bind)
+
+    if "geocode_cache" not in _table_names(inspector):
+        op.create_table(
+            "geocode_cache",
+            sa.Column("address_key", sa.String(), primary_key=True),
+            sa.Column("lat", sa.Float(), nullable=True),
+            sa.Column("lng", sa.Float(), nullable=True),
+            sa.Column(
+                "source",
+                sa.String(),
+                nullable=False,
+                server_default=sa.text("'google'"),
+            ),
+            sa.Column("updated_at", sa.DateTime(), nullable=False),
+        )
+
+    if "ix_geocode_cache_updated_at" not in _index_names(inspector, "geocode_cache"):
+        op.create_index("ix_geocode_cache_updated_at", "geocode_cache", ["updated_at"])
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = inspect(bind)
+
+    if "geocode_cache" not in _table_names(inspector):
+        return
+
+    if "ix_geocode_cache_updated_at" in _index_names(inspector, "geocode_cache"):
+        op.drop_index("ix_geocode_cache_updated_at", table_name="geocode_cache")
+    op.drop_table("geocode_cache")
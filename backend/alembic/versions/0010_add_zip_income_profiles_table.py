@@ -0,0 +1,64 @@
+"""Add zip_income_profiles table for cached Census income enrichment."""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy import inspect
+
+# revision identifiers, used by Alembic.
+revision = "0010_add_zip_income_profiles_table"
+down_revision = "0009_add_geocode_cache_table"
+branch_labels = None
+depends_on = None
+
+
+def _table_names(inspector: sa.Inspector) -> set[str]:
+    return set(inspector.get_table_names())
+
+
+def _index_names(inspector: sa.Inspector, table_name: str) -> set[str]:
+    try:
+        return {idx["name"] for idx in inspector.get_indexes(table_name)}
+    except sa.exc.NoSuchTableError:
+        return set()
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = inspect(bind)
+
+    if "zip_income_profiles" not in _table_names(inspector):
+        op.create_table(
+            "zip_income_profiles",
+            sa.Column("zip_code", sa.String(), primary_key=True),
+            sa.Column("median_household_income", sa.Integer(), nullable=True),
+            sa.Column(
+                "source",
+                sa.String(),
+                nullable=False,
+                server_default=sa.text("'census_acs_2022'"),
+            ),
+            sa.Column("fetched_at", sa.DateTime(), nullable=False),
+        )
+
+    indexes = _index_names(inspector, "zip_income_profiles")
+    if "ix_zip_income_profiles_fetched_at" not in indexes:
+        op.create_index(
+            "ix_zip_income_profiles_fetched_at", "zip_income_profiles", ["fetched_at"]
+        )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = inspect(bind)
+
+    if "zip_income_profiles" not in _table_names(inspector):
+        return
+
+    indexes = _index_names(inspector, "zip_income_profiles")
+    if "ix_zip_income_profiles_fetched_at" in indexes:
+        op.drop_index(
+            "ix_zip_income_profiles_fetched_at", table_name="zip_income_profiles"
+        )
+    op.drop_table("zip_income_profiles")
@@ -60,6 +60,9 @@ CONVERSATION_STRINGS: Mapping[str, Mapping[str, str]] = {
             "Someone will review your request and call you back shortly."
         ),
         "schedule_propose": "I can book you for {when}. Does that time work for you?",
+        "schedule_propose_alternative": (
+            "No problem. I can also do {when}. Does that time work for you?"
+        ),
         "confirm_slot_decline": (
             "Okay, I won't schedule that time. "
             "A team member will contact you to find a different slot."
@@ -136,6 +139,9 @@ CONVERSATION_STRINGS: Mapping[str, Mapping[str, str]] = {
             "Alguien revisará tu solicitud y te llamará pronto."
         ),
         "schedule_propose": "Te puedo agendar el {when}. ¿Ese horario te funciona?",
+        "schedule_propose_alternative": (
+            "No hay problema. También puedo el {when}. ¿Ese horario te funciona?"
+        ),
         "confirm_slot_decline": (
             "De acuerdo, no reservaré ese horario. "
             "Un miembro del equipo se pondrá en contacto contigo para encontrar otra hora."
@@ -1,31 +1,247 @@
 from __future__ import annotations
 
+from dataclasses import dataclass, fields
+from datetime import datetime
+import threading
+import time
+from typing import Any
+
 from .config import get_settings
 from .db import SQLALCHEMY_AVAILABLE, SessionLocal
 from .db_models import BusinessDB
+from .services.invalidation_bus import invalidation_bus
 
+_sa_event: Any = None
+_sa_inspect: Any = None
+_SaSession: Any = None
+try:  # Optional: only needed to hook ORM commits for cache invalidation.
+    from sqlalchemy import event as _sa_event
+    from sqlalchemy import inspect as _sa_inspect
+    from sqlalchemy.orm import Session as _SaSession
+except ImportError:  # pragma: no cover - optional dependency
+    pass
 
-def get_calendar_id_for_business(business_id: str) -> str:
-    """Return the calendar ID to use for a given business/tenant.
 
-    - If DB support is available and the Business row has a calendar_id, use it.
-    - Otherwise, fall back to the global calendar_id from settings.
+@dataclass(frozen=True)
+class TenantConfig:
+    """Immutable snapshot of the per-tenant settings read on hot paths.
+
+    Field names mirror the BusinessDB columns they are copied from so the
+    snapshot can be rebuilt from a row without a hand-written mapping.
     """
-    settings = get_settings()
-    default_calendar_id = settings.calendar.calendar_id
 
-    if not SQLALCHEMY_AVAILABLE or SessionLocal is None:
-        return default_calendar_id
+    id: str
+    name: str | None = None
+    vertical: str | None = None
+    language_code: str | None = None
+    calendar_id: str | None = None
+    tts_voice: str | None = None
+    time_zone: str | None = None
+    status: str | None = None
+    lockdown_mode: bool | None = None
+    emergency_keywords: str | None = None
+    service_duration_config: str | None = None
+    intent_threshold: int | None = None
+    open_hour: int | None = None
+    close_hour: int | None = None
+    closed_days: str | None = None
+    max_jobs_per_day: int | None = None
+    reserve_mornings_for_emergencies: bool | None = None
+    travel_buffer_minutes: int | None = None
+    service_tier: str | None = None
+    subscription_status: str | None = None
+    subscription_current_period_end: datetime | None = None
+
+    @property
+    def business_id(self) -> str:
+        return self.id
+
+    @classmethod
+    def from_row(cls, row: object) -> "TenantConfig":
+        values: dict[str, Any] = {
+            name: getattr(row, name, None) for name in _SNAPSHOT_FIELDS if name != "id"
+        }
+        return cls(id=str(getattr(row, "id")), **values)
+
+
+_SNAPSHOT_FIELDS: tuple[str, ...] = tuple(f.name for f in fields(TenantConfig))
+# Columns whose changes must be broadcast: the snapshot itself plus the
+# credentials cached by services.tenant_credentials.
+_WATCHED_FIELDS: tuple[str, ...] = _SNAPSHOT_FIELDS + (
+    "api_key",
+    "widget_token",
+    "widget_token_expires_at",
+)
+
+
+class _TenantConfigCache:
+    """Thread-safe TTL cache of TenantConfig snapshots keyed by business id.
+
+    Unknown tenants are cached as ``None`` so repeated lookups for a missing
+    row do not hit the database either. A generation counter prevents a
+    lookup that raced with an invalidation from storing a stale snapshot.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._entries: dict[str, tuple[float, TenantConfig | None]] = {}
+        self._generation = 0
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def get(self, business_id: str) -> tuple[bool, TenantConfig | None]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(business_id)
+            if entry is None:
+                return False, None
+            expires_at, config = entry
+            if expires_at <= now:
+                self._entries.pop(business_id, None)
+                return False, None
+            return True, config
+
+    def set(
+        self,
+        business_id: str,
+        config: TenantConfig | None,
+        ttl_seconds: float,
+        generation: int,
+    ) -> None:
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._entries[business_id] = (time.monotonic() + ttl_seconds, config)
+
+    def invalidate(self, business_id: str | None = None) -> None:
+        with self._lock:
+            self._generation += 1
+            if business_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(business_id, None)
 
+
+_cache = _TenantConfigCache()
+invalidation_bus.subscribe(_cache.invalidate)
+
+
+def _ttl_seconds() -> float:
+    try:
+        return float(getattr(get_settings(), "tenant_config_ttl_seconds", 30.0))
+    except Exception:
+        return 0.0
+
+
+def get_tenant_config(business_id: str | None) -> TenantConfig | None:
+    """Return the cached configuration snapshot for a tenant.
+
+    At most one ``BusinessDB`` read is issued per tenant per TTL window;
+    ORM commits touching a business invalidate its snapshot immediately.
+    Returns None when the tenant does not exist or the database is
+    unavailable, in which case callers should use their global defaults.
+    """
+    if not business_id or not (SQLALCHEMY_AVAILABLE and SessionLocal is not None):
+        return None
+
+    hit, config = _cache.get(business_id)
+    if hit:
+        return config
+
+    generation = _cache.generation
     session = SessionLocal()
     try:
         row = session.get(BusinessDB, business_id)
-        if row and getattr(row, "calendar_id", None):
-            return row.calendar_id  # type: ignore[return-value]
-        return default_calendar_id
+        config = TenantConfig.from_row(row) if row is not None else None
     finally:
         session.close()
 
+    ttl = _ttl_seconds()
+    if ttl > 0:
+        _cache.set(business_id, config, ttl, generation)
+    return config
+
+
+def invalidate_tenant_config(business_id: str | None = None) -> None:
+    """Drop the cached snapshot for one tenant, or for all tenants when None.
+
+    The invalidation is published on the shared bus so other replicas drop
+    their copies too when Redis is configured.
+    """
+    invalidation_bus.publish(business_id)
+
+
+_PENDING_KEY = "tenant_config_invalidations"
+_ALL_TENANTS = "*"
+
+
+def _changed_business_ids(session) -> set[str]:
+    ids: set[str] = set()
+    for obj in list(session.new) + list(session.deleted):
+        if isinstance(obj, BusinessDB) and getattr(obj, "id", None):
+            ids.add(str(obj.id))
+    for obj in session.dirty:
+        if not isinstance(obj, BusinessDB) or not getattr(obj, "id", None):
+            continue
+        # Skip bookkeeping-only writes (e.g. api_key_last_used_at) that do
+        # not change anything a cache depends on.
+        attrs = _sa_inspect(obj).attrs
+        if any(attrs[name].history.has_changes() for name in _WATCHED_FIELDS):
+            ids.add(str(obj.id))
+    return ids
+
+
+def _on_after_flush(session, flush_context) -> None:
+    ids = _changed_business_ids(session)
+    if ids:
+        session.info.setdefault(_PENDING_KEY, set()).update(ids)
+
+
+def _on_orm_execute(orm_execute_state) -> None:
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    if any(m.class_ is BusinessDB for m in orm_execute_state.all_mappers):
+        orm_execute_state.session.info.setdefault(_PENDING_KEY, set()).add(_ALL_TENANTS)
+
+
+def _on_after_commit(session) -> None:
+    pending = session.info.pop(_PENDING_KEY, None)
+    if not pending:
+        return
+    if _ALL_TENANTS in pending:
+        invalidate_tenant_config()
+        return
+    for business_id in pending:
+        invalidate_tenant_config(business_id)
+
+
+def _on_after_rollback(session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+if SQLALCHEMY_AVAILABLE and _sa_event is not None and _SaSession is not None:
+    _sa_event.listen(_SaSession, "after_flush", _on_after_flush)
+    _sa_event.listen(_SaSession, "do_orm_execute", _on_orm_execute)
+    _sa_event.listen(_SaSession, "after_commit", _on_after_commit)
+    _sa_event.listen(_SaSession, "after_rollback", _on_after_rollback)
+
+
+def get_calendar_id_for_business(business_id: str) -> str:
+    """Return the calendar ID to use for a given business/tenant.
+
+    - If DB support is available and the Business row has a calendar_id, use it.
+    - Otherwise, fall back to the global calendar_id from settings.
+    """
+    settings = get_settings()
+    default_calendar_id = settings.calendar.calendar_id
+
+    config = get_tenant_config(business_id)
+    if config is not None and config.calendar_id:
+        return config.calendar_id
+    return default_calendar_id
+
 
 def get_language_for_business(business_id: str | None) -> str:
     """Return the language code for a given business/tenant.
@@ -36,17 +252,10 @@ def get_language_for_business(business_id: str | None) -> str:
     settings = get_settings()
     default_language = getattr(settings, "default_language_code", "en")
 
-    if not business_id or not (SQLALCHEMY_AVAILABLE and SessionLocal is not None):
-        return default_language
-
-    session = SessionLocal()
-    try:
-        row = session.get(BusinessDB, business_id)
-        if row and getattr(row, "language_code", None):
-            return row.language_code  # type: ignore[return-value]
-        return default_language
-    finally:
-        session.close()
+    config = get_tenant_config(business_id)
+    if config is not None and config.language_code:
+        return config.language_code
+    return default_language
 
 
 def get_vertical_for_business(business_id: str | None) -> str:
@@ -58,17 +267,10 @@ def get_vertical_for_business(business_id: str | None) -> str:
     settings = get_settings()
     default_vertical = getattr(settings, "default_vertical", "plumbing")
 
-    if not business_id or not (SQLALCHEMY_AVAILABLE and SessionLocal is not None):
-        return default_vertical
-
-    session = SessionLocal()
-    try:
-        row = session.get(BusinessDB, business_id)
-        if row and getattr(row, "vertical", None):
-            return row.vertical  # type: ignore[return-value]
-        return default_vertical
-    finally:
-        session.close()
+    config = get_tenant_config(business_id)
+    if config is not None and config.vertical:
+        return config.vertical
+    return default_vertical
 
 
 def get_voice_for_business(business_id: str | None) -> str:
@@ -80,14 +282,7 @@ def get_voice_for_business(business_id: str | None) -> str:
     settings = get_settings()
     default_voice = settings.speech.openai_tts_voice
 
-    if not business_id or not (SQLALCHEMY_AVAILABLE and SessionLocal is not None):
-        return default_voice
-
-    session = SessionLocal()
-    try:
-        row = session.get(BusinessDB, business_id)
-        if row and getattr(row, "tts_voice", None):
-            return row.tts_voice  # type: ignore[return-value]
-        return default_voice
-    finally:
-        session.close()
+    config = get_tenant_config(business_id)
+    if config is not None and config.tts_voice:
+        return config.tts_voice
+    return default_voice
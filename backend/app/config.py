@@ -26,10 +26,24 @@ class CalendarSettings(BaseModel):
     default_open_hour: int = 8
     default_close_hour: int = 17
     default_closed_days: str = ""
+    # Blocking Google API calls run on a bounded thread pool with a timeout.
+    api_max_workers: int = 8
+    api_timeout_seconds: float = 10.0
+    # Upper bound on FreeBusy cache staleness when push notifications are missed.
+    freebusy_cache_ttl_seconds: float = 300.0
+    # Background incremental sync across tenants (0 disables periodic sweeps).
+    sync_max_concurrency: int = 8
+    sync_sweep_interval_seconds: float = 900.0
+    # Geocoding for travel buffers. The optional ZIP centroid file (CSV or
+    # Census ZCTA gazetteer) is the offline fallback for unresolved addresses.
+    geocode_cache_max_entries: int = 10000
+    geocode_max_concurrency: int = 4
+    geocode_prefetch_timeout_seconds: float = 2.0
+    geocode_zip_centroids_path: str | None = None
 
 
 class SpeechSettings(BaseModel):
-    provider: str = "stub"  # "stub", "openai", "gcp"
+    provider: str = "stub"  # "stub", "openai", "gcp", "replay"
     openai_api_key: str | None = None
     openai_api_base: str = "https://api.openai.com/v1"
     openai_tts_model: str = "gpt-4o-mini"
@@ -41,6 +55,14 @@ class SpeechSettings(BaseModel):
     gcp_tts_voice: str | None = None
     gcp_tts_audio_encoding: str = "MP3"
     gcp_timeout_seconds: float = 12.0
+    # JSON list of transcripts replayed by SPEECH_PROVIDER=replay (offline).
+    replay_fixture_path: str | None = None
+    # Synthesized replies are cached in memory up to this many bytes of
+    # (base64) audio, and optionally on disk or in a GCS bucket.
+    tts_cache_max_bytes: int = 16 * 1024 * 1024
+    tts_cache_dir: str | None = None
+    tts_cache_gcs_bucket: str | None = None
+    tts_cache_gcs_prefix: str = "tts-cache/"
 
 
 class NluSettings(BaseModel):
@@ -68,6 +90,13 @@ class OAuthSettings(BaseModel):
         "GCALENDAR_SCOPES",
         "openid email profile https://www.googleapis.com/auth/calendar.events.readonly",
     )
+    # Pooled OAuth clients are refreshed this long before their token expires.
+    client_refresh_ahead_seconds: float = float(
+        os.getenv("OAUTH_CLIENT_REFRESH_AHEAD_SECONDS", "300")
+    )
+    client_refresh_interval_seconds: float = float(
+        os.getenv("OAUTH_CLIENT_REFRESH_INTERVAL_SECONDS", "60")
+    )
 
 
 class EmailSettings(BaseModel):
@@ -103,6 +132,27 @@ class TelephonySettings(BaseModel):
     twilio_stream_min_seconds: float = float(
         os.getenv("TWILIO_STREAM_MIN_SECONDS", "1.0")
     )
+    # Capacity of the per-call PCM ring buffer; older audio is dropped beyond it.
+    twilio_stream_buffer_seconds: float = float(
+        os.getenv("TWILIO_STREAM_BUFFER_SECONDS", "30.0")
+    )
+    # Utterances a call may queue for STT before the reader defers flushing.
+    twilio_stream_queue_size: int = int(os.getenv("TWILIO_STREAM_QUEUE_SIZE", "4"))
+    # Voice activity detection: flush an utterance once the caller has been
+    # quiet for the hangover, or once it reaches the maximum length. When
+    # disabled, audio is flushed every twilio_stream_min_seconds instead.
+    twilio_stream_vad_enabled: bool = (
+        os.getenv("TWILIO_STREAM_VAD_ENABLED", "true").lower() == "true"
+    )
+    twilio_stream_vad_min_rms: float = float(
+        os.getenv("TWILIO_STREAM_VAD_MIN_RMS", "400")
+    )
+    twilio_stream_vad_hangover_ms: int = int(
+        os.getenv("TWILIO_STREAM_VAD_HANGOVER_MS", "600")
+    )
+    twilio_stream_max_utterance_seconds: float = float(
+        os.getenv("TWILIO_STREAM_MAX_UTTERANCE_SECONDS", "10.0")
+    )
 
 
 class QuickBooksSettings(BaseModel):
@@ -173,6 +223,15 @@ class AppSettings(BaseModel):
     rate_limit_burst: int = 20
     rate_limit_whitelist_ips: list[str] = []
     retention_purge_interval_hours: int = 24
+    tenant_config_ttl_seconds: float = 30.0
+    tenant_credential_cache_ttl_seconds: float = 60.0
+    audit_buffer_enabled: bool = True
+    audit_buffer_max_events: int = 10000
+    audit_flush_batch_size: int = 200
+    audit_flush_interval_ms: int = 250
+    customer_search_index_ttl_seconds: float = 60.0
+    # Cached Census ZIP income profiles are refreshed after this many days.
+    zip_income_refresh_days: int = 180
     capture_transcripts: bool = True
     security_headers_enabled: bool = True
     security_csp: str = (
@@ -225,6 +284,23 @@ class AppSettings(BaseModel):
             default_open_hour=default_open_hour,
             default_close_hour=default_close_hour,
             default_closed_days=default_closed_days,
+            api_max_workers=int(os.getenv("GOOGLE_API_MAX_WORKERS", "8")),
+            api_timeout_seconds=float(os.getenv("GOOGLE_API_TIMEOUT_SECONDS", "10")),
+            freebusy_cache_ttl_seconds=float(
+                os.getenv("GOOGLE_FREEBUSY_CACHE_TTL_SECONDS", "300")
+            ),
+            sync_max_concurrency=int(os.getenv("GCALENDAR_SYNC_MAX_CONCURRENCY", "8")),
+            sync_sweep_interval_seconds=float(
+                os.getenv("GCALENDAR_SYNC_SWEEP_INTERVAL_SECONDS", "900")
+            ),
+            geocode_cache_max_entries=int(
+                os.getenv("GEOCODE_CACHE_MAX_ENTRIES", "10000")
+            ),
+            geocode_max_concurrency=int(os.getenv("GEOCODE_MAX_CONCURRENCY", "4")),
+            geocode_prefetch_timeout_seconds=float(
+                os.getenv("GEOCODE_PREFETCH_TIMEOUT_SECONDS", "2")
+            ),
+            geocode_zip_centroids_path=os.getenv("GEOCODE_ZIP_CENTROIDS_PATH") or None,
         )
         speech = SpeechSettings(
             provider=os.getenv("SPEECH_PROVIDER", "stub"),
@@ -239,6 +315,13 @@ class AppSettings(BaseModel):
             gcp_tts_voice=os.getenv("GCP_TTS_VOICE"),
             gcp_tts_audio_encoding=os.getenv("GCP_TTS_AUDIO_ENCODING", "MP3"),
             gcp_timeout_seconds=float(os.getenv("GCP_SPEECH_TIMEOUT_SECONDS", "12")),
+            replay_fixture_path=os.getenv("SPEECH_REPLAY_FIXTURE") or None,
+            tts_cache_max_bytes=int(
+                os.getenv("TTS_CACHE_MAX_BYTES", str(16 * 1024 * 1024))
+            ),
+            tts_cache_dir=os.getenv("TTS_CACHE_DIR") or None,
+            tts_cache_gcs_bucket=os.getenv("TTS_CACHE_GCS_BUCKET") or None,
+            tts_cache_gcs_prefix=os.getenv("TTS_CACHE_GCS_PREFIX", "tts-cache/"),
         )
         nlu = NluSettings(
             intent_provider=os.getenv("NLU_PROVIDER", "heuristic"),
@@ -266,6 +349,12 @@ class AppSettings(BaseModel):
                 "GCALENDAR_SCOPES",
                 "openid email profile https://www.googleapis.com/auth/calendar.events.readonly",
             ),
+            client_refresh_ahead_seconds=float(
+                os.getenv("OAUTH_CLIENT_REFRESH_AHEAD_SECONDS", "300")
+            ),
+            client_refresh_interval_seconds=float(
+                os.getenv("OAUTH_CLIENT_REFRESH_INTERVAL_SECONDS", "60")
+            ),
         )
         email = EmailSettings(
             provider=os.getenv("EMAIL_PROVIDER", "stub"),
@@ -300,6 +389,23 @@ class AppSettings(BaseModel):
             twilio_stream_min_seconds=float(
                 os.getenv("TWILIO_STREAM_MIN_SECONDS", "1.0")
             ),
+            twilio_stream_buffer_seconds=float(
+                os.getenv("TWILIO_STREAM_BUFFER_SECONDS", "30.0")
+            ),
+            twilio_stream_queue_size=int(os.getenv("TWILIO_STREAM_QUEUE_SIZE", "4")),
+            twilio_stream_vad_enabled=os.getenv(
+                "TWILIO_STREAM_VAD_ENABLED", "true"
+            ).lower()
+            == "true",
+            twilio_stream_vad_min_rms=float(
+                os.getenv("TWILIO_STREAM_VAD_MIN_RMS", "400")
+            ),
+            twilio_stream_vad_hangover_ms=int(
+                os.getenv("TWILIO_STREAM_VAD_HANGOVER_MS", "600")
+            ),
+            twilio_stream_max_utterance_seconds=float(
+                os.getenv("TWILIO_STREAM_MAX_UTTERANCE_SECONDS", "10.0")
+            ),
         )
         quickbooks = QuickBooksSettings(
             client_id=os.getenv("QBO_CLIENT_ID"),
@@ -381,6 +487,20 @@ class AppSettings(BaseModel):
         retention_purge_interval_hours = int(
             os.getenv("RETENTION_PURGE_INTERVAL_HOURS", "24")
         )
+        tenant_config_ttl_seconds = float(os.getenv("TENANT_CONFIG_TTL_SECONDS", "30"))
+        tenant_credential_cache_ttl_seconds = float(
+            os.getenv("TENANT_CREDENTIAL_CACHE_TTL_SECONDS", "60")
+        )
+        audit_buffer_enabled = (
+            os.getenv("AUDIT_BUFFER_ENABLED", "true").lower() == "true"
+        )
+        audit_buffer_max_events = int(os.getenv("AUDIT_BUFFER_MAX_EVENTS", "10000"))
+        audit_flush_batch_size = int(os.getenv("AUDIT_FLUSH_BATCH_SIZE", "200"))
+        audit_flush_interval_ms = int(os.getenv("AUDIT_FLUSH_INTERVAL_MS", "250"))
+        customer_search_index_ttl_seconds = float(
+            os.getenv("CUSTOMER_SEARCH_INDEX_TTL_SECONDS", "60")
+        )
+        zip_income_refresh_days = int(os.getenv("ZIP_INCOME_REFRESH_DAYS", "180"))
         capture_transcripts = (
             os.getenv("CAPTURE_TRANSCRIPTS", "true").lower() != "false"
         )
@@ -426,6 +546,14 @@ class AppSettings(BaseModel):
             rate_limit_burst=rate_limit_burst,
             rate_limit_whitelist_ips=rate_limit_whitelist_ips,
             retention_purge_interval_hours=retention_purge_interval_hours,
+            tenant_config_ttl_seconds=tenant_config_ttl_seconds,
+            tenant_credential_cache_ttl_seconds=tenant_credential_cache_ttl_seconds,
+            audit_buffer_enabled=audit_buffer_enabled,
+            audit_buffer_max_events=audit_buffer_max_events,
+            audit_flush_batch_size=audit_flush_batch_size,
+            audit_flush_interval_ms=audit_flush_interval_ms,
+            customer_search_index_ttl_seconds=customer_search_index_ttl_seconds,
+            zip_income_refresh_days=zip_income_refresh_days,
             capture_transcripts=capture_transcripts,
             security_headers_enabled=security_headers_enabled,
             security_csp=security_csp,
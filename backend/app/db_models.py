@@ -1,10 +1,20 @@
 from __future__ import annotations
 
-from datetime import UTC, datetime
+from datetime import UTC, date, datetime
 from typing import TYPE_CHECKING
 from uuid import uuid4
 
-from sqlalchemy import Boolean, Column, DateTime, Integer, String, Text
+from sqlalchemy import (
+    Boolean,
+    Column,
+    Date,
+    DateTime,
+    Float,
+    Index,
+    Integer,
+    String,
+    Text,
+)
 
 from .db import Base, SQLALCHEMY_AVAILABLE
 
@@ -17,6 +27,11 @@ def _new_id() -> str:
     return str(uuid4())
 
 
+# Statuses that count as booked work; appointment statuses are stored
+# upper-case so this list can be matched without UPPER().
+ACTIVE_APPOINTMENT_STATUSES = ("SCHEDULED", "CONFIRMED")
+
+
 if TYPE_CHECKING or SQLALCHEMY_AVAILABLE:
 
     class BusinessDB(Base):
@@ -145,6 +160,11 @@ if TYPE_CHECKING or SQLALCHEMY_AVAILABLE:
         sms_opt_out = Column(Boolean, nullable=False, default=False)
         tags = Column(String, nullable=True)
 
+        __table_args__ = (
+            Index("ix_customers_business_phone", "business_id", "phone"),
+            Index("ix_customers_business_created_at", "business_id", "created_at"),
+        )
+
     class AppointmentDB(Base):
         __tablename__ = "appointments"
 
@@ -168,6 +188,26 @@ if TYPE_CHECKING or SQLALCHEMY_AVAILABLE:
         tags = Column(String, nullable=True)
         technician_id = Column(String, nullable=True)
 
+        # Composite indexes for the tenant/time-window and per-customer query
+        # shapes; the partial index covers the active-only windows used by
+        # dashboard analytics. Mirrored by alembic revision 0007.
+        __table_args__ = (
+            Index("ix_appointments_business_start", "business_id", "start_time", "id"),
+            Index(
+                "ix_appointments_customer_business_start",
+                "customer_id",
+                "business_id",
+                "start_time",
+            ),
+            Index(
+                "ix_appointments_business_active_start",
+                "business_id",
+                "start_time",
+                postgresql_where=status.in_(ACTIVE_APPOINTMENT_STATUSES),
+                sqlite_where=status.in_(ACTIVE_APPOINTMENT_STATUSES),
+            ),
+        )
+
     class ConversationDB(Base):
         __tablename__ = "conversations"
 
@@ -180,6 +220,11 @@ if TYPE_CHECKING or SQLALCHEMY_AVAILABLE:
         intent = Column(String, nullable=True)
         intent_confidence = Column(Integer, nullable=True)
 
+        __table_args__ = (
+            Index("ix_conversations_business_created_at", "business_id", "created_at"),
+            Index("ix_conversations_customer_business", "customer_id", "business_id"),
+        )
+
     class ConversationMessageDB(Base):
         __tablename__ = "conversation_messages"
 
@@ -189,6 +234,14 @@ if TYPE_CHECKING or SQLALCHEMY_AVAILABLE:
         text = Column(String, nullable=False)
         timestamp = Column(DateTime, nullable=False, default=_utcnow, index=True)
 
+        __table_args__ = (
+            Index(
+                "ix_conversation_messages_conversation_timestamp",
+                "conversation_id",
+                "timestamp",
+            ),
+        )
+
     class RetentionPurgeLogDB(Base):
         __tablename__ = "retention_purge_logs"
 
@@ -269,6 +322,41 @@ if TYPE_CHECKING or SQLALCHEMY_AVAILABLE:
         message = Column(String, nullable=True)
         event = Column(String, nullable=False)  # "opt_out", "opt_in", "sent", "blocked"
 
+    class GeocodeCacheDB(Base):
+        __tablename__ = "geocode_cache"
+
+        # Normalised address text (lower-cased, single-spaced).
+        address_key = Column(String, primary_key=True)
+        # Both NULL when the geocoder found no match for the address.
+        lat = Column(Float, nullable=True)
+        lng = Column(Float, nullable=True)
+        source = Column(String, nullable=False, default="google")
+        updated_at = Column(DateTime, nullable=False, default=_utcnow, index=True)
+
+    class ZipIncomeProfileDB(Base):
+        __tablename__ = "zip_income_profiles"
+
+        zip_code = Column(String, primary_key=True)
+        # NULL when the Census API has no estimate for the ZCTA.
+        median_household_income = Column(Integer, nullable=True)
+        source = Column(String, nullable=False, default="census_acs_2022")
+        fetched_at = Column(DateTime, nullable=False, default=_utcnow, index=True)
+
+    class AppointmentDailyRollupDB(Base):
+        __tablename__ = "appointment_daily_rollup"
+
+        business_id = Column(String, primary_key=True)
+        # UTC calendar day of the appointments' start time.
+        day = Column(Date, primary_key=True)
+        total_appointments = Column(Integer, nullable=False, default=0)
+        # JSON objects mapping tag / service type to appointment counts.
+        tag_counts = Column(Text, nullable=False, default="{}")
+        service_type_counts = Column(Text, nullable=False, default="{}")
+        estimated_value_total = Column(Float, nullable=False, default=0.0)
+        estimated_value_count = Column(Integer, nullable=False, default=0)
+        new_customers = Column(Integer, nullable=False, default=0)
+        updated_at = Column(DateTime, nullable=False, default=_utcnow)
+
 else:  # pragma: no cover - for environments without SQLAlchemy
 
     class BusinessDB:
@@ -360,3 +448,19 @@ else:  # pragma: no cover - for environments without SQLAlchemy
     class SmsAuditDB:
         __tablename__ = "sms_audit"
         id: int
+
+    class GeocodeCacheDB:
+        __tablename__ = "geocode_cache"
+        address_key: str
+        lat: float | None
+        lng: float | None
+
+    class ZipIncomeProfileDB:
+        __tablename__ = "zip_income_profiles"
+        zip_code: str
+        median_household_income: int | None
+
+    class AppointmentDailyRollupDB:
+        __tablename__ = "appointment_daily_rollup"
+        business_id: str
+        day: date
@@ -5,12 +5,14 @@ from datetime import datetime, UTC
 from fastapi import Depends, Header, HTTPException, status, Request
 from typing import cast
 
+from .business_config import get_tenant_config
 from .config import get_settings
 from .db import SQLALCHEMY_AVAILABLE, SessionLocal
 from .db_models import BusinessDB, BusinessUserDB
 from .services.auth import TokenError, decode_token
 from .services import subscription as subscription_service
 from .services import audit as audit_service
+from .services import tenant_credentials
 from .metrics import metrics
 
 DEFAULT_BUSINESS_ID = "default_business"
@@ -111,67 +113,38 @@ async def get_business_id(
         and SessionLocal is not None
         and (x_api_key or x_widget_token)
     ):
-        session = SessionLocal()
-        business_id_value: str | None = None
-        try:
-            business = None
-            now = datetime.now(UTC)
-            if x_api_key:
-                business = (
-                    session.query(BusinessDB)
-                    .filter(BusinessDB.api_key == x_api_key)
-                    .one_or_none()
-                )
-                if business is not None:
-                    try:
-                        business.api_key_last_used_at = now  # type: ignore[assignment]
-                        session.add(business)
-                        session.commit()
-                    except Exception:
-                        session.rollback()
-            elif x_widget_token:
-                business = (
-                    session.query(BusinessDB)
-                    .filter(BusinessDB.widget_token == x_widget_token)
-                    .one_or_none()
+        now = datetime.now(UTC)
+        kind = (
+            tenant_credentials.CREDENTIAL_API_KEY
+            if x_api_key
+            else tenant_credentials.CREDENTIAL_WIDGET_TOKEN
+        )
+        credential = cast(str, x_api_key or x_widget_token)
+        match = tenant_credentials.resolve_credential(
+            kind, credential, session_factory=SessionLocal, request=request
+        )
+        if match is not None and not x_api_key:
+            expires_at = match.widget_token_expires_at
+            if expires_at is not None and expires_at < now:
+                if _security_events_enabled(request):
+                    await audit_service.record_security_event(
+                        request=request,
+                        event_type=audit_service.SECURITY_EVENT_AUTH_FAILURE,
+                        status_code=status.HTTP_401_UNAUTHORIZED,
+                        business_id=match.business_id,
+                        meta={
+                            "reason": "widget_token_expired",
+                            "widget_token_hash": audit_service.hash_value(
+                                x_widget_token
+                            ),
+                        },
+                    )
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="Widget token expired",
                 )
-                if business is not None:
-                    expires_at = getattr(business, "widget_token_expires_at", None)
-                    if expires_at is not None and expires_at.tzinfo is None:
-                        expires_at = expires_at.replace(tzinfo=UTC)
-                    if expires_at is not None and expires_at < now:
-                        if _security_events_enabled(request):
-                            await audit_service.record_security_event(
-                                request=request,
-                                event_type=audit_service.SECURITY_EVENT_AUTH_FAILURE,
-                                status_code=status.HTTP_401_UNAUTHORIZED,
-                                business_id=cast(str, getattr(business, "id", None)),
-                                meta={
-                                    "reason": "widget_token_expired",
-                                    "widget_token_hash": audit_service.hash_value(
-                                        x_widget_token
-                                    ),
-                                },
-                            )
-                        raise HTTPException(
-                            status_code=status.HTTP_401_UNAUTHORIZED,
-                            detail="Widget token expired",
-                        )
-                    try:
-                        business.widget_token_last_used_at = now  # type: ignore[assignment]
-                        session.add(business)
-                        session.commit()
-                    except HTTPException:
-                        session.rollback()
-                        raise
-                    except Exception:
-                        session.rollback()
-            if business is not None:
-                business_id_value = cast(str, business.id)
-        finally:
-            session.close()
-
-        if not business:
+
+        if match is None:
             # In tests we allow falling back to the default tenant when an API key is
             # supplied but multi-tenant enforcement is not required, to avoid 401s in
             # routes that set dummy keys.
@@ -195,7 +168,10 @@ async def get_business_id(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid tenant credentials",
             )
-        return cast(str, business_id_value)
+        tenant_credentials.record_credential_use(
+            kind, credential, match.business_id, session_factory=SessionLocal
+        )
+        return match.business_id
 
     # If configured, do not allow silent fallback to the default tenant when no
     # tenant-identifying headers are present.
@@ -226,12 +202,8 @@ async def ensure_business_active(
     behaves like a passthrough.
     """
     if SQLALCHEMY_AVAILABLE and SessionLocal is not None:
-        session = SessionLocal()
-        try:
-            row = session.get(BusinessDB, business_id)
-        finally:
-            session.close()
-        if row is not None and getattr(row, "status", "ACTIVE") != "ACTIVE":
+        config = get_tenant_config(business_id)
+        if config is not None and config.status != "ACTIVE":
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Business is suspended",
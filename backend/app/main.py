@@ -11,6 +11,7 @@ from fastapi.responses import RedirectResponse
 from fastapi.staticfiles import StaticFiles
 from sqlalchemy import text
 
+from .business_config import get_tenant_config
 from .config import get_settings
 from .db import SQLALCHEMY_AVAILABLE, SessionLocal, init_db
 from .logging_config import configure_logging
@@ -25,6 +26,7 @@ from .context import (
 from . import observability
 from .services.audit import (
     SECURITY_EVENT_RATE_LIMIT_BLOCKED,
+    audit_writer,
     hash_value,
     record_audit_event,
     record_security_event,
@@ -32,6 +34,10 @@ from .services.audit import (
 from .services.retention_purge import start_retention_scheduler
 from .services.rate_limit import RateLimiter, RateLimitError
 from .services.job_queue import job_queue
+from .services.invalidation_bus import invalidation_bus
+from .services.google_api import google_api_executor
+from .services.calendar_sync import calendar_sync_scheduler
+from .services.oauth_clients import oauth_client_pool
 from .services import alerting
 from .routers import (
     business_admin,
@@ -59,24 +65,23 @@ from .routers import (
 
 
 def _is_business_locked(business_id: str) -> bool:
-    """Return True when the tenant is in lockdown mode (DB-backed flag)."""
+    """Return True when the tenant is in lockdown mode (DB-backed flag).
+
+    Reads the cached tenant snapshot; toggling lockdown commits a BusinessDB
+    change which invalidates the snapshot on every replica.
+    """
     if not (SQLALCHEMY_AVAILABLE and SessionLocal is not None):
         return False
-    from .db_models import BusinessDB  # local import to avoid circular deps
-
-    session_db = SessionLocal()
     try:
-        row = session_db.get(BusinessDB, business_id)
-        if row is None:
-            return False
-        return bool(getattr(row, "lockdown_mode", False))
+        config = get_tenant_config(business_id)
     except Exception:
         logging.getLogger(__name__).warning(
             "lockdown_check_failed", exc_info=True, extra={"business_id": business_id}
         )
         return False
-    finally:
-        session_db.close()
+    if config is None:
+        return False
+    return bool(config.lockdown_mode)
 
 
 def create_app() -> FastAPI:
@@ -242,6 +247,25 @@ def create_app() -> FastAPI:
         job_queue.start()
     except Exception:
         logger.warning("job_queue_start_failed", exc_info=True)
+    try:
+        invalidation_bus.start()
+    except Exception:
+        logger.warning("invalidation_bus_start_failed", exc_info=True)
+    try:
+        oauth_client_pool.start()
+    except Exception:
+        logger.warning("oauth_client_pool_start_failed", exc_info=True)
+    # Tests read audit rows back immediately, so keep writes synchronous there.
+    if getattr(settings, "audit_buffer_enabled", False) and not testing_mode:
+        try:
+            audit_writer.configure(
+                max_events=settings.audit_buffer_max_events,
+                batch_size=settings.audit_flush_batch_size,
+                flush_interval_ms=settings.audit_flush_interval_ms,
+            )
+            audit_writer.start()
+        except Exception:
+            logger.warning("audit_writer_start_failed", exc_info=True)
 
     shared_dir = repo_root / "shared"
     dashboard_dir = repo_root / "dashboard"
@@ -566,12 +590,42 @@ def create_app() -> FastAPI:
 
         app.add_middleware(SentryAsgiMiddleware)
 
+    @app.on_event("startup")
+    async def _start_calendar_sync() -> None:  # pragma: no cover - wiring only
+        # Periodic sweeps need the server's event loop; tests drive syncs directly.
+        if testing_mode:
+            return
+        try:
+            calendar_sync_scheduler.start()
+        except Exception:
+            logger.warning("calendar_sync_scheduler_start_failed", exc_info=True)
+
     @app.on_event("shutdown")
     async def _shutdown_services() -> None:  # pragma: no cover - wiring only
+        try:
+            await calendar_sync_scheduler.stop()
+        except Exception:
+            logger.warning("calendar_sync_scheduler_stop_failed", exc_info=True)
         try:
             job_queue.stop()
         except Exception:
             logger.warning("job_queue_stop_failed", exc_info=True)
+        try:
+            invalidation_bus.stop()
+        except Exception:
+            logger.warning("invalidation_bus_stop_failed", exc_info=True)
+        try:
+            audit_writer.stop()
+        except Exception:
+            logger.warning("audit_writer_stop_failed", exc_info=True)
+        try:
+            oauth_client_pool.stop()
+        except Exception:
+            logger.warning("oauth_client_pool_stop_failed", exc_info=True)
+        try:
+            google_api_executor.shutdown()
+        except Exception:
+            logger.warning("google_api_executor_stop_failed", exc_info=True)
 
     app.include_router(voice.router, prefix="/v1/voice", tags=["voice"])
     # Support both legacy and versioned prefixes for telephony and Twilio
@@ -683,6 +737,44 @@ def create_app() -> FastAPI:
         emit("ai_telephony_sms_sent_total", float(metrics.sms_sent_total))
         emit("ai_telephony_twilio_voice_requests", float(metrics.twilio_voice_requests))
         emit("ai_telephony_twilio_voice_errors", float(metrics.twilio_voice_errors))
+        emit(
+            "ai_telephony_twilio_stream_audio_dropped_bytes",
+            float(metrics.twilio_stream_audio_dropped_bytes),
+        )
+        emit(
+            "ai_telephony_twilio_stream_flushes_deferred",
+            float(metrics.twilio_stream_flushes_deferred),
+        )
+        emit(
+            "ai_telephony_twilio_stream_queue_depth_max",
+            float(metrics.twilio_stream_queue_depth_max),
+        )
+        emit(
+            "ai_telephony_twilio_stream_worker_cancellations",
+            float(metrics.twilio_stream_worker_cancellations),
+        )
+        emit(
+            "ai_telephony_twilio_stream_vad_utterances",
+            float(metrics.twilio_stream_vad_utterances),
+        )
+        emit(
+            "ai_telephony_twilio_stream_vad_splits",
+            float(metrics.twilio_stream_vad_splits),
+        )
+        emit(
+            "ai_telephony_twilio_stream_partial_transcripts",
+            float(metrics.twilio_stream_partial_transcripts),
+        )
+        emit("ai_telephony_intent_speculations", float(metrics.intent_speculations))
+        emit(
+            "ai_telephony_intent_speculation_hits",
+            float(metrics.intent_speculation_hits),
+        )
+        emit("ai_telephony_tts_cache_hits", float(metrics.tts_cache_hits))
+        emit("ai_telephony_tts_cache_store_hits", float(metrics.tts_cache_store_hits))
+        emit("ai_telephony_tts_cache_misses", float(metrics.tts_cache_misses))
+        emit("ai_telephony_tts_cache_coalesced", float(metrics.tts_cache_coalesced))
+        emit("ai_telephony_tts_cache_evictions", float(metrics.tts_cache_evictions))
         emit("ai_telephony_twilio_sms_requests", float(metrics.twilio_sms_requests))
         emit("ai_telephony_twilio_sms_errors", float(metrics.twilio_sms_errors))
         emit(
@@ -717,6 +809,84 @@ def create_app() -> FastAPI:
             "ai_telephony_calendar_webhook_failures",
             float(metrics.calendar_webhook_failures),
         )
+        emit("ai_telephony_google_api_calls", float(metrics.google_api_calls))
+        emit("ai_telephony_google_api_errors", float(metrics.google_api_errors))
+        emit("ai_telephony_google_api_timeouts", float(metrics.google_api_timeouts))
+        emit(
+            "ai_telephony_google_api_queue_ms_total",
+            float(metrics.google_api_queue_ms_total),
+        )
+        emit(
+            "ai_telephony_google_api_call_ms_total",
+            float(metrics.google_api_call_ms_total),
+        )
+        emit(
+            "ai_telephony_google_api_call_ms_max",
+            float(metrics.google_api_call_ms_max),
+        )
+        emit("ai_telephony_freebusy_cache_hits", float(metrics.freebusy_cache_hits))
+        emit("ai_telephony_freebusy_cache_misses", float(metrics.freebusy_cache_misses))
+        emit(
+            "ai_telephony_freebusy_cache_invalidations",
+            float(metrics.freebusy_cache_invalidations),
+        )
+        emit(
+            "ai_telephony_oauth_client_pool_hits",
+            float(metrics.oauth_client_pool_hits),
+        )
+        emit(
+            "ai_telephony_oauth_client_pool_misses",
+            float(metrics.oauth_client_pool_misses),
+        )
+        emit(
+            "ai_telephony_oauth_client_refresh_failures",
+            float(metrics.oauth_client_refresh_failures),
+        )
+        emit("ai_telephony_geocode_cache_hits", float(metrics.geocode_cache_hits))
+        emit("ai_telephony_geocode_cache_misses", float(metrics.geocode_cache_misses))
+        emit("ai_telephony_geocode_requests", float(metrics.geocode_requests))
+        emit("ai_telephony_geocode_failures", float(metrics.geocode_failures))
+        emit(
+            "ai_telephony_geocode_zip_fallbacks",
+            float(metrics.geocode_zip_fallbacks),
+        )
+        emit(
+            "ai_telephony_zip_income_local_hits",
+            float(metrics.zip_income_local_hits),
+        )
+        emit(
+            "ai_telephony_zip_income_local_misses",
+            float(metrics.zip_income_local_misses),
+        )
+        emit(
+            "ai_telephony_zip_income_fetch_failures",
+            float(metrics.zip_income_fetch_failures),
+        )
+        emit(
+            "ai_telephony_appointment_rollup_rebuilds",
+            float(metrics.appointment_rollup_rebuilds),
+        )
+        emit(
+            "ai_telephony_appointment_rollup_day_refreshes",
+            float(metrics.appointment_rollup_day_refreshes),
+        )
+        emit("ai_telephony_calendar_sync_runs", float(metrics.calendar_sync_runs))
+        emit(
+            "ai_telephony_calendar_sync_failures",
+            float(metrics.calendar_sync_failures),
+        )
+        emit(
+            "ai_telephony_calendar_sync_coalesced",
+            float(metrics.calendar_sync_coalesced),
+        )
+        emit(
+            "ai_telephony_calendar_sync_lag_seconds_max",
+            float(metrics.calendar_sync_lag_seconds_max),
+        )
+        for tenant_id, lag in sorted(metrics.calendar_sync_lag_seconds.items()):
+            lines.append(
+                f'ai_telephony_calendar_sync_lag_seconds{{business_id="{tenant_id}"}} {lag}'
+            )
         emit(
             "ai_telephony_notification_attempts",
             float(metrics.notification_attempts),
@@ -858,6 +1028,15 @@ def create_app() -> FastAPI:
         emit("ai_telephony_job_queue_enqueued", float(metrics.job_queue_enqueued))
         emit("ai_telephony_job_queue_completed", float(metrics.job_queue_completed))
         emit("ai_telephony_job_queue_failed", float(metrics.job_queue_failed))
+        emit("ai_telephony_audit_events_dropped", float(metrics.audit_events_dropped))
+        emit(
+            "ai_telephony_security_events_dropped",
+            float(metrics.security_events_dropped),
+        )
+        emit(
+            "ai_telephony_audit_writer_write_failures",
+            float(metrics.audit_writer_write_failures),
+        )
         emit(
             "ai_telephony_billing_webhook_failures",
             float(metrics.billing_webhook_failures),
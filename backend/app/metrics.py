@@ -117,15 +117,65 @@ class Metrics:
     security_events_total: int = 0
     security_events_by_type: Dict[str, int] = field(default_factory=dict)
     security_events_by_business: Dict[str, Dict[str, int]] = field(default_factory=dict)
+    audit_events_dropped: int = 0
+    security_events_dropped: int = 0
+    audit_writer_rows_written: int = 0
+    audit_writer_write_failures: int = 0
     sms_by_business: Dict[str, BusinessSmsMetrics] = field(default_factory=dict)
     twilio_voice_requests: int = 0
     twilio_voice_errors: int = 0
+    twilio_stream_audio_dropped_bytes: int = 0
+    twilio_stream_flushes_deferred: int = 0
+    twilio_stream_queue_depth_max: int = 0
+    twilio_stream_worker_cancellations: int = 0
+    twilio_stream_vad_utterances: int = 0
+    twilio_stream_vad_splits: int = 0
+    twilio_stream_partial_transcripts: int = 0
+    intent_speculations: int = 0
+    intent_speculation_hits: int = 0
+    tts_cache_hits: int = 0
+    tts_cache_store_hits: int = 0
+    tts_cache_misses: int = 0
+    tts_cache_coalesced: int = 0
+    tts_cache_evictions: int = 0
     twilio_sms_requests: int = 0
     twilio_sms_errors: int = 0
     twilio_webhook_requests: int = 0
     twilio_webhook_accepted: int = 0
     twilio_webhook_failures: int = 0
     calendar_webhook_failures: int = 0
+    google_api_calls: int = 0
+    google_api_errors: int = 0
+    google_api_timeouts: int = 0
+    google_api_queue_ms_total: float = 0.0
+    google_api_queue_ms_max: float = 0.0
+    google_api_call_ms_total: float = 0.0
+    google_api_call_ms_max: float = 0.0
+    google_api_calls_by_operation: Dict[str, int] = field(default_factory=dict)
+    freebusy_cache_hits: int = 0
+    freebusy_cache_misses: int = 0
+    freebusy_cache_invalidations: int = 0
+    oauth_client_pool_hits: int = 0
+    oauth_client_pool_misses: int = 0
+    oauth_client_refreshes: int = 0
+    oauth_client_refresh_failures: int = 0
+    geocode_cache_hits: int = 0
+    geocode_cache_misses: int = 0
+    geocode_requests: int = 0
+    geocode_failures: int = 0
+    geocode_zip_fallbacks: int = 0
+    zip_income_local_hits: int = 0
+    zip_income_local_misses: int = 0
+    zip_income_fetches: int = 0
+    zip_income_fetch_failures: int = 0
+    appointment_rollup_rebuilds: int = 0
+    appointment_rollup_day_refreshes: int = 0
+    calendar_sync_runs: int = 0
+    calendar_sync_failures: int = 0
+    calendar_sync_coalesced: int = 0
+    calendar_sync_lag_seconds_max: float = 0.0
+    # Most recent request-to-synced lag per tenant.
+    calendar_sync_lag_seconds: Dict[str, float] = field(default_factory=dict)
     twilio_by_business: Dict[str, BusinessTwilioMetrics] = field(default_factory=dict)
     voice_session_requests: int = 0
     voice_session_errors: int = 0
@@ -170,6 +220,41 @@ class Metrics:
                 self.chat_latency_bucket_counts.get(float("inf"), 0) + 1
             )
 
+    def record_calendar_sync(
+        self, business_id: str, *, lag_seconds: float, synced: bool
+    ) -> None:
+        self.calendar_sync_runs += 1
+        if not synced:
+            self.calendar_sync_failures += 1
+        self.calendar_sync_lag_seconds[business_id] = lag_seconds
+        if lag_seconds > self.calendar_sync_lag_seconds_max:
+            self.calendar_sync_lag_seconds_max = lag_seconds
+
+    def record_google_api_call(
+        self,
+        operation: str,
+        *,
+        queue_ms: float,
+        total_ms: float,
+        failed: bool = False,
+        timed_out: bool = False,
+    ) -> None:
+        """Track a Google API call; queue time is spent waiting for a worker."""
+        self.google_api_calls += 1
+        self.google_api_calls_by_operation[operation] = (
+            self.google_api_calls_by_operation.get(operation, 0) + 1
+        )
+        if failed:
+            self.google_api_errors += 1
+        if timed_out:
+            self.google_api_timeouts += 1
+        self.google_api_queue_ms_total += queue_ms
+        if queue_ms > self.google_api_queue_ms_max:
+            self.google_api_queue_ms_max = queue_ms
+        self.google_api_call_ms_total += total_ms
+        if total_ms > self.google_api_call_ms_max:
+            self.google_api_call_ms_max = total_ms
+
     def record_conversation_latency(self, latency_ms: float) -> None:
         """Track conversation latency with buckets and rolling samples."""
         self.conversation_latency_ms_total += latency_ms
@@ -257,6 +342,10 @@ class Metrics:
                 business_id: dict(types)
                 for business_id, types in self.security_events_by_business.items()
             },
+            "audit_events_dropped": self.audit_events_dropped,
+            "security_events_dropped": self.security_events_dropped,
+            "audit_writer_rows_written": self.audit_writer_rows_written,
+            "audit_writer_write_failures": self.audit_writer_write_failures,
             "billing_webhook_requests": self.billing_webhook_requests,
             "billing_webhook_accepted": self.billing_webhook_accepted,
             "billing_webhook_failures": self.billing_webhook_failures,
@@ -282,12 +371,63 @@ class Metrics:
             },
             "twilio_voice_requests": self.twilio_voice_requests,
             "twilio_voice_errors": self.twilio_voice_errors,
+            "twilio_stream_audio_dropped_bytes": (
+                self.twilio_stream_audio_dropped_bytes
+            ),
+            "twilio_stream_flushes_deferred": self.twilio_stream_flushes_deferred,
+            "twilio_stream_queue_depth_max": self.twilio_stream_queue_depth_max,
+            "twilio_stream_worker_cancellations": (
+                self.twilio_stream_worker_cancellations
+            ),
+            "twilio_stream_vad_utterances": self.twilio_stream_vad_utterances,
+            "twilio_stream_vad_splits": self.twilio_stream_vad_splits,
+            "twilio_stream_partial_transcripts": (
+                self.twilio_stream_partial_transcripts
+            ),
+            "intent_speculations": self.intent_speculations,
+            "intent_speculation_hits": self.intent_speculation_hits,
+            "tts_cache_hits": self.tts_cache_hits,
+            "tts_cache_store_hits": self.tts_cache_store_hits,
+            "tts_cache_misses": self.tts_cache_misses,
+            "tts_cache_coalesced": self.tts_cache_coalesced,
+            "tts_cache_evictions": self.tts_cache_evictions,
             "twilio_sms_requests": self.twilio_sms_requests,
             "twilio_sms_errors": self.twilio_sms_errors,
             "twilio_webhook_requests": self.twilio_webhook_requests,
             "twilio_webhook_accepted": self.twilio_webhook_accepted,
             "twilio_webhook_failures": self.twilio_webhook_failures,
             "calendar_webhook_failures": self.calendar_webhook_failures,
+            "google_api_calls": self.google_api_calls,
+            "google_api_errors": self.google_api_errors,
+            "google_api_timeouts": self.google_api_timeouts,
+            "google_api_queue_ms_total": self.google_api_queue_ms_total,
+            "google_api_queue_ms_max": self.google_api_queue_ms_max,
+            "google_api_call_ms_total": self.google_api_call_ms_total,
+            "google_api_call_ms_max": self.google_api_call_ms_max,
+            "google_api_calls_by_operation": dict(self.google_api_calls_by_operation),
+            "freebusy_cache_hits": self.freebusy_cache_hits,
+            "freebusy_cache_misses": self.freebusy_cache_misses,
+            "freebusy_cache_invalidations": self.freebusy_cache_invalidations,
+            "oauth_client_pool_hits": self.oauth_client_pool_hits,
+            "oauth_client_pool_misses": self.oauth_client_pool_misses,
+            "oauth_client_refreshes": self.oauth_client_refreshes,
+            "oauth_client_refresh_failures": self.oauth_client_refresh_failures,
+            "geocode_cache_hits": self.geocode_cache_hits,
+            "geocode_cache_misses": self.geocode_cache_misses,
+            "geocode_requests": self.geocode_requests,
+            "geocode_failures": self.geocode_failures,
+            "geocode_zip_fallbacks": self.geocode_zip_fallbacks,
+            "zip_income_local_hits": self.zip_income_local_hits,
+            "zip_income_local_misses": self.zip_income_local_misses,
+            "zip_income_fetches": self.zip_income_fetches,
+            "zip_income_fetch_failures": self.zip_income_fetch_failures,
+            "appointment_rollup_rebuilds": self.appointment_rollup_rebuilds,
+            "appointment_rollup_day_refreshes": (self.appointment_rollup_day_refreshes),
+            "calendar_sync_runs": self.calendar_sync_runs,
+            "calendar_sync_failures": self.calendar_sync_failures,
+            "calendar_sync_coalesced": self.calendar_sync_coalesced,
+            "calendar_sync_lag_seconds_max": self.calendar_sync_lag_seconds_max,
+            "calendar_sync_lag_seconds": dict(self.calendar_sync_lag_seconds),
             "twilio_by_business": {
                 business_id: {
                     "voice_requests": m.voice_requests,
@@ -53,6 +53,55 @@ class Appointment:
     technician_id: Optional[str] = None
 
 
+@dataclass
+class AppointmentQuery:
+    """Filters and keyset position for ``query_for_business``.
+
+    Results are ordered by ``(start_time, id)``. ``after`` is the
+    ``(start_time, id)`` of the last row already returned; when set, only
+    rows strictly after it are returned and ``offset`` is ignored.
+    """
+
+    start_from: Optional[datetime] = None
+    start_to: Optional[datetime] = None
+    status: Optional[str] = None
+    service_type: Optional[str] = None
+    is_emergency: Optional[bool] = None
+    tag: Optional[str] = None
+    after: Optional[tuple[datetime, str]] = None
+    offset: int = 0
+    limit: int = 100
+
+
+@dataclass
+class AppointmentPage:
+    items: List[Appointment] = field(default_factory=list)
+    # (start_time, id) of the last item when more rows may follow.
+    next_after: Optional[tuple[datetime, str]] = None
+
+
+@dataclass
+class AppointmentAggregate:
+    """One GROUP BY bucket returned by ``aggregate_for_business``.
+
+    ``group`` maps each requested group field to its raw value for the
+    bucket. ``quoted_or_estimated_total`` sums quoted_value, falling back to
+    estimated_value when no (or a zero) quote is recorded. The ``with_*``
+    counters report how many rows have the field filled in, and
+    ``complete`` counts rows with all three.
+    """
+
+    group: dict[str, object] = field(default_factory=dict)
+    count: int = 0
+    emergency_count: int = 0
+    estimated_value_total: float = 0.0
+    quoted_or_estimated_total: float = 0.0
+    with_service_type: int = 0
+    with_lead_source: int = 0
+    with_estimated_value: int = 0
+    complete: int = 0
+
+
 @dataclass
 class Conversation:
     id: str
@@ -68,6 +117,9 @@ class Conversation:
     intent: Optional[str] = None
     intent_confidence: Optional[float] = None
     messages: List["ConversationMessage"] = field(default_factory=list)
+    # Set instead of ``messages`` when a repository lists conversations
+    # without loading their transcripts (``with_messages=False``).
+    message_count: Optional[int] = None
 
 
 @dataclass
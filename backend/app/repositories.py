@@ -1,7 +1,11 @@
 from __future__ import annotations
 
-from typing import Dict, List, Optional
+from bisect import bisect_left, bisect_right, insort
+from datetime import UTC, datetime
+from typing import Any, Collection, Dict, Iterable, List, Optional, Sequence
 import os
+import threading
+import time
 
 from .config import get_settings
 from .db import SQLALCHEMY_AVAILABLE, SessionLocal
@@ -14,6 +18,9 @@ from .db_models import (
 )
 from .models import (
     Appointment,
+    AppointmentAggregate,
+    AppointmentPage,
+    AppointmentQuery,
     Conversation,
     ConversationMessage,
     Customer,
@@ -21,6 +28,19 @@ from .models import (
     new_conversation_id,
     new_customer_id,
 )
+from .services.appointment_rollup import AppointmentDailyRollup, DbRollupStore
+from .services.customer_search import (
+    SCORE_FUZZY,
+    SCORE_NAME_EXACT,
+    SCORE_NAME_PREFIX,
+    SCORE_NAME_SUBSTRING,
+    SCORE_PHONE_EXACT,
+    SCORE_PHONE_PARTIAL,
+    CustomerSearchIndex,
+    name_tokens,
+    normalize_phone,
+    phone_query_digits,
+)
 from .services.privacy import redact_text
 
 
@@ -37,6 +57,103 @@ def _join_tags(tags: list[str] | None) -> str | None:
     return ",".join(cleaned) if cleaned else None
 
 
+# Keep IN (...) lists under SQLite's default bound-parameter limit.
+_IN_CLAUSE_CHUNK = 500
+
+
+# Fields accepted by ``aggregate_for_business(group_by=...)``. ``start_date``
+# buckets appointments by the calendar day (UTC) of their start time.
+APPOINTMENT_GROUP_FIELDS = (
+    "service_type",
+    "job_stage",
+    "lead_source",
+    "quote_status",
+    "is_emergency",
+    "customer_id",
+    "start_date",
+)
+
+
+def _as_utc(value: datetime) -> datetime:
+    return value.replace(tzinfo=UTC) if value.tzinfo is None else value
+
+
+def _as_db_datetime(value: datetime) -> datetime:
+    """Return a naive UTC datetime, matching how DateTime columns are stored."""
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(UTC).replace(tzinfo=None)
+
+
+def _check_group_fields(group_by: Sequence[str]) -> None:
+    unknown = [f for f in group_by if f not in APPOINTMENT_GROUP_FIELDS]
+    if unknown:
+        raise ValueError(f"Unsupported appointment group fields: {unknown}")
+
+
+def _appointment_group_value(appt: Appointment, field_name: str) -> object:
+    if field_name == "start_date":
+        return _as_utc(appt.start_time).date().isoformat()
+    if field_name == "is_emergency":
+        return bool(appt.is_emergency)
+    return getattr(appt, field_name, None)
+
+
+def _aggregate_appointments(
+    appointments: Iterable[Appointment], group_by: Sequence[str]
+) -> List[AppointmentAggregate]:
+    buckets: Dict[tuple, AppointmentAggregate] = {}
+    for appt in appointments:
+        key = tuple(_appointment_group_value(appt, f) for f in group_by)
+        agg = buckets.get(key)
+        if agg is None:
+            agg = AppointmentAggregate(group=dict(zip(group_by, key)))
+            buckets[key] = agg
+        est = appt.estimated_value
+        quoted = appt.quoted_value
+        has_service_type = bool((appt.service_type or "").strip())
+        has_lead_source = bool((appt.lead_source or "").strip())
+        has_estimated_value = est is not None
+        agg.count += 1
+        if appt.is_emergency:
+            agg.emergency_count += 1
+        agg.estimated_value_total += float(est) if est is not None else 0.0
+        agg.quoted_or_estimated_total += float(quoted or est or 0.0)
+        agg.with_service_type += int(has_service_type)
+        agg.with_lead_source += int(has_lead_source)
+        agg.with_estimated_value += int(has_estimated_value)
+        agg.complete += int(
+            has_service_type and has_lead_source and has_estimated_value
+        )
+    return list(buckets.values())
+
+
+def _matches_appointment_query(appt: Appointment, query: AppointmentQuery) -> bool:
+    if query.status is not None and (appt.status or "").upper() != (
+        query.status.upper()
+    ):
+        return False
+    if query.service_type is not None and (appt.service_type or "").lower() != (
+        query.service_type.lower()
+    ):
+        return False
+    if query.is_emergency is not None and bool(appt.is_emergency) is not (
+        query.is_emergency
+    ):
+        return False
+    if query.tag is not None and query.tag not in (appt.tags or []):
+        return False
+    return True
+
+
+def _page_from_rows(rows: List[Appointment], limit: int) -> AppointmentPage:
+    if len(rows) <= limit:
+        return AppointmentPage(items=rows)
+    items = rows[:limit]
+    last = items[-1]
+    return AppointmentPage(items=items, next_after=(_as_utc(last.start_time), last.id))
+
+
 def _capture_transcripts_allowed(business_id: str | None) -> bool:
     """Return whether transcripts should be stored for a tenant."""
     settings = get_settings()
@@ -59,8 +176,19 @@ def _capture_transcripts_allowed(business_id: str | None) -> bool:
 class InMemoryCustomerRepository:
     def __init__(self) -> None:
         self._by_id: Dict[str, Customer] = {}
+        # Phone -> most recent customer id across tenants; only used for
+        # lookups that do not name a business. Phones match exactly, as in
+        # DbCustomerRepository.
         self._by_phone: Dict[str, str] = {}
-        self._by_business: Dict[str, List[str]] = {}
+        # (business_id, phone) -> customer id.
+        self._by_business_phone: Dict[tuple[str, str], str] = {}
+        # Insertion-ordered id sets so deletes are O(1).
+        self._by_business: Dict[str, Dict[str, None]] = {}
+        self._search: Dict[str, CustomerSearchIndex] = {}
+
+    def _index_for_search(self, customer: Customer) -> None:
+        index = self._search.setdefault(customer.business_id, CustomerSearchIndex())
+        index.add(customer.id, customer.name, customer.phone)
 
     def upsert(
         self,
@@ -82,6 +210,7 @@ class InMemoryCustomerRepository:
             if tags is not None:
                 existing.tags = list(tags)
             self._by_id[existing.id] = existing
+            self._index_for_search(existing)
             return existing
 
         customer = Customer(
@@ -95,7 +224,9 @@ class InMemoryCustomerRepository:
         )
         self._by_id[customer.id] = customer
         self._by_phone[phone] = customer.id
-        self._by_business.setdefault(business_id, []).append(customer.id)
+        self._by_business_phone[(business_id, phone)] = customer.id
+        self._by_business.setdefault(business_id, {})[customer.id] = None
+        self._index_for_search(customer)
         return customer
 
     def get(self, customer_id: str) -> Optional[Customer]:
@@ -106,12 +237,14 @@ class InMemoryCustomerRepository:
     ) -> Optional[Customer]:
         # When a business_id is provided, restrict the lookup to that tenant.
         if business_id is not None:
-            ids = self._by_business.get(business_id, [])
-            for cid in ids:
-                c = self._by_id.get(cid)
-                if c and c.phone == phone:
-                    return c
-            return None
+            customer_id = self._by_business_phone.get((business_id, phone))
+            if customer_id is None:
+                return None
+            if customer_id not in self._by_business.get(business_id, ()):
+                # The tenant's rows were dropped without going through delete().
+                self._by_business_phone.pop((business_id, phone), None)
+                return None
+            return self._by_id.get(customer_id)
         # Fallback: use the last customer stored for this phone across tenants.
         customer_id = self._by_phone.get(phone)
         if not customer_id:
@@ -125,16 +258,30 @@ class InMemoryCustomerRepository:
         ids = self._by_business.get(business_id, [])
         return [self._by_id[i] for i in ids]
 
+    def search(
+        self, business_id: str, query: str, *, limit: int = 20, offset: int = 0
+    ) -> List[Customer]:
+        """Return a tenant's customers matching ``query``, best match first."""
+        index = self._search.get(business_id)
+        if index is None:
+            return []
+        matches = [self._by_id[i] for i in index.ranked(query) if i in self._by_id]
+        return matches[offset : offset + limit]
+
     def delete(self, customer_id: str) -> None:
         """Delete a customer and remove from indexes."""
         customer = self._by_id.pop(customer_id, None)
         if not customer:
             return
-        for phone, cid in list(self._by_phone.items()):
-            if cid == customer_id:
-                self._by_phone.pop(phone, None)
-        for biz, ids in list(self._by_business.items()):
-            self._by_business[biz] = [cid for cid in ids if cid != customer_id]
+        index = self._search.get(customer.business_id)
+        if index is not None:
+            index.remove(customer_id)
+        if self._by_phone.get(customer.phone) == customer_id:
+            self._by_phone.pop(customer.phone, None)
+        tenant_key = (customer.business_id, customer.phone)
+        if self._by_business_phone.get(tenant_key) == customer_id:
+            self._by_business_phone.pop(tenant_key, None)
+        self._by_business.get(customer.business_id, {}).pop(customer_id, None)
 
     def set_sms_opt_out(
         self,
@@ -153,6 +300,27 @@ class InMemoryAppointmentRepository:
         self._by_id: Dict[str, Appointment] = {}
         self._by_customer: Dict[str, List[str]] = {}
         self._by_business: Dict[str, List[str]] = {}
+        # Per-tenant (start_time, id) pairs kept sorted so windowed
+        # aggregations only visit appointments inside the window.
+        self._by_business_start: Dict[str, List[tuple[datetime, str]]] = {}
+        self.daily_rollup = AppointmentDailyRollup(self)
+
+    def _index_start(self, appt: Appointment) -> None:
+        if appt.start_time is None:
+            return
+        insort(
+            self._by_business_start.setdefault(appt.business_id, []),
+            (_as_utc(appt.start_time), appt.id),
+        )
+
+    def _unindex_start(self, appt: Appointment) -> None:
+        if appt.start_time is None:
+            return
+        index = self._by_business_start.get(appt.business_id, [])
+        entry = (_as_utc(appt.start_time), appt.id)
+        pos = bisect_left(index, entry)
+        if pos < len(index) and index[pos] == entry:
+            index.pop(pos)
 
     def create(
         self,
@@ -192,9 +360,12 @@ class InMemoryAppointmentRepository:
             tags=list(tags or []),
             technician_id=technician_id,
         )
-        self._by_id[appointment.id] = appointment
-        self._by_customer.setdefault(customer_id, []).append(appointment.id)
-        self._by_business.setdefault(business_id, []).append(appointment.id)
+        with self.daily_rollup.track(customers=[(business_id, customer_id)]) as done:
+            self._by_id[appointment.id] = appointment
+            self._by_customer.setdefault(customer_id, []).append(appointment.id)
+            self._by_business.setdefault(business_id, []).append(appointment.id)
+            self._index_start(appointment)
+            done.append(appointment)
         return appointment
 
     def list_for_customer(self, customer_id: str) -> List[Appointment]:
@@ -210,11 +381,14 @@ class InMemoryAppointmentRepository:
 
     def delete_for_customer(self, customer_id: str) -> None:
         """Delete appointments for a customer and clean indexes."""
-        ids = self._by_customer.pop(customer_id, [])
-        for appt_id in ids:
-            self._by_id.pop(appt_id, None)
-        for biz, appts in list(self._by_business.items()):
-            self._by_business[biz] = [aid for aid in appts if aid not in ids]
+        with self.daily_rollup.track(self.list_for_customer(customer_id)):
+            ids = self._by_customer.pop(customer_id, [])
+            for appt_id in ids:
+                appt = self._by_id.pop(appt_id, None)
+                if appt is not None:
+                    self._unindex_start(appt)
+            for biz, appts in list(self._by_business.items()):
+                self._by_business[biz] = [aid for aid in appts if aid not in ids]
 
     def get(self, appointment_id: str) -> Optional[Appointment]:
         return self._by_id.get(appointment_id)
@@ -259,34 +433,180 @@ class InMemoryAppointmentRepository:
         appt = self._by_id.get(appointment_id)
         if not appt:
             return None
-        if start_time is not None:
-            appt.start_time = start_time
-        if end_time is not None:
-            appt.end_time = end_time
-        if service_type is not None:
-            appt.service_type = service_type
-        if description is not None:
-            appt.description = description
-        if is_emergency is not None:
-            appt.is_emergency = is_emergency
-        if status is not None:
-            appt.status = status
-        if lead_source is not None:
-            appt.lead_source = lead_source
-        if estimated_value is not None:
-            appt.estimated_value = float(estimated_value)
-        if job_stage is not None:
-            appt.job_stage = job_stage
-        if tags is not None:
-            appt.tags = list(tags)
-        if quoted_value is not None:
-            appt.quoted_value = float(quoted_value)
-        if quote_status is not None:
-            appt.quote_status = quote_status
-        if technician_id is not None:
-            appt.technician_id = technician_id
+        with self.daily_rollup.track([appt]) as done:
+            if start_time is not None:
+                self._unindex_start(appt)
+                appt.start_time = start_time
+                self._index_start(appt)
+            if end_time is not None:
+                appt.end_time = end_time
+            if service_type is not None:
+                appt.service_type = service_type
+            if description is not None:
+                appt.description = description
+            if is_emergency is not None:
+                appt.is_emergency = is_emergency
+            if status is not None:
+                appt.status = status.upper()
+            if lead_source is not None:
+                appt.lead_source = lead_source
+            if estimated_value is not None:
+                appt.estimated_value = float(estimated_value)
+            if job_stage is not None:
+                appt.job_stage = job_stage
+            if tags is not None:
+                appt.tags = list(tags)
+            if quoted_value is not None:
+                appt.quoted_value = float(quoted_value)
+            if quote_status is not None:
+                appt.quote_status = quote_status
+            if technician_id is not None:
+                appt.technician_id = technician_id
+            done.append(appt)
         return appt
 
+    def find_by_calendar_events(
+        self, calendar_event_ids: Collection[str], *, business_id: str
+    ) -> Dict[str, Appointment]:
+        """Map each given calendar_event_id to the tenant appointment holding it."""
+        wanted = set(calendar_event_ids)
+        found: Dict[str, Appointment] = {}
+        for appt_id in self._by_business.get(business_id, []):
+            appt = self._by_id.get(appt_id)
+            event_id = getattr(appt, "calendar_event_id", None) if appt else None
+            if event_id in wanted and event_id not in found:
+                found[event_id] = appt  # type: ignore[assignment]
+        return found
+
+    def bulk_update(self, updates: Sequence[tuple[str, Dict[str, Any]]]) -> int:
+        """Apply ``(appointment_id, fields)`` updates; returns the rows changed."""
+        changed = 0
+        for appointment_id, fields in updates:
+            if self.update(appointment_id, **fields) is not None:
+                changed += 1
+        return changed
+
+    def _iter_window(
+        self,
+        business_id: str,
+        start: datetime | None,
+        end: datetime | None,
+    ) -> Iterable[Appointment]:
+        index = self._by_business_start.get(business_id, [])
+        lo = bisect_left(index, (_as_utc(start),)) if start is not None else 0
+        hi = (
+            bisect_right(index, (_as_utc(end), "\U0010ffff"))
+            if end is not None
+            else len(index)
+        )
+        for _, appt_id in index[lo:hi]:
+            appt = self._by_id.get(appt_id)
+            if appt is not None:
+                yield appt
+
+    def list_for_business_window(
+        self,
+        business_id: str,
+        start: datetime,
+        end: datetime,
+        *,
+        statuses: Collection[str] | None = None,
+    ) -> List[Appointment]:
+        """Return a tenant's appointments with start in [start, end], by start."""
+        rows = self._iter_window(business_id, start, end)
+        if statuses is None:
+            return list(rows)
+        wanted = set(statuses)
+        return [a for a in rows if (a.status or "SCHEDULED").upper() in wanted]
+
+    def aggregate_for_business(
+        self,
+        business_id: str,
+        *,
+        group_by: Sequence[str] = (),
+        start: datetime | None = None,
+        end: datetime | None = None,
+        statuses: Collection[str] | None = None,
+    ) -> List[AppointmentAggregate]:
+        """Group a tenant's appointments with start in [start, end].
+
+        ``statuses`` restricts rows to the given (upper-case) statuses.
+        """
+        _check_group_fields(group_by)
+        rows = self._iter_window(business_id, start, end)
+        if statuses is not None:
+            wanted = set(statuses)
+            rows = (a for a in rows if (a.status or "SCHEDULED").upper() in wanted)
+        return _aggregate_appointments(rows, group_by)
+
+    def query_for_business(
+        self, business_id: str, query: AppointmentQuery
+    ) -> AppointmentPage:
+        """Return one page of a tenant's appointments ordered by start time.
+
+        Walks the sorted start-time index from the keyset position, so the
+        cost tracks the page size rather than the tenant's history.
+        """
+        index = self._by_business_start.get(business_id, [])
+        lo = 0
+        if query.start_from is not None:
+            lo = bisect_left(index, (_as_utc(query.start_from),))
+        if query.after is not None:
+            after_start, after_id = query.after
+            lo = max(lo, bisect_right(index, (_as_utc(after_start), after_id)))
+        hi = len(index)
+        if query.start_to is not None:
+            hi = bisect_right(index, (_as_utc(query.start_to), "\U0010ffff"))
+
+        skip = query.offset if query.after is None else 0
+        rows: List[Appointment] = []
+        for pos in range(lo, hi):
+            appt = self._by_id.get(index[pos][1])
+            if appt is None or not _matches_appointment_query(appt, query):
+                continue
+            if skip:
+                skip -= 1
+                continue
+            rows.append(appt)
+            if len(rows) > query.limit:
+                break
+        return _page_from_rows(rows, query.limit)
+
+    def first_appointment_after(
+        self,
+        business_id: str,
+        after_by_customer: Dict[str, datetime],
+        *,
+        end: datetime | None = None,
+        statuses: Collection[str] | None = None,
+    ) -> Dict[str, datetime]:
+        """Return each customer's earliest start strictly after their cutoff."""
+        wanted = set(statuses) if statuses is not None else None
+        result: Dict[str, datetime] = {}
+        for customer_id, after in after_by_customer.items():
+            after = _as_utc(after)
+            best: datetime | None = None
+            for appt_id in self._by_customer.get(customer_id, []):
+                appt = self._by_id.get(appt_id)
+                if (
+                    appt is None
+                    or appt.business_id != business_id
+                    or appt.start_time is None
+                ):
+                    continue
+                if wanted is not None and (appt.status or "SCHEDULED").upper() not in (
+                    wanted
+                ):
+                    continue
+                start_time = _as_utc(appt.start_time)
+                if start_time <= after or (end is not None and start_time > end):
+                    continue
+                if best is None or start_time < best:
+                    best = start_time
+            if best is not None:
+                result[customer_id] = best
+        return result
+
 
 class InMemoryConversationRepository:
     def __init__(self) -> None:
@@ -325,7 +645,11 @@ class InMemoryConversationRepository:
             return None
         return self._by_id.get(conv_id)
 
-    def list_for_customer(self, customer_id: str) -> List[Conversation]:
+    # ``with_messages`` is accepted for parity with the DB repository;
+    # in-memory conversations always carry their messages.
+    def list_for_customer(
+        self, customer_id: str, *, with_messages: bool = True
+    ) -> List[Conversation]:
         return [c for c in self._by_id.values() if c.customer_id == customer_id]
 
     def delete_for_customer(self, customer_id: str) -> None:
@@ -360,10 +684,12 @@ class InMemoryConversationRepository:
         conv.intent_confidence = confidence
         self._by_id[conversation_id] = conv
 
-    def list_all(self) -> List[Conversation]:
+    def list_all(self, *, with_messages: bool = True) -> List[Conversation]:
         return list(self._by_id.values())
 
-    def list_for_business(self, business_id: str) -> List[Conversation]:
+    def list_for_business(
+        self, business_id: str, *, with_messages: bool = True
+    ) -> List[Conversation]:
         ids = self._by_business.get(business_id, [])
         return [self._by_id[i] for i in ids]
 
@@ -375,6 +701,15 @@ class DbCustomerRepository:
     SQLAlchemy and a SessionLocal are available.
     """
 
+    def __init__(self) -> None:
+        # Per-tenant in-process search indexes used when pg_trgm is not
+        # available (SQLite, or Postgres without the extension). They are
+        # rebuilt after ``customer_search_index_ttl_seconds`` to pick up
+        # writes made by other processes.
+        self._search_lock = threading.Lock()
+        self._search_indexes: Dict[str, tuple[float, CustomerSearchIndex]] = {}
+        self._pg_trgm: bool | None = None
+
     def _to_model(self, row: CustomerDB) -> Customer:
         return Customer(
             id=row.id,
@@ -433,9 +768,11 @@ class DbCustomerRepository:
                 session.add(row)
             session.commit()
             session.refresh(row)
-            return self._to_model(row)
+            customer = self._to_model(row)
         finally:
             session.close()
+        self._update_search_index(customer)
+        return customer
 
     def set_sms_opt_out(
         self,
@@ -524,11 +861,143 @@ class DbCustomerRepository:
         try:
             row = session.get(CustomerDB, customer_id)
             if row:
+                business_id = row.business_id
                 session.delete(row)
                 session.commit()
+                with self._search_lock:
+                    cached = self._search_indexes.get(business_id)
+                if cached is not None:
+                    cached[1].remove(customer_id)
+        finally:
+            session.close()
+
+    def _update_search_index(self, customer: Customer) -> None:
+        with self._search_lock:
+            cached = self._search_indexes.get(customer.business_id)
+        if cached is not None:
+            cached[1].add(customer.id, customer.name, customer.phone)
+
+    def _search_index(self, session: Any, business_id: str) -> CustomerSearchIndex:
+        now = time.monotonic()
+        with self._search_lock:
+            cached = self._search_indexes.get(business_id)
+        if cached is not None and cached[0] > now:
+            return cached[1]
+        index = CustomerSearchIndex()
+        rows = (
+            session.query(CustomerDB.id, CustomerDB.name, CustomerDB.phone)
+            .filter(CustomerDB.business_id == business_id)
+            .all()
+        )
+        for customer_id, name, phone in rows:
+            index.add(customer_id, name, phone)
+        ttl = float(getattr(get_settings(), "customer_search_index_ttl_seconds", 60.0))
+        if ttl > 0:
+            with self._search_lock:
+                self._search_indexes[business_id] = (now + ttl, index)
+        return index
+
+    def _use_pg_trgm(self, session: Any) -> bool:
+        if self._pg_trgm is None:
+            from sqlalchemy import text
+
+            available = False
+            if session.get_bind().dialect.name == "postgresql":
+                try:
+                    available = (
+                        session.execute(
+                            text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+                        ).first()
+                        is not None
+                    )
+                except Exception:
+                    session.rollback()
+            self._pg_trgm = available
+        return self._pg_trgm
+
+    def search(
+        self, business_id: str, query: str, *, limit: int = 20, offset: int = 0
+    ) -> List[Customer]:
+        """Return a tenant's customers matching ``query``, best match first.
+
+        Uses pg_trgm on Postgres and an in-process n-gram index otherwise;
+        both rank exact phone > partial phone > exact name > name-token
+        prefix > substring > fuzzy similarity.
+        """
+        if SessionLocal is None:
+            raise RuntimeError("Database session factory is not available")
+        if not (query or "").strip():
+            return []
+        session = SessionLocal()
+        try:
+            if self._use_pg_trgm(session):
+                rows = self._search_pg(session, business_id, query, limit, offset)
+                return [self._to_model(r) for r in rows]
+            ids = self._search_index(session, business_id).search(
+                query, limit=limit, offset=offset
+            )
+            if not ids:
+                return []
+            rows = session.query(CustomerDB).filter(CustomerDB.id.in_(ids)).all()
+            by_id = {r.id: r for r in rows}
+            return [self._to_model(by_id[i]) for i in ids if i in by_id]
         finally:
             session.close()
 
+    def _search_pg(
+        self, session: Any, business_id: str, query: str, limit: int, offset: int
+    ) -> List[CustomerDB]:
+        from sqlalchemy import and_, case, func, literal, or_
+
+        text_query = query.strip()
+        q = session.query(CustomerDB).filter(CustomerDB.business_id == business_id)
+        digits = phone_query_digits(text_query)
+        if digits:
+            phone_digits = func.regexp_replace(CustomerDB.phone, "[^0-9]", "", "g")
+            key = normalize_phone(text_query).lstrip("+")
+            # Compare national numbers so "+1 555..." matches a stored "555...".
+            if len(key) >= 10:
+                exact = func.right(phone_digits, 10) == key[-10:]
+            else:
+                exact = phone_digits == key
+            rank = case(
+                (exact, literal(SCORE_PHONE_EXACT)),
+                else_=literal(SCORE_PHONE_PARTIAL),
+            )
+            q = q.filter(or_(exact, phone_digits.contains(digits, autoescape=True)))
+        else:
+            folded = " ".join(text_query.casefold().split())
+            tokens = name_tokens(text_query)
+            if not tokens:
+                return []
+            name = func.lower(CustomerDB.name)
+            prefix = and_(
+                *[
+                    or_(
+                        name.startswith(t, autoescape=True),
+                        name.contains(f" {t}", autoescape=True),
+                    )
+                    for t in tokens
+                ]
+            )
+            substring = name.contains(folded, autoescape=True)
+            similarity = func.similarity(name, folded)
+            rank = case(
+                (name == folded, literal(SCORE_NAME_EXACT)),
+                (prefix, literal(SCORE_NAME_PREFIX)),
+                (substring, literal(SCORE_NAME_SUBSTRING)),
+                else_=similarity * SCORE_FUZZY,
+            )
+            # ``%`` is pg_trgm's similarity operator (threshold 0.3 by default)
+            # and, unlike a similarity() comparison, can use the GIN index.
+            q = q.filter(or_(prefix, substring, name.bool_op("%")(folded)))
+        return (
+            q.order_by(rank.desc(), func.lower(CustomerDB.name), CustomerDB.id)
+            .offset(offset)
+            .limit(limit)
+            .all()
+        )
+
 
 USE_DB_CUSTOMERS = os.getenv("USE_DB_CUSTOMERS", "false").lower() == "true"
 
@@ -541,6 +1010,9 @@ else:
 class DbAppointmentRepository:
     """Appointment repository backed by the SQLAlchemy database."""
 
+    def __init__(self) -> None:
+        self.daily_rollup = AppointmentDailyRollup(self, store=DbRollupStore())
+
     def _to_model(self, row: AppointmentDB) -> Appointment:
         return Appointment(
             id=row.id,
@@ -606,10 +1078,15 @@ class DbAppointmentRepository:
                 tags=_join_tags(tags or []),
                 technician_id=technician_id,
             )  # type: ignore[call-arg]
-            session.add(row)
-            session.commit()
-            session.refresh(row)
-            return self._to_model(row)
+            with self.daily_rollup.track(
+                customers=[(business_id, customer_id)]
+            ) as done:
+                session.add(row)
+                session.commit()
+                session.refresh(row)
+                appointment = self._to_model(row)
+                done.append(appointment)
+            return appointment
         finally:
             session.close()
 
@@ -656,10 +1133,11 @@ class DbAppointmentRepository:
             raise RuntimeError("Database session factory is not available")
         session = SessionLocal()
         try:
-            session.query(AppointmentDB).filter(
-                AppointmentDB.customer_id == customer_id
-            ).delete()
-            session.commit()
+            with self.daily_rollup.track(self.list_for_customer(customer_id)):
+                session.query(AppointmentDB).filter(
+                    AppointmentDB.customer_id == customer_id
+                ).delete()
+                session.commit()
         finally:
             session.close()
 
@@ -718,39 +1196,346 @@ class DbAppointmentRepository:
             row = session.get(AppointmentDB, appointment_id)
             if not row:
                 return None
-            if start_time is not None:
-                row.start_time = start_time
-            if end_time is not None:
-                row.end_time = end_time
-            if service_type is not None:
-                row.service_type = service_type
-            if description is not None:
-                row.description = description
-            if is_emergency is not None:
-                row.is_emergency = is_emergency
-            if status is not None:
-                row.status = status
-            if lead_source is not None:
-                row.lead_source = lead_source
-            if estimated_value is not None:
-                row.estimated_value = estimated_value
-            if job_stage is not None:
-                row.job_stage = job_stage
-            if tags is not None:
-                row.tags = _join_tags(tags)
-            if quoted_value is not None:
-                row.quoted_value = quoted_value
-            if quote_status is not None:
-                row.quote_status = quote_status
-            if technician_id is not None:
-                row.technician_id = technician_id
-            session.add(row)
-            session.commit()
-            session.refresh(row)
-            return self._to_model(row)
+            with self.daily_rollup.track([self._to_model(row)]) as done:
+                if start_time is not None:
+                    row.start_time = start_time
+                if end_time is not None:
+                    row.end_time = end_time
+                if service_type is not None:
+                    row.service_type = service_type
+                if description is not None:
+                    row.description = description
+                if is_emergency is not None:
+                    row.is_emergency = is_emergency
+                if status is not None:
+                    row.status = status.upper()
+                if lead_source is not None:
+                    row.lead_source = lead_source
+                if estimated_value is not None:
+                    row.estimated_value = estimated_value
+                if job_stage is not None:
+                    row.job_stage = job_stage
+                if tags is not None:
+                    row.tags = _join_tags(tags)
+                if quoted_value is not None:
+                    row.quoted_value = quoted_value
+                if quote_status is not None:
+                    row.quote_status = quote_status
+                if technician_id is not None:
+                    row.technician_id = technician_id
+                session.add(row)
+                session.commit()
+                session.refresh(row)
+                appointment = self._to_model(row)
+                done.append(appointment)
+            return appointment
         finally:
             session.close()
 
+    def find_by_calendar_events(
+        self, calendar_event_ids: Collection[str], *, business_id: str
+    ) -> Dict[str, Appointment]:
+        """Map each given calendar_event_id to the tenant appointment holding it."""
+        if SessionLocal is None:
+            raise RuntimeError("Database session factory is not available")
+        if not calendar_event_ids:
+            return {}
+        session = SessionLocal()
+        try:
+            rows = (
+                session.query(AppointmentDB)
+                .filter(
+                    AppointmentDB.business_id == business_id,
+                    AppointmentDB.calendar_event_id.in_(list(calendar_event_ids)),
+                )
+                .all()
+            )
+            found: Dict[str, Appointment] = {}
+            for row in rows:
+                found.setdefault(row.calendar_event_id, self._to_model(row))
+            return found
+        finally:
+            session.close()
+
+    def bulk_update(self, updates: Sequence[tuple[str, Dict[str, Any]]]) -> int:
+        """Apply ``(appointment_id, fields)`` updates in one transaction.
+
+        Uses a bulk UPDATE by primary key, so a page of calendar changes costs
+        one round trip per distinct column set rather than one per row.
+        """
+        if SessionLocal is None:
+            raise RuntimeError("Database session factory is not available")
+        if not updates:
+            return 0
+        from sqlalchemy import update
+
+        mappings: List[Dict[str, Any]] = []
+        for appointment_id, fields in updates:
+            mapping: Dict[str, Any] = {"id": appointment_id}
+            for key, value in fields.items():
+                if value is None:
+                    continue
+                if not hasattr(AppointmentDB, key):
+                    raise ValueError(f"Unknown appointment field: {key}")
+                if key == "status":
+                    value = str(value).upper()
+                elif key == "tags":
+                    value = _join_tags(value)
+                elif isinstance(value, datetime):
+                    value = _as_db_datetime(value)
+                mapping[key] = value
+            mappings.append(mapping)
+
+        session = SessionLocal()
+        try:
+            before = {
+                row.id: self._to_model(row)
+                for row in session.query(AppointmentDB)
+                .filter(AppointmentDB.id.in_([m["id"] for m in mappings]))
+                .all()
+            }
+            mappings = [m for m in mappings if m["id"] in before and len(m) > 1]
+            with self.daily_rollup.track([before[m["id"]] for m in mappings]) as done:
+                if mappings:
+                    session.execute(update(AppointmentDB), mappings)
+                session.commit()
+                done.extend(
+                    self._to_model(row)
+                    for row in session.query(AppointmentDB)
+                    .filter(AppointmentDB.id.in_([m["id"] for m in mappings]))
+                    .all()
+                )
+            return len(mappings)
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    def query_for_business(
+        self, business_id: str, query: AppointmentQuery
+    ) -> AppointmentPage:
+        """Return one page of a tenant's appointments ordered by start time.
+
+        All filters and the ``(start_time, id)`` keyset are applied in SQL so
+        only ``limit + 1`` rows are read per page.
+        """
+        if SessionLocal is None:
+            raise RuntimeError("Database session factory is not available")
+        from sqlalchemy import and_, func, literal, or_
+
+        session = SessionLocal()
+        try:
+            q = session.query(AppointmentDB).filter(
+                AppointmentDB.business_id == business_id
+            )
+            if query.start_from is not None:
+                q = q.filter(
+                    AppointmentDB.start_time >= _as_db_datetime(query.start_from)
+                )
+            if query.start_to is not None:
+                q = q.filter(
+                    AppointmentDB.start_time <= _as_db_datetime(query.start_to)
+                )
+            if query.status is not None:
+                q = q.filter(AppointmentDB.status == query.status.upper())
+            if query.service_type is not None:
+                q = q.filter(
+                    func.lower(AppointmentDB.service_type) == query.service_type.lower()
+                )
+            if query.is_emergency is not None:
+                q = q.filter(AppointmentDB.is_emergency.is_(query.is_emergency))
+            if query.tag is not None:
+                # Tags are stored comma-joined; wrap in commas to match whole tags.
+                wrapped = literal(",") + AppointmentDB.tags + literal(",")
+                q = q.filter(wrapped.contains(f",{query.tag},", autoescape=True))
+            if query.after is not None:
+                after_start = _as_db_datetime(query.after[0])
+                q = q.filter(
+                    or_(
+                        AppointmentDB.start_time > after_start,
+                        and_(
+                            AppointmentDB.start_time == after_start,
+                            AppointmentDB.id > query.after[1],
+                        ),
+                    )
+                )
+            q = q.order_by(AppointmentDB.start_time, AppointmentDB.id)
+            if query.after is None and query.offset:
+                q = q.offset(query.offset)
+            rows = q.limit(query.limit + 1).all()
+            return _page_from_rows([self._to_model(r) for r in rows], query.limit)
+        finally:
+            session.close()
+
+    def _group_column(self, field_name: str):  # type: ignore[no-untyped-def]
+        from sqlalchemy import func
+
+        if field_name == "start_date":
+            return func.date(AppointmentDB.start_time)
+        return getattr(AppointmentDB, field_name)
+
+    def list_for_business_window(
+        self,
+        business_id: str,
+        start: datetime,
+        end: datetime,
+        *,
+        statuses: Collection[str] | None = None,
+    ) -> List[Appointment]:
+        """Return a tenant's appointments with start in [start, end], by start."""
+        if SessionLocal is None:
+            raise RuntimeError("Database session factory is not available")
+        session = SessionLocal()
+        try:
+            query = session.query(AppointmentDB).filter(
+                AppointmentDB.business_id == business_id,
+                AppointmentDB.start_time >= _as_db_datetime(start),
+                AppointmentDB.start_time <= _as_db_datetime(end),
+            )
+            if statuses is not None:
+                query = query.filter(AppointmentDB.status.in_(list(statuses)))
+            rows = query.order_by(AppointmentDB.start_time, AppointmentDB.id).all()
+            return [self._to_model(r) for r in rows]
+        finally:
+            session.close()
+
+    def aggregate_for_business(
+        self,
+        business_id: str,
+        *,
+        group_by: Sequence[str] = (),
+        start: datetime | None = None,
+        end: datetime | None = None,
+        statuses: Collection[str] | None = None,
+    ) -> List[AppointmentAggregate]:
+        """Group a tenant's appointments with start in [start, end] in SQL."""
+        if SessionLocal is None:
+            raise RuntimeError("Database session factory is not available")
+        from sqlalchemy import and_, case, func
+
+        _check_group_fields(group_by)
+        est = AppointmentDB.estimated_value
+        quoted = AppointmentDB.quoted_value
+        has_service_type = (
+            func.trim(func.coalesce(AppointmentDB.service_type, "")) != ""
+        )
+        has_lead_source = func.trim(func.coalesce(AppointmentDB.lead_source, "")) != ""
+        has_estimated_value = est.isnot(None)
+        group_columns = [self._group_column(f) for f in group_by]
+
+        session = SessionLocal()
+        try:
+            query = session.query(
+                *group_columns,
+                func.count(AppointmentDB.id),
+                func.sum(case((AppointmentDB.is_emergency.is_(True), 1), else_=0)),
+                func.sum(func.coalesce(est, 0)),
+                func.sum(
+                    case(
+                        (and_(quoted.isnot(None), quoted != 0), quoted),
+                        else_=func.coalesce(est, 0),
+                    )
+                ),
+                func.sum(case((has_service_type, 1), else_=0)),
+                func.sum(case((has_lead_source, 1), else_=0)),
+                func.sum(case((has_estimated_value, 1), else_=0)),
+                func.sum(
+                    case(
+                        (
+                            and_(
+                                has_service_type, has_lead_source, has_estimated_value
+                            ),
+                            1,
+                        ),
+                        else_=0,
+                    )
+                ),
+            ).filter(AppointmentDB.business_id == business_id)
+            if start is not None:
+                query = query.filter(AppointmentDB.start_time >= _as_db_datetime(start))
+            if end is not None:
+                query = query.filter(AppointmentDB.start_time <= _as_db_datetime(end))
+            if statuses is not None:
+                query = query.filter(AppointmentDB.status.in_(list(statuses)))
+            if group_columns:
+                query = query.group_by(*group_columns)
+            rows = query.all()
+        finally:
+            session.close()
+
+        results: List[AppointmentAggregate] = []
+        width = len(group_by)
+        for row in rows:
+            count = int(row[width] or 0)
+            if not count:
+                continue
+            group: dict[str, object] = {}
+            for field_name, value in zip(group_by, row[:width]):
+                if field_name == "start_date" and value is not None:
+                    value = str(getattr(value, "isoformat", lambda: value)())[:10]
+                elif field_name == "is_emergency":
+                    value = bool(value)
+                group[field_name] = value
+            results.append(
+                AppointmentAggregate(
+                    group=group,
+                    count=count,
+                    emergency_count=int(row[width + 1] or 0),
+                    estimated_value_total=float(row[width + 2] or 0),
+                    quoted_or_estimated_total=float(row[width + 3] or 0),
+                    with_service_type=int(row[width + 4] or 0),
+                    with_lead_source=int(row[width + 5] or 0),
+                    with_estimated_value=int(row[width + 6] or 0),
+                    complete=int(row[width + 7] or 0),
+                )
+            )
+        return results
+
+    def first_appointment_after(
+        self,
+        business_id: str,
+        after_by_customer: Dict[str, datetime],
+        *,
+        end: datetime | None = None,
+        statuses: Collection[str] | None = None,
+    ) -> Dict[str, datetime]:
+        """Return each customer's earliest start strictly after their cutoff.
+
+        Issues a single query for all customers instead of one per customer.
+        """
+        if SessionLocal is None:
+            raise RuntimeError("Database session factory is not available")
+        if not after_by_customer:
+            return {}
+
+        earliest = min(_as_utc(ts) for ts in after_by_customer.values())
+        session = SessionLocal()
+        try:
+            query = session.query(
+                AppointmentDB.customer_id, AppointmentDB.start_time
+            ).filter(
+                AppointmentDB.business_id == business_id,
+                AppointmentDB.customer_id.in_(list(after_by_customer)),
+                AppointmentDB.start_time > _as_db_datetime(earliest),
+            )
+            if end is not None:
+                query = query.filter(AppointmentDB.start_time <= _as_db_datetime(end))
+            if statuses is not None:
+                query = query.filter(AppointmentDB.status.in_(list(statuses)))
+            rows = query.order_by(AppointmentDB.start_time).all()
+        finally:
+            session.close()
+
+        result: Dict[str, datetime] = {}
+        for customer_id, start_time in rows:
+            if customer_id in result:
+                continue
+            start_time = _as_utc(start_time)
+            if start_time > _as_utc(after_by_customer[customer_id]):
+                result[customer_id] = start_time
+        return result
+
 
 USE_DB_APPOINTMENTS = os.getenv("USE_DB_APPOINTMENTS", "false").lower() == "true"
 
@@ -898,71 +1683,88 @@ class DbConversationRepository:
         finally:
             session.close()
 
-    def list_all(self) -> List[Conversation]:
-        if SessionLocal is None:
-            raise RuntimeError("Database session factory is not available")
-        session = SessionLocal()
-        try:
-            rows = session.query(ConversationDB).all()
-            conversations: List[Conversation] = []
-            for row in rows:
-                messages = (
-                    session.query(ConversationMessageDB)
-                    .filter(ConversationMessageDB.conversation_id == row.id)
-                    .order_by(ConversationMessageDB.timestamp.asc())
-                    .all()
-                )
-                conversations.append(self._to_model(row, messages))
-            return conversations
-        finally:
-            session.close()
-
-    def list_for_business(self, business_id: str) -> List[Conversation]:
-        if SessionLocal is None:
-            raise RuntimeError("Database session factory is not available")
-        session = SessionLocal()
-        try:
+    def _load_messages(
+        self, session: Any, conversation_ids: List[str]
+    ) -> Dict[str, List[ConversationMessageDB]]:
+        """Fetch messages for many conversations with chunked IN queries."""
+        grouped: Dict[str, List[ConversationMessageDB]] = {}
+        for offset in range(0, len(conversation_ids), _IN_CLAUSE_CHUNK):
+            chunk = conversation_ids[offset : offset + _IN_CLAUSE_CHUNK]
             rows = (
-                session.query(ConversationDB)
-                .filter(ConversationDB.business_id == business_id)
+                session.query(ConversationMessageDB)
+                .filter(ConversationMessageDB.conversation_id.in_(chunk))
+                .order_by(
+                    ConversationMessageDB.conversation_id,
+                    ConversationMessageDB.timestamp.asc(),
+                )
                 .all()
             )
-            conversations: List[Conversation] = []
-            for row in rows:
-                messages = (
-                    session.query(ConversationMessageDB)
-                    .filter(ConversationMessageDB.conversation_id == row.id)
-                    .order_by(ConversationMessageDB.timestamp.asc())
-                    .all()
+            for msg in rows:
+                grouped.setdefault(msg.conversation_id, []).append(msg)
+        return grouped
+
+    def _count_messages(
+        self, session: Any, conversation_ids: List[str]
+    ) -> Dict[str, int]:
+        from sqlalchemy import func
+
+        counts: Dict[str, int] = {}
+        for offset in range(0, len(conversation_ids), _IN_CLAUSE_CHUNK):
+            chunk = conversation_ids[offset : offset + _IN_CLAUSE_CHUNK]
+            rows = (
+                session.query(
+                    ConversationMessageDB.conversation_id,
+                    func.count(ConversationMessageDB.id),
                 )
-                conversations.append(self._to_model(row, messages))
-            return conversations
-        finally:
-            session.close()
+                .filter(ConversationMessageDB.conversation_id.in_(chunk))
+                .group_by(ConversationMessageDB.conversation_id)
+                .all()
+            )
+            for conversation_id, count in rows:
+                counts[conversation_id] = int(count)
+        return counts
 
-    def list_for_customer(self, customer_id: str) -> List[Conversation]:
+    def _list(self, criterion: Any, with_messages: bool) -> List[Conversation]:
         if SessionLocal is None:
             raise RuntimeError("Database session factory is not available")
         session = SessionLocal()
         try:
-            rows = (
-                session.query(ConversationDB)
-                .filter(ConversationDB.customer_id == customer_id)
-                .all()
-            )
-            conversations: List[Conversation] = []
-            for row in rows:
-                messages = (
-                    session.query(ConversationMessageDB)
-                    .filter(ConversationMessageDB.conversation_id == row.id)
-                    .order_by(ConversationMessageDB.timestamp.asc())
-                    .all()
-                )
-                conversations.append(self._to_model(row, messages))
-            return conversations
+            query = session.query(ConversationDB)
+            if criterion is not None:
+                query = query.filter(criterion)
+            rows = query.all()
+            ids = [row.id for row in rows]
+            if not with_messages:
+                counts = self._count_messages(session, ids)
+                conversations: List[Conversation] = []
+                for row in rows:
+                    conv = self._to_model(row, [])
+                    conv.message_count = counts.get(row.id, 0)
+                    conversations.append(conv)
+                return conversations
+            messages = self._load_messages(session, ids)
+            return [self._to_model(row, messages.get(row.id, [])) for row in rows]
         finally:
             session.close()
 
+    def list_all(self, *, with_messages: bool = True) -> List[Conversation]:
+        """List every conversation.
+
+        Messages are loaded in bulk; pass ``with_messages=False`` to skip
+        transcripts and only fill in ``message_count``.
+        """
+        return self._list(None, with_messages)
+
+    def list_for_business(
+        self, business_id: str, *, with_messages: bool = True
+    ) -> List[Conversation]:
+        return self._list(ConversationDB.business_id == business_id, with_messages)
+
+    def list_for_customer(
+        self, customer_id: str, *, with_messages: bool = True
+    ) -> List[Conversation]:
+        return self._list(ConversationDB.customer_id == customer_id, with_messages)
+
     def delete_for_customer(self, customer_id: str) -> None:
         if SessionLocal is None:
             raise RuntimeError("Database session factory is not available")
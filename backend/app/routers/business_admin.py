@@ -820,7 +820,9 @@ def _build_business_usage(business_id: str, row: BusinessDB) -> BusinessUsageRes
     """Aggregate simple per-tenant usage stats from repositories."""
     customers = customers_repo.list_for_business(business_id)
     appointments = appointments_repo.list_for_business(business_id)
-    conversations = conversations_repo.list_for_business(business_id)
+    conversations = conversations_repo.list_for_business(
+        business_id, with_messages=False
+    )
 
     total_customers = len(customers)
     sms_opt_out_customers = sum(
@@ -107,7 +107,9 @@ def _build_business_context(business_id: str) -> str:
     callbacks = metrics.callbacks_by_business.get(business_id, {}) or {}
     voice_usage = twilio_stats.voice_requests if twilio_stats else 0
     sms_usage = twilio_stats.sms_requests if twilio_stats else 0
-    total_conversations = len(conversations_repo.list_for_business(business_id))
+    total_conversations = len(
+        conversations_repo.list_for_business(business_id, with_messages=False)
+    )
 
     context_lines = [
         f"Business: {name} (id={business_id})",
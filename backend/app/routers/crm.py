@@ -1,11 +1,13 @@
 from __future__ import annotations
 
+import base64
+import binascii
 from datetime import datetime
 import json
 from typing import Any, Dict, List
 
 import httpx
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from pydantic import BaseModel
 
 from ..config import get_settings
@@ -14,6 +16,7 @@ from ..deps import (
     require_dashboard_role,
     require_subscription_active,
 )
+from ..models import AppointmentQuery
 from ..repositories import appointments_repo, conversations_repo, customers_repo
 from ..business_config import get_calendar_id_for_business
 from ..services.calendar import TimeSlot, calendar_service
@@ -163,6 +166,11 @@ class TimelineItem(BaseModel):
     channel: str | None = None
 
 
+def _message_count(conv) -> int:  # type: ignore[no-untyped-def]
+    count = getattr(conv, "message_count", None)
+    return count if count is not None else len(conv.messages)
+
+
 def _normalize_outcome_label(text: str) -> str | None:
     value = (text or "").strip().lower()
     if not value:
@@ -399,30 +407,27 @@ def list_customers(
 def search_customers(
     q: str = Query(..., min_length=1),
     business_id: str = Depends(ensure_business_active),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
 ) -> list[CustomerResponse]:
     """Search customers for this tenant by name or phone.
 
-    - Name: case-insensitive substring match.
-    - Phone: exact match on the stored phone string.
+    - Phone: any format; matched on the E.164 number or partial digits.
+    - Name: token prefix ("jo smi"), substring, or fuzzy match for typos.
+
+    Results are ranked best match first and paginated with limit/offset.
     """
-    query = q.strip().lower()
-    results: list[CustomerResponse] = []
-    for c in customers_repo.list_for_business(business_id):
-        name_match = query in (c.name or "").lower()
-        phone_match = c.phone == q
-        if not (name_match or phone_match):
-            continue
-        results.append(
-            CustomerResponse(
-                id=c.id,
-                name=c.name,
-                phone=c.phone,
-                email=c.email,
-                address=c.address,
-                tags=getattr(c, "tags", []) or [],
-            )
+    return [
+        CustomerResponse(
+            id=c.id,
+            name=c.name,
+            phone=c.phone,
+            email=c.email,
+            address=c.address,
+            tags=getattr(c, "tags", []) or [],
         )
-    return results
+        for c in customers_repo.search(business_id, q, limit=limit, offset=offset)
+    ]
 
 
 @router.post("/appointments", response_model=AppointmentResponse)
@@ -520,11 +525,28 @@ def list_customer_appointments(customer_id: str) -> list[AppointmentResponse]:
     ]
 
 
+def _encode_appointment_cursor(after: tuple[datetime, str]) -> str:
+    payload = json.dumps({"start": after[0].isoformat(), "id": after[1]})
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+
+def _decode_appointment_cursor(cursor: str) -> tuple[datetime, str]:
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return datetime.fromisoformat(payload["start"]), str(payload["id"])
+    except (binascii.Error, ValueError, TypeError, KeyError, UnicodeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        )
+
+
 @router.get("/appointments", response_model=list[AppointmentResponse])
 def list_appointments(
+    response: Response,
     business_id: str = Depends(ensure_business_active),
     limit: int = Query(100, ge=1, le=500),
     offset: int = Query(0, ge=0),
+    cursor: str | None = Query(default=None),
     start_time_from: datetime | None = Query(default=None),
     start_time_to: datetime | None = Query(default=None),
     status: str | None = Query(default=None),
@@ -532,45 +554,28 @@ def list_appointments(
     is_emergency: bool | None = Query(default=None),
     tag: str | None = Query(default=None),
 ) -> list[AppointmentResponse]:
-    appts = appointments_repo.list_for_business(business_id)
-    if (
-        start_time_from is not None
-        or start_time_to is not None
-        or status is not None
-        or service_type is not None
-        or is_emergency is not None
-        or tag is not None
-    ):
-        filtered: list = []
-        for a in appts:
-            start = getattr(a, "start_time", None)
-            if start_time_from is not None and (
-                start is None or start < start_time_from
-            ):
-                continue
-            if start_time_to is not None and (start is None or start > start_time_to):
-                continue
-            if status is not None:
-                current_status = getattr(a, "status", "")
-                if current_status.upper() != status.upper():
-                    continue
-            if service_type is not None:
-                current_service = getattr(a, "service_type", None) or ""
-                if current_service.lower() != service_type.lower():
-                    continue
-            if is_emergency is not None:
-                current_emergency = bool(getattr(a, "is_emergency", False))
-                if current_emergency is not is_emergency:
-                    continue
-            if tag is not None:
-                tags = getattr(a, "tags", []) or []
-                if tag not in tags:
-                    continue
-            filtered.append(a)
-        appts = filtered
-    slice_start = offset
-    slice_end = offset + limit
-    window = appts[slice_start:slice_end]
+    """List appointments ordered by start time.
+
+    Pass the ``X-Next-Cursor`` response header back as ``cursor`` to fetch
+    the following page; the header is omitted on the last page.
+    """
+    page = appointments_repo.query_for_business(
+        business_id,
+        AppointmentQuery(
+            start_from=start_time_from,
+            start_to=start_time_to,
+            status=status,
+            service_type=service_type,
+            is_emergency=is_emergency,
+            tag=tag,
+            after=_decode_appointment_cursor(cursor) if cursor else None,
+            offset=offset,
+            limit=limit,
+        ),
+    )
+    if page.next_after is not None:
+        response.headers["X-Next-Cursor"] = _encode_appointment_cursor(page.next_after)
+    window = page.items
     return [
         AppointmentResponse(
             id=a.id,
@@ -828,7 +833,9 @@ async def cancel_appointment(
 def list_conversations(
     business_id: str = Depends(ensure_business_active),
 ) -> list[ConversationSummaryResponse]:
-    conversations = conversations_repo.list_for_business(business_id)
+    conversations = conversations_repo.list_for_business(
+        business_id, with_messages=False
+    )
     # Best-effort mapping of conversations to a service type and whether the
     # customer has any active appointments in this business.
     svc_by_customer: dict[str, str | None] = {}
@@ -856,7 +863,7 @@ def list_conversations(
             customer_id=c.customer_id,
             session_id=c.session_id,
             created_at=c.created_at,
-            message_count=len(c.messages),
+            message_count=_message_count(c),
             flagged_for_review=getattr(c, "flagged_for_review", False),
             tags=getattr(c, "tags", []) or [],
             outcome=getattr(c, "outcome", None),
@@ -883,7 +890,7 @@ def list_customer_conversations(
 ) -> list[ConversationSummaryResponse]:
     conversations = [
         c
-        for c in conversations_repo.list_for_business(business_id)
+        for c in conversations_repo.list_for_business(business_id, with_messages=False)
         if c.customer_id == customer_id
     ]
     # Treat any active appointment for this customer in this business as
@@ -904,7 +911,7 @@ def list_customer_conversations(
             customer_id=c.customer_id,
             session_id=c.session_id,
             created_at=c.created_at,
-            message_count=len(c.messages),
+            message_count=_message_count(c),
             service_type=None,
             has_appointments=has_appt,
         )
@@ -945,7 +952,7 @@ def customer_timeline(
         )
 
     # Conversations for this customer in this business.
-    for c in conversations_repo.list_for_business(business_id):
+    for c in conversations_repo.list_for_business(business_id, with_messages=False):
         if c.customer_id != customer_id:
             continue
         ts = getattr(c, "created_at", None)
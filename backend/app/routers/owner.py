@@ -32,12 +32,15 @@ from ..db_models import (
     UserDB,
 )
 from ..metrics import metrics
+from ..models import Appointment
 from ..services import twilio_provision
+from ..services.appointment_rollup import DailyRollup
 from ..services.sms import sms_service
 from ..services.email_service import email_service
 from ..services.stt_tts import speech_service
-from ..services.geo_utils import derive_neighborhood_label, geocode_address
-from ..services.zip_enrichment import fetch_zip_income
+from ..services.geo_utils import derive_neighborhood_label
+from ..services.geocoding import geocoding_service
+from ..services.zip_enrichment import zip_income_store
 from ..business_config import get_voice_for_business
 from ..services.auth import decode_token, TokenError
 from ..services.privacy import redact_text
@@ -52,6 +55,9 @@ router = APIRouter(
 _DEFAULT_ONBOARDING_RESET = False
 logger = logging.getLogger(__name__)
 
+# Appointment statuses counted as active work in dashboard analytics.
+_ACTIVE_STATUSES = frozenset({"SCHEDULED", "CONFIRMED"})
+
 
 def _require_db():
     if not SQLALCHEMY_AVAILABLE or SessionLocal is None:
@@ -961,6 +967,7 @@ def delete_tenant_data(
         session.commit()
     finally:
         session.close()
+    appointments_repo.daily_rollup.purge(business_id)
 
     return TenantDataDeleteResponse(
         business_id=business_id,
@@ -1148,25 +1155,21 @@ def owner_service_mix(
     service_counts: dict[str, int] = {}
     emergency_counts: dict[str, int] = {}
 
-    for appt in appointments_repo.list_for_business(business_id):
-        start_time = getattr(appt, "start_time", None)
-        if not start_time:
-            continue
-        if start_time < window or start_time > now:
-            continue
-        status = getattr(appt, "status", "SCHEDULED").upper()
-        if status not in {"SCHEDULED", "CONFIRMED"}:
-            continue
-
-        total += 1
-        is_emergency = bool(getattr(appt, "is_emergency", False))
-        if is_emergency:
-            emergency += 1
-
-        service_type = getattr(appt, "service_type", None) or "unspecified"
-        service_counts[service_type] = service_counts.get(service_type, 0) + 1
-        if is_emergency:
-            emergency_counts[service_type] = emergency_counts.get(service_type, 0) + 1
+    for agg in appointments_repo.aggregate_for_business(
+        business_id,
+        group_by=("service_type",),
+        start=window,
+        end=now,
+        statuses=_ACTIVE_STATUSES,
+    ):
+        total += agg.count
+        emergency += agg.emergency_count
+        service_type = agg.group["service_type"] or "unspecified"
+        service_counts[service_type] = service_counts.get(service_type, 0) + agg.count
+        if agg.emergency_count:
+            emergency_counts[service_type] = (
+                emergency_counts.get(service_type, 0) + agg.emergency_count
+            )
 
     return OwnerServiceMixResponse(
         total_appointments_30d=total,
@@ -1193,21 +1196,14 @@ def owner_pipeline(
     buckets: dict[str, dict[str, float]] = {}
     total_estimated = 0.0
 
-    for appt in appointments_repo.list_for_business(business_id):
-        start_time = getattr(appt, "start_time", None)
-        if not start_time:
-            continue
-        if start_time < window or start_time > now:
-            continue
-        stage = (
-            getattr(appt, "job_stage", None) or "Unspecified"
-        ).strip() or "Unspecified"
-        est_value = getattr(appt, "estimated_value", None)
-        value = float(est_value) if est_value is not None else 0.0
+    for agg in appointments_repo.aggregate_for_business(
+        business_id, group_by=("job_stage",), start=window, end=now
+    ):
+        stage = (agg.group["job_stage"] or "Unspecified").strip() or "Unspecified"
         bucket = buckets.setdefault(stage, {"count": 0.0, "value": 0.0})
-        bucket["count"] += 1
-        bucket["value"] += value
-        total_estimated += value
+        bucket["count"] += agg.count
+        bucket["value"] += agg.estimated_value_total
+        total_estimated += agg.estimated_value_total
 
     stages: list[OwnerPipelineStage] = []
     for stage, agg in buckets.items():
@@ -1257,61 +1253,48 @@ def owner_quotes(
     now = datetime.now(UTC)
     window = now - timedelta(days=days)
 
-    # Consider only recent, active appointments.
-    relevant = []
-    for appt in appointments_repo.list_for_business(business_id):
-        start_time = getattr(appt, "start_time", None)
-        if not start_time or start_time < window or start_time > now:
-            continue
-        status = getattr(appt, "status", "SCHEDULED").upper()
-        if status not in {"SCHEDULED", "CONFIRMED"}:
-            continue
-        relevant.append(appt)
+    # One grouped pass over recent, active appointments gives both the
+    # per-stage/status totals and which customers reached which stages.
+    groups = appointments_repo.aggregate_for_business(
+        business_id,
+        group_by=("job_stage", "quote_status", "customer_id"),
+        start=window,
+        end=now,
+        statuses=_ACTIVE_STATUSES,
+    )
 
     # Aggregate per quote stage and track which customers have quotes and
     # booked/completed work in the same window.
     stage_buckets: dict[str, dict[str, float]] = {}
     status_buckets: dict[str, dict[str, float]] = {}
     quote_customers: set[str] = set()
-    converted_customers: set[str] = set()
-
-    for appt in relevant:
-        raw_stage = getattr(appt, "job_stage", None) or "Unspecified"
-        stage = raw_stage.strip() or "Unspecified"
-        est_value = getattr(appt, "estimated_value", None)
-        est_booked_value = float(est_value) if est_value is not None else 0.0
-        quoted_val = getattr(appt, "quoted_value", None)
-        q_value = float(quoted_val) if quoted_val is not None else 0.0
-        customer_id = getattr(appt, "customer_id", None)
-
-        if _is_quote_stage(stage):
-            bucket = stage_buckets.setdefault(
-                stage, {"count": 0.0, "est_value": 0.0, "quoted_value": 0.0}
-            )
-            bucket["count"] += 1
-            bucket["est_value"] += est_booked_value
-            bucket["quoted_value"] += q_value or est_booked_value
-            # Quote-status funnel: treat missing status as a basic "QUOTED" state.
-            raw_status = getattr(appt, "quote_status", None) or "QUOTED"
-            status_norm = raw_status.strip().upper() or "QUOTED"
-            sb = status_buckets.setdefault(
-                status_norm, {"count": 0.0, "quoted_value": 0.0}
-            )
-            sb["count"] += 1
-            sb["quoted_value"] += q_value or est_booked_value
-            if customer_id:
-                quote_customers.add(customer_id)
+    booked_customers: set[str] = set()
+
+    for agg in groups:
+        stage = (agg.group["job_stage"] or "Unspecified").strip() or "Unspecified"
+        customer_id = agg.group["customer_id"]
+        if _is_booked_or_completed_stage(stage) and customer_id:
+            booked_customers.add(customer_id)
+        if not _is_quote_stage(stage):
+            continue
+        bucket = stage_buckets.setdefault(
+            stage, {"count": 0.0, "est_value": 0.0, "quoted_value": 0.0}
+        )
+        bucket["count"] += agg.count
+        bucket["est_value"] += agg.estimated_value_total
+        bucket["quoted_value"] += agg.quoted_or_estimated_total
+        # Quote-status funnel: treat missing status as a basic "QUOTED" state.
+        raw_status = agg.group["quote_status"] or "QUOTED"
+        status_norm = raw_status.strip().upper() or "QUOTED"
+        sb = status_buckets.setdefault(status_norm, {"count": 0.0, "quoted_value": 0.0})
+        sb["count"] += agg.count
+        sb["quoted_value"] += agg.quoted_or_estimated_total
+        if customer_id:
+            quote_customers.add(customer_id)
 
     # Conversion: customers who have both quote-stage and booked/completed
     # appointments in the same window.
-    for appt in relevant:
-        customer_id = getattr(appt, "customer_id", None)
-        if not customer_id or customer_id not in quote_customers:
-            continue
-        raw_stage = getattr(appt, "job_stage", None) or "Unspecified"
-        stage = raw_stage.strip() or "Unspecified"
-        if _is_booked_or_completed_stage(stage):
-            converted_customers.add(customer_id)
+    converted_customers = quote_customers & booked_customers
 
     stages: list[OwnerQuoteStage] = []
     total_quotes = 0
@@ -1468,151 +1451,33 @@ class OwnerCalendarWindowResponse(BaseModel):
     days: list[OwnerCalendarDaySummary]
 
 
-def _compute_first_appointment_dates(business_id: str) -> dict[str, date]:
-    """Return first-seen appointment date per customer for this tenant."""
-    first_by_customer: dict[str, datetime] = {}
-    for appt in appointments_repo.list_for_business(business_id):
-        customer_id = getattr(appt, "customer_id", None)
-        start_time = getattr(appt, "start_time", None)
-        if not customer_id or not start_time:
-            continue
-        existing = first_by_customer.get(customer_id)
-        if existing is None or start_time < existing:
-            first_by_customer[customer_id] = start_time
-    return {cid: dt.date() for cid, dt in first_by_customer.items()}
-
-
-def _classify_calendar_tags(
-    appt,
-    is_new_client: bool,
-) -> set[str]:
-    """Assign high-level calendar tags to an appointment.
-
-    Tags are used for the 90-day calendar heatmap:
-    - emergency
-    - routine (non-emergency work)
-    - maintenance (service_type hints)
-    - service (all qualifying work)
-    - new_client (first appointment for a customer)
-    """
-    tags: set[str] = set()
-    is_emergency = bool(getattr(appt, "is_emergency", False))
-    service_type_raw = getattr(appt, "service_type", None) or ""
-    service_type = str(service_type_raw).lower()
-
-    if is_emergency:
-        tags.add("emergency")
-    else:
-        tags.add("routine")
-
-    if (
-        "maint" in service_type
-        or "tune" in service_type
-        or "inspection" in service_type
-    ):
-        tags.add("maintenance")
-
-    # All scheduled work is still tagged as generic service.
-    tags.add("service")
-
-    if is_new_client:
-        tags.add("new_client")
-
-    return tags
-
-
 def _compute_calendar_window(
     business_id: str,
     start_date: date,
     end_date: date,
 ) -> OwnerCalendarWindowResponse:
-    """Aggregate appointments into per-day calendar buckets for a window."""
+    """Read per-day calendar buckets for a window from the daily rollup."""
     if end_date < start_date:
         start_date, end_date = end_date, start_date
 
-    first_dates = _compute_first_appointment_dates(business_id)
-
-    buckets: dict[date, dict[str, object]] = {}
-    for appt in appointments_repo.list_for_business(business_id):
-        start_time = getattr(appt, "start_time", None)
-        if not start_time:
-            continue
-        appt_day = start_time.date()
-        if appt_day < start_date or appt_day > end_date:
-            continue
-        status = getattr(appt, "status", "SCHEDULED").upper()
-        if status not in {"SCHEDULED", "CONFIRMED", "COMPLETED"}:
-            continue
-
-        customer_id = getattr(appt, "customer_id", None)
-        is_new_client = False
-        if customer_id:
-            first_date = first_dates.get(customer_id)
-            if first_date is not None and first_date == appt_day:
-                is_new_client = True
-
-        tags = _classify_calendar_tags(appt, is_new_client=is_new_client)
-
-        bucket = buckets.setdefault(
-            appt_day,
-            {
-                "total": 0,
-                "tags": {},  # type: ignore[dict-item]
-                "services": {},  # type: ignore[dict-item]
-                "value_total": 0.0,
-                "value_count": 0,
-                "new_customers": 0,
-            },
-        )
-        bucket["total"] = int(bucket["total"]) + 1  # type: ignore[index]
-        tag_counts: dict[str, int] = bucket["tags"]  # type: ignore[assignment]
-        for tag in tags:
-            tag_counts[tag] = tag_counts.get(tag, 0) + 1
-
-        service_type_name = getattr(appt, "service_type", None) or "unspecified"
-        services: dict[str, int] = bucket["services"]  # type: ignore[assignment]
-        services[service_type_name] = services.get(service_type_name, 0) + 1
-
-        est_value_raw = getattr(appt, "estimated_value", None)
-        if est_value_raw is not None:
-            value = float(est_value_raw)
-            bucket["value_total"] = float(bucket["value_total"]) + value  # type: ignore[index]
-            bucket["value_count"] = int(bucket["value_count"]) + 1  # type: ignore[index]
-
-        if is_new_client:
-            bucket["new_customers"] = int(bucket["new_customers"]) + 1  # type: ignore[index]
+    rollups = appointments_repo.daily_rollup.read_range(
+        business_id, start_date, end_date
+    )
 
     days: list[OwnerCalendarDaySummary] = []
     span_days = (end_date - start_date).days + 1
     for offset in range(span_days):
         day = start_date + timedelta(days=offset)
-        bucket = buckets.get(
-            day,
-            {
-                "total": 0,
-                "tags": {},
-                "services": {},
-                "value_total": 0.0,
-                "value_count": 0,
-                "new_customers": 0,
-            },
-        )
-        total = int(bucket["total"])  # type: ignore[index]
-        value_total = float(bucket["value_total"])  # type: ignore[index]
-        value_count = int(bucket["value_count"])  # type: ignore[index]
-        avg_value = value_total / float(value_count) if value_count > 0 else None
-        tag_counts = dict(bucket["tags"])  # type: ignore[arg-type]
-        service_type_counts = dict(bucket["services"])  # type: ignore[arg-type]
-        new_customers = int(bucket["new_customers"])  # type: ignore[index]
+        rollup = rollups.get(day) or DailyRollup()
         days.append(
             OwnerCalendarDaySummary(
                 date=day,
-                total_appointments=total,
-                tag_counts=tag_counts,
-                service_type_counts=service_type_counts,
-                estimated_value_total=value_total,
-                estimated_value_average=avg_value,
-                new_customers=new_customers,
+                total_appointments=rollup.total,
+                tag_counts=dict(rollup.tag_counts),
+                service_type_counts=dict(rollup.service_type_counts),
+                estimated_value_total=rollup.value_total,
+                estimated_value_average=rollup.value_average,
+                new_customers=rollup.new_customers,
             )
         )
 
@@ -2628,24 +2493,19 @@ def owner_lead_sources(
     total_count = 0
     total_value = 0.0
 
-    for appt in appointments_repo.list_for_business(business_id):
-        start_time = getattr(appt, "start_time", None)
-        if not start_time or start_time < window or start_time > now:
-            continue
-        status = getattr(appt, "status", "SCHEDULED").upper()
-        if status not in {"SCHEDULED", "CONFIRMED"}:
-            continue
-
-        source = (
-            getattr(appt, "lead_source", None) or "unspecified"
-        ).strip() or "unspecified"
-        est_value = getattr(appt, "estimated_value", None)
-        value = float(est_value) if est_value is not None else 0.0
+    for agg in appointments_repo.aggregate_for_business(
+        business_id,
+        group_by=("lead_source",),
+        start=window,
+        end=now,
+        statuses=_ACTIVE_STATUSES,
+    ):
+        source = (agg.group["lead_source"] or "unspecified").strip() or "unspecified"
         bucket = buckets.setdefault(source, {"count": 0.0, "value": 0.0})
-        bucket["count"] += 1
-        bucket["value"] += value
-        total_count += 1
-        total_value += value
+        bucket["count"] += agg.count
+        bucket["value"] += agg.estimated_value_total
+        total_count += agg.count
+        total_value += agg.estimated_value_total
 
     items: list[OwnerLeadSourceItem] = []
     for source, agg in buckets.items():
@@ -2680,25 +2540,17 @@ def owner_service_economics(
     window = now - timedelta(days=days)
 
     buckets: dict[str, dict[str, float]] = {}
-    for appt in appointments_repo.list_for_business(business_id):
-        start_time = getattr(appt, "start_time", None)
-        if not start_time or start_time < window or start_time > now:
-            continue
-        status = getattr(appt, "status", "SCHEDULED").upper()
-        if status not in {"SCHEDULED", "CONFIRMED"}:
-            continue
-        svc = getattr(appt, "service_type", None) or "unspecified"
-        est_value = getattr(appt, "estimated_value", None)
-        value = float(est_value) if est_value is not None else 0.0
-        bucket = buckets.setdefault(
-            svc,
-            {
-                "count": 0.0,
-                "value": 0.0,
-            },
-        )
-        bucket["count"] += 1.0
-        bucket["value"] += value
+    for agg in appointments_repo.aggregate_for_business(
+        business_id,
+        group_by=("service_type",),
+        start=window,
+        end=now,
+        statuses=_ACTIVE_STATUSES,
+    ):
+        svc = agg.group["service_type"] or "unspecified"
+        bucket = buckets.setdefault(svc, {"count": 0.0, "value": 0.0})
+        bucket["count"] += agg.count
+        bucket["value"] += agg.estimated_value_total
 
     items: list[OwnerServiceTypeEconomicsItem] = []
     for svc, agg in buckets.items():
@@ -2908,21 +2760,19 @@ def owner_neighborhoods(
             bucket["emergencies"] += 1.0
         bucket["value"] += value
 
+    # Income comes from the local store only; missing or stale ZIPs are
+    # refreshed in the background and show up on a later load.
+    zip_profiles = zip_income_store.read_local(
+        label for label in buckets if len(label) == 5 and label.isdigit()
+    )
     items: list[OwnerNeighborhoodItem] = []
-    zip_income_cache: dict[str, int | None] = {}
     for label, agg in buckets.items():
         customers = len(agg["customers"])  # type: ignore[index]
         appts = int(agg["appointments"])
         emergencies = int(agg["emergencies"])
         value = float(agg["value"])
-        median_income: int | None = None
-        if len(label) == 5 and label.isdigit():
-            cached = zip_income_cache.get(label)
-            if cached is None and label not in zip_income_cache:
-                profile = fetch_zip_income(label)
-                cached = profile.median_household_income
-                zip_income_cache[label] = cached
-            median_income = cached
+        profile = zip_profiles.get(label)
+        median_income = profile.median_household_income if profile else None
         items.append(
             OwnerNeighborhoodItem(
                 label=label,
@@ -2940,28 +2790,30 @@ def owner_neighborhoods(
 
 
 @router.get("/geo/markers", response_model=OwnerGeoMarkersResponse)
-def owner_geo_markers(
+async def owner_geo_markers(
     business_id: str = Depends(ensure_business_active),
     days: int = Query(30, ge=1, le=365),
 ) -> OwnerGeoMarkersResponse:
     """Return geocoded appointment markers for map visualization."""
     now = datetime.now(UTC)
     window_start = now - timedelta(days=days)
-    markers: list[OwnerGeoMarker] = []
-    geo_cache: dict[str, tuple[float, float] | None] = {}
-
+    located: list[tuple[Appointment, str]] = []
     for appt in appointments_repo.list_for_business(business_id):
         if getattr(appt, "start_time", None) and appt.start_time < window_start:
             continue
         customer = customers_repo.get(appt.customer_id)
         address = customer.address if customer else None
-        if not address:
-            continue
-        if address in geo_cache:
-            coords = geo_cache[address]
-        else:
-            coords = geocode_address(address)
-            geo_cache[address] = coords
+        if address:
+            located.append((appt, address))
+
+    # Resolve every address in one batch instead of one request per marker.
+    geo = await geocoding_service.prefetch(
+        {address for _, address in located},
+        timeout=get_settings().calendar.geocode_prefetch_timeout_seconds,
+    )
+    markers: list[OwnerGeoMarker] = []
+    for appt, address in located:
+        coords = geo.get(address)
         if not coords:
             continue
         lat, lng = coords
@@ -3086,7 +2938,7 @@ def owner_time_to_book(
     # Earliest conversation per customer in the window, keyed by customer and
     # channel.
     first_contact: dict[str, tuple[datetime, str]] = {}
-    for conv in conversations_repo.list_for_business(business_id):
+    for conv in conversations_repo.list_for_business(business_id, with_messages=False):
         created_at = getattr(conv, "created_at", None)
         if not created_at:
             continue
@@ -3114,29 +2966,20 @@ def owner_time_to_book(
     overall_minutes = 0.0
     per_channel: dict[str, dict[str, float]] = {}
 
+    # Earliest active appointment after each customer's first contact,
+    # fetched in one repository call rather than per customer.
+    first_booked = appointments_repo.first_appointment_after(
+        business_id,
+        {cid: first_ts for cid, (first_ts, _) in first_contact.items()},
+        end=now,
+        statuses=_ACTIVE_STATUSES,
+    )
+
     for customer_id, (first_ts, channel) in first_contact.items():
-        appts = [
-            a
-            for a in appointments_repo.list_for_customer(customer_id)
-            if getattr(a, "business_id", business_id) == business_id
-        ]
-        # Consider only appointments after the initial contact.
-        candidates = []
-        for appt in appts:
-            start_time = getattr(appt, "start_time", None)
-            if not start_time:
-                continue
-            if start_time <= first_ts or start_time > now:
-                continue
-            status = getattr(appt, "status", "SCHEDULED").upper()
-            if status not in {"SCHEDULED", "CONFIRMED"}:
-                continue
-            candidates.append(appt)
-        if not candidates:
+        first_start = first_booked.get(customer_id)
+        if first_start is None:
             continue
-        candidates.sort(key=lambda a: a.start_time)
-        first_appt = candidates[0]
-        delta = first_appt.start_time - first_ts
+        delta = first_start - first_ts
         minutes = max(delta.total_seconds() / 60.0, 0.0)
 
         overall_samples += 1
@@ -3184,7 +3027,7 @@ def owner_conversion_funnel(
     window_start = now - timedelta(days=days)
 
     first_contact: dict[str, tuple[datetime, str]] = {}
-    for conv in conversations_repo.list_for_business(business_id):
+    for conv in conversations_repo.list_for_business(business_id, with_messages=False):
         created_at = getattr(conv, "created_at", None)
         if not created_at:
             continue
@@ -3216,31 +3059,21 @@ def owner_conversion_funnel(
     overall_booked = 0
     overall_minutes = 0.0
 
+    first_booked = appointments_repo.first_appointment_after(
+        business_id,
+        {cid: first_ts for cid, (first_ts, _) in first_contact.items()},
+        end=now,
+        statuses=_ACTIVE_STATUSES,
+    )
+
     for customer_id, (first_ts, channel) in first_contact.items():
         overall_leads += 1
         per_channel_leads[channel] = per_channel_leads.get(channel, 0) + 1
 
-        appts = [
-            a
-            for a in appointments_repo.list_for_customer(customer_id)
-            if getattr(a, "business_id", business_id) == business_id
-        ]
-        candidates = []
-        for appt in appts:
-            start_time = getattr(appt, "start_time", None)
-            if not start_time:
-                continue
-            if start_time <= first_ts or start_time > now:
-                continue
-            status = getattr(appt, "status", "SCHEDULED").upper()
-            if status not in {"SCHEDULED", "CONFIRMED"}:
-                continue
-            candidates.append(appt)
-        if not candidates:
+        first_start = first_booked.get(customer_id)
+        if first_start is None:
             continue
-        candidates.sort(key=lambda a: a.start_time)
-        first_appt = candidates[0]
-        delta = first_appt.start_time - first_ts
+        delta = first_start - first_ts
         minutes = max(delta.total_seconds() / 60.0, 0.0)
 
         overall_booked += 1
@@ -3318,27 +3151,14 @@ def owner_data_completeness(
     appts_with_lead_source = 0
     appts_complete = 0
 
-    for appt in appointments_repo.list_for_business(business_id):
-        start_time = getattr(appt, "start_time", None)
-        if not start_time or start_time < window_start or start_time > now:
-            continue
-        total_appointments += 1
-        service_type = (getattr(appt, "service_type", None) or "").strip()
-        lead_source = (getattr(appt, "lead_source", None) or "").strip()
-        est_value = getattr(appt, "estimated_value", None)
-
-        has_service_type = bool(service_type)
-        has_lead_source = bool(lead_source)
-        has_estimated_value = est_value is not None
-
-        if has_service_type:
-            appts_with_service_type += 1
-        if has_estimated_value:
-            appts_with_estimated_value += 1
-        if has_lead_source:
-            appts_with_lead_source += 1
-        if has_service_type and has_lead_source and has_estimated_value:
-            appts_complete += 1
+    for agg in appointments_repo.aggregate_for_business(
+        business_id, start=window_start, end=now
+    ):
+        total_appointments += agg.count
+        appts_with_service_type += agg.with_service_type
+        appts_with_estimated_value += agg.with_estimated_value
+        appts_with_lead_source += agg.with_lead_source
+        appts_complete += agg.complete
 
     customer_score = (
         float(customers_complete) / float(total_customers)
@@ -3653,7 +3473,7 @@ def owner_followup_summary(
     from ..repositories import conversations_repo  # local import to avoid cycles
 
     candidate_customers: set[str] = set()
-    for conv in conversations_repo.list_for_business(business_id):
+    for conv in conversations_repo.list_for_business(business_id, with_messages=False):
         if not conv.customer_id:
             continue
         created_at = getattr(conv, "created_at", now)
@@ -3756,7 +3576,9 @@ def owner_conversations_review(
     only conversations that have been explicitly flagged or marked as
     emergency-related via tags or outcome text.
     """
-    conversations = conversations_repo.list_for_business(business_id)
+    conversations = conversations_repo.list_for_business(
+        business_id, with_messages=False
+    )
     total = len(conversations)
     flagged = 0
     emergency = 0
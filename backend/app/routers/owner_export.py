@@ -130,7 +130,7 @@ def export_conversations_csv(
     window = now - timedelta(days=days)
 
     rows = []
-    for conv in conversations_repo.list_for_business(business_id):
+    for conv in conversations_repo.list_for_business(business_id, with_messages=False):
         created_at = getattr(conv, "created_at", None)
         if not created_at:
             continue
@@ -289,7 +289,7 @@ def export_conversion_funnel_csv(
 
     # Earliest conversation per customer in the window.
     first_contact: dict[str, tuple[datetime, str]] = {}
-    for conv in conversations_repo.list_for_business(business_id):
+    for conv in conversations_repo.list_for_business(business_id, with_messages=False):
         created_at = getattr(conv, "created_at", None)
         if not created_at:
             continue
@@ -119,7 +119,7 @@ async def send_unbooked_lead_followups(
     sent = 0
     seen_customers: set[str] = set()
 
-    for conv in conversations_repo.list_for_business(business_id):
+    for conv in conversations_repo.list_for_business(business_id, with_messages=False):
         if not conv.customer_id or conv.customer_id in seen_customers:
             continue
         created_at = getattr(conv, "created_at", now)
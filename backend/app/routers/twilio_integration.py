@@ -3,12 +3,10 @@ from __future__ import annotations
 import base64
 import hashlib
 import hmac
-import io
 import json
 import os
-import struct
 import time
-import wave
+from collections import deque
 from datetime import UTC, datetime, timedelta
 from html import escape
 import logging
@@ -25,7 +23,7 @@ from fastapi import (
     status,
 )
 from pydantic import BaseModel
-from typing import Dict, TYPE_CHECKING
+from typing import Callable, Dict, TYPE_CHECKING
 
 from ..config import get_settings
 from ..db import SQLALCHEMY_AVAILABLE, SessionLocal
@@ -46,8 +44,18 @@ from ..services import (
     sessions,
     subscription as subscription_service,
 )
+from ..services.audio_pipeline import (
+    VAD_END,
+    VAD_SPLIT,
+    PcmRingBuffer,
+    VoiceActivityDetector,
+    is_mulaw,
+    pcm_bytes_for,
+)
+from ..services.call_stream import CallStreamWorker, StreamJob, StreamingUtterance
 from ..services.idempotency import idempotency_store
-from ..services.stt_tts import speech_service
+from ..services.nlu import speculate_intent
+from ..services.stt_tts import SpeechResult, speech_service
 from ..services.sms import sms_service
 from ..business_config import get_language_for_business
 from ..services.twilio_state import PendingAction, twilio_state_store
@@ -289,70 +297,6 @@ def _safe_int(value: object, default: int) -> int:
         return default
 
 
-def _stream_min_bytes(sample_rate: int, encoding: str, min_seconds: float) -> int:
-    encoding_norm = (encoding or "").lower()
-    bytes_per_sample = 1 if ("mulaw" in encoding_norm or "ulaw" in encoding_norm) else 2
-    safe_seconds = max(min_seconds, 0.1)
-    return max(1, int(sample_rate * bytes_per_sample * safe_seconds))
-
-
-# audioop was removed in Python 3.13; keep a local mu-law decoder for streaming.
-def _build_mulaw_decode_table() -> tuple[int, ...]:
-    table: list[int] = []
-    for value in range(256):
-        mu_law = (~value) & 0xFF
-        sign = mu_law & 0x80
-        exponent = (mu_law >> 4) & 0x07
-        mantissa = mu_law & 0x0F
-        sample = ((mantissa << 3) + 0x84) << exponent
-        sample -= 0x84
-        if sign:
-            sample = -sample
-        table.append(sample)
-    return tuple(table)
-
-
-_MULAW_DECODE_TABLE = _build_mulaw_decode_table()
-
-
-def _mulaw_to_pcm(payload: bytes) -> bytes:
-    if not payload:
-        return b""
-    pcm = bytearray(len(payload) * 2)
-    for idx, byte_value in enumerate(payload):
-        struct.pack_into("<h", pcm, idx * 2, _MULAW_DECODE_TABLE[byte_value])
-    return bytes(pcm)
-
-
-def _pcm_to_wav_bytes(
-    pcm_bytes: bytes, sample_rate: int, sample_width: int = 2
-) -> bytes:
-    buffer = io.BytesIO()
-    with wave.open(buffer, "wb") as wav_file:
-        wav_file.setnchannels(1)
-        wav_file.setsampwidth(sample_width)
-        wav_file.setframerate(sample_rate)
-        wav_file.writeframes(pcm_bytes)
-    return buffer.getvalue()
-
-
-def _twilio_payload_to_wav_base64(
-    payload: bytes, encoding: str, sample_rate: int
-) -> str | None:
-    if not payload:
-        return None
-    encoding_norm = (encoding or "").lower()
-    pcm_bytes = payload
-    sample_width = 2
-    if "mulaw" in encoding_norm or "ulaw" in encoding_norm:
-        try:
-            pcm_bytes = _mulaw_to_pcm(payload)
-        except Exception:
-            return None
-    wav_bytes = _pcm_to_wav_bytes(pcm_bytes, sample_rate, sample_width=sample_width)
-    return base64.b64encode(wav_bytes).decode("ascii")
-
-
 def _find_next_appointment_for_phone(
     phone: str,
     business_id: str,
@@ -1607,6 +1551,19 @@ async def twilio_voice_assistant(
         return Response(content=twiml, media_type="text/xml")
 
 
+# How long a stopped stream may spend finishing queued transcripts and turns.
+_STREAM_STOP_DRAIN_SECONDS = 10.0
+# Audio kept ahead of detected speech so the first syllable is not clipped,
+# and after it so the last one is not.
+_STREAM_VAD_PREROLL_SECONDS = 0.2
+_STREAM_VAD_TAIL_SECONDS = 0.1
+# Partial transcripts at or above this recognizer stability, and final
+# segments, start intent classification; less stable partials do so at
+# most once per debounce interval.
+_STREAM_STABLE_PARTIAL = 0.8
+_STREAM_SPECULATION_DEBOUNCE_SECONDS = 0.5
+
+
 @router.websocket("/voice-stream")
 async def twilio_voice_stream_websocket(websocket: WebSocket) -> None:
     """Handle Twilio Media Streams and forward transcripts to the HTTP stream handler."""
@@ -1634,19 +1591,165 @@ async def twilio_voice_stream_websocket(websocket: WebSocket) -> None:
     min_seconds = float(
         getattr(settings.telephony, "twilio_stream_min_seconds", 1.0) or 1.0
     )
-    buffer = bytearray()
+    buffer_seconds = float(
+        getattr(settings.telephony, "twilio_stream_buffer_seconds", 30.0) or 30.0
+    )
+    queue_size = int(getattr(settings.telephony, "twilio_stream_queue_size", 4) or 4)
+    vad_enabled = bool(getattr(settings.telephony, "twilio_stream_vad_enabled", True))
+    max_utterance_seconds = float(
+        getattr(settings.telephony, "twilio_stream_max_utterance_seconds", 10.0) or 10.0
+    )
+    # Decoded PCM for the current utterance; (re)sized when the format is known.
+    ring: PcmRingBuffer | None = None
+    # Utterance segmentation; without it audio is flushed every min_seconds.
+    vad: VoiceActivityDetector | None = None
+    dropped_reported = 0
+    flush_pending = False
+    # With a streaming provider, confirmed speech goes to the recognizer as
+    # it arrives and partial transcripts start intent classification early.
+    streaming = vad_enabled and speech_service.supports_streaming()
+    live: StreamingUtterance | None = None
+    live_utterances: list[StreamingUtterance] = []
+    live_session_id: str | None = None
+    pending_jobs: deque[StreamJob] = deque()
+
+    def ensure_ring() -> PcmRingBuffer:
+        nonlocal ring, vad
+        capacity = pcm_bytes_for(
+            sample_rate,
+            max(buffer_seconds, min_seconds, max_utterance_seconds + 1.0),
+        )
+        if ring is None or ring.capacity != capacity:
+            ring = PcmRingBuffer(capacity)
+        if vad_enabled and (vad is None or vad.sample_rate != sample_rate):
+            vad = VoiceActivityDetector(
+                sample_rate,
+                min_rms=float(
+                    getattr(settings.telephony, "twilio_stream_vad_min_rms", 400.0)
+                ),
+                hangover_ms=float(
+                    getattr(settings.telephony, "twilio_stream_vad_hangover_ms", 600)
+                ),
+                max_utterance_ms=max_utterance_seconds * 1000.0,
+            )
+        return ring
 
-    async def flush_buffer() -> str | None:
-        nonlocal buffer
-        if not buffer:
-            return None
-        audio_b64 = _twilio_payload_to_wav_base64(bytes(buffer), encoding, sample_rate)
-        buffer = bytearray()
-        if not audio_b64:
+    worker = CallStreamWorker(queue_size, call_sid=call_sid)
+
+    def take_utterance() -> StreamJob | None:
+        """Move buffered audio into a transcription job for the worker."""
+        nonlocal dropped_reported
+        if ring is None or not len(ring):
             return None
-        transcript = await speech_service.transcribe(audio_b64)
-        transcript = (transcript or "").strip()
-        return transcript or None
+        if ring.dropped_bytes > dropped_reported:
+            metrics.twilio_stream_audio_dropped_bytes += (
+                ring.dropped_bytes - dropped_reported
+            )
+            dropped_reported = ring.dropped_bytes
+        pcm = bytes(ring.view())
+        ring.clear()
+        rate = sample_rate
+
+        async def transcribe_and_reply() -> None:
+            transcript = await speech_service.transcribe_bytes(pcm, rate)
+            transcript = (transcript or "").strip()
+            if transcript:
+                await handle_transcript(transcript)
+
+        return transcribe_and_reply
+
+    def try_flush() -> bool:
+        """Hand the buffered utterance to the worker unless it is behind."""
+        if worker.full():
+            # Keep buffering; the ring bounds memory meanwhile.
+            metrics.twilio_stream_flushes_deferred += 1
+            return False
+        job = take_utterance()
+        if job is not None:
+            worker.start()
+            worker.submit_nowait(job)
+        return True
+
+    def submit_job(job: StreamJob) -> None:
+        """Queue a job, parking it while the worker is behind."""
+        if pending_jobs or worker.full():
+            metrics.twilio_stream_flushes_deferred += 1
+            pending_jobs.append(job)
+            return
+        worker.start()
+        worker.submit_nowait(job)
+
+    def live_result_handler() -> Callable[[str, SpeechResult], None]:
+        """Return the ``on_result`` callback for one streamed utterance."""
+        history: list[tuple[str, str | None]] | None = None
+        last_text = ""
+        last_at = float("-inf")
+
+        def on_result(hypothesis: str, result: SpeechResult) -> None:
+            nonlocal live_session_id, history, last_text, last_at
+            if not result.is_final:
+                metrics.twilio_stream_partial_transcripts += 1
+            if live_session_id is None and call_sid:
+                link = twilio_state_store.get_call_session(call_sid)
+                live_session_id = link.session_id if link is not None else None
+            if live_session_id is None or hypothesis == last_text:
+                return
+            now = time.monotonic()
+            stable = (
+                result.is_final or (result.stability or 0.0) >= _STREAM_STABLE_PARTIAL
+            )
+            if not stable and now - last_at < _STREAM_SPECULATION_DEBOUNCE_SECONDS:
+                return
+            last_text, last_at = hypothesis, now
+            if history is None:
+                # Read once per utterance. If the previous turn is still being
+                # handled it is missing here, which only costs a reuse miss.
+                history = conversation.recent_messages(live_session_id)
+            # The turn reuses this classification when the final transcript
+            # matches the hypothesis.
+            speculate_intent(
+                hypothesis,
+                business_id,
+                history=conversation.user_turns(history, pending=hypothesis),
+            )
+
+        return on_result
+
+    def open_live() -> StreamingUtterance:
+        utterance = StreamingUtterance(
+            sample_rate, call_sid=call_sid, on_result=live_result_handler()
+        )
+        live_utterances.append(utterance)
+
+        async def reply() -> None:
+            transcript = await utterance.transcript()
+            if transcript:
+                await handle_transcript(transcript)
+
+        submit_job(reply)
+        return utterance
+
+    def feed_live(
+        buffer: PcmRingBuffer,
+        detector: VoiceActivityDetector,
+        vad_event: str | None,
+        frame_bytes: int,
+    ) -> None:
+        """Stream confirmed speech to the recognizer frame by frame."""
+        nonlocal live
+        if live is None and detector.confirmed:
+            # Pre-roll plus the speech that confirmed the utterance.
+            live = open_live()
+            live.feed(bytes(buffer.view()))
+            buffer.clear()
+        elif live is not None:
+            live.feed(bytes(buffer.tail(frame_bytes)))
+            buffer.clear()
+        if live is not None and vad_event in (VAD_END, VAD_SPLIT):
+            live.finish()
+            live = None
+        if not detector.in_utterance:
+            buffer.keep_newest(pcm_bytes_for(sample_rate, _STREAM_VAD_PREROLL_SECONDS))
 
     async def handle_transcript(text: str) -> None:
         if not text or not call_sid:
@@ -1716,7 +1819,9 @@ async def twilio_voice_stream_websocket(websocket: WebSocket) -> None:
                     from_number = custom_params.get("from_number") or custom_params.get(
                         "from"
                     )
-                await handle_start()
+                ensure_ring()
+                worker.start()
+                await worker.submit(handle_start)
                 continue
 
             if event == "media":
@@ -1732,23 +1837,71 @@ async def twilio_voice_stream_websocket(websocket: WebSocket) -> None:
                 except Exception:
                     logger.warning("twilio_stream_payload_decode_failed")
                     continue
-                buffer.extend(audio_bytes)
-                min_bytes = _stream_min_bytes(sample_rate, encoding, min_seconds)
-                if len(buffer) >= min_bytes:
-                    transcript = await flush_buffer()
-                    if transcript:
-                        await handle_transcript(transcript)
+                pcm = ring if ring is not None else ensure_ring()
+                if is_mulaw(encoding):
+                    pcm.write_mulaw(audio_bytes)
+                    frame_bytes = len(audio_bytes) * 2
+                else:
+                    pcm.write(audio_bytes)
+                    frame_bytes = len(audio_bytes)
+                if vad is None:
+                    if len(pcm) >= pcm_bytes_for(sample_rate, max(min_seconds, 0.1)):
+                        flush_pending = True
+                else:
+                    vad_event = vad.process(pcm.tail(frame_bytes))
+                    if vad_event == VAD_END:
+                        metrics.twilio_stream_vad_utterances += 1
+                    elif vad_event == VAD_SPLIT:
+                        metrics.twilio_stream_vad_splits += 1
+                    if streaming:
+                        while pending_jobs and not worker.full():
+                            worker.submit_nowait(pending_jobs.popleft())
+                        feed_live(pcm, vad, vad_event, frame_bytes)
+                    elif vad_event == VAD_END:
+                        trailing_ms = (
+                            vad.trailing_silence_ms - _STREAM_VAD_TAIL_SECONDS * 1000.0
+                        )
+                        if trailing_ms > 0:
+                            pcm.drop_newest(
+                                pcm_bytes_for(sample_rate, trailing_ms / 1000.0)
+                            )
+                        flush_pending = True
+                    elif vad_event == VAD_SPLIT:
+                        flush_pending = True
+                    elif not flush_pending and not vad.in_utterance:
+                        # Between utterances keep only a short pre-roll, so
+                        # silence and discarded clicks never reach STT.
+                        pcm.keep_newest(
+                            pcm_bytes_for(sample_rate, _STREAM_VAD_PREROLL_SECONDS)
+                        )
+                if flush_pending:
+                    flush_pending = not try_flush()
                 continue
 
             if event == "stop":
-                transcript = await flush_buffer()
-                if transcript:
-                    await handle_transcript(transcript)
-                await handle_stop()
+                worker.start()
+                if vad is not None and ring is not None:
+                    if vad.finish() == VAD_END:
+                        metrics.twilio_stream_vad_utterances += 1
+                    elif not flush_pending:
+                        ring.clear()
+                if live is not None:
+                    live.finish()
+                    live = None
+                while pending_jobs:
+                    await worker.submit(pending_jobs.popleft())
+                job = take_utterance()
+                if job is not None:
+                    await worker.submit(job)
+                await worker.submit(handle_stop)
+                await worker.close(timeout=_STREAM_STOP_DRAIN_SECONDS)
                 break
     except Exception:  # pragma: no cover - defensive
         logger.exception("twilio_stream_websocket_error")
     finally:
+        await worker.cancel()
+        for utterance in live_utterances:
+            await utterance.cancel()
         try:
             await websocket.close()
         except RuntimeError:
@@ -188,6 +188,9 @@ async def reschedule_appointment(
         )
 
     # Conflict check before touching calendar or CRM state.
+    await calendar_service.prefetch_conflict_geocodes(
+        business_id=business_id, start=new_start, address=address
+    )
     if calendar_service.has_conflict(
         business_id=business_id,
         start=new_start,
@@ -0,0 +1,508 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import UTC, date, datetime, time, timedelta
+import json
+import logging
+import threading
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+from ..db import SessionLocal
+from ..db_models import AppointmentDailyRollupDB
+from ..metrics import metrics
+from ..models import Appointment
+
+logger = logging.getLogger(__name__)
+
+# Statuses counted on the calendar heatmap and in the daily PDF report.
+ROLLUP_STATUSES = ("SCHEDULED", "CONFIRMED", "COMPLETED")
+
+# Cutoff passed to ``first_appointment_after`` to get a customer's first visit.
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+
+# Day of the persisted row recording that a tenant's rollup has been built.
+_BUILT_MARKER_DAY = date.min
+
+
+def appointment_day(start_time: datetime) -> date:
+    """Return the UTC calendar day an appointment starts on."""
+    if start_time.tzinfo is not None:
+        start_time = start_time.astimezone(UTC)
+    return start_time.date()
+
+
+def classify_calendar_tags(appt: Any, is_new_client: bool) -> set[str]:
+    """Assign high-level calendar tags to an appointment.
+
+    Tags are used for the 90-day calendar heatmap:
+    - emergency
+    - routine (non-emergency work)
+    - maintenance (service_type hints)
+    - service (all qualifying work)
+    - new_client (first appointment for a customer)
+    """
+    tags: set[str] = set()
+    is_emergency = bool(getattr(appt, "is_emergency", False))
+    service_type_raw = getattr(appt, "service_type", None) or ""
+    service_type = str(service_type_raw).lower()
+
+    if is_emergency:
+        tags.add("emergency")
+    else:
+        tags.add("routine")
+
+    if (
+        "maint" in service_type
+        or "tune" in service_type
+        or "inspection" in service_type
+    ):
+        tags.add("maintenance")
+
+    # All scheduled work is still tagged as generic service.
+    tags.add("service")
+
+    if is_new_client:
+        tags.add("new_client")
+
+    return tags
+
+
+@dataclass
+class DailyRollup:
+    """Calendar totals for one tenant day."""
+
+    total: int = 0
+    tag_counts: Dict[str, int] = field(default_factory=dict)
+    service_type_counts: Dict[str, int] = field(default_factory=dict)
+    value_total: float = 0.0
+    value_count: int = 0
+    new_customers: int = 0
+
+    @property
+    def value_average(self) -> float | None:
+        if self.value_count <= 0:
+            return None
+        return self.value_total / float(self.value_count)
+
+    def add(self, appt: Any, is_new_client: bool) -> None:
+        self.total += 1
+        for tag in classify_calendar_tags(appt, is_new_client=is_new_client):
+            self.tag_counts[tag] = self.tag_counts.get(tag, 0) + 1
+        service_type = getattr(appt, "service_type", None) or "unspecified"
+        self.service_type_counts[service_type] = (
+            self.service_type_counts.get(service_type, 0) + 1
+        )
+        value = getattr(appt, "estimated_value", None)
+        if value is not None:
+            self.value_total += float(value)
+            self.value_count += 1
+        if is_new_client:
+            self.new_customers += 1
+
+
+def _counts_for_rollup(appt: Any) -> bool:
+    status = (getattr(appt, "status", None) or "SCHEDULED").upper()
+    return status in ROLLUP_STATUSES and getattr(appt, "start_time", None) is not None
+
+
+def build_daily_rollups(
+    appointments: Iterable[Any],
+    first_days: Dict[str, date],
+) -> Dict[date, DailyRollup]:
+    """Bucket qualifying appointments by start day.
+
+    ``first_days`` maps customer ids to the day of their first appointment
+    (any status); appointments on that day count as new-client work.
+    """
+    rows: Dict[date, DailyRollup] = {}
+    for appt in appointments:
+        if not _counts_for_rollup(appt):
+            continue
+        day = appointment_day(appt.start_time)
+        customer_id = getattr(appt, "customer_id", None)
+        is_new_client = bool(customer_id) and first_days.get(customer_id) == day
+        rows.setdefault(day, DailyRollup()).add(appt, is_new_client=is_new_client)
+    return rows
+
+
+class InMemoryRollupStore:
+    """Process-local rollup rows, used with the in-memory appointment store."""
+
+    persistent = False
+
+    def __init__(self) -> None:
+        self._rows: Dict[str, Dict[date, DailyRollup]] = {}
+
+    def is_built(self, business_id: str) -> bool:
+        return business_id in self._rows
+
+    def read(
+        self, business_id: str, start_date: date, end_date: date
+    ) -> Dict[date, DailyRollup]:
+        rows = self._rows.get(business_id, {})
+        span = (end_date - start_date).days + 1
+        if span > len(rows):
+            return {d: r for d, r in rows.items() if start_date <= d <= end_date}
+        found: Dict[date, DailyRollup] = {}
+        for offset in range(span):
+            day = start_date + timedelta(days=offset)
+            row = rows.get(day)
+            if row is not None:
+                found[day] = row
+        return found
+
+    def write(self, business_id: str, rows: Dict[date, DailyRollup | None]) -> None:
+        tenant = self._rows.setdefault(business_id, {})
+        for day, row in rows.items():
+            if row is None:
+                tenant.pop(day, None)
+            else:
+                tenant[day] = row
+
+    def replace(self, business_id: str, rows: Dict[date, DailyRollup]) -> None:
+        self._rows[business_id] = dict(rows)
+
+    def delete(self, business_id: str) -> None:
+        self._rows.pop(business_id, None)
+
+    def clear(self) -> None:
+        self._rows.clear()
+
+
+class DbRollupStore:
+    """Rollup rows persisted in the appointment_daily_rollup table."""
+
+    persistent = True
+
+    @staticmethod
+    def _to_rollup(row: AppointmentDailyRollupDB) -> DailyRollup:
+        return DailyRollup(
+            total=int(row.total_appointments or 0),
+            tag_counts=json.loads(row.tag_counts or "{}"),
+            service_type_counts=json.loads(row.service_type_counts or "{}"),
+            value_total=float(row.estimated_value_total or 0.0),
+            value_count=int(row.estimated_value_count or 0),
+            new_customers=int(row.new_customers or 0),
+        )
+
+    @staticmethod
+    def _fill(row: AppointmentDailyRollupDB, rollup: DailyRollup) -> None:
+        row.total_appointments = rollup.total
+        row.tag_counts = json.dumps(rollup.tag_counts, sort_keys=True)
+        row.service_type_counts = json.dumps(rollup.service_type_counts, sort_keys=True)
+        row.estimated_value_total = rollup.value_total
+        row.estimated_value_count = rollup.value_count
+        row.new_customers = rollup.new_customers
+        row.updated_at = datetime.now(UTC).replace(tzinfo=None)
+
+    def read(
+        self, business_id: str, start_date: date, end_date: date
+    ) -> Dict[date, DailyRollup]:
+        if SessionLocal is None:
+            raise RuntimeError("Database session factory is not available")
+        session = SessionLocal()
+        try:
+            rows = (
+                session.query(AppointmentDailyRollupDB)
+                .filter(
+                    AppointmentDailyRollupDB.business_id == business_id,
+                    AppointmentDailyRollupDB.day >= start_date,
+                    AppointmentDailyRollupDB.day <= end_date,
+                )
+                .all()
+            )
+            return {
+                row.day: self._to_rollup(row)
+                for row in rows
+                if row.day != _BUILT_MARKER_DAY
+            }
+        finally:
+            session.close()
+
+    def is_built(self, business_id: str) -> bool:
+        if SessionLocal is None:
+            raise RuntimeError("Database session factory is not available")
+        session = SessionLocal()
+        try:
+            marker = session.get(
+                AppointmentDailyRollupDB, (business_id, _BUILT_MARKER_DAY)
+            )
+            return marker is not None
+        finally:
+            session.close()
+
+    def write(self, business_id: str, rows: Dict[date, DailyRollup | None]) -> None:
+        from sqlalchemy.exc import IntegrityError
+
+        try:
+            self._write(business_id, rows)
+        except IntegrityError:
+            # Another process inserted one of these days first; its row is
+            # visible now, so a second pass updates it instead.
+            self._write(business_id, rows)
+
+    def _write(self, business_id: str, rows: Dict[date, DailyRollup | None]) -> None:
+        if SessionLocal is None:
+            raise RuntimeError("Database session factory is not available")
+        session = SessionLocal()
+        try:
+            for day, rollup in rows.items():
+                row = session.get(AppointmentDailyRollupDB, (business_id, day))
+                if rollup is None:
+                    if row is not None:
+                        session.delete(row)
+                    continue
+                if row is None:
+                    row = AppointmentDailyRollupDB(
+                        business_id=business_id, day=day
+                    )  # type: ignore[call-arg]
+                    session.add(row)
+                self._fill(row, rollup)
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    def replace(self, business_id: str, rows: Dict[date, DailyRollup]) -> None:
+        """Swap in a tenant's rebuilt rows and record it as built.
+
+        When another process rebuilds the same tenant concurrently, the
+        insert that loses the race hits the primary key; its rows came from
+        an equally fresh scan, so the winner's rows are kept.
+        """
+        from sqlalchemy.exc import IntegrityError
+
+        if SessionLocal is None:
+            raise RuntimeError("Database session factory is not available")
+        session = SessionLocal()
+        try:
+            session.query(AppointmentDailyRollupDB).filter(
+                AppointmentDailyRollupDB.business_id == business_id
+            ).delete(synchronize_session=False)
+            for day, rollup in rows.items():
+                row = AppointmentDailyRollupDB(
+                    business_id=business_id, day=day
+                )  # type: ignore[call-arg]
+                self._fill(row, rollup)
+                session.add(row)
+            marker = AppointmentDailyRollupDB(
+                business_id=business_id, day=_BUILT_MARKER_DAY
+            )  # type: ignore[call-arg]
+            self._fill(marker, DailyRollup())
+            session.add(marker)
+            session.commit()
+        except IntegrityError:
+            session.rollback()
+            logger.info(
+                "appointment_rollup_concurrent_rebuild",
+                extra={"business_id": business_id},
+            )
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    def delete(self, business_id: str) -> None:
+        if SessionLocal is None:
+            raise RuntimeError("Database session factory is not available")
+        session = SessionLocal()
+        try:
+            session.query(AppointmentDailyRollupDB).filter(
+                AppointmentDailyRollupDB.business_id == business_id
+            ).delete(synchronize_session=False)
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    def clear(self) -> None:
+        if SessionLocal is None:
+            raise RuntimeError("Database session factory is not available")
+        session = SessionLocal()
+        try:
+            session.query(AppointmentDailyRollupDB).delete(synchronize_session=False)
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+
+class AppointmentDailyRollup:
+    """Per-day calendar totals for each tenant, kept current by writes.
+
+    Rows are keyed by ``(business_id, day)``. A tenant is built from one
+    full scan on its first read; with the database store the build is
+    recorded in the table, so other processes reuse the rows instead of
+    scanning again. After that the appointment repository reports each
+    write through ``track``, and only the days the write touched are
+    recomputed: the old and new start days, plus the first visit day of the
+    customers involved, since that decides ``new_client``.
+    """
+
+    def __init__(
+        self,
+        source: Any,
+        store: InMemoryRollupStore | DbRollupStore | None = None,
+    ) -> None:
+        self._source = source
+        self._store = store or InMemoryRollupStore()
+        self._lock = threading.RLock()
+
+    def _is_maintained(self, business_id: str) -> bool:
+        # A persistent table may be read by other processes, so it is kept
+        # current even for tenants that have not been built yet.
+        return self._store.persistent or self._store.is_built(business_id)
+
+    def _first_days(
+        self,
+        business_id: str,
+        customer_ids: Iterable[str],
+        *,
+        end: datetime | None = None,
+    ) -> Dict[str, date]:
+        wanted = {cid: _EPOCH for cid in customer_ids if cid}
+        if not wanted:
+            return {}
+        firsts = self._source.first_appointment_after(business_id, wanted, end=end)
+        return {cid: appointment_day(start) for cid, start in firsts.items()}
+
+    @contextmanager
+    def track(
+        self,
+        before: Iterable[Appointment] = (),
+        *,
+        customers: Iterable[Tuple[str, str]] = (),
+    ) -> Iterator[List[Appointment]]:
+        """Refresh the rollup days touched by a write made inside the block.
+
+        ``before`` holds the affected appointments as they were before the
+        write; ``customers`` adds ``(business_id, customer_id)`` pairs for
+        new appointments. The caller appends the written appointments to the
+        yielded list.
+        """
+        touched: Dict[str, set[date]] = {}
+        involved: Dict[str, set[str]] = {}
+        for appt in before:
+            if appt is None or not self._is_maintained(appt.business_id):
+                continue
+            if appt.start_time is not None:
+                touched.setdefault(appt.business_id, set()).add(
+                    appointment_day(appt.start_time)
+                )
+            involved.setdefault(appt.business_id, set()).add(appt.customer_id)
+        for business_id, customer_id in customers:
+            if self._is_maintained(business_id):
+                involved.setdefault(business_id, set()).add(customer_id)
+        # First visits before the write; the day losing one needs a refresh.
+        for business_id, customer_ids in involved.items():
+            touched.setdefault(business_id, set()).update(
+                self._first_days(business_id, customer_ids).values()
+            )
+
+        written: List[Appointment] = []
+        yield written
+
+        for appt in written:
+            if appt is None or not self._is_maintained(appt.business_id):
+                continue
+            if appt.start_time is not None:
+                touched.setdefault(appt.business_id, set()).add(
+                    appointment_day(appt.start_time)
+                )
+            involved.setdefault(appt.business_id, set()).add(appt.customer_id)
+        # The write has already committed, so a failed refresh must not
+        # surface to the caller; the tenant is rebuilt on its next read.
+        for business_id in set(touched) | set(involved):
+            days = touched.get(business_id, set())
+            customer_ids = involved.get(business_id, set())
+            try:
+                days.update(self._first_days(business_id, customer_ids).values())
+                if days:
+                    self.refresh(business_id, days)
+            except Exception:
+                logger.warning(
+                    "appointment_rollup_refresh_failed",
+                    exc_info=True,
+                    extra={"business_id": business_id},
+                )
+                try:
+                    self.invalidate(business_id)
+                except Exception:
+                    logger.exception(
+                        "appointment_rollup_invalidate_failed",
+                        extra={"business_id": business_id},
+                    )
+
+    def refresh(self, business_id: str, days: Iterable[date]) -> None:
+        """Recompute the given days for a tenant from the appointment store."""
+        rows: Dict[date, DailyRollup | None] = {}
+        with self._lock:
+            for day in sorted(set(days)):
+                start = datetime.combine(day, time.min, tzinfo=UTC)
+                end = datetime.combine(day, time.max, tzinfo=UTC)
+                appts = self._source.list_for_business_window(
+                    business_id, start, end, statuses=ROLLUP_STATUSES
+                )
+                first_days = self._first_days(
+                    business_id, {a.customer_id for a in appts}, end=end
+                )
+                rows[day] = build_daily_rollups(appts, first_days).get(day)
+            self._store.write(business_id, rows)
+        metrics.appointment_rollup_day_refreshes += len(rows)
+
+    def rebuild(self, business_id: str) -> None:
+        """Recompute every day for a tenant from one scan of its appointments."""
+        with self._lock:
+            appts = self._source.list_for_business(business_id)
+            first_starts: Dict[str, datetime] = {}
+            for appt in appts:
+                if not appt.customer_id or appt.start_time is None:
+                    continue
+                start = appt.start_time
+                if start.tzinfo is None:
+                    start = start.replace(tzinfo=UTC)
+                existing = first_starts.get(appt.customer_id)
+                if existing is None or start < existing:
+                    first_starts[appt.customer_id] = start
+            first_days = {
+                cid: appointment_day(start) for cid, start in first_starts.items()
+            }
+            self._store.replace(business_id, build_daily_rollups(appts, first_days))
+        metrics.appointment_rollup_rebuilds += 1
+
+    def read_range(
+        self, business_id: str, start_date: date, end_date: date
+    ) -> Dict[date, DailyRollup]:
+        """Return the stored days in ``[start_date, end_date]`` for a tenant.
+
+        Days without qualifying appointments are absent from the result.
+        """
+        if not self._store.is_built(business_id):
+            self.rebuild(business_id)
+        return self._store.read(business_id, start_date, end_date)
+
+    def purge(self, business_id: str) -> None:
+        """Delete a tenant's stored rows, e.g. after its data is deleted."""
+        with self._lock:
+            self._store.delete(business_id)
+
+    def invalidate(self, business_id: str | None = None) -> None:
+        """Rebuild a tenant (default: all tenants) on its next read.
+
+        Used when refreshing a write's days fails. The stored rows are
+        dropped rather than just forgotten locally, so the next read in
+        any process recomputes the tenant from the appointment store.
+        """
+        with self._lock:
+            if business_id is None:
+                self._store.clear()
+            else:
+                self._store.delete(business_id)
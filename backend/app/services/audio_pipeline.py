@@ -0,0 +1,278 @@
+from __future__ import annotations
+
+import io
+import math
+from operator import mul
+import wave
+
+# Bytes per sample of the 16-bit little-endian PCM the pipeline produces.
+PCM_SAMPLE_WIDTH = 2
+
+
+def is_mulaw(encoding: str | None) -> bool:
+    encoding_norm = (encoding or "").lower()
+    return "mulaw" in encoding_norm or "ulaw" in encoding_norm
+
+
+def pcm_bytes_for(sample_rate: int, seconds: float) -> int:
+    """Return the (even) byte length of ``seconds`` of 16-bit mono PCM."""
+    samples = max(1, int(sample_rate * max(seconds, 0.0)))
+    return samples * PCM_SAMPLE_WIDTH
+
+
+# audioop was removed in Python 3.13; keep a local G.711 mu-law decoder.
+def _build_mulaw_decode_table() -> tuple[int, ...]:
+    table: list[int] = []
+    for value in range(256):
+        mu_law = (~value) & 0xFF
+        sign = mu_law & 0x80
+        exponent = (mu_law >> 4) & 0x07
+        mantissa = mu_law & 0x0F
+        sample = ((mantissa << 3) + 0x84) << exponent
+        sample -= 0x84
+        if sign:
+            sample = -sample
+        table.append(sample)
+    return tuple(table)
+
+
+MULAW_DECODE_TABLE = _build_mulaw_decode_table()
+
+# Low and high bytes of each decoded sample, as ``bytes.translate`` tables, so
+# a whole frame is decoded by two C-level passes instead of a per-byte loop.
+_MULAW_LOW_BYTES = bytes(sample & 0xFF for sample in MULAW_DECODE_TABLE)
+_MULAW_HIGH_BYTES = bytes((sample >> 8) & 0xFF for sample in MULAW_DECODE_TABLE)
+
+
+def decode_mulaw_into(payload: bytes, out: bytearray, offset: int = 0) -> int:
+    """Decode mu-law ``payload`` into ``out`` at ``offset``; returns bytes written."""
+    written = len(payload) * PCM_SAMPLE_WIDTH
+    end = offset + written
+    out[offset:end:2] = payload.translate(_MULAW_LOW_BYTES)
+    out[offset + 1 : end : 2] = payload.translate(_MULAW_HIGH_BYTES)
+    return written
+
+
+def mulaw_to_pcm(payload: bytes) -> bytes:
+    if not payload:
+        return b""
+    pcm = bytearray(len(payload) * PCM_SAMPLE_WIDTH)
+    decode_mulaw_into(payload, pcm)
+    return bytes(pcm)
+
+
+def pcm_to_wav_bytes(
+    pcm: bytes | memoryview, sample_rate: int, sample_width: int = PCM_SAMPLE_WIDTH
+) -> bytes:
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(sample_width)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(pcm)
+    return buffer.getvalue()
+
+
+class PcmRingBuffer:
+    """Fixed-capacity ring of 16-bit PCM for one streaming call.
+
+    Storage is allocated once. Frames are decoded or copied straight into it.
+    When the ring is full the oldest audio is dropped, so memory per call
+    stays bounded. ``view`` returns a memoryview of the buffered audio that
+    stays valid until the next write or ``clear``.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        capacity = max(PCM_SAMPLE_WIDTH, capacity - capacity % PCM_SAMPLE_WIDTH)
+        self._buf = bytearray(capacity)
+        self._view = memoryview(self._buf)
+        self._start = 0
+        self._size = 0
+        self.dropped_bytes = 0
+
+    @property
+    def capacity(self) -> int:
+        return len(self._buf)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _reserve(self, nbytes: int) -> list[tuple[int, int]]:
+        """Make room for ``nbytes`` and return the ``(offset, length)`` spans to fill."""
+        capacity = len(self._buf)
+        overflow = self._size + nbytes - capacity
+        if overflow > 0:
+            self._start = (self._start + overflow) % capacity
+            self._size -= overflow
+            self.dropped_bytes += overflow
+        end = (self._start + self._size) % capacity
+        first = min(nbytes, capacity - end)
+        spans = [(end, first)]
+        if first < nbytes:
+            spans.append((0, nbytes - first))
+        self._size += nbytes
+        return spans
+
+    def write(self, pcm: bytes | memoryview) -> None:
+        """Append 16-bit PCM."""
+        data = memoryview(pcm).cast("B")
+        excess = len(data) - len(self._buf)
+        if excess > 0:
+            self.dropped_bytes += excess
+            data = data[excess:]
+        pos = 0
+        for offset, length in self._reserve(len(data)):
+            self._view[offset : offset + length] = data[pos : pos + length]
+            pos += length
+
+    def write_mulaw(self, payload: bytes) -> None:
+        """Decode a mu-law frame and append the samples."""
+        max_samples = len(self._buf) // PCM_SAMPLE_WIDTH
+        if len(payload) > max_samples:
+            self.dropped_bytes += (len(payload) - max_samples) * PCM_SAMPLE_WIDTH
+            payload = payload[-max_samples:]
+        pos = 0
+        for offset, length in self._reserve(len(payload) * PCM_SAMPLE_WIDTH):
+            samples = length // PCM_SAMPLE_WIDTH
+            chunk = payload if samples == len(payload) else payload[pos : pos + samples]
+            decode_mulaw_into(chunk, self._buf, offset)
+            pos += samples
+
+    def tail(self, nbytes: int) -> memoryview:
+        """Return the newest ``nbytes`` of buffered audio."""
+        nbytes = min(max(0, nbytes), self._size)
+        end = self._start + self._size
+        if end > len(self._buf):
+            end -= len(self._buf)
+            if end < nbytes:
+                # The tail straddles the end of the storage.
+                return self.view()[self._size - nbytes :]
+        return self._view[end - nbytes : end]
+
+    def keep_newest(self, nbytes: int) -> None:
+        """Drop all but the newest ``nbytes`` (e.g. silence before speech)."""
+        excess = self._size - max(0, nbytes)
+        if excess > 0:
+            self._start = (self._start + excess) % len(self._buf)
+            self._size -= excess
+
+    def drop_newest(self, nbytes: int) -> None:
+        """Drop the newest ``nbytes`` (e.g. trailing silence)."""
+        self._size -= min(self._size, max(0, nbytes))
+
+    def view(self) -> memoryview:
+        """Return the buffered audio, oldest first, as one contiguous view."""
+        capacity = len(self._buf)
+        if self._start + self._size > capacity:
+            # Only reached after an overflow; rotate so the audio is contiguous.
+            self._buf[:] = self._buf[self._start :] + self._buf[: self._start]
+            self._start = 0
+        return self._view[self._start : self._start + self._size]
+
+    def clear(self) -> None:
+        self._start = 0
+        self._size = 0
+
+
+VAD_START = "start"
+VAD_END = "end"
+VAD_SPLIT = "split"
+VAD_DISCARD = "discard"
+
+# Zero-crossing rate (crossings per sample) typical of unvoiced speech such
+# as "s" and "f"; broadband sounds cross far more often than voiced speech.
+UNVOICED_ZCR = 0.3
+
+
+class VoiceActivityDetector:
+    """Energy / zero-crossing voice activity detector for 16-bit mono PCM.
+
+    Feed it consecutive frames; Twilio sends 20 ms. A frame is voiced when
+    its RMS clears ``min_rms`` or ``noise_ratio`` times the running noise
+    floor. Quieter frames with a high zero-crossing rate, such as trailing
+    fricatives, keep an utterance open but never start one. ``process``
+    reports utterance boundaries:
+
+    - ``VAD_START``: speech began in this frame.
+    - ``VAD_END``: ``hangover_ms`` of non-speech followed the utterance.
+    - ``VAD_SPLIT``: the utterance reached ``max_utterance_ms`` and goes on.
+    - ``VAD_DISCARD``: the utterance ended with under ``min_speech_ms`` of
+      speech (a click or cough).
+    """
+
+    def __init__(
+        self,
+        sample_rate: int = 8000,
+        *,
+        min_rms: float = 400.0,
+        hangover_ms: float = 600.0,
+        max_utterance_ms: float = 10_000.0,
+        min_speech_ms: float = 120.0,
+        noise_ratio: float = 3.0,
+    ) -> None:
+        self.sample_rate = sample_rate
+        self.min_rms = min_rms
+        self.hangover_ms = hangover_ms
+        self.max_utterance_ms = max_utterance_ms
+        self.min_speech_ms = min_speech_ms
+        self.noise_ratio = noise_ratio
+        self._noise_floor = min_rms / noise_ratio
+        self._in_utterance = False
+        self._utterance_ms = 0.0
+        self._speech_ms = 0.0
+        self.trailing_silence_ms = 0.0
+
+    @property
+    def in_utterance(self) -> bool:
+        return self._in_utterance
+
+    @property
+    def confirmed(self) -> bool:
+        """Whether the open utterance already has ``min_speech_ms`` of speech."""
+        return self._in_utterance and self._speech_ms >= self.min_speech_ms
+
+    def _end(self) -> str:
+        self._in_utterance = False
+        return VAD_END if self._speech_ms >= self.min_speech_ms else VAD_DISCARD
+
+    def process(self, pcm: bytes | memoryview) -> str | None:
+        """Classify one frame; returns a boundary event or ``None``."""
+        samples = memoryview(pcm).cast("B").cast("h")
+        count = len(samples)
+        if count == 0:
+            return None
+        frame_ms = count * 1000.0 / self.sample_rate
+        rms = math.sqrt(sum(map(mul, samples, samples)) / count)
+        threshold = max(self.min_rms, self._noise_floor * self.noise_ratio)
+        voiced = rms >= threshold
+
+        if not self._in_utterance:
+            if not voiced:
+                self._noise_floor = 0.95 * self._noise_floor + 0.05 * rms
+                return None
+            self._in_utterance = True
+            self._utterance_ms = self._speech_ms = frame_ms
+            self.trailing_silence_ms = 0.0
+            return VAD_START
+
+        self._utterance_ms += frame_ms
+        if not voiced and rms >= threshold * 0.5:
+            crossings = sum(1 for a, b in zip(samples, samples[1:]) if (a ^ b) < 0)
+            voiced = crossings / max(1, count - 1) >= UNVOICED_ZCR
+        if voiced:
+            self._speech_ms += frame_ms
+            self.trailing_silence_ms = 0.0
+        else:
+            self.trailing_silence_ms += frame_ms
+            if self.trailing_silence_ms >= self.hangover_ms:
+                return self._end()
+        if self._utterance_ms >= self.max_utterance_ms:
+            self._utterance_ms = self._speech_ms = 0.0
+            return VAD_SPLIT
+        return None
+
+    def finish(self) -> str | None:
+        """Close any open utterance at end of stream."""
+        if not self._in_utterance:
+            return None
+        return self._end()
@@ -5,6 +5,8 @@ import hashlib
 import json
 import logging
 import os
+import threading
+from collections import deque
 from dataclasses import dataclass
 from datetime import UTC, datetime
 from typing import Any
@@ -12,9 +14,10 @@ from typing import Any
 from fastapi import Request
 
 from ..db import SQLALCHEMY_AVAILABLE, SessionLocal
-from ..db_models import AuditEventDB, BusinessDB, SecurityEventDB
+from ..db_models import AuditEventDB, SecurityEventDB
 from ..metrics import metrics
 from .privacy import redact_text
+from . import tenant_credentials
 
 logger = logging.getLogger(__name__)
 
@@ -34,12 +37,138 @@ class RequestActor:
     business_id: str | None = None
 
 
+class AuditEventWriter:
+    """Buffer audit/security rows and write them in batches off the request path.
+
+    Until ``start()`` is called (and again after ``stop()``) events are written
+    synchronously, which keeps tests and single-shot scripts deterministic.
+    Once started, a background thread flushes every ``flush_interval_ms`` or
+    as soon as ``batch_size`` rows are waiting. The buffer is bounded; when it
+    is full new events are dropped and counted in metrics rather than
+    blocking the request.
+    """
+
+    def __init__(
+        self,
+        max_events: int = 10000,
+        batch_size: int = 200,
+        flush_interval_ms: int = 250,
+    ) -> None:
+        self._buffer: deque[tuple[str, dict[str, Any]]] = deque()
+        self._cond = threading.Condition()
+        self._max_events = max_events
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval_ms / 1000.0
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def running(self) -> bool:
+        return bool(self._thread and self._thread.is_alive())
+
+    def configure(
+        self, *, max_events: int, batch_size: int, flush_interval_ms: int
+    ) -> None:
+        self._max_events = max(1, max_events)
+        self._batch_size = max(1, batch_size)
+        self._flush_interval = max(1, flush_interval_ms) / 1000.0
+
+    def pending(self) -> int:
+        with self._cond:
+            return len(self._buffer)
+
+    def submit(self, kind: str, values: dict[str, Any]) -> bool:
+        """Queue one row; returns False when it had to be dropped."""
+        if not self.running:
+            self._write_batch([(kind, values)])
+            return True
+        with self._cond:
+            if len(self._buffer) >= self._max_events:
+                if kind == "security_event":
+                    metrics.security_events_dropped += 1
+                else:
+                    metrics.audit_events_dropped += 1
+                return False
+            self._buffer.append((kind, values))
+            if len(self._buffer) >= self._batch_size:
+                self._cond.notify()
+        return True
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run, daemon=True, name="audit-writer"
+        )
+        self._thread.start()
+        logger.info("audit_writer_started")
+
+    def stop(self) -> None:
+        """Stop the background thread and flush whatever is still buffered."""
+        self._stop_event.set()
+        with self._cond:
+            self._cond.notify()
+        if self._thread:
+            self._thread.join(timeout=5.0)
+        self._thread = None
+        self.flush()
+        logger.info("audit_writer_stopped")
+
+    def flush(self) -> None:
+        while True:
+            batch = self._drain()
+            if not batch:
+                return
+            self._write_batch(batch)
+
+    def _drain(self) -> list[tuple[str, dict[str, Any]]]:
+        with self._cond:
+            count = min(len(self._buffer), self._batch_size)
+            return [self._buffer.popleft() for _ in range(count)]
+
+    def _run(self) -> None:
+        while not self._stop_event.is_set():
+            with self._cond:
+                if len(self._buffer) < self._batch_size:
+                    self._cond.wait(timeout=self._flush_interval)
+            self.flush()
+
+    def _write_batch(self, batch: list[tuple[str, dict[str, Any]]]) -> None:
+        if not SQLALCHEMY_AVAILABLE or SessionLocal is None:
+            return
+        grouped: dict[str, list[dict[str, Any]]] = {}
+        for kind, values in batch:
+            grouped.setdefault(kind, []).append(values)
+        for kind, rows in grouped.items():
+            model = SecurityEventDB if kind == "security_event" else AuditEventDB
+            session = SessionLocal()
+            try:
+                for values in rows:
+                    session.add(model(**values))  # type: ignore[call-arg]
+                session.commit()
+                metrics.audit_writer_rows_written += len(rows)
+            except Exception:  # pragma: no cover - defensive
+                metrics.audit_writer_write_failures += len(rows)
+                logger.exception(
+                    "security_event_persist_failed"
+                    if kind == "security_event"
+                    else "audit_event_persist_failed"
+                )
+            finally:
+                session.close()
+
+
+audit_writer = AuditEventWriter()
+
+
 def _resolve_business_id_from_headers(request: Request) -> str | None:
     """Best-effort tenant resolution for audit logging.
 
     For performance and simplicity we only consult the database when an
-    API key or widget token is present. When unavailable we fall back to
-    any explicit X-Business-ID header if provided.
+    API key or widget token is present, and reuse the lookup already made by
+    the request's tenant dependency when there was one. When unavailable we
+    fall back to any explicit X-Business-ID header if provided.
     """
     if not SQLALCHEMY_AVAILABLE or SessionLocal is None:
         return request.headers.get("X-Business-ID") or None
@@ -51,30 +180,24 @@ def _resolve_business_id_from_headers(request: Request) -> str | None:
     if not x_api_key and not x_widget_token:
         return explicit_business_id or None
 
-    session = SessionLocal()
+    kind = (
+        tenant_credentials.CREDENTIAL_API_KEY
+        if x_api_key
+        else tenant_credentials.CREDENTIAL_WIDGET_TOKEN
+    )
     try:
-        business = None
-        if x_api_key:
-            try:
-                filter_expr = BusinessDB.api_key == x_api_key  # type: ignore[attr-defined]
-            except AttributeError:
-                # Placeholder models without SQLAlchemy columns may not expose attributes.
-                filter_expr = True
-            business = session.query(BusinessDB).filter(filter_expr).one_or_none()
-        elif x_widget_token:
-            try:
-                filter_expr = BusinessDB.widget_token == x_widget_token  # type: ignore[attr-defined]
-            except AttributeError:
-                filter_expr = True
-            business = session.query(BusinessDB).filter(filter_expr).one_or_none()
-        if business:
-            return business.id
-        return explicit_business_id or None
+        match = tenant_credentials.resolve_credential(
+            kind,
+            x_api_key or x_widget_token,
+            session_factory=SessionLocal,
+            request=request,
+        )
     except Exception:  # pragma: no cover - defensive
         logger.exception("audit_business_resolution_failed")
         return explicit_business_id or None
-    finally:
-        session.close()
+    if match is not None:
+        return match.business_id
+    return explicit_business_id or None
 
 
 def _derive_actor(request: Request) -> RequestActor:
@@ -243,33 +366,27 @@ async def record_security_event(
         if not SQLALCHEMY_AVAILABLE or SessionLocal is None:
             return
 
-        session = SessionLocal()
-        try:
-            now = datetime.now(UTC)
-            # Keep path reasonably bounded for storage.
-            stored_path = path
-            if len(stored_path) > 255:
-                stored_path = stored_path[:252] + "..."
-            event = SecurityEventDB(  # type: ignore[call-arg]
-                created_at=now,
-                event_type=event_type,
-                severity=severity,
-                actor_type=actor_type,
-                business_id=effective_business_id,
-                path=stored_path,
-                method=method,
-                status_code=status_code,
-                ip_hash=ip_hash,
-                user_agent_hash=user_agent_hash,
-                request_id=request_id,
-                meta=meta_json,
-            )
-            session.add(event)
-            session.commit()
-        except Exception:  # pragma: no cover - defensive
-            logger.exception("security_event_persist_failed")
-        finally:
-            session.close()
+        # Keep path reasonably bounded for storage.
+        stored_path = path
+        if len(stored_path) > 255:
+            stored_path = stored_path[:252] + "..."
+        audit_writer.submit(
+            "security_event",
+            {
+                "created_at": datetime.now(UTC),
+                "event_type": event_type,
+                "severity": severity,
+                "actor_type": actor_type,
+                "business_id": effective_business_id,
+                "path": stored_path,
+                "method": method,
+                "status_code": status_code,
+                "ip_hash": ip_hash,
+                "user_agent_hash": user_agent_hash,
+                "request_id": request_id,
+                "meta": meta_json,
+            },
+        )
     except Exception:  # pragma: no cover - never break request flow
         logger.exception("security_event_record_failed")
 
@@ -296,24 +413,21 @@ async def record_audit_event(request: Request, status_code: int) -> None:
         )
         return
 
-    session = SessionLocal()
+    path = redact_text(request.url.path)
+    # Keep path reasonably bounded for storage.
+    if len(path) > 255:
+        path = path[:252] + "..."
     try:
-        now = datetime.now(UTC)
-        path = redact_text(request.url.path)
-        # Keep path reasonably bounded for storage.
-        if len(path) > 255:
-            path = path[:252] + "..."
-        event = AuditEventDB(  # type: ignore[call-arg]
-            created_at=now,
-            actor_type=actor.role,
-            business_id=actor.business_id,
-            path=path,
-            method=request.method,
-            status_code=status_code,
+        audit_writer.submit(
+            "audit_event",
+            {
+                "created_at": datetime.now(UTC),
+                "actor_type": actor.role,
+                "business_id": actor.business_id,
+                "path": path,
+                "method": request.method,
+                "status_code": status_code,
+            },
         )
-        session.add(event)
-        session.commit()
     except Exception:  # pragma: no cover - defensive
         logger.exception("audit_event_persist_failed")
-    finally:
-        session.close()
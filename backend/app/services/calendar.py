@@ -1,14 +1,16 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from datetime import UTC, datetime, timedelta, timezone
+from datetime import UTC, date, datetime, timedelta, timezone
 import logging
 import os
 from pathlib import Path
+from types import SimpleNamespace
 import re
 import secrets
-from typing import List, Optional, cast
+from typing import Dict, Iterable, List, Optional, Sequence, cast
 import uuid
+import anyio
 import httpx
 import json
 
@@ -18,11 +20,17 @@ try:  # Optional Google Calendar dependencies.
     from google.oauth2.credentials import Credentials as UserCredentials
     from googleapiclient.discovery import build
     from googleapiclient.errors import HttpError
+    from googleapiclient.http import HttpRequest
+    import google_auth_httplib2
+    import httplib2
 except Exception:  # pragma: no cover - fallback when google libs are absent.
     Request = None  # type: ignore[assignment]
     ServiceAccountCredentials = None  # type: ignore[assignment]
     UserCredentials = None  # type: ignore[assignment]
     build = None  # type: ignore[assignment]
+    HttpRequest = None  # type: ignore[assignment]
+    google_auth_httplib2 = None  # type: ignore[assignment]
+    httplib2 = None  # type: ignore[assignment]
 
     class HttpError(Exception):
         """Lightweight stand-in for googleapiclient.errors.HttpError."""
@@ -34,9 +42,13 @@ except Exception:  # pragma: no cover - fallback when google libs are absent.
             self.content = kwargs.get("content")
 
 
+from ..business_config import get_tenant_config
 from ..config import get_settings
 from ..db import SQLALCHEMY_AVAILABLE, SessionLocal
-from ..db_models import BusinessDB
+from ..db_models import BusinessDB, TechnicianDB
+from ..services.freebusy_cache import freebusy_cache, freebusy_key
+from ..services.google_api import GoogleApiTimeout, google_api_executor
+from ..services.oauth_clients import PooledClient, oauth_client_pool
 from ..services.oauth_tokens import oauth_store, OAuthToken
 
 logger = logging.getLogger(__name__)
@@ -44,11 +56,36 @@ logger = logging.getLogger(__name__)
 _FIXED_OFFSET_TZ_RE = re.compile(r"^(?:UTC)?([+-])(\d{2}):?(\d{2})$")
 _UNSET = object()
 
+# How far ahead slot searches look.
+SLOT_SEARCH_DAYS = 14
+
+# FreeBusy windows are fetched a day past the search horizon so a cached
+# window keeps covering searches that start a little later.
+FREEBUSY_CACHE_DAYS = SLOT_SEARCH_DAYS + 1
+
+# Availability ranking modes.
+RANK_EARLIEST = "earliest"
+RANK_TRAVEL = "travel"
+RANK_ROUTE = "route"
+RANK_MODES = frozenset({RANK_EARLIEST, RANK_TRAVEL, RANK_ROUTE})
+
+# Average driving speed assumed by travel estimates.
+DRIVE_SPEED_KMH = 40
+
+# Drive assumed between a technician's base and a day's first or last job
+# when ranking by route; base locations are not stored, so a job on an
+# otherwise empty day costs the trip out and back.
+ROUTE_BASE_LEG_MINUTES = 15
+
 
 @dataclass
 class TimeSlot:
     start: datetime
     end: datetime
+    technician_id: str | None = None
+    travel_minutes: int = 0
+    # Extra drive time the job adds to the technician's route that day.
+    detour_minutes: int = 0
 
 
 def _tzinfo_from_label(label: str | None):
@@ -78,17 +115,12 @@ def _get_business_timezone(business_id: str | None):
     """Return the tzinfo used for tenant-local timestamps.
 
     When business_id is provided and the database is available, this consults the
-    Business row's `time_zone`. If unavailable/missing/invalid, falls back to UTC.
+    tenant's cached `time_zone`. If unavailable/missing/invalid, falls back to UTC.
     """
     tz_label = os.getenv("DEFAULT_TIME_ZONE", "UTC")
-    if business_id and SQLALCHEMY_AVAILABLE and SessionLocal is not None:
-        session_db = SessionLocal()
-        try:
-            row = session_db.get(BusinessDB, business_id)
-        finally:
-            session_db.close()
-        if row is not None and getattr(row, "time_zone", None):
-            tz_label = str(getattr(row, "time_zone"))
+    config = get_tenant_config(business_id)
+    if config is not None and config.time_zone:
+        tz_label = str(config.time_zone)
     return _tzinfo_from_label(tz_label)
 
 
@@ -141,27 +173,22 @@ def _get_business_hours(business_id: str | None) -> tuple[int, int, set[int]]:
     """Return (open_hour, close_hour, closed_days) for a tenant.
 
     Defaults are taken from calendar settings and may be overridden on
-    a per-tenant basis via the Business row when database support is
-    available.
+    a per-tenant basis via the cached tenant config when database support
+    is available.
     """
     settings = get_settings().calendar
     open_hour = getattr(settings, "default_open_hour", 8)
     close_hour = getattr(settings, "default_close_hour", 17)
     closed_days = _parse_closed_days(getattr(settings, "default_closed_days", ""))
 
-    if business_id and SQLALCHEMY_AVAILABLE and SessionLocal is not None:
-        session_db = SessionLocal()
-        try:
-            row = session_db.get(BusinessDB, business_id)
-        finally:
-            session_db.close()
-        if row is not None:
-            if getattr(row, "open_hour", None) is not None:
-                open_hour = int(row.open_hour)  # type: ignore[arg-type]
-            if getattr(row, "close_hour", None) is not None:
-                close_hour = int(row.close_hour)  # type: ignore[arg-type]
-            if getattr(row, "closed_days", None):
-                closed_days = _parse_closed_days(row.closed_days)
+    config = get_tenant_config(business_id)
+    if config is not None:
+        if config.open_hour is not None:
+            open_hour = int(config.open_hour)
+        if config.close_hour is not None:
+            close_hour = int(config.close_hour)
+        if config.closed_days:
+            closed_days = _parse_closed_days(config.closed_days)
 
     # Guard against misconfiguration where close_hour <= open_hour; treat as always open.
     if close_hour <= open_hour:
@@ -174,8 +201,8 @@ def _get_business_capacity(
 ) -> tuple[Optional[int], bool, int, dict[str, int]]:
     """Return (max_jobs_per_day, reserve_mornings_for_emergencies, travel_buffer_minutes, service_durations).
 
-    Values are pulled from the Business row when database support is available.
-    Missing values fall back to sensible defaults:
+    Values are pulled from the cached tenant config when database support is
+    available. Missing values fall back to sensible defaults:
     - max_jobs_per_day: None (no explicit per-day cap)
     - reserve_mornings_for_emergencies: False
     - travel_buffer_minutes: 0
@@ -186,40 +213,33 @@ def _get_business_capacity(
     travel_buffer_minutes = 0
     service_durations: dict[str, int] = {}
 
-    if business_id and SQLALCHEMY_AVAILABLE and SessionLocal is not None:
-        session_db = SessionLocal()
+    config = get_tenant_config(business_id)
+    if config is not None:
+        raw_duration_config = config.service_duration_config or ""
         try:
-            row = session_db.get(BusinessDB, business_id)
-            raw_duration_config = getattr(row, "service_duration_config", None) or ""
+            parsed = json.loads(raw_duration_config) if raw_duration_config else {}
+            if isinstance(parsed, dict):
+                service_durations = {
+                    str(k): int(v)
+                    for k, v in parsed.items()
+                    if isinstance(v, (int, float))
+                }
+        except Exception:
+            service_durations = {}
+        if config.max_jobs_per_day is not None:
             try:
-                parsed = json.loads(raw_duration_config) if raw_duration_config else {}
-                if isinstance(parsed, dict):
-                    service_durations = {
-                        str(k): int(v)
-                        for k, v in parsed.items()
-                        if isinstance(v, (int, float))
-                    }
-            except Exception:
-                service_durations = {}
-        finally:
-            session_db.close()
-        if row is not None:
-            if getattr(row, "max_jobs_per_day", None) is not None:
-                try:
-                    max_jobs_per_day = int(row.max_jobs_per_day)  # type: ignore[arg-type]
-                except (TypeError, ValueError):
-                    max_jobs_per_day = None
-            if getattr(row, "reserve_mornings_for_emergencies", None) is not None:
-                reserve_mornings_for_emergencies = bool(
-                    row.reserve_mornings_for_emergencies  # type: ignore[attr-defined]
-                )
-            if getattr(row, "travel_buffer_minutes", None) is not None:
-                try:
-                    travel_buffer_minutes = max(
-                        0, int(row.travel_buffer_minutes)  # type: ignore[arg-type]
-                    )
-                except (TypeError, ValueError):
-                    travel_buffer_minutes = 0
+                max_jobs_per_day = int(config.max_jobs_per_day)
+            except (TypeError, ValueError):
+                max_jobs_per_day = None
+        if config.reserve_mornings_for_emergencies is not None:
+            reserve_mornings_for_emergencies = bool(
+                config.reserve_mornings_for_emergencies
+            )
+        if config.travel_buffer_minutes is not None:
+            try:
+                travel_buffer_minutes = max(0, int(config.travel_buffer_minutes))
+            except (TypeError, ValueError):
+                travel_buffer_minutes = 0
 
     return (
         max_jobs_per_day,
@@ -229,6 +249,28 @@ def _get_business_capacity(
     )
 
 
+def _get_active_technicians(business_id: str) -> list[str]:
+    """Return a tenant's active technician ids, oldest first."""
+    if not (SQLALCHEMY_AVAILABLE and SessionLocal is not None):
+        return []
+    session_db = SessionLocal()
+    try:
+        rows = (
+            session_db.query(TechnicianDB.id)
+            .filter(
+                TechnicianDB.business_id == business_id,
+                TechnicianDB.is_active.is_(True),
+            )
+            .order_by(TechnicianDB.created_at.asc())
+            .all()
+        )
+    except Exception:
+        return []
+    finally:
+        session_db.close()
+    return [row[0] for row in rows]
+
+
 def _load_gcal_tokens(business_id: str) -> OAuthToken | None:
     if not (SQLALCHEMY_AVAILABLE and SessionLocal is not None):
         return None
@@ -367,6 +409,29 @@ def _align_to_business_hours(
     return start
 
 
+def _estimate_travel_minutes(origin: str | None, destination: str | None) -> int | None:
+    """Rough drive time between two addresses, or None when either is unknown.
+
+    Assumes 40 km/h plus ten minutes to park and unload. Only cached
+    coordinates and ZIP centroids are used, so callers should prefetch the
+    addresses (see ``CalendarService._prefetch_geocodes``) beforehand.
+    """
+    if not origin or not destination:
+        return None
+    try:
+        from ..services.geo_utils import haversine_km
+        from ..services.geocoding import geocoding_service
+
+        origin_coords = geocoding_service.resolve_offline(origin)
+        destination_coords = geocoding_service.resolve_offline(destination)
+        if not origin_coords or not destination_coords:
+            return None
+        km = haversine_km(origin_coords, destination_coords)
+        return int((km / DRIVE_SPEED_KMH) * 60) + 10
+    except Exception:
+        return None
+
+
 def _build_busy_ranges(
     appointments: List,
     travel_buffer_minutes: int,
@@ -381,17 +446,11 @@ def _build_busy_ranges(
         if not appt_start or not appt_end:
             continue
         buffer_minutes = travel_buffer_minutes
-        if target_address and getattr(appt, "address", None):
-            try:
-                from ..services.geo_utils import geocode_address, haversine_km
-
-                prev_coords = geocode_address(getattr(appt, "address"))
-                next_coords = geocode_address(target_address)
-                if prev_coords and next_coords:
-                    km = haversine_km(prev_coords, next_coords)
-                    buffer_minutes = max(buffer_minutes, int((km / 40) * 60) + 10)
-            except Exception:
-                buffer_minutes = travel_buffer_minutes
+        travel = _estimate_travel_minutes(
+            getattr(appt, "address", None), target_address
+        )
+        if travel is not None:
+            buffer_minutes = max(buffer_minutes, travel)
 
         if buffer_minutes > 0:
             appt_start = appt_start - timedelta(minutes=buffer_minutes)
@@ -401,6 +460,385 @@ def _build_busy_ranges(
     return ranges
 
 
+_ACTIVE_STATUSES = ("SCHEDULED", "CONFIRMED")
+
+
+def _utc_date(value: datetime) -> date:
+    if value.tzinfo is None:
+        return value.date()
+    return value.astimezone(UTC).date()
+
+
+class _BusyIndex:
+    """Active appointments bucketed by day and technician.
+
+    Slot search and conflict checks only look at one day at a time, so
+    bucketing once keeps each lookup proportional to that day's bookings.
+    The ``None`` technician bucket holds every appointment on the day.
+    """
+
+    _UNASSIGNED = ""
+
+    def __init__(self, appointments: Iterable) -> None:
+        self._days: Dict[date, Dict[str | None, list]] = {}
+        self.addresses: set[str] = set()
+        for appt in appointments:
+            appt_start = getattr(appt, "start_time", None)
+            appt_end = getattr(appt, "end_time", None)
+            if not appt_start or not appt_end:
+                continue
+            status = (getattr(appt, "status", None) or "SCHEDULED").upper()
+            if status not in _ACTIVE_STATUSES:
+                continue
+            address = getattr(appt, "address", None)
+            if address:
+                self.addresses.add(address)
+            buckets = self._days.setdefault(_utc_date(appt_start), {})
+            buckets.setdefault(None, []).append(appt)
+            technician_id = getattr(appt, "technician_id", None)
+            key = self._UNASSIGNED if technician_id is None else technician_id
+            buckets.setdefault(key, []).append(appt)
+
+    def for_day(
+        self,
+        day: date,
+        technician_id: str | None = None,
+        *,
+        include_unassigned: bool = False,
+    ) -> list:
+        buckets = self._days.get(day, {})
+        if technician_id is None:
+            return buckets.get(None, [])
+        appts = buckets.get(technician_id, [])
+        if include_unassigned:
+            appts = appts + buckets.get(self._UNASSIGNED, [])
+        return appts
+
+
+def _load_busy_index(business_id: str, first_day: date, days: int) -> _BusyIndex:
+    """Index a tenant's active appointments starting on ``days`` days from
+    ``first_day`` (UTC), loading only that window from the repository."""
+    from ..repositories import appointments_repo  # local import to avoid cycles
+
+    window_start = datetime(first_day.year, first_day.month, first_day.day, tzinfo=UTC)
+    window_end = window_start + timedelta(days=days) - timedelta(microseconds=1)
+    return _BusyIndex(
+        appointments_repo.list_for_business_window(
+            business_id, window_start, window_end, statuses=_ACTIVE_STATUSES
+        )
+    )
+
+
+@dataclass(frozen=True)
+class _SlotRules:
+    open_hour: int
+    close_hour: int
+    closed_days: frozenset[int]
+    max_jobs_per_day: Optional[int]
+    reserve_mornings_for_emergencies: bool
+    travel_buffer_minutes: int
+
+
+def _load_slot_rules(business_id: str | None) -> _SlotRules:
+    open_hour, close_hour, closed_days = _get_business_hours(business_id)
+    (
+        max_jobs_per_day,
+        reserve_mornings_for_emergencies,
+        travel_buffer_minutes,
+        _service_durations,
+    ) = _get_business_capacity(business_id)
+    return _SlotRules(
+        open_hour=open_hour,
+        close_hour=close_hour,
+        closed_days=frozenset(closed_days),
+        max_jobs_per_day=max_jobs_per_day,
+        reserve_mornings_for_emergencies=reserve_mornings_for_emergencies,
+        travel_buffer_minutes=travel_buffer_minutes,
+    )
+
+
+def _free_gap_starts(
+    busy_ranges: List[tuple[datetime, datetime]],
+    window_start: datetime,
+    window_end: datetime,
+    duration: timedelta,
+) -> List[datetime]:
+    """Return the earliest start of every free gap that fits ``duration``."""
+    starts: List[datetime] = []
+    candidate = window_start
+    for busy_start, busy_end in busy_ranges:
+        if busy_end <= candidate:
+            continue
+        if candidate + duration <= min(busy_start, window_end):
+            starts.append(candidate)
+        if busy_start >= window_end:
+            return starts
+        candidate = max(candidate, busy_end)
+        if candidate + duration > window_end:
+            return starts
+    if candidate + duration <= window_end:
+        starts.append(candidate)
+    return starts
+
+
+def _travel_from_previous(
+    appointments: list, start: datetime, address: str | None
+) -> int:
+    """Estimated minutes from the job finishing before ``start`` to ``address``."""
+    if not address:
+        return 0
+    previous = None
+    for appt in appointments:
+        appt_end = getattr(appt, "end_time", None)
+        if appt_end and appt_end <= start:
+            if previous is None or appt_end > previous.end_time:
+                previous = appt
+    if previous is None:
+        return 0
+    travel = _estimate_travel_minutes(getattr(previous, "address", None), address)
+    return travel or 0
+
+
+class _RouteMatrix:
+    """Drive minutes between one day's jobs and a new job site.
+
+    Coordinates come from the geocode cache (see ``_estimate_travel_minutes``)
+    and the pairwise matrix is built once per technician and day, so scoring
+    each candidate slot is a few lookups. Jobs without known coordinates
+    contribute no legs; the technician's base sits a fixed
+    ``ROUTE_BASE_LEG_MINUTES`` from every site.
+    """
+
+    def __init__(self, appointments: list, address: str | None) -> None:
+        from ..services.geo_utils import haversine_matrix_km
+        from ..services.geocoding import geocoding_service
+
+        self._jobs = sorted(appointments, key=lambda appt: appt.start_time)
+        self._slots: List[int | None] = []
+        points: List[tuple[float, float]] = []
+        target = geocoding_service.resolve_offline(address)
+        if target is not None:
+            points.append(target)
+        for appt in self._jobs:
+            coords = None
+            if target is not None:
+                coords = geocoding_service.resolve_offline(
+                    getattr(appt, "address", None)
+                )
+            if coords is None:
+                self._slots.append(None)
+            else:
+                self._slots.append(len(points))
+                points.append(coords)
+        minutes_per_km = 60 / DRIVE_SPEED_KMH
+        self._minutes = [
+            [km * minutes_per_km for km in row] for row in haversine_matrix_km(points)
+        ]
+
+    def _leg(self, a: int | None, b: int | None) -> float:
+        if a is None or b is None:
+            return 0.0
+        return self._minutes[a][b]
+
+    def detour_minutes(self, start: datetime, end: datetime) -> int:
+        """Extra driving from inserting the new job between its neighbours."""
+        if not self._minutes:
+            return 0
+        previous: int | None = None
+        following: int | None = None
+        for index, appt in enumerate(self._jobs):
+            if appt.end_time <= start:
+                if previous is None or appt.end_time > self._jobs[previous].end_time:
+                    previous = index
+            elif following is None and appt.start_time >= end:
+                following = index
+        if previous is None and following is None:
+            return 2 * ROUTE_BASE_LEG_MINUTES
+        # With one neighbour missing, the base legs on either side of the
+        # insertion are equal and cancel out.
+        prev_point = None if previous is None else self._slots[previous]
+        next_point = None if following is None else self._slots[following]
+        extra = (
+            self._leg(prev_point, 0)
+            + self._leg(0, next_point)
+            - self._leg(prev_point, next_point)
+        )
+        return max(0, int(round(extra)))
+
+
+def _slot_cost(slot: TimeSlot, rank_by: str) -> tuple:
+    if rank_by == RANK_ROUTE:
+        return (slot.detour_minutes, slot.travel_minutes, slot.start)
+    if rank_by == RANK_TRAVEL:
+        return (slot.travel_minutes, slot.start)
+    return (slot.start, slot.travel_minutes)
+
+
+def _search_slots(
+    busy_index: _BusyIndex,
+    rules: _SlotRules,
+    *,
+    search_start: datetime,
+    duration: timedelta,
+    technicians: Sequence[str | None],
+    include_unassigned: bool = False,
+    is_emergency: bool | None = None,
+    address: str | None = None,
+    limit: int = 1,
+    rank_by: str = RANK_EARLIEST,
+    days: int = SLOT_SEARCH_DAYS,
+) -> List[TimeSlot]:
+    """Collect candidate slots for each technician, one per free gap.
+
+    A ``None`` technician stands for the whole business. Candidates at the
+    same start keep the technician with the least travel (least detour when
+    ranking by route).
+    """
+    candidates: Dict[datetime, TimeSlot] = {}
+    for day_offset in range(days):
+        day_base = search_start + timedelta(days=day_offset)
+        if day_base.weekday() in rules.closed_days:
+            continue
+        day = day_base.date()
+        day_open = datetime(day.year, day.month, day.day, rules.open_hour, tzinfo=UTC)
+        day_close = datetime(day.year, day.month, day.day, rules.close_hour, tzinfo=UTC)
+        # Skip days where the requested duration cannot fit at all.
+        if day_open + duration > day_close:
+            continue
+
+        # Start no earlier than search_start on the first day; otherwise at open.
+        window_start = day_open
+        if day_offset == 0 and search_start > window_start:
+            window_start = search_start
+        # Optionally reserve mornings for emergencies only.
+        if rules.reserve_mornings_for_emergencies and not is_emergency:
+            morning_end = datetime(
+                day.year, day.month, day.day, max(rules.open_hour, 12), tzinfo=UTC
+            )
+            window_start = max(window_start, morning_end)
+        if window_start + duration > day_close:
+            continue
+
+        for technician_id in technicians:
+            day_appts = busy_index.for_day(
+                day, technician_id, include_unassigned=include_unassigned
+            )
+            if (
+                rules.max_jobs_per_day is not None
+                and len(day_appts) >= rules.max_jobs_per_day
+            ):
+                continue
+            busy_ranges = _build_busy_ranges(
+                day_appts, rules.travel_buffer_minutes, address
+            )
+            route = (
+                _RouteMatrix(day_appts, address)
+                if rank_by == RANK_ROUTE and address
+                else None
+            )
+            for start in _free_gap_starts(
+                busy_ranges, window_start, day_close, duration
+            ):
+                slot = TimeSlot(
+                    start=start,
+                    end=start + duration,
+                    technician_id=technician_id,
+                    travel_minutes=_travel_from_previous(day_appts, start, address),
+                    detour_minutes=(
+                        route.detour_minutes(start, start + duration) if route else 0
+                    ),
+                )
+                current = candidates.get(start)
+                if current is None or _slot_cost(slot, rank_by) < _slot_cost(
+                    current, rank_by
+                ):
+                    candidates[start] = slot
+
+        # Later days can only add later starts.
+        if rank_by == RANK_EARLIEST and len(candidates) >= limit:
+            break
+
+    ranked = sorted(candidates.values(), key=lambda s: _slot_cost(s, rank_by))
+    return ranked[:limit]
+
+
+def _build_calendar_service(creds):
+    """Build a Calendar service that is safe to share across threads.
+
+    httplib2 connections are not thread-safe, and pooled clients are used
+    concurrently from the Google API executor, so every request gets its
+    own authorised connection.
+    """
+
+    def _request_builder(http, *args, **kwargs):  # type: ignore[no-untyped-def]
+        authed = google_auth_httplib2.AuthorizedHttp(creds, http=httplib2.Http())
+        return HttpRequest(authed, *args, **kwargs)
+
+    return build(
+        "calendar",
+        "v3",
+        http=google_auth_httplib2.AuthorizedHttp(creds, http=httplib2.Http()),
+        requestBuilder=_request_builder,
+        cache_discovery=False,
+    )
+
+
+def _calendar_event_updates(
+    appt,
+    *,
+    status: str | None,
+    start: str | None,
+    end: str | None,
+    summary: str | None,
+    description: str | None,
+    assume_tz=UTC,
+) -> dict:
+    """Appointment fields to change for an inbound calendar event update."""
+    start_dt = _parse_datetime_utc(start, assume_tz=assume_tz)
+    end_dt = _parse_datetime_utc(end, assume_tz=assume_tz)
+    if start_dt and end_dt and start_dt >= end_dt:
+        start_dt = None
+        end_dt = None
+
+    updates: dict = {}
+    current_start = getattr(appt, "start_time", None)
+    current_end = getattr(appt, "end_time", None)
+    if current_start is not None and getattr(current_start, "tzinfo", None) is None:
+        current_start = current_start.replace(tzinfo=UTC)
+    if current_end is not None and getattr(current_end, "tzinfo", None) is None:
+        current_end = current_end.replace(tzinfo=UTC)
+    if start_dt:
+        updates["start_time"] = start_dt
+    if end_dt:
+        updates["end_time"] = end_dt
+    if description is not None:
+        updates["description"] = description
+    if summary is not None:
+        updates["service_type"] = summary
+
+    cancelled = status and status.lower() in {"cancelled", "canceled", "declined"}
+    if cancelled:
+        updates["status"] = "CANCELLED"
+        updates["job_stage"] = "Cancelled"
+    else:
+        times_changed = False
+        if start_dt and current_start and start_dt != current_start.astimezone(UTC):
+            times_changed = True
+        if end_dt and current_end and end_dt != current_end.astimezone(UTC):
+            times_changed = True
+        if times_changed:
+            updates.setdefault("status", "SCHEDULED")
+            updates.setdefault("job_stage", "Rescheduled")
+    return updates
+
+
+def _event_time_raw(value) -> str | None:
+    if not isinstance(value, dict):
+        return None
+    raw = value.get("dateTime") or value.get("date")
+    return str(raw) if raw else None
+
+
 def _parse_datetime_utc(raw: str | None, *, assume_tz=UTC) -> datetime | None:
     """Parse an ISO8601/RFC3339 datetime and normalize to UTC.
 
@@ -442,6 +880,7 @@ class CalendarService:
     def __init__(self) -> None:
         self._settings = get_settings().calendar
         self._client = self._build_client() if not self._settings.use_stub else None
+        oauth_client_pool.register("gcalendar", self._refresh_user_client)
 
     def _build_client(self):
         creds_path = self._settings.credentials_file
@@ -459,16 +898,38 @@ class CalendarService:
             )
             if creds.expired and creds.refresh_token:
                 creds.refresh(Request())
-            service = build("calendar", "v3", credentials=creds, cache_discovery=False)
-            return service
+            return _build_calendar_service(creds)
         except Exception:
             # Fallback to stub behaviour if credentials are invalid/misconfigured.
             return None
 
     def _build_user_client(self, business_id: str | None):
-        """Build a Google Calendar client using per-tenant OAuth tokens when available."""
+        """Return the tenant's pooled Google Calendar client, building it on a miss."""
         if not business_id:
             return None
+        pooled = oauth_client_pool.get("gcalendar", business_id)
+        if pooled is not None:
+            return pooled.client
+        entry = self._create_user_client(business_id)
+        if entry is None:
+            return None
+        oauth_client_pool.put("gcalendar", business_id, entry)
+        return entry.client
+
+    def _refresh_user_client(self, business_id: str) -> PooledClient | None:
+        """Background refresh hook for the OAuth client pool."""
+        settings = get_settings()
+        if not (
+            settings.oauth.google_client_id and settings.oauth.google_client_secret
+        ):
+            # Without client credentials only the stub refresh is available.
+            return None
+        if _refresh_gcal_tokens(business_id, settings) is None:
+            return None
+        return self._create_user_client(business_id)
+
+    def _create_user_client(self, business_id: str) -> PooledClient | None:
+        """Build a Google Calendar client using per-tenant OAuth tokens when available."""
         if not (UserCredentials and Request and build):
             return None
         settings = get_settings()
@@ -486,6 +947,7 @@ class CalendarService:
             client_id=client_id,
             client_secret=client_secret,
         )
+        expires_at = tok.expires_at
         try:
             if creds and getattr(creds, "expired", False):
                 creds.refresh(Request())
@@ -499,32 +961,55 @@ class CalendarService:
                         )
                     except Exception:
                         expires_in = 3600
-                _save_gcal_tokens(
+                saved = _save_gcal_tokens(
                     business_id,
                     access_token=creds.token,
                     refresh_token=creds.refresh_token or tok.refresh_token,
                     expires_in=expires_in,
                 )
-            return build("calendar", "v3", credentials=creds, cache_discovery=False)
+                expires_at = saved.expires_at
+            service = _build_calendar_service(creds)
+            return PooledClient(
+                client=service,
+                expires_at=expires_at,
+                access_token=str(creds.token),
+            )
         except Exception:
             refreshed = _refresh_gcal_tokens(business_id, settings)
             if refreshed:
-                return self._build_user_client(business_id)
+                return self._create_user_client(business_id)
             return None
 
     def _resolve_calendar_id(self, business_id: str | None, calendar_id: str | None):
         if calendar_id:
             return calendar_id
-        if business_id and SQLALCHEMY_AVAILABLE and SessionLocal is not None:
-            session = SessionLocal()
-            try:
-                row = session.get(BusinessDB, business_id)
-                if row is not None and getattr(row, "calendar_id", None):
-                    return row.calendar_id  # type: ignore[return-value]
-            finally:
-                session.close()
+        config = get_tenant_config(business_id)
+        if config is not None and config.calendar_id:
+            return config.calendar_id
         return self._settings.calendar_id
 
+    async def _google_client(self, business_id: str | None):
+        """Tenant OAuth client, else the service-account client, else None.
+
+        Pooled tenant clients are returned directly. Building one can read
+        tokens and refresh them over HTTP, so a miss runs on the Google API
+        executor.
+        """
+        if self._settings.use_stub:
+            return None
+        pooled = (
+            oauth_client_pool.get("gcalendar", business_id) if business_id else None
+        )
+        if pooled is not None:
+            return pooled.client
+        try:
+            user_client = await google_api_executor.run(
+                self._build_user_client, business_id, operation="oauth.user_client"
+            )
+        except GoogleApiTimeout:
+            user_client = None
+        return user_client or self._client
+
     async def find_slots(
         self,
         duration_minutes: int,
@@ -534,24 +1019,30 @@ class CalendarService:
         technician_id: str | None = None,
         address: str | None = None,
         service_type: str | None = None,
+        rank_by: str = RANK_EARLIEST,
     ) -> List[TimeSlot]:
+        """Return the best slot for a new job (a single-item list).
+
+        ``rank_by="route"`` picks the slot whose insertion adds the least
+        drive time between the neighbouring jobs instead of the earliest
+        one; it applies to the local appointment search, since the Google
+        FreeBusy path has no job addresses.
+        """
+        if rank_by not in RANK_MODES:
+            raise ValueError(f"Unsupported rank_by: {rank_by}")
         duration_minutes = self.resolve_duration_minutes(
             business_id, service_type, duration_minutes
         )
         # Choose client: tenant OAuth > service account > stub.
-        client = (
-            None
-            if self._settings.use_stub
-            else self._build_user_client(business_id) or self._client
-        )
+        client = await self._google_client(business_id)
         if not client:
             # Stub implementation with basic capacity and routing constraints.
             now = datetime.now(UTC)
-            open_hour, close_hour, closed_days = _get_business_hours(business_id)
             duration = timedelta(minutes=duration_minutes)
 
             # If we don't have a business context, fall back to simple alignment.
             if not business_id:
+                open_hour, close_hour, closed_days = _get_business_hours(business_id)
                 candidate = _align_to_business_hours(
                     now + timedelta(hours=1),
                     duration,
@@ -562,132 +1053,33 @@ class CalendarService:
                 end = candidate + duration
                 return [TimeSlot(start=candidate, end=end)]
 
-            from ..repositories import (
-                appointments_repo,
-            )  # Local import to avoid cycles.
-
-            (
-                max_jobs_per_day,
-                reserve_mornings_for_emergencies,
-                travel_buffer_minutes,
-                _service_durations,
-            ) = _get_business_capacity(business_id)
-
             # Search starting roughly an hour from now, up to two weeks out.
+            rules = _load_slot_rules(business_id)
             search_start = now + timedelta(hours=1)
-            max_days = 14
-            appointments = appointments_repo.list_for_business(business_id)
-            if technician_id is not None:
-                appointments = [
-                    a
-                    for a in appointments
-                    if getattr(a, "technician_id", None) == technician_id
-                ]
-
-            for day_offset in range(max_days):
-                day_base = search_start + timedelta(days=day_offset)
-                weekday = day_base.weekday()
-                if weekday in closed_days:
-                    continue
-
-                day = day_base.date()
-                day_open = datetime(
-                    day.year,
-                    day.month,
-                    day.day,
-                    open_hour,
-                    0,
-                    0,
-                    tzinfo=UTC,
-                )
-                day_close = datetime(
-                    day.year,
-                    day.month,
-                    day.day,
-                    close_hour,
-                    0,
-                    0,
-                    tzinfo=UTC,
-                )
-
-                # Skip days where the requested duration cannot fit at all.
-                if day_open + duration > day_close:
-                    continue
-
-                # Start no earlier than search_start on the first day; otherwise at open.
-                candidate_start = day_open
-                if day_offset == 0 and search_start > candidate_start:
-                    candidate_start = search_start
-
-                # Optionally reserve mornings for emergencies only.
-                if reserve_mornings_for_emergencies and not is_emergency:
-                    morning_end_hour = max(open_hour, 12)
-                    morning_end = datetime(
-                        day.year,
-                        day.month,
-                        day.day,
-                        morning_end_hour,
-                        0,
-                        0,
-                        tzinfo=UTC,
-                    )
-                    if candidate_start < morning_end:
-                        candidate_start = morning_end
-
-                if candidate_start + duration > day_close:
-                    continue
-
-                # Collect existing appointments for this business on the day.
-                day_appts = []
-                for appt in appointments:
-                    appt_start = getattr(appt, "start_time", None)
-                    appt_end = getattr(appt, "end_time", None)
-                    if not appt_start or not appt_end:
-                        continue
-                    if appt_start.date() != day:
-                        continue
-                    status = getattr(appt, "status", "SCHEDULED").upper()
-                    if status not in {"SCHEDULED", "CONFIRMED"}:
-                        continue
-                    day_appts.append(appt)
-
-                # Enforce per-day capacity if configured.
-                if max_jobs_per_day is not None and len(day_appts) >= max_jobs_per_day:
-                    continue
-
-                # Build busy ranges including travel buffers.
-                busy_ranges = _build_busy_ranges(
-                    day_appts, travel_buffer_minutes, address
-                )
-
-                # Scan for the first free gap that can hold the duration.
-                candidate = candidate_start
-                for busy_start, busy_end in busy_ranges:
-                    # If the candidate window fits before the next busy range, use it.
-                    if candidate + duration <= busy_start:
-                        break
-                    # Otherwise, move candidate to the end of this busy range and continue.
-                    if candidate < busy_end:
-                        candidate = busy_end
-                    if candidate + duration > day_close:
-                        break
-                else:
-                    # No busy ranges or candidate is after all busy ranges.
-                    if candidate + duration <= day_close:
-                        return [TimeSlot(start=candidate, end=candidate + duration)]
-                    continue
-
-                # After scanning busy ranges, ensure the candidate still fits in the day.
-                if candidate + duration <= day_close:
-                    return [TimeSlot(start=candidate, end=candidate + duration)]
+            busy_index = _load_busy_index(
+                business_id, search_start.date(), SLOT_SEARCH_DAYS
+            )
+            await self._prefetch_geocodes(address, busy_index)
+            slots = _search_slots(
+                busy_index,
+                rules,
+                search_start=search_start,
+                duration=duration,
+                technicians=[technician_id],
+                is_emergency=is_emergency,
+                address=address,
+                rank_by=rank_by,
+            )
+            if slots:
+                return slots
 
             # Fallback: if no constrained slot found, align next hour within business hours.
             fallback = _align_to_business_hours(
                 now + timedelta(hours=1),
                 duration,
-                open_hour,
-                close_hour,
-                closed_days,
+                rules.open_hour,
+                rules.close_hour,
+                set(rules.closed_days),
             )
             return [TimeSlot(start=fallback, end=fallback + duration)]
 
@@ -711,24 +1103,13 @@ class CalendarService:
             close_hour,
             closed_days,
         )
-        time_min = now.isoformat().replace("+00:00", "Z")
-        time_max = (now + timedelta(days=7)).isoformat().replace("+00:00", "Z")
         cal_id = self._resolve_calendar_id(business_id, calendar_id)
 
-        busy_ranges: List[tuple[datetime, datetime]] = []
         try:
-            body = {
-                "timeMin": time_min,
-                "timeMax": time_max,
-                "items": [{"id": cal_id}],
-            }
-            freebusy = client.freebusy().query(body=body).execute()
-            cal_busy = freebusy["calendars"][cal_id]["busy"]
-            for item in cal_busy:
-                start = datetime.fromisoformat(item["start"].replace("Z", "+00:00"))
-                end = datetime.fromisoformat(item["end"].replace("Z", "+00:00"))
-                busy_ranges.append((start, end))
-        except HttpError:
+            busy_ranges = await self._google_busy_ranges(
+                client, business_id, cal_id, now, 7
+            )
+        except (HttpError, GoogleApiTimeout):
             # On API failure, fall back to stub behaviour.
             now = datetime.now(UTC)
             open_hour, close_hour, closed_days = _get_business_hours(business_id)
@@ -786,6 +1167,173 @@ class CalendarService:
         # If we find nothing in the next week, fall back to stub-like behaviour.
         return [TimeSlot(start=candidate_start, end=candidate_start + duration)]
 
+    async def find_availability(
+        self,
+        duration_minutes: int,
+        *,
+        business_id: str,
+        calendar_id: str | None = None,
+        is_emergency: bool | None = None,
+        address: str | None = None,
+        service_type: str | None = None,
+        technician_ids: Sequence[str] | None = None,
+        limit: int = 3,
+        rank_by: str = RANK_EARLIEST,
+    ) -> List[TimeSlot]:
+        """Return up to ``limit`` candidate slots across technicians in one pass.
+
+        Technicians default to the tenant's active roster; with no roster the
+        business is treated as a single crew. Unassigned appointments block
+        every technician. Each free gap yields one candidate, ranked by
+        earliest start, by least travel from the previous job
+        (``rank_by="travel"``) or by least added route drive time
+        (``rank_by="route"``). Returns an empty list when nothing fits.
+        """
+        if rank_by not in RANK_MODES:
+            raise ValueError(f"Unsupported rank_by: {rank_by}")
+        duration_minutes = self.resolve_duration_minutes(
+            business_id, service_type, duration_minutes
+        )
+        now = datetime.now(UTC)
+        search_start = now + timedelta(hours=1)
+        rules = _load_slot_rules(business_id)
+
+        busy_index: _BusyIndex | None = None
+        technicians: List[str | None] = []
+        client = await self._google_client(business_id)
+        if client:
+            # A linked calendar is shared by the whole crew, so it is searched
+            # as a single resource with one FreeBusy round trip.
+            cal_id = self._resolve_calendar_id(business_id, calendar_id)
+            try:
+                busy_index = _BusyIndex(
+                    await self._google_busy_blocks(
+                        client, business_id, cal_id, now, SLOT_SEARCH_DAYS
+                    )
+                )
+                technicians = [None]
+            except (HttpError, GoogleApiTimeout):
+                logger.warning(
+                    "calendar_freebusy_failed_using_local_appointments",
+                    extra={"business_id": business_id},
+                )
+        if busy_index is None:
+            busy_index = _load_busy_index(
+                business_id, search_start.date(), SLOT_SEARCH_DAYS
+            )
+            technicians = list(technician_ids or _get_active_technicians(business_id))
+            if not technicians:
+                technicians = [None]
+
+        await self._prefetch_geocodes(address, busy_index)
+        return _search_slots(
+            busy_index,
+            rules,
+            search_start=search_start,
+            duration=timedelta(minutes=duration_minutes),
+            technicians=technicians,
+            include_unassigned=True,
+            is_emergency=is_emergency,
+            address=address,
+            limit=max(1, limit),
+            rank_by=rank_by,
+        )
+
+    async def _prefetch_geocodes(
+        self, address: str | None, busy_index: _BusyIndex
+    ) -> None:
+        """Geocode the job site and booked addresses before a slot search.
+
+        Travel estimates inside the search only read the cache, so the
+        network is never hit per candidate slot. Lookups still running when
+        the timeout expires fall back to ZIP centroids for this search.
+        """
+        if not address:
+            return
+        from .geocoding import geocoding_service  # local import to avoid cycles
+
+        await geocoding_service.prefetch(
+            [address, *busy_index.addresses],
+            timeout=getattr(self._settings, "geocode_prefetch_timeout_seconds", 2.0),
+        )
+
+    async def prefetch_conflict_geocodes(
+        self, *, business_id: str, start: datetime, address: str | None
+    ) -> None:
+        """Geocode the job site and that day's bookings before ``has_conflict``.
+
+        ``has_conflict`` only reads cached coordinates; async callers await
+        this first so a cold cache still gets travel-time buffers.
+        """
+        if start.tzinfo is None:
+            start = start.replace(tzinfo=UTC)
+        day = _utc_date(start)
+        await self._prefetch_geocodes(address, _load_busy_index(business_id, day, 1))
+
+    async def _google_busy_blocks(
+        self,
+        client,
+        business_id: str | None,
+        calendar_id: str,
+        start: datetime,
+        days: int,
+    ) -> List[SimpleNamespace]:
+        """Return FreeBusy blocks shaped like appointments for ``_BusyIndex``."""
+        ranges = await self._google_busy_ranges(
+            client, business_id, calendar_id, start, days
+        )
+        return [
+            SimpleNamespace(
+                start_time=busy_start,
+                end_time=busy_end,
+                status="CONFIRMED",
+                technician_id=None,
+                address=None,
+            )
+            for busy_start, busy_end in ranges
+        ]
+
+    async def _google_busy_ranges(
+        self,
+        client,
+        business_id: str | None,
+        calendar_id: str,
+        start: datetime,
+        days: int,
+    ) -> List[tuple[datetime, datetime]]:
+        """Busy ranges for ``days`` from ``start``, served from the FreeBusy cache."""
+
+        async def _fetch():
+            window_end = start + timedelta(days=max(days, FREEBUSY_CACHE_DAYS))
+            ranges = await self._query_freebusy(client, calendar_id, start, window_end)
+            return start, window_end, ranges
+
+        return await freebusy_cache.get_or_fetch(
+            freebusy_key(business_id, calendar_id),
+            start,
+            start + timedelta(days=days),
+            _fetch,
+        )
+
+    async def _query_freebusy(
+        self, client, calendar_id: str, start: datetime, end: datetime
+    ) -> List[tuple[datetime, datetime]]:
+        body = {
+            "timeMin": start.isoformat().replace("+00:00", "Z"),
+            "timeMax": end.isoformat().replace("+00:00", "Z"),
+            "items": [{"id": calendar_id}],
+        }
+        freebusy = await google_api_executor.execute(
+            client.freebusy().query(body=body), operation="freebusy.query"
+        )
+        ranges: List[tuple[datetime, datetime]] = []
+        for item in freebusy["calendars"][calendar_id]["busy"]:
+            busy_start = _parse_datetime_utc(item.get("start"))
+            busy_end = _parse_datetime_utc(item.get("end"))
+            if busy_start and busy_end:
+                ranges.append((busy_start, busy_end))
+        return ranges
+
     async def create_event(
         self,
         summary: str,
@@ -794,11 +1342,7 @@ class CalendarService:
         calendar_id: str | None = None,
         business_id: str | None = None,
     ) -> str:
-        client = (
-            None
-            if self._settings.use_stub
-            else self._build_user_client(business_id) or self._client
-        )
+        client = await self._google_client(business_id)
         if not client:
             # Stub behaviour.
             return f"event_placeholder_{slot.start.isoformat()}"
@@ -811,10 +1355,25 @@ class CalendarService:
         }
         try:
             cal_id = self._resolve_calendar_id(business_id, calendar_id)
-            created = client.events().insert(calendarId=cal_id, body=event).execute()
-            return created.get("id", f"event_placeholder_{slot.start.isoformat()}")
-        except HttpError:
+            created = await google_api_executor.execute(
+                client.events().insert(calendarId=cal_id, body=event),
+                operation="events.insert",
+            )
+        except (HttpError, GoogleApiTimeout):
+            # A timed-out insert may still have landed on the calendar.
+            freebusy_cache.invalidate(business_id or "")
+            return f"event_placeholder_{slot.start.isoformat()}"
+        created_id = created.get("id")
+        if not created_id:
             return f"event_placeholder_{slot.start.isoformat()}"
+        freebusy_cache.apply_change(
+            freebusy_key(business_id, cal_id),
+            str(created_id),
+            slot.start,
+            slot.end,
+            created=True,
+        )
+        return created_id
 
     async def update_event(
         self,
@@ -825,11 +1384,7 @@ class CalendarService:
         calendar_id: str | None = None,
         business_id: str | None = None,
     ) -> bool:
-        client = (
-            None
-            if self._settings.use_stub
-            else self._build_user_client(business_id) or self._client
-        )
+        client = await self._google_client(business_id)
         if not client:
             return False
 
@@ -844,14 +1399,17 @@ class CalendarService:
             body["description"] = description
 
         try:
-            (
-                client.events()
-                .patch(calendarId=cal_id, eventId=event_id, body=body)
-                .execute()
+            await google_api_executor.execute(
+                client.events().patch(calendarId=cal_id, eventId=event_id, body=body),
+                operation="events.patch",
             )
-            return True
-        except HttpError:
+        except (HttpError, GoogleApiTimeout):
+            freebusy_cache.invalidate(business_id or "")
             return False
+        freebusy_cache.apply_change(
+            freebusy_key(business_id, cal_id), event_id, slot.start, slot.end
+        )
+        return True
 
     def _lookup_business_for_gcalendar_channel(
         self,
@@ -926,20 +1484,6 @@ class CalendarService:
         finally:
             session_db.close()
 
-    def _tracked_calendar_event_ids(self, business_id: str) -> set[str]:
-        from ..repositories import appointments_repo  # local import to avoid cycles
-
-        tracked: set[str] = set()
-        try:
-            appointments = appointments_repo.list_for_business(business_id)
-        except Exception:
-            return tracked
-        for appt in appointments:
-            event_id = getattr(appt, "calendar_event_id", None)
-            if event_id:
-                tracked.add(str(event_id))
-        return tracked
-
     async def sync_google_calendar_events(
         self,
         *,
@@ -951,15 +1495,19 @@ class CalendarService:
         if self._settings.use_stub:
             return {"processed": 0, "synced": False, "reason": "stub"}
 
-        client = self._build_user_client(business_id) or self._client
+        client = await self._google_client(business_id)
         if not client:
             return {"processed": 0, "synced": False, "reason": "no_client"}
 
         cal_id = self._resolve_calendar_id(business_id, calendar_id)
-        tracked_event_ids = self._tracked_calendar_event_ids(business_id)
         sync_token = (
             None if force_full else self._load_gcalendar_sync_token(business_id)
         )
+        cache_key = freebusy_key(business_id, cal_id)
+        if not sync_token:
+            # A full listing carries no "what changed" signal; refetch instead.
+            freebusy_cache.invalidate(business_id)
+        assume_tz = _get_business_timezone(business_id)
 
         processed = 0
         next_sync_token: str | None = None
@@ -978,7 +1526,9 @@ class CalendarService:
                 kwargs["syncToken"] = sync_token
 
             try:
-                resp = client.events().list(**kwargs).execute()
+                resp = await google_api_executor.execute(
+                    client.events().list(**kwargs), operation="events.list"
+                )
             except HttpError as exc:
                 status_code = getattr(getattr(exc, "resp", None), "status", None)
                 if sync_token and status_code == 410:
@@ -1012,37 +1562,19 @@ class CalendarService:
                 return {"processed": 0, "synced": False, "reason": "error"}
 
             items = resp.get("items") if isinstance(resp, dict) else None
-            for event in items or []:
-                if not isinstance(event, dict):
-                    continue
-                event_id = event.get("id")
-                if not event_id or (
-                    tracked_event_ids and event_id not in tracked_event_ids
-                ):
-                    continue
-                start_obj = event.get("start") or {}
-                end_obj = event.get("end") or {}
-                start_raw = (
-                    start_obj.get("dateTime") or start_obj.get("date")
-                    if isinstance(start_obj, dict)
-                    else None
-                )
-                end_raw = (
-                    end_obj.get("dateTime") or end_obj.get("date")
-                    if isinstance(end_obj, dict)
-                    else None
-                )
-                updated = await self.handle_inbound_update(
-                    business_id=business_id,
-                    event_id=str(event_id),
-                    status=event.get("status"),
-                    start=str(start_raw) if start_raw else None,
-                    end=str(end_raw) if end_raw else None,
-                    summary=event.get("summary"),
-                    description=event.get("description"),
+            events = [
+                event
+                for event in items or []
+                if isinstance(event, dict) and event.get("id")
+            ]
+            if sync_token:
+                for event in events:
+                    self._apply_event_to_freebusy_cache(cache_key, event, assume_tz)
+            if events:
+                # One lookup and one transaction per page, off the event loop.
+                processed += await anyio.to_thread.run_sync(
+                    self._apply_sync_page, business_id, events, assume_tz
                 )
-                if updated:
-                    processed += 1
 
             if isinstance(resp, dict) and resp.get("nextSyncToken"):
                 next_sync_token = str(resp.get("nextSyncToken"))
@@ -1063,6 +1595,65 @@ class CalendarService:
 
         return {"processed": processed, "synced": True, "sync_token": next_sync_token}
 
+    def _apply_sync_page(self, business_id: str, events: List[dict], assume_tz) -> int:
+        """Apply one page of synced events to their appointments.
+
+        Returns how many events matched a stored appointment.
+        """
+        from ..repositories import appointments_repo  # local import to avoid cycles
+
+        by_event = appointments_repo.find_by_calendar_events(
+            {str(event["id"]) for event in events}, business_id=business_id
+        )
+        updates: list[tuple[str, dict]] = []
+        matched = 0
+        for event in events:
+            appt = by_event.get(str(event["id"]))
+            if appt is None:
+                continue
+            matched += 1
+            fields = _calendar_event_updates(
+                appt,
+                status=event.get("status"),
+                start=_event_time_raw(event.get("start")),
+                end=_event_time_raw(event.get("end")),
+                summary=event.get("summary"),
+                description=event.get("description"),
+                assume_tz=assume_tz,
+            )
+            if fields:
+                updates.append((appt.id, fields))
+        if updates:
+            appointments_repo.bulk_update(updates)
+        return matched
+
+    def _apply_event_to_freebusy_cache(self, key, event: dict, assume_tz) -> None:
+        """Patch the cached busy window with one incrementally synced event."""
+        start = _parse_datetime_utc(
+            _event_time_raw(event.get("start")), assume_tz=assume_tz
+        )
+        end = _parse_datetime_utc(
+            _event_time_raw(event.get("end")), assume_tz=assume_tz
+        )
+        status = str(event.get("status") or "").lower()
+        removed = status == "cancelled" or event.get("transparency") == "transparent"
+        created_at = _parse_datetime_utc(event.get("created"))
+        updated_at = _parse_datetime_utc(event.get("updated"))
+        # An event never edited since creation cannot hide in an older block.
+        created = bool(
+            created_at
+            and updated_at
+            and abs((updated_at - created_at).total_seconds()) <= 1
+        )
+        freebusy_cache.apply_change(
+            key,
+            str(event["id"]),
+            start,
+            end,
+            removed=removed,
+            created=created,
+        )
+
     async def create_google_calendar_watch(
         self,
         *,
@@ -1077,7 +1668,7 @@ class CalendarService:
         if not (SQLALCHEMY_AVAILABLE and SessionLocal is not None):
             return {"created": False, "reason": "no_database"}
 
-        client = self._build_user_client(business_id) or self._client
+        client = await self._google_client(business_id)
         if not client:
             return {"created": False, "reason": "no_client"}
 
@@ -1092,7 +1683,10 @@ class CalendarService:
             "params": {"ttl": str(int(ttl_seconds))},
         }
         try:
-            resp = client.events().watch(calendarId=cal_id, body=body).execute()
+            resp = await google_api_executor.execute(
+                client.events().watch(calendarId=cal_id, body=body),
+                operation="events.watch",
+            )
         except Exception:
             logger.warning(
                 "gcalendar_watch_create_failed",
@@ -1157,11 +1751,16 @@ class CalendarService:
         if not business_id:
             return {"processed": 0, "synced": False, "reason": "unknown_channel"}
 
+        from .calendar_sync import calendar_sync_scheduler  # local import
+
+        # Duplicate pushes for a tenant share one queued sync.
         force_full = (resource_state or "").lower() in {"sync", "not_exists"}
-        result = await self.sync_google_calendar_events(
-            business_id=business_id,
-            force_full=force_full,
+        result = dict(
+            await calendar_sync_scheduler.submit(business_id, force_full=force_full)
         )
+        if not result.get("synced"):
+            # The calendar changed but the change could not be applied.
+            freebusy_cache.invalidate(business_id)
         result["business_id"] = business_id
         return result
 
@@ -1189,43 +1788,15 @@ class CalendarService:
         if not appt:
             return False
 
-        assume_tz = _get_business_timezone(business_id)
-        start_dt = _parse_datetime_utc(start, assume_tz=assume_tz)
-        end_dt = _parse_datetime_utc(end, assume_tz=assume_tz)
-        if start_dt and end_dt and start_dt >= end_dt:
-            start_dt = None
-            end_dt = None
-
-        updates = {}
-        current_start = getattr(appt, "start_time", None)
-        current_end = getattr(appt, "end_time", None)
-        if current_start is not None and getattr(current_start, "tzinfo", None) is None:
-            current_start = current_start.replace(tzinfo=UTC)
-        if current_end is not None and getattr(current_end, "tzinfo", None) is None:
-            current_end = current_end.replace(tzinfo=UTC)
-        if start_dt:
-            updates["start_time"] = start_dt
-        if end_dt:
-            updates["end_time"] = end_dt
-        if description is not None:
-            updates["description"] = description
-        if summary is not None:
-            updates["service_type"] = summary
-
-        cancelled = status and status.lower() in {"cancelled", "canceled", "declined"}
-        if cancelled:
-            updates["status"] = "CANCELLED"
-            updates["job_stage"] = "Cancelled"
-        else:
-            times_changed = False
-            if start_dt and current_start and start_dt != current_start.astimezone(UTC):
-                times_changed = True
-            if end_dt and current_end and end_dt != current_end.astimezone(UTC):
-                times_changed = True
-            if times_changed:
-                updates.setdefault("status", "SCHEDULED")
-                updates.setdefault("job_stage", "Rescheduled")
-
+        updates = _calendar_event_updates(
+            appt,
+            status=status,
+            start=start,
+            end=end,
+            summary=summary,
+            description=description,
+            assume_tz=_get_business_timezone(business_id),
+        )
         if updates:
             appointments_repo.update(appt.id, **updates)
         return True
@@ -1273,27 +1844,10 @@ class CalendarService:
             if start < morning_end:
                 return True
 
-        from ..repositories import appointments_repo  # local import to avoid cycles
-
-        appointments = appointments_repo.list_for_business(business_id)
-        if technician_id is not None:
-            appointments = [
-                a
-                for a in appointments
-                if getattr(a, "technician_id", None) == technician_id
-            ]
-        day_appts = []
-        for appt in appointments:
-            appt_start = getattr(appt, "start_time", None)
-            appt_end = getattr(appt, "end_time", None)
-            if not appt_start or not appt_end:
-                continue
-            if appt_start.date() != start.date():
-                continue
-            status = getattr(appt, "status", "SCHEDULED").upper()
-            if status not in {"SCHEDULED", "CONFIRMED"}:
-                continue
-            day_appts.append(appt)
+        day = _utc_date(start)
+        day_appts = _load_busy_index(business_id, day, 1).for_day(
+            day, technician_id, include_unassigned=True
+        )
 
         if max_jobs_per_day is not None and len(day_appts) >= max_jobs_per_day:
             return True
@@ -1303,6 +1857,18 @@ class CalendarService:
             if start < busy_end and end > busy_start:
                 return True
 
+        # Also honour the linked Google Calendar when its FreeBusy window is
+        # already cached; this check never calls the API.
+        if not self._settings.use_stub:
+            buffer = timedelta(minutes=travel_buffer_minutes)
+            cached = freebusy_cache.lookup(
+                freebusy_key(business_id, self._resolve_calendar_id(business_id, None)),
+                start - buffer,
+                end + buffer,
+            )
+            if cached:
+                return True
+
         return False
 
     async def delete_event(
@@ -1311,20 +1877,23 @@ class CalendarService:
         calendar_id: str | None = None,
         business_id: str | None = None,
     ) -> bool:
-        client = (
-            None
-            if self._settings.use_stub
-            else self._build_user_client(business_id) or self._client
-        )
+        client = await self._google_client(business_id)
         if not client:
             return False
 
         cal_id = self._resolve_calendar_id(business_id, calendar_id)
         try:
-            client.events().delete(calendarId=cal_id, eventId=event_id).execute()
-            return True
-        except HttpError:
+            await google_api_executor.execute(
+                client.events().delete(calendarId=cal_id, eventId=event_id),
+                operation="events.delete",
+            )
+        except (HttpError, GoogleApiTimeout):
+            freebusy_cache.invalidate(business_id or "")
             return False
+        freebusy_cache.apply_change(
+            freebusy_key(business_id, cal_id), event_id, removed=True
+        )
+        return True
 
 
 calendar_service = CalendarService()
@@ -0,0 +1,230 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, List
+
+from ..config import get_settings
+from ..db import SQLALCHEMY_AVAILABLE, SessionLocal
+from ..db_models import BusinessDB
+from ..metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+SyncFn = Callable[..., Awaitable[Dict[str, Any]]]
+
+
+@dataclass
+class _TenantSync:
+    """Queued or running sync for one tenant."""
+
+    force_full: bool
+    requested_at: float
+    future: asyncio.Future
+    requests: int = 1
+    # Set when a notification arrives while the sync is already running; the
+    # running pass may have listed events before that change.
+    rerun: "_TenantSync | None" = field(default=None)
+
+
+class CalendarSyncScheduler:
+    """Runs Google Calendar incremental syncs across tenants.
+
+    Push notifications and periodic sweeps both go through ``submit``.
+    Requests for a tenant that is already queued are coalesced into the
+    queued run. A request that arrives while the tenant is mid-sync queues
+    one follow-up run, and later requests join it. Runs for different
+    tenants proceed concurrently up to ``max_concurrency``. Per-tenant lag
+    (first request to finished sync) is recorded in metrics.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 8,
+        sweep_interval_seconds: float = 900.0,
+        sync_fn: SyncFn | None = None,
+    ) -> None:
+        self._max_concurrency = max(1, max_concurrency)
+        self._sweep_interval_seconds = sweep_interval_seconds
+        self._sync_fn = sync_fn
+        self._queued: Dict[str, _TenantSync] = {}
+        self._running: Dict[str, _TenantSync] = {}
+        self._tasks: set[asyncio.Task] = set()
+        self._semaphore: asyncio.Semaphore | None = None
+        self._semaphore_loop: asyncio.AbstractEventLoop | None = None
+        self._sweep_task: asyncio.Task | None = None
+
+    def configure(
+        self,
+        *,
+        max_concurrency: int | None = None,
+        sweep_interval_seconds: float | None = None,
+    ) -> None:
+        if max_concurrency is not None:
+            self._max_concurrency = max(1, max_concurrency)
+            self._semaphore = None
+        if sweep_interval_seconds is not None:
+            self._sweep_interval_seconds = sweep_interval_seconds
+
+    def _sync(self) -> SyncFn:
+        if self._sync_fn is None:
+            from .calendar import calendar_service  # local import to avoid cycles
+
+            return calendar_service.sync_google_calendar_events
+        return self._sync_fn
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self._max_concurrency)
+            self._semaphore_loop = loop
+        return self._semaphore
+
+    def submit(self, business_id: str, *, force_full: bool = False) -> asyncio.Future:
+        """Request a sync for ``business_id``; the future resolves to its result."""
+        loop = asyncio.get_running_loop()
+        for pending in (self._queued, self._running):
+            stale = pending.get(business_id)
+            if stale is not None and stale.future.get_loop() is not loop:
+                # Left behind by a closed loop (e.g. a previous test client).
+                pending.pop(business_id, None)
+        queued = self._queued.get(business_id)
+        if queued is None:
+            running = self._running.get(business_id)
+            if running is not None:
+                if running.rerun is None:
+                    running.rerun = _TenantSync(
+                        force_full=force_full,
+                        requested_at=time.monotonic(),
+                        future=loop.create_future(),
+                        requests=0,
+                    )
+                queued = running.rerun
+            else:
+                job = _TenantSync(
+                    force_full=force_full,
+                    requested_at=time.monotonic(),
+                    future=loop.create_future(),
+                )
+                self._queued[business_id] = job
+                self._spawn(business_id, job)
+                return job.future
+        queued.force_full = queued.force_full or force_full
+        queued.requests += 1
+        if queued.requests > 1:
+            metrics.calendar_sync_coalesced += 1
+        return queued.future
+
+    def _spawn(self, business_id: str, job: _TenantSync) -> None:
+        task = asyncio.get_running_loop().create_task(self._run(business_id, job))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, business_id: str, job: _TenantSync) -> None:
+        try:
+            async with self._get_semaphore():
+                self._queued.pop(business_id, None)
+                self._running[business_id] = job
+                try:
+                    result = await self._sync()(
+                        business_id=business_id, force_full=job.force_full
+                    )
+                finally:
+                    self._running.pop(business_id, None)
+        except asyncio.CancelledError:
+            job.future.cancel()
+            if job.rerun is not None:
+                job.rerun.future.cancel()
+            raise
+        except Exception as exc:
+            metrics.calendar_sync_failures += 1
+            logger.warning(
+                "calendar_sync_failed",
+                exc_info=True,
+                extra={"business_id": business_id},
+            )
+            if not job.future.done():
+                job.future.set_exception(exc)
+                # Sweeps do not await their futures.
+                job.future.exception()
+        else:
+            metrics.record_calendar_sync(
+                business_id,
+                lag_seconds=time.monotonic() - job.requested_at,
+                synced=bool(result.get("synced")),
+            )
+            if not job.future.done():
+                job.future.set_result(result)
+        if job.rerun is not None:
+            # Nothing else can be queued for this tenant while it was running.
+            self._queued[business_id] = job.rerun
+            self._spawn(business_id, job.rerun)
+
+    async def sweep(self, business_ids: Iterable[str] | None = None) -> int:
+        """Sync every tenant (default: those with a push channel); returns count."""
+        targets = list(
+            business_ids if business_ids is not None else _watched_business_ids()
+        )
+        futures = [self.submit(business_id) for business_id in targets]
+        if futures:
+            await asyncio.gather(*futures, return_exceptions=True)
+        return len(targets)
+
+    async def drain(self) -> None:
+        """Wait until no sync is queued or running."""
+        while self._tasks:
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
+
+    def start(self) -> None:
+        """Start periodic sweeps on the running loop (no-op if disabled)."""
+        if self._sweep_interval_seconds <= 0:
+            return
+        if self._sweep_task is not None and not self._sweep_task.done():
+            return
+        self._sweep_task = asyncio.get_running_loop().create_task(self._sweep_loop())
+
+    async def stop(self) -> None:
+        task, self._sweep_task = self._sweep_task, None
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        for pending in list(self._tasks):
+            pending.cancel()
+        await asyncio.gather(*list(self._tasks), return_exceptions=True)
+
+    async def _sweep_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self._sweep_interval_seconds)
+            try:
+                await self.sweep()
+            except Exception:
+                metrics.background_job_errors += 1
+                logger.exception("calendar_sync_sweep_failed")
+
+
+def _watched_business_ids() -> List[str]:
+    if not (SQLALCHEMY_AVAILABLE and SessionLocal is not None):
+        return []
+    session = SessionLocal()
+    try:
+        rows = (
+            session.query(BusinessDB.id)
+            .filter(BusinessDB.gcalendar_channel_id.isnot(None))  # type: ignore[attr-defined]
+            .all()
+        )
+    finally:
+        session.close()
+    return [str(row[0]) for row in rows]
+
+
+def _create_calendar_sync_scheduler() -> CalendarSyncScheduler:
+    settings = get_settings().calendar
+    return CalendarSyncScheduler(
+        max_concurrency=getattr(settings, "sync_max_concurrency", 8),
+        sweep_interval_seconds=getattr(settings, "sync_sweep_interval_seconds", 900.0),
+    )
+
+
+calendar_sync_scheduler = _create_calendar_sync_scheduler()
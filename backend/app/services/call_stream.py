@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import AsyncIterator, Awaitable, Callable
+
+from ..metrics import metrics
+from .stt_tts import SpeechResult, speech_service
+
+logger = logging.getLogger(__name__)
+
+StreamJob = Callable[[], Awaitable[None]]
+
+
+class CallStreamWorker:
+    """Runs one streaming call's STT and conversation turns in order.
+
+    The media-stream reader hands jobs over through a bounded queue and
+    never waits on them. A single task runs the jobs in order, so
+    transcripts reach the conversation in the order they were spoken. When
+    the queue is full the reader keeps buffering audio and submits later.
+    """
+
+    def __init__(self, maxsize: int = 4, *, call_sid: str | None = None) -> None:
+        self._queue: asyncio.Queue[StreamJob | None] = asyncio.Queue(
+            maxsize=max(1, maxsize)
+        )
+        self._call_sid = call_sid
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def full(self) -> bool:
+        return self._queue.full()
+
+    def _record_depth(self) -> None:
+        depth = self._queue.qsize()
+        if depth > metrics.twilio_stream_queue_depth_max:
+            metrics.twilio_stream_queue_depth_max = depth
+
+    def submit_nowait(self, job: StreamJob) -> None:
+        """Queue a job; raises ``asyncio.QueueFull`` if the worker is behind."""
+        self._queue.put_nowait(job)
+        self._record_depth()
+
+    async def submit(self, job: StreamJob) -> None:
+        """Queue a job, waiting for room (only once ingestion has finished)."""
+        await self._queue.put(job)
+        self._record_depth()
+
+    async def close(self, timeout: float) -> None:
+        """Let queued jobs finish, cancelling whatever is left after ``timeout``."""
+        task = self._task
+        if task is None:
+            return
+
+        async def _drain() -> None:
+            await self._queue.put(None)
+            await asyncio.shield(task)
+
+        try:
+            await asyncio.wait_for(_drain(), timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.warning(
+                "twilio_stream_worker_drain_timeout",
+                extra={"call_sid": self._call_sid},
+            )
+            await self.cancel()
+
+    async def cancel(self) -> None:
+        """Stop the worker now, abandoning queued and in-flight jobs."""
+        task = self._task
+        if task is None or task.done():
+            return
+        task.cancel()
+        metrics.twilio_stream_worker_cancellations += 1
+        await asyncio.gather(task, return_exceptions=True)
+
+    async def _run(self) -> None:
+        while True:
+            job = await self._queue.get()
+            if job is None:
+                return
+            try:
+                await job()
+            except Exception:
+                logger.exception(
+                    "twilio_stream_job_failed", extra={"call_sid": self._call_sid}
+                )
+
+
+class StreamingUtterance:
+    """Streams one utterance to the speech provider while it is spoken.
+
+    The reader ``feed``s PCM as frames arrive and calls ``finish`` at the
+    utterance boundary. Recognition runs in its own task, so ``on_result``
+    sees each partial as soon as the provider returns it, while the worker
+    awaits ``transcript`` after earlier turns. The hypothesis passed to
+    ``on_result`` is the finished segments plus the current partial.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int,
+        *,
+        call_sid: str | None = None,
+        on_result: Callable[[str, SpeechResult], None] | None = None,
+    ) -> None:
+        self._sample_rate = sample_rate
+        self._call_sid = call_sid
+        self._on_result = on_result
+        self._chunks: asyncio.Queue[bytes | None] = asyncio.Queue()
+        self._finals: list[str] = []
+        self._finished = False
+        self._task = asyncio.get_running_loop().create_task(self._recognize())
+
+    def feed(self, pcm: bytes) -> None:
+        if pcm and not self._finished:
+            self._chunks.put_nowait(pcm)
+
+    def finish(self) -> None:
+        if not self._finished:
+            self._finished = True
+            self._chunks.put_nowait(None)
+
+    async def _audio(self) -> AsyncIterator[bytes]:
+        while True:
+            chunk = await self._chunks.get()
+            if chunk is None:
+                return
+            yield chunk
+
+    async def _recognize(self) -> None:
+        try:
+            async for result in speech_service.stream_transcribe(
+                self._audio(), self._sample_rate
+            ):
+                text = result.text.strip()
+                if not text:
+                    continue
+                if result.is_final:
+                    self._finals.append(text)
+                    hypothesis = " ".join(self._finals)
+                else:
+                    hypothesis = " ".join([*self._finals, text])
+                if self._on_result is not None:
+                    try:
+                        self._on_result(hypothesis, result)
+                    except Exception:
+                        logger.exception(
+                            "twilio_stream_result_callback_failed",
+                            extra={"call_sid": self._call_sid},
+                        )
+        except Exception:
+            logger.exception(
+                "twilio_stream_recognition_failed", extra={"call_sid": self._call_sid}
+            )
+
+    async def transcript(self) -> str:
+        """Wait for recognition to end and return the final transcript."""
+        await asyncio.shield(self._task)
+        return " ".join(self._finals).strip()
+
+    async def cancel(self) -> None:
+        self.finish()
+        if not self._task.done():
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
@@ -18,12 +18,11 @@ from .email_service import email_service
 from . import sessions
 from . import subscription as subscription_service
 from ..config import get_settings
-from ..db import SQLALCHEMY_AVAILABLE, SessionLocal
-from ..db_models import BusinessDB
 from ..metrics import CallbackItem, metrics
 from ..repositories import appointments_repo, customers_repo, conversations_repo
 from ..business_config import (
     get_calendar_id_for_business,
+    get_tenant_config,
     get_language_for_business,
     get_vertical_for_business,
 )
@@ -53,14 +52,8 @@ NEGATIVE = {"no", "n", "nope"}
 def _intent_threshold_for_business(business_id: str | None) -> float:
     settings = get_settings()
     default_threshold = getattr(settings.nlu, "intent_confidence_threshold", 0.35)
-    if not business_id or not (SQLALCHEMY_AVAILABLE and SessionLocal is not None):
-        return float(default_threshold)
-    session = SessionLocal()
-    try:
-        row = session.get(BusinessDB, business_id)
-    finally:
-        session.close()
-    raw = getattr(row, "intent_threshold", None) if row is not None else None
+    config = get_tenant_config(business_id)
+    raw = config.intent_threshold if config is not None else None
     try:
         val = float(raw) if raw is not None else float(default_threshold)
         return val / 100.0 if val > 1 else val
@@ -73,17 +66,12 @@ DEFAULT_BUSINESS_NAME = "Bristol Plumbing"
 
 def _get_emergency_keywords_for_business(business_id: str | None) -> list[str]:
     """Return per-tenant emergency keywords, falling back to defaults."""
-    if business_id and SQLALCHEMY_AVAILABLE and SessionLocal is not None:
-        session_db = SessionLocal()
-        try:
-            row = session_db.get(BusinessDB, business_id)
-        finally:
-            session_db.close()
-        if row is not None and getattr(row, "emergency_keywords", None):
-            raw = row.emergency_keywords or ""
-            keywords = [k.strip().lower() for k in raw.split(",") if k.strip()]
-            if keywords:
-                return keywords
+    config = get_tenant_config(business_id)
+    if config is not None and config.emergency_keywords:
+        raw = config.emergency_keywords
+        keywords = [k.strip().lower() for k in raw.split(",") if k.strip()]
+        if keywords:
+            return keywords
     return EMERGENCY_KEYWORDS
 
 
@@ -118,14 +106,9 @@ def _score_emergency_signal(
 
 def _get_business_name(business_id: str | None) -> str:
     """Return the business display name for voice/SMS copy."""
-    if business_id and SQLALCHEMY_AVAILABLE and SessionLocal is not None:
-        session_db = SessionLocal()
-        try:
-            row = session_db.get(BusinessDB, business_id)
-        finally:
-            session_db.close()
-        if row is not None and getattr(row, "name", None):
-            return row.name  # type: ignore[return-value]
+    config = get_tenant_config(business_id)
+    if config is not None and config.name:
+        return config.name
     return DEFAULT_BUSINESS_NAME
 
 
@@ -182,14 +165,8 @@ SERVICE_TYPE_DURATIONS_MINUTES: dict[str, int] = {
 
 def _get_service_duration_overrides(business_id: str | None) -> dict[str, int]:
     """Return per-tenant overrides for service durations, if configured."""
-    if not business_id or not (SQLALCHEMY_AVAILABLE and SessionLocal is not None):
-        return {}
-    session_db = SessionLocal()
-    try:
-        row = session_db.get(BusinessDB, business_id)
-    finally:
-        session_db.close()
-    raw = getattr(row, "service_duration_config", None) if row is not None else None
+    config = get_tenant_config(business_id)
+    raw = config.service_duration_config if config is not None else None
     if not raw:
         return {}
     overrides: dict[str, int] = {}
@@ -309,6 +286,62 @@ def _normalize_intent_label(intent: str | None) -> str | None:
     return intent if intent in ALLOWED_ASSISTANT_INTENTS else "fallback"
 
 
+# Number of candidate slots fetched per availability search; declined
+# proposals move on to the next cached candidate.
+SLOT_ALTERNATIVES = 3
+
+
+def _slot_to_state(slot: TimeSlot) -> dict:
+    return {
+        "start": slot.start.isoformat(),
+        "end": slot.end.isoformat(),
+        "technician_id": slot.technician_id,
+    }
+
+
+def _slot_from_state(data: dict) -> TimeSlot | None:
+    try:
+        start = datetime.fromisoformat(str(data["start"]))
+        end = datetime.fromisoformat(str(data["end"]))
+    except (KeyError, TypeError, ValueError):
+        return None
+    return TimeSlot(start=start, end=end, technician_id=data.get("technician_id"))
+
+
+def _next_slot_alternative(session: CallSession, business_id: str) -> TimeSlot | None:
+    """Drop the declined proposal and return the next cached slot still free.
+
+    Cached candidates are re-checked against local bookings, which is cheap
+    and needs no calendar round trip.
+    """
+    remaining = list(session.slot_alternatives[1:])
+    while remaining:
+        slot = _slot_from_state(remaining[0])
+        if slot is not None and not calendar_service.has_conflict(
+            business_id=business_id,
+            start=slot.start,
+            end=slot.end,
+            technician_id=slot.technician_id,
+            address=session.address,
+            is_emergency=session.is_emergency,
+        ):
+            session.slot_alternatives = remaining
+            return slot
+        remaining.pop(0)
+    session.slot_alternatives = []
+    return None
+
+
+def _proposed_technician_id(session: CallSession) -> str | None:
+    """Technician attached to the slot currently proposed, if any."""
+    if not session.slot_alternatives or not session.requested_time:
+        return None
+    proposed = session.slot_alternatives[0]
+    if proposed.get("start") != session.requested_time:
+        return None
+    return proposed.get("technician_id")
+
+
 def _session_state(session: CallSession, pending_slot: TimeSlot | None = None) -> dict:
     state: dict = {
         "session_id": session.id,
@@ -331,6 +364,12 @@ def _session_state(session: CallSession, pending_slot: TimeSlot | None = None) -
             "start": pending_slot.start.isoformat(),
             "end": pending_slot.end.isoformat(),
         }
+        if pending_slot.technician_id:
+            state["proposed_slot"]["technician_id"] = pending_slot.technician_id
+        state["alternative_slots"] = [
+            {"start": alt.get("start"), "end": alt.get("end")}
+            for alt in session.slot_alternatives[1:]
+        ]
     return state
 
 
@@ -394,6 +433,33 @@ def _handoff_to_human(
     return ConversationResult(reply_text=reply, new_state=_session_state(session))
 
 
+def recent_messages(session_id: str) -> list[tuple[str, str | None]]:
+    """The last four ``(role, text)`` pairs of a session's conversation."""
+    conv = conversations_repo.get_by_session(session_id)
+    return [
+        (getattr(m, "role", ""), getattr(m, "text", None))
+        for m in (getattr(conv, "messages", None) or [])[-4:]
+    ]
+
+
+def user_turns(
+    messages: list[tuple[str, str | None]], pending: str | None = None
+) -> list[str]:
+    """Caller turns among ``messages`` plus ``pending``, keeping the last four.
+
+    ``pending`` is a caller turn about to be appended; the streaming
+    websocket passes it to classify ahead of the conversation manager.
+    """
+    if pending:
+        messages = [*messages, ("user", pending)]
+    return [text for role, text in messages[-4:] if role == "user" and text]
+
+
+def recent_user_turns(session_id: str, pending: str | None = None) -> list[str]:
+    """Caller turns among the last four messages, used as intent context."""
+    return user_turns(recent_messages(session_id), pending)
+
+
 class ConversationManager:
     """Simple state-machine-based conversation manager for Phase 1."""
 
@@ -450,14 +516,7 @@ class ConversationManager:
         intent_meta = None
         classified_intent: str | None = None
         intent_low_confidence = False
-        history: list[str] = []
-        conv = conversations_repo.get_by_session(session.id)
-        if conv and getattr(conv, "messages", None):
-            history = [
-                m.text
-                for m in conv.messages[-4:]
-                if getattr(m, "role", "") == "user" and getattr(m, "text", None)
-            ]
+        history = recent_user_turns(session.id)
         if normalized:
             try:
                 intent_meta = await classify_intent_with_metadata(
@@ -783,13 +842,24 @@ class ConversationManager:
                 business_id,
             )
             calendar_id = get_calendar_id_for_business(business_id)
-            slots = await calendar_service.find_slots(
+            # Fetch several candidates across technicians so a declined slot
+            # can be replaced without searching again.
+            slots = await calendar_service.find_availability(
                 duration_minutes=duration_minutes,
                 calendar_id=calendar_id,
                 business_id=business_id,
                 address=session.address,
                 is_emergency=session.is_emergency,
+                limit=SLOT_ALTERNATIVES,
             )
+            if not slots:
+                slots = await calendar_service.find_slots(
+                    duration_minutes=duration_minutes,
+                    calendar_id=calendar_id,
+                    business_id=business_id,
+                    address=session.address,
+                    is_emergency=session.is_emergency,
+                )
             slot: TimeSlot | None = slots[0] if slots else None
             if not slot:
                 reply = conversation_text(language_code, "schedule_no_slot")
@@ -800,6 +870,7 @@ class ConversationManager:
                 )
 
             session.stage = "CONFIRM_SLOT"
+            session.slot_alternatives = [_slot_to_state(s) for s in slots]
             session.requested_time = slot.start.isoformat()
             when_str = slot.start.strftime("%A at %I:%M %p UTC")
             # Test suite looks for this phrase.
@@ -812,6 +883,17 @@ class ConversationManager:
         # CONFIRM_SLOT: finalize appointment or mark for follow-up.
         if session.stage == "CONFIRM_SLOT":
             if "no" in lower:
+                alternative = _next_slot_alternative(session, business_id)
+                if alternative is not None:
+                    session.requested_time = alternative.start.isoformat()
+                    when_str = alternative.start.strftime("%A at %I:%M %p UTC")
+                    reply = conversation_text(
+                        language_code, "schedule_propose_alternative", when=when_str
+                    )
+                    return ConversationResult(
+                        reply_text=reply,
+                        new_state=_session_state(session, pending_slot=alternative),
+                    )
                 reply = conversation_text(language_code, "confirm_slot_decline")
                 session.stage = "COMPLETED"
                 session.status = "PENDING_FOLLOWUP"
@@ -835,7 +917,11 @@ class ConversationManager:
             if session.requested_time:
                 start = datetime.fromisoformat(session.requested_time)
                 end = start + timedelta(minutes=duration_minutes)
-                slot = TimeSlot(start=start, end=end)
+                slot = TimeSlot(
+                    start=start,
+                    end=end,
+                    technician_id=_proposed_technician_id(session),
+                )
             else:  # pragma: no cover - defensive fallback
                 calendar_id = get_calendar_id_for_business(business_id)
                 slots = await calendar_service.find_slots(
@@ -917,7 +1003,9 @@ class ConversationManager:
                 tags=[],
                 quoted_value=quoted_value,
                 quote_status=quote_status,
+                technician_id=slot.technician_id,
             )
+            session.slot_alternatives = []
             metrics.appointments_scheduled += 1
 
             logger.info(
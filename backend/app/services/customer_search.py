@@ -0,0 +1,237 @@
+from __future__ import annotations
+
+from bisect import bisect_left, insort
+from dataclasses import dataclass
+import re
+import threading
+from typing import Dict, Iterable, List, Set, Tuple
+
+# Minimum trigram similarity for a fuzzy name match (pg_trgm's default).
+MIN_SIMILARITY = 0.3
+
+# Rank tiers; higher sorts first. Fuzzy matches score
+# ``SCORE_FUZZY * similarity`` and so always rank below substring matches.
+SCORE_PHONE_EXACT = 100.0
+SCORE_PHONE_PARTIAL = 80.0
+SCORE_NAME_EXACT = 70.0
+SCORE_NAME_PREFIX = 60.0
+SCORE_NAME_SUBSTRING = 45.0
+SCORE_FUZZY = 40.0
+
+# Phone queries need enough digits to be selective.
+MIN_PHONE_QUERY_DIGITS = 4
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def normalize_phone(raw: str | None) -> str:
+    """Return a phone number in E.164 form where it can be inferred.
+
+    Ten-digit numbers are assumed to be North American (+1). Numbers that
+    are too short to be dialable (e.g. demo "555-0001" values) are returned
+    as bare digits so they still compare equal to each other.
+    """
+    text = (raw or "").strip()
+    digits = "".join(ch for ch in text if ch.isdigit())
+    if not digits:
+        return ""
+    if text.startswith("+"):
+        return f"+{digits}"
+    if len(digits) == 10:
+        return f"+1{digits}"
+    if len(digits) == 11 and digits.startswith("1"):
+        return f"+{digits}"
+    return digits
+
+
+def phone_query_digits(query: str) -> str | None:
+    """Return the digits of ``query`` when it looks like a phone number."""
+    if any(ch.isalpha() for ch in query):
+        return None
+    digits = "".join(ch for ch in query if ch.isdigit())
+    return digits if len(digits) >= MIN_PHONE_QUERY_DIGITS else None
+
+
+def name_tokens(text: str | None) -> List[str]:
+    return _TOKEN_RE.findall((text or "").casefold())
+
+
+def _fold(text: str | None) -> str:
+    return " ".join((text or "").casefold().split())
+
+
+def name_trigrams(text: str | None) -> Set[str]:
+    """pg_trgm-style trigrams: each word padded with two leading spaces and
+    one trailing space."""
+    grams: Set[str] = set()
+    for token in name_tokens(text):
+        padded = f"  {token} "
+        grams.update(padded[i : i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def _plain_trigrams(text: str) -> Set[str]:
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+@dataclass(frozen=True)
+class _Entry:
+    name: str
+    tokens: Tuple[str, ...]
+    grams: frozenset[str]
+    phone_key: str
+    phone_digits: str
+
+
+class CustomerSearchIndex:
+    """In-process search index over one tenant's customers.
+
+    Supports exact E.164 phone lookup, partial phone digits, name-token
+    prefix matching, substring matching and trigram fuzzy matching, all
+    driven from posting lists so a query only touches candidate customers.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._entries: Dict[str, _Entry] = {}
+        self._by_phone: Dict[str, Set[str]] = {}
+        self._tokens: List[Tuple[str, str]] = []
+        self._name_grams: Dict[str, Set[str]] = {}
+        self._digit_grams: Dict[str, Set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, customer_id: str, name: str | None, phone: str | None) -> None:
+        """Index a customer, replacing any previous entry for the same id."""
+        phone_key = normalize_phone(phone)
+        entry = _Entry(
+            name=_fold(name),
+            tokens=tuple(sorted(set(name_tokens(name)))),
+            grams=frozenset(name_trigrams(name)),
+            phone_key=phone_key,
+            phone_digits=phone_key.lstrip("+"),
+        )
+        with self._lock:
+            self._remove_locked(customer_id)
+            self._entries[customer_id] = entry
+            if entry.phone_key:
+                self._by_phone.setdefault(entry.phone_key, set()).add(customer_id)
+            for token in entry.tokens:
+                insort(self._tokens, (token, customer_id))
+            for gram in entry.grams:
+                self._name_grams.setdefault(gram, set()).add(customer_id)
+            for gram in _plain_trigrams(entry.phone_digits):
+                self._digit_grams.setdefault(gram, set()).add(customer_id)
+
+    def remove(self, customer_id: str) -> None:
+        with self._lock:
+            self._remove_locked(customer_id)
+
+    def _remove_locked(self, customer_id: str) -> None:
+        entry = self._entries.pop(customer_id, None)
+        if entry is None:
+            return
+        _discard(self._by_phone, entry.phone_key, customer_id)
+        for token in entry.tokens:
+            pos = bisect_left(self._tokens, (token, customer_id))
+            if pos < len(self._tokens) and self._tokens[pos] == (token, customer_id):
+                self._tokens.pop(pos)
+        for gram in entry.grams:
+            _discard(self._name_grams, gram, customer_id)
+        for gram in _plain_trigrams(entry.phone_digits):
+            _discard(self._digit_grams, gram, customer_id)
+
+    def search(self, query: str, *, limit: int = 20, offset: int = 0) -> List[str]:
+        """Return one page of customer ids ranked by match quality."""
+        return self.ranked(query)[offset : offset + limit]
+
+    def ranked(self, query: str) -> List[str]:
+        """Return every matching customer id, best match first."""
+        text = (query or "").strip()
+        if not text:
+            return []
+        with self._lock:
+            scores = self._score_locked(text)
+            ranked = sorted(
+                scores.items(),
+                key=lambda item: (-item[1], self._entries[item[0]].name, item[0]),
+            )
+        return [customer_id for customer_id, _ in ranked]
+
+    def _score_locked(self, text: str) -> Dict[str, float]:
+        scores: Dict[str, float] = {}
+
+        def _bump(customer_id: str, score: float) -> None:
+            if score > scores.get(customer_id, 0.0):
+                scores[customer_id] = score
+
+        digits = phone_query_digits(text)
+        if digits:
+            for customer_id in self._by_phone.get(normalize_phone(text), ()):
+                _bump(customer_id, SCORE_PHONE_EXACT)
+            for customer_id in self._intersect(
+                self._digit_grams, _plain_trigrams(digits)
+            ):
+                if digits in self._entries[customer_id].phone_digits:
+                    _bump(customer_id, SCORE_PHONE_PARTIAL)
+            return scores
+
+        folded = _fold(text)
+        tokens = name_tokens(text)
+
+        # Every query token must prefix some name token; candidates come from
+        # the sorted token list range for the first query token.
+        first = tokens[0] if tokens else ""
+        pos = bisect_left(self._tokens, (first, "")) if first else len(self._tokens)
+        while pos < len(self._tokens) and self._tokens[pos][0].startswith(first):
+            customer_id = self._tokens[pos][1]
+            pos += 1
+            entry = self._entries[customer_id]
+            if all(any(t.startswith(q) for t in entry.tokens) for q in tokens[1:]):
+                exact = entry.name == folded
+                _bump(customer_id, SCORE_NAME_EXACT if exact else SCORE_NAME_PREFIX)
+
+        inner = set().union(*(_plain_trigrams(t) for t in tokens))
+        if inner:
+            candidates: Iterable[str] = self._intersect(self._name_grams, inner)
+        else:
+            # Every query token is under three characters (e.g. "al" or
+            # "n s"), so there are no trigrams to look up; scan the tenant.
+            candidates = self._entries
+        for customer_id in candidates:
+            if folded in self._entries[customer_id].name:
+                _bump(customer_id, SCORE_NAME_SUBSTRING)
+
+        query_grams = name_trigrams(text)
+        overlap: Dict[str, int] = {}
+        for gram in query_grams:
+            for customer_id in self._name_grams.get(gram, ()):
+                overlap[customer_id] = overlap.get(customer_id, 0) + 1
+        for customer_id, shared in overlap.items():
+            union = len(query_grams) + len(self._entries[customer_id].grams) - shared
+            similarity = shared / union if union else 0.0
+            if similarity >= MIN_SIMILARITY:
+                _bump(customer_id, SCORE_FUZZY * similarity)
+        return scores
+
+    @staticmethod
+    def _intersect(postings: Dict[str, Set[str]], grams: Set[str]) -> Set[str]:
+        if not grams:
+            return set()
+        lists = sorted((postings.get(g, set()) for g in grams), key=len)
+        result = set(lists[0])
+        for other in lists[1:]:
+            result &= other
+            if not result:
+                break
+        return result
+
+
+def _discard(postings: Dict[str, Set[str]], key: str, customer_id: str) -> None:
+    ids = postings.get(key)
+    if ids is None:
+        return
+    ids.discard(customer_id)
+    if not ids:
+        postings.pop(key, None)
@@ -10,6 +10,7 @@ from typing import List
 import httpx
 
 from ..config import get_settings
+from ..services.oauth_clients import PooledClient, oauth_client_pool
 from ..services.oauth_tokens import oauth_store
 from ..db import SQLALCHEMY_AVAILABLE, SessionLocal
 from ..db_models import BusinessDB
@@ -45,6 +46,7 @@ class EmailService:
 
     def __init__(self) -> None:
         self._sent: List[SentEmail] = []
+        oauth_client_pool.register("gmail", self._refresh_pooled_token)
 
     @property
     def sent_messages(self) -> List[SentEmail]:
@@ -114,6 +116,52 @@ class EmailService:
 
     async def _refresh_token_if_needed(
         self, business_id: str, client_id: str | None, client_secret: str | None
+    ):
+        pooled = oauth_client_pool.get("gmail", business_id)
+        if pooled is not None:
+            return pooled.client
+        tok = await self._load_fresh_token(business_id, client_id, client_secret)
+        if tok is not None:
+            oauth_client_pool.put(
+                "gmail",
+                business_id,
+                PooledClient(
+                    client=tok, expires_at=tok.expires_at, access_token=tok.access_token
+                ),
+            )
+        return tok
+
+    def _refresh_pooled_token(self, business_id: str) -> PooledClient | None:
+        """Background refresh hook for the OAuth client pool.
+
+        Runs on the pool's refresher thread, which has no event loop.
+        """
+        oauth = get_settings().oauth
+        if not (oauth.google_client_id and oauth.google_client_secret):
+            return None
+        tok = asyncio.run(
+            self._load_fresh_token(
+                business_id,
+                oauth.google_client_id,
+                oauth.google_client_secret,
+                refresh_within=float("inf"),
+                stub_fallback=False,
+            )
+        )
+        if tok is None:
+            return None
+        return PooledClient(
+            client=tok, expires_at=tok.expires_at, access_token=tok.access_token
+        )
+
+    async def _load_fresh_token(
+        self,
+        business_id: str,
+        client_id: str | None,
+        client_secret: str | None,
+        *,
+        refresh_within: float = 60.0,
+        stub_fallback: bool = True,
     ):
         tok = self._load_gmail_tokens_from_db(business_id) or oauth_store.get_tokens(
             "gmail", business_id
@@ -121,7 +169,7 @@ class EmailService:
         if not tok:
             return None
         now = time.time()
-        if tok.expires_at - now > 60:
+        if tok.expires_at - now > refresh_within:
             return tok
         # Try real refresh if credentials are available; otherwise fall back to stub refresh.
         if client_id and client_secret and tok.refresh_token:
@@ -155,6 +203,8 @@ class EmailService:
                     exc_info=True,
                     extra={"business_id": business_id},
                 )
+        if not stub_fallback:
+            return None
         # Stub refresh path.
         return oauth_store.refresh("gmail", business_id)
 
@@ -0,0 +1,263 @@
+from __future__ import annotations
+
+import asyncio
+from bisect import insort
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+import threading
+import time
+from typing import Awaitable, Callable, Dict, List, Tuple
+
+from ..config import get_settings
+from ..metrics import metrics
+from .invalidation_bus import invalidation_bus
+
+BusyRange = Tuple[datetime, datetime]
+CacheKey = Tuple[str, str]
+
+# Returned by fill callbacks: (window_start, window_end, busy ranges).
+FreeBusyWindow = Tuple[datetime, datetime, List[BusyRange]]
+
+
+def freebusy_key(business_id: str | None, calendar_id: str) -> CacheKey:
+    return (business_id or "", calendar_id)
+
+
+@dataclass
+class _Entry:
+    window_start: datetime
+    window_end: datetime
+    expires_at: float
+    # Sorted (start, end, event_id); FreeBusy blocks carry no event id.
+    ranges: List[Tuple[datetime, datetime, str]] = field(default_factory=list)
+    events: Dict[str, BusyRange] = field(default_factory=dict)
+
+    def covers(self, start: datetime, end: datetime) -> bool:
+        return self.window_start <= start and end <= self.window_end
+
+    def overlapping(self, start: datetime, end: datetime) -> List[BusyRange]:
+        return [(s, e) for s, e, _ in self.ranges if s < end and e > start]
+
+    def add(self, event_id: str, start: datetime, end: datetime) -> None:
+        self.events[event_id] = (start, end)
+        insort(self.ranges, (start, end, event_id))
+
+    def discard(self, event_id: str) -> None:
+        if self.events.pop(event_id, None) is None:
+            return
+        self.ranges = [r for r in self.ranges if r[2] != event_id]
+
+
+class FreeBusyCache:
+    """Per-calendar busy intervals, filled from FreeBusy and patched in place.
+
+    An entry covers a fixed window. Changes seen by the incremental sync
+    (push notifications) and by our own event writes are applied to it
+    directly when the affected interval is known. When it is not, e.g. an
+    event that existed before the fill was moved or cancelled, the entry is
+    dropped and the next read refetches. The TTL is a safety net for
+    calendars without a push channel.
+
+    Concurrent misses for the same calendar share a single fetch.
+    """
+
+    def __init__(self, ttl_seconds: float = 300.0, max_entries: int = 1024) -> None:
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[CacheKey, _Entry] = OrderedDict()
+        self._epoch = 0
+        self._generations: Dict[str, int] = {}
+        self._inflight: Dict[CacheKey, asyncio.Future] = {}
+        self._ttl_seconds = ttl_seconds
+        self._max_entries = max_entries
+
+    def configure(self, *, ttl_seconds: float | None = None) -> None:
+        if ttl_seconds is not None:
+            self._ttl_seconds = ttl_seconds
+
+    def _live_entry(self, key: CacheKey) -> _Entry | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= time.monotonic():
+            self._entries.pop(key, None)
+            return None
+        return entry
+
+    def lookup(
+        self, key: CacheKey, start: datetime, end: datetime
+    ) -> List[BusyRange] | None:
+        """Return busy ranges overlapping [start, end), or None on a miss."""
+        with self._lock:
+            entry = self._live_entry(key)
+            if entry is None or not entry.covers(start, end):
+                return None
+            self._entries.move_to_end(key)
+            return entry.overlapping(start, end)
+
+    async def get_or_fetch(
+        self,
+        key: CacheKey,
+        start: datetime,
+        end: datetime,
+        fetch: Callable[[], Awaitable[FreeBusyWindow]],
+    ) -> List[BusyRange]:
+        """Return cached ranges for [start, end), fetching the window on a miss.
+
+        ``fetch`` must return a window covering [start, end). Errors from
+        ``fetch`` propagate to every caller waiting on it.
+        """
+        cached = self.lookup(key, start, end)
+        if cached is not None:
+            metrics.freebusy_cache_hits += 1
+            return cached
+
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            pending = self._inflight.get(key)
+            if pending is not None and pending.get_loop() is loop:
+                owner = False
+            else:
+                owner = True
+                pending = loop.create_future()
+                self._inflight[key] = pending
+                generation = self._generation_locked(key[0])
+        if not owner:
+            metrics.freebusy_cache_hits += 1
+            try:
+                window = await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise
+                # The fetching caller was cancelled; try again ourselves.
+                return await self.get_or_fetch(key, start, end, fetch)
+            if window[0] <= start and end <= window[1]:
+                return _overlapping(window[2], start, end)
+            return await self.get_or_fetch(key, start, end, fetch)
+
+        metrics.freebusy_cache_misses += 1
+        try:
+            window = await fetch()
+        except asyncio.CancelledError:
+            pending.cancel()
+            raise
+        except Exception as exc:
+            pending.set_exception(exc)
+            # Mark retrieved so an unawaited future does not log a warning.
+            pending.exception()
+            raise
+        else:
+            pending.set_result(window)
+            self.store(key, *window, generation=generation)
+            return _overlapping(window[2], start, end)
+        finally:
+            with self._lock:
+                if self._inflight.get(key) is pending:
+                    self._inflight.pop(key, None)
+
+    def generation(self, business_id: str | None) -> Tuple[int, int]:
+        """Token to pass to ``store`` so fills that raced a change are dropped."""
+        with self._lock:
+            return self._generation_locked(business_id or "")
+
+    def _generation_locked(self, business_id: str) -> Tuple[int, int]:
+        return (self._epoch, self._generations.get(business_id, 0))
+
+    def store(
+        self,
+        key: CacheKey,
+        window_start: datetime,
+        window_end: datetime,
+        ranges: List[BusyRange],
+        *,
+        generation: Tuple[int, int],
+    ) -> None:
+        """Cache a FreeBusy window unless the tenant changed while fetching."""
+        with self._lock:
+            if generation != self._generation_locked(key[0]):
+                return
+            self._entries[key] = _Entry(
+                window_start=window_start,
+                window_end=window_end,
+                expires_at=time.monotonic() + self._ttl_seconds,
+                ranges=sorted((s, e, "") for s, e in ranges),
+            )
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def apply_change(
+        self,
+        key: CacheKey,
+        event_id: str,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        *,
+        removed: bool = False,
+        created: bool = False,
+    ) -> None:
+        """Apply one event change to a cached window.
+
+        ``removed`` marks a cancelled (or non-blocking) event. ``created``
+        marks an event that cannot already be in the FreeBusy blocks, so it
+        is safe to add without knowing any previous interval.
+        """
+        with self._lock:
+            self._bump_locked(key[0])
+            entry = self._live_entry(key)
+            if entry is None:
+                return
+            known = event_id in entry.events
+            if not known and (removed or not created):
+                # The old interval is hidden inside an anonymous block.
+                self._entries.pop(key, None)
+                metrics.freebusy_cache_invalidations += 1
+                return
+            entry.discard(event_id)
+            if removed or start is None or end is None or start >= end:
+                return
+            if not known:
+                # The fill may already have seen the new event as a block.
+                anonymous = (start, end, "")
+                if anonymous in entry.ranges:
+                    entry.ranges.remove(anonymous)
+            entry.add(event_id, start, end)
+
+    def invalidate(self, business_id: str | None = None) -> None:
+        with self._lock:
+            if business_id is None:
+                self._epoch += 1
+                dropped = len(self._entries)
+                self._entries.clear()
+            else:
+                self._bump_locked(business_id)
+                stale = [key for key in self._entries if key[0] == business_id]
+                for key in stale:
+                    self._entries.pop(key, None)
+                dropped = len(stale)
+        metrics.freebusy_cache_invalidations += dropped
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._generations.clear()
+
+    def _bump_locked(self, business_id: str) -> None:
+        self._generations[business_id] = self._generations.get(business_id, 0) + 1
+
+
+def _overlapping(
+    ranges: List[BusyRange], start: datetime, end: datetime
+) -> List[BusyRange]:
+    return sorted((s, e) for s, e in ranges if s < end and e > start)
+
+
+def _create_freebusy_cache() -> FreeBusyCache:
+    settings = get_settings().calendar
+    return FreeBusyCache(
+        ttl_seconds=getattr(settings, "freebusy_cache_ttl_seconds", 300.0)
+    )
+
+
+freebusy_cache = _create_freebusy_cache()
+invalidation_bus.subscribe(freebusy_cache.invalidate)
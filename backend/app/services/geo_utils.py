@@ -2,13 +2,23 @@ from __future__ import annotations
 
 import re
 import os
-from typing import Tuple
+from typing import Sequence, Tuple
 import httpx
 import math
 
+from ..metrics import metrics
+from .geocoding import (
+    DEFINITIVE_STATUSES,
+    GEOCODE_TIMEOUT_SECONDS,
+    GEOCODE_URL,
+    geocoding_service,
+    parse_geocode_response,
+)
+
 
 ZIP_RE = re.compile(r"\b(\d{5})\b")
-_GEOCODE_CACHE: dict[str, Tuple[float, float] | None] = {}
+# In-process layer of the geocode cache, kept for callers that reset it.
+_GEOCODE_CACHE = geocoding_service.memory
 
 
 def derive_neighborhood_label(address: str | None) -> str:
@@ -41,48 +51,42 @@ def geocode_address(address: str | None) -> Tuple[float, float] | None:
     """Best-effort geocoding using Google Maps Geocoding API if configured.
 
     Returns (lat, lng) on success, or None on failure/misconfiguration. Results
-    are cached in-process to avoid repeated external calls for the same address.
+    are cached in memory and in the persistent geocode cache; addresses that
+    cannot be resolved fall back to their ZIP centroid when that dataset is
+    configured. Async callers should use ``geocoding_service`` instead.
     """
     if not address:
         return None
     addr = address.strip()
     if not addr:
         return None
-    if addr in _GEOCODE_CACHE:
-        return _GEOCODE_CACHE[addr]
+    found, coords = geocoding_service.lookup(addr)
+    if found:
+        return coords or geocoding_service.zip_centroid(addr)
 
     api_key = os.getenv("GOOGLE_MAPS_API_KEY")
     if not api_key:
-        _GEOCODE_CACHE[addr] = None
-        return None
+        return geocoding_service.zip_centroid(addr)
 
     try:
+        metrics.geocode_requests += 1
         resp = httpx.get(
-            "https://maps.googleapis.com/maps/api/geocode/json",
+            GEOCODE_URL,
             params={"address": addr, "key": api_key},
-            timeout=5.0,
+            timeout=GEOCODE_TIMEOUT_SECONDS,
         )
         resp.raise_for_status()
         data = resp.json()
-        if data.get("status") != "OK":
-            _GEOCODE_CACHE[addr] = None
-            return None
-        results = data.get("results") or []
-        if not results:
-            _GEOCODE_CACHE[addr] = None
-            return None
-        loc = results[0].get("geometry", {}).get("location", {})
-        lat = loc.get("lat")
-        lng = loc.get("lng")
-        if lat is None or lng is None:
-            _GEOCODE_CACHE[addr] = None
-            return None
-        coords = (float(lat), float(lng))
-        _GEOCODE_CACHE[addr] = coords
-        return coords
     except Exception:
-        _GEOCODE_CACHE[addr] = None
-        return None
+        metrics.geocode_failures += 1
+        return geocoding_service.zip_centroid(addr)
+    if not isinstance(data, dict) or data.get("status") not in DEFINITIVE_STATUSES:
+        # Quota or server errors say nothing about the address; retry later.
+        metrics.geocode_failures += 1
+        return geocoding_service.zip_centroid(addr)
+    coords = parse_geocode_response(data)
+    geocoding_service.remember(addr, coords)
+    return coords or geocoding_service.zip_centroid(addr)
 
 
 def haversine_km(a: tuple[float, float], b: tuple[float, float]) -> float:
@@ -98,3 +102,29 @@ def haversine_km(a: tuple[float, float], b: tuple[float, float]) -> float:
         + math.cos(lat1_r) * math.cos(lat2_r) * math.sin(dlon / 2) ** 2
     )
     return 2 * R * math.asin(math.sqrt(h))
+
+
+def haversine_matrix_km(points: Sequence[tuple[float, float]]) -> list[list[float]]:
+    """Return the symmetric matrix of kilometers between (lat, lng) pairs.
+
+    Radians and latitude cosines are computed once per point rather than
+    once per pair, and each pair is evaluated once.
+    """
+    R = 6371  # Earth radius km
+    radians = [(math.radians(lat), math.radians(lng)) for lat, lng in points]
+    cos_lat = [math.cos(lat) for lat, _ in radians]
+    size = len(points)
+    matrix = [[0.0] * size for _ in range(size)]
+    for i in range(size):
+        lat_i, lng_i = radians[i]
+        row = matrix[i]
+        for j in range(i + 1, size):
+            lat_j, lng_j = radians[j]
+            h = (
+                math.sin((lat_j - lat_i) / 2) ** 2
+                + cos_lat[i] * cos_lat[j] * math.sin((lng_j - lng_i) / 2) ** 2
+            )
+            km = 2 * R * math.asin(math.sqrt(min(1.0, h)))
+            row[j] = km
+            matrix[j][i] = km
+    return matrix
@@ -0,0 +1,458 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+import csv
+from datetime import UTC, datetime, timedelta
+import logging
+import os
+import re
+import threading
+from typing import Any, Dict, Iterable, List, Tuple
+
+import anyio
+import httpx
+
+from ..config import get_settings
+from ..db import SQLALCHEMY_AVAILABLE, SessionLocal
+from ..db_models import GeocodeCacheDB
+from ..metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+Coords = Tuple[float, float]
+
+GEOCODE_URL = "https://maps.googleapis.com/maps/api/geocode/json"
+GEOCODE_TIMEOUT_SECONDS = 5.0
+# Statuses that describe the address itself; anything else (quota, denied,
+# server errors) is transient and must not be cached.
+DEFINITIVE_STATUSES = frozenset({"OK", "ZERO_RESULTS"})
+# Addresses Google could not match are retried after this long.
+NEGATIVE_TTL = timedelta(days=7)
+
+# ZIP or ZIP+4; the last match wins so house numbers are not mistaken for it.
+_ZIP_RE = re.compile(r"\b(\d{5})(?:-\d{4})?\b")
+_IN_CHUNK = 500
+
+
+def normalize_address(address: str | None) -> str:
+    """Cache key for an address: lower-cased with whitespace collapsed."""
+    if not address:
+        return ""
+    return " ".join(str(address).lower().split())
+
+
+def parse_geocode_response(data: Any) -> Coords | None:
+    """Coordinates of the first result in a Geocoding API payload."""
+    if not isinstance(data, dict) or data.get("status") != "OK":
+        return None
+    results = data.get("results") or []
+    if not results:
+        return None
+    location = (results[0].get("geometry") or {}).get("location") or {}
+    lat = location.get("lat")
+    lng = location.get("lng")
+    if lat is None or lng is None:
+        return None
+    return (float(lat), float(lng))
+
+
+def extract_zip(address: str | None) -> str | None:
+    matches = _ZIP_RE.findall(address or "")
+    return matches[-1] if matches else None
+
+
+def load_zip_centroids(path: str) -> Dict[str, Coords]:
+    """Read ZIP centroids from a ``zip,lat,lng`` CSV or a Census ZCTA gazetteer.
+
+    The gazetteer is tab-separated with ``GEOID``, ``INTPTLAT`` and
+    ``INTPTLONG`` columns; the delimiter is detected from the header.
+    """
+    centroids: Dict[str, Coords] = {}
+    with open(path, newline="", encoding="utf-8") as handle:
+        header = handle.readline()
+        delimiter = "\t" if "\t" in header else ","
+        columns = [name.strip().lower() for name in header.split(delimiter)]
+
+        def _column(*names: str) -> int:
+            for name in names:
+                if name in columns:
+                    return columns.index(name)
+            raise ValueError(f"ZIP centroid file is missing a {names[0]} column")
+
+        zip_col = _column("zip", "zcta", "geoid")
+        lat_col = _column("lat", "latitude", "intptlat")
+        lng_col = _column("lng", "lon", "longitude", "intptlong")
+        for row in csv.reader(handle, delimiter=delimiter):
+            try:
+                code = row[zip_col].strip().zfill(5)
+                centroids[code] = (float(row[lat_col]), float(row[lng_col]))
+            except (IndexError, ValueError):
+                continue
+    return centroids
+
+
+class _LruCache:
+    """Thread-safe bounded map of address key to coordinates.
+
+    A stored ``None`` records that the geocoder found no match.
+    """
+
+    _MISSING = object()
+
+    def __init__(self, max_entries: int) -> None:
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, Coords | None] = OrderedDict()
+        self.max_entries = max(1, max_entries)
+
+    def get(self, key: str) -> Tuple[bool, Coords | None]:
+        with self._lock:
+            coords = self._entries.get(key, self._MISSING)
+            if coords is self._MISSING:
+                return False, None
+            self._entries.move_to_end(key)
+            return True, coords  # type: ignore[return-value]
+
+    def put(self, key: str, coords: Coords | None) -> None:
+        with self._lock:
+            self._entries[key] = coords
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class DbGeocodeStore:
+    """Geocoding results persisted in the ``geocode_cache`` table."""
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Coords | None]:
+        if SessionLocal is None:
+            raise RuntimeError("Database session factory is not available")
+        wanted = list(dict.fromkeys(keys))
+        if not wanted:
+            return {}
+        retry_before = datetime.now(UTC).replace(tzinfo=None) - NEGATIVE_TTL
+        found: Dict[str, Coords | None] = {}
+        session = SessionLocal()
+        try:
+            for offset in range(0, len(wanted), _IN_CHUNK):
+                rows = (
+                    session.query(GeocodeCacheDB)
+                    .filter(
+                        GeocodeCacheDB.address_key.in_(  # type: ignore[attr-defined]
+                            wanted[offset : offset + _IN_CHUNK]
+                        )
+                    )
+                    .all()
+                )
+                for row in rows:
+                    if row.lat is None or row.lng is None:
+                        if row.updated_at is not None and row.updated_at < retry_before:
+                            continue
+                        found[row.address_key] = None
+                    else:
+                        found[row.address_key] = (float(row.lat), float(row.lng))
+        finally:
+            session.close()
+        return found
+
+    def put_many(self, results: Dict[str, Coords | None]) -> None:
+        if SessionLocal is None:
+            raise RuntimeError("Database session factory is not available")
+        if not results:
+            return
+        now = datetime.now(UTC).replace(tzinfo=None)
+        session = SessionLocal()
+        try:
+            for key, coords in results.items():
+                session.merge(
+                    GeocodeCacheDB(
+                        address_key=key,
+                        lat=coords[0] if coords else None,
+                        lng=coords[1] if coords else None,
+                        source="google",
+                        updated_at=now,
+                    )
+                )
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+
+class _Inflight:
+    def __init__(self) -> None:
+        self.done = anyio.Event()
+        self.coords: Coords | None = None
+
+
+class GeocodingService:
+    """Address geocoding for travel estimates and owner maps.
+
+    Lookups go to an in-memory LRU, then the persistent ``geocode_cache``
+    table (when enabled), then the Google Geocoding API. Concurrent lookups
+    of the same address share one API request. Addresses that cannot be
+    resolved fall back to the centroid of their ZIP code from an offline
+    dataset.
+
+    Slot search calls ``prefetch`` once before it starts and then only uses
+    ``resolve_offline``, which never performs I/O.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        max_concurrency: int = 4,
+        zip_centroids_path: str | None = None,
+        store: DbGeocodeStore | None = None,
+    ) -> None:
+        self._memory = _LruCache(max_entries)
+        self._max_concurrency = max(1, max_concurrency)
+        self._zip_centroids_path = zip_centroids_path
+        self._zip_centroids: Dict[str, Coords] | None = None
+        self._store = store
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, _Inflight] = {}
+
+    @property
+    def memory(self) -> _LruCache:
+        return self._memory
+
+    def clear(self) -> None:
+        self._memory.clear()
+
+    def zip_centroid(self, address: str | None) -> Coords | None:
+        code = extract_zip(address)
+        if code is None:
+            return None
+        return self._centroids().get(code)
+
+    def _centroids(self) -> Dict[str, Coords]:
+        with self._lock:
+            if self._zip_centroids is None:
+                self._zip_centroids = {}
+                path = self._zip_centroids_path
+                if path:
+                    try:
+                        self._zip_centroids = load_zip_centroids(path)
+                    except (OSError, ValueError):
+                        logger.warning(
+                            "zip_centroids_load_failed",
+                            exc_info=True,
+                            extra={"path": path},
+                        )
+            return self._zip_centroids
+
+    def resolve_offline(self, address: str | None) -> Coords | None:
+        """Cached coordinates or the ZIP centroid; never touches the network."""
+        key = normalize_address(address)
+        if not key:
+            return None
+        _, coords = self._memory.get(key)
+        return coords or self.zip_centroid(key)
+
+    def lookup(self, address: str | None) -> Tuple[bool, Coords | None]:
+        """Return ``(found, coords)`` from memory or the persistent cache."""
+        key = normalize_address(address)
+        if not key:
+            return True, None
+        found, coords = self._memory.get(key)
+        if not found and self._store is not None:
+            try:
+                stored = self._store.get_many([key])
+            except Exception:
+                logger.warning("geocode_cache_read_failed", exc_info=True)
+                stored = {}
+            if key in stored:
+                found, coords = True, stored[key]
+                self._memory.put(key, coords)
+        if found:
+            metrics.geocode_cache_hits += 1
+        else:
+            metrics.geocode_cache_misses += 1
+        return found, coords
+
+    def remember(self, address: str | None, coords: Coords | None) -> None:
+        """Record a definitive geocoding result in memory and persistently."""
+        key = normalize_address(address)
+        if not key:
+            return
+        self._memory.put(key, coords)
+        if self._store is not None:
+            try:
+                self._store.put_many({key: coords})
+            except Exception:
+                logger.warning("geocode_cache_write_failed", exc_info=True)
+
+    async def geocode(self, address: str | None) -> Coords | None:
+        return (await self.prefetch([address])).get(address or "")
+
+    async def prefetch(
+        self,
+        addresses: Iterable[str | None],
+        *,
+        timeout: float | None = None,
+    ) -> Dict[str, Coords | None]:
+        """Resolve many addresses at once, warming the caches.
+
+        Memory misses are read from the persistent cache in one query and
+        the rest are geocoded concurrently. With ``timeout``, addresses still
+        unresolved when it expires fall back to their ZIP centroid. Returns
+        coordinates (or None) keyed by the given address strings.
+        """
+        requested = [address for address in addresses if address]
+        keys: Dict[str, str] = {}
+        for address in requested:
+            key = normalize_address(address)
+            if key and key not in keys:
+                keys[key] = address.strip()
+
+        resolved: Dict[str, Coords | None] = {}
+        missing: List[str] = []
+        for key in keys:
+            found, coords = self._memory.get(key)
+            if found:
+                resolved[key] = coords
+            else:
+                missing.append(key)
+        if missing and self._store is not None:
+            try:
+                stored = await anyio.to_thread.run_sync(self._store.get_many, missing)
+            except Exception:
+                logger.warning("geocode_cache_read_failed", exc_info=True)
+                stored = {}
+            for key, coords in stored.items():
+                self._memory.put(key, coords)
+            resolved.update(stored)
+            missing = [key for key in missing if key not in stored]
+        metrics.geocode_cache_hits += len(keys) - len(missing)
+        metrics.geocode_cache_misses += len(missing)
+
+        api_key = os.getenv("GOOGLE_MAPS_API_KEY")
+        if missing and api_key:
+            pending = {key: keys[key] for key in missing}
+            with anyio.move_on_after(timeout):
+                await self._fetch_remote(pending, api_key, resolved)
+
+        results: Dict[str, Coords | None] = {}
+        for address in requested:
+            key = normalize_address(address)
+            coords = resolved.get(key)
+            if coords is None:
+                coords = self.zip_centroid(key)
+                if coords is not None:
+                    metrics.geocode_zip_fallbacks += 1
+            results[address] = coords
+        return results
+
+    async def _fetch_remote(
+        self,
+        pending: Dict[str, str],
+        api_key: str,
+        resolved: Dict[str, Coords | None],
+    ) -> None:
+        definitive: Dict[str, Coords | None] = {}
+        limiter = anyio.CapacityLimiter(self._max_concurrency)
+        try:
+            async with httpx.AsyncClient(timeout=GEOCODE_TIMEOUT_SECONDS) as client:
+                async with anyio.create_task_group() as tg:
+                    for key, address in pending.items():
+                        tg.start_soon(
+                            self._fetch_one,
+                            client,
+                            limiter,
+                            key,
+                            address,
+                            api_key,
+                            resolved,
+                            definitive,
+                        )
+        finally:
+            if definitive and self._store is not None:
+                # Persist whatever finished, even if the batch timed out.
+                with anyio.CancelScope(shield=True):
+                    try:
+                        await anyio.to_thread.run_sync(self._store.put_many, definitive)
+                    except Exception:
+                        logger.warning("geocode_cache_write_failed", exc_info=True)
+
+    async def _fetch_one(
+        self,
+        client: httpx.AsyncClient,
+        limiter: anyio.CapacityLimiter,
+        key: str,
+        address: str,
+        api_key: str,
+        resolved: Dict[str, Coords | None],
+        definitive: Dict[str, Coords | None],
+    ) -> None:
+        with self._lock:
+            inflight = self._inflight.get(key)
+            owner = inflight is None
+            if inflight is None:
+                inflight = self._inflight[key] = _Inflight()
+        if not owner:
+            with anyio.move_on_after(GEOCODE_TIMEOUT_SECONDS):
+                await inflight.done.wait()
+            resolved[key] = inflight.coords
+            return
+        try:
+            async with limiter:
+                coords, is_definitive = await self._request(client, address, api_key)
+            inflight.coords = coords
+            resolved[key] = coords
+            if is_definitive:
+                self._memory.put(key, coords)
+                definitive[key] = coords
+        finally:
+            with self._lock:
+                if self._inflight.get(key) is inflight:
+                    self._inflight.pop(key, None)
+            inflight.done.set()
+
+    async def _request(
+        self, client: httpx.AsyncClient, address: str, api_key: str
+    ) -> Tuple[Coords | None, bool]:
+        metrics.geocode_requests += 1
+        try:
+            resp = await client.get(
+                GEOCODE_URL, params={"address": address, "key": api_key}
+            )
+            resp.raise_for_status()
+            data = resp.json()
+        except Exception:
+            metrics.geocode_failures += 1
+            logger.warning("geocode_request_failed", exc_info=True)
+            return None, False
+        status = data.get("status") if isinstance(data, dict) else None
+        if status not in DEFINITIVE_STATUSES:
+            metrics.geocode_failures += 1
+            logger.warning("geocode_request_rejected", extra={"status": status})
+            return None, False
+        return parse_geocode_response(data), True
+
+
+USE_DB_GEOCODE_CACHE = os.getenv("USE_DB_GEOCODE_CACHE", "false").lower() == "true"
+
+
+def _create_geocoding_service() -> GeocodingService:
+    settings = get_settings().calendar
+    store = None
+    if USE_DB_GEOCODE_CACHE and SQLALCHEMY_AVAILABLE and SessionLocal is not None:
+        store = DbGeocodeStore()
+    return GeocodingService(
+        max_entries=getattr(settings, "geocode_cache_max_entries", 10000),
+        max_concurrency=getattr(settings, "geocode_max_concurrency", 4),
+        zip_centroids_path=getattr(settings, "geocode_zip_centroids_path", None),
+        store=store,
+    )
+
+
+geocoding_service = _create_geocoding_service()
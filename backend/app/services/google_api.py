@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+from ..config import get_settings
+from ..metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class GoogleApiTimeout(TimeoutError):
+    """Raised when a Google API call does not finish within its timeout."""
+
+
+class GoogleApiExecutor:
+    """Thread pool that runs blocking googleapiclient calls off the event loop.
+
+    Only the coroutine waiting on a slow response is delayed. A timed-out
+    call keeps its worker thread until the HTTP request returns (threads
+    cannot be cancelled), but the awaiting coroutine is released at once.
+    """
+
+    def __init__(self, max_workers: int = 8, timeout_seconds: float = 10.0) -> None:
+        self._lock = threading.Lock()
+        self._max_workers = max(1, max_workers)
+        self._timeout_seconds = timeout_seconds
+        self._pool: ThreadPoolExecutor | None = None
+
+    @property
+    def timeout_seconds(self) -> float:
+        return self._timeout_seconds
+
+    def configure(
+        self,
+        *,
+        max_workers: int | None = None,
+        timeout_seconds: float | None = None,
+    ) -> None:
+        """Apply new limits; a resized pool is recreated on next use."""
+        stale: ThreadPoolExecutor | None = None
+        with self._lock:
+            if timeout_seconds is not None:
+                self._timeout_seconds = timeout_seconds
+            if max_workers is not None and max(1, max_workers) != self._max_workers:
+                self._max_workers = max(1, max_workers)
+                stale, self._pool = self._pool, None
+        if stale is not None:
+            stale.shutdown(wait=False)
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self._max_workers, thread_name_prefix="google-api"
+                )
+            return self._pool
+
+    async def run(
+        self,
+        fn: Callable[..., T],
+        *args: Any,
+        operation: str,
+        timeout: float | None = None,
+    ) -> T:
+        """Run ``fn(*args)`` on the pool and await it with a timeout."""
+        loop = asyncio.get_running_loop()
+        limit = self._timeout_seconds if timeout is None else timeout
+        submitted = time.perf_counter()
+        started: list[float] = []
+
+        def _call() -> T:
+            started.append(time.perf_counter())
+            return fn(*args)
+
+        future = loop.run_in_executor(self._get_pool(), _call)
+        failed = timed_out = False
+        try:
+            if limit and limit > 0:
+                return await asyncio.wait_for(future, timeout=limit)
+            return await future
+        except asyncio.TimeoutError:
+            timed_out = True
+            logger.warning(
+                "google_api_call_timeout",
+                extra={"operation": operation, "timeout_seconds": limit},
+            )
+            raise GoogleApiTimeout(f"{operation} timed out after {limit}s") from None
+        except Exception:
+            failed = True
+            raise
+        finally:
+            finished = time.perf_counter()
+            queued_until = started[0] if started else finished
+            metrics.record_google_api_call(
+                operation,
+                queue_ms=(queued_until - submitted) * 1000.0,
+                total_ms=(finished - submitted) * 1000.0,
+                failed=failed,
+                timed_out=timed_out,
+            )
+
+    async def execute(
+        self, request: Any, *, operation: str, timeout: float | None = None
+    ) -> Any:
+        """Await ``request.execute()`` for a googleapiclient request object."""
+        return await self.run(request.execute, operation=operation, timeout=timeout)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _create_google_api_executor() -> GoogleApiExecutor:
+    settings = get_settings().calendar
+    return GoogleApiExecutor(
+        max_workers=getattr(settings, "api_max_workers", 8),
+        timeout_seconds=getattr(settings, "api_timeout_seconds", 10.0),
+    )
+
+
+google_api_executor = _create_google_api_executor()
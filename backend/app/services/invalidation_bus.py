@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+from typing import Any, Callable, Protocol
+from uuid import uuid4
+
+redis: Any | None
+try:  # Optional Redis dependency, mirroring services/sessions.py
+    import redis as _redis
+except Exception:  # pragma: no cover - redis is optional
+    redis = None
+else:
+    redis = _redis
+
+
+logger = logging.getLogger(__name__)
+
+# Listeners receive the business id whose cached state is stale, or None when
+# every tenant should be dropped (e.g. after a bulk update or lost messages).
+InvalidationListener = Callable[[str | None], None]
+
+
+class InvalidationBus(Protocol):
+    """Fan-out channel for "tenant config changed" notifications."""
+
+    def subscribe(self, listener: InvalidationListener) -> None: ...
+
+    def publish(self, business_id: str | None) -> None: ...
+
+    def start(self) -> None: ...
+
+    def stop(self) -> None: ...
+
+
+class InMemoryInvalidationBus:
+    """Process-local bus.
+
+    Listeners in this process are notified synchronously; other replicas are
+    not reachable, so their caches fall back to TTL-only expiry.
+    """
+
+    def __init__(self) -> None:
+        self._listeners: list[InvalidationListener] = []
+        self._lock = threading.Lock()
+
+    def subscribe(self, listener: InvalidationListener) -> None:
+        with self._lock:
+            if listener not in self._listeners:
+                self._listeners.append(listener)
+
+    def publish(self, business_id: str | None) -> None:
+        self._deliver(business_id)
+
+    def start(self) -> None:
+        return None
+
+    def stop(self) -> None:
+        return None
+
+    def _deliver(self, business_id: str | None) -> None:
+        with self._lock:
+            listeners = list(self._listeners)
+        for listener in listeners:
+            try:
+                listener(business_id)
+            except Exception:
+                logger.warning(
+                    "invalidation_listener_failed",
+                    exc_info=True,
+                    extra={"business_id": business_id},
+                )
+
+
+class RedisInvalidationBus(InMemoryInvalidationBus):
+    """Bus backed by Redis pub/sub so every replica drops stale entries.
+
+    Publishing notifies local listeners immediately and then broadcasts on the
+    channel; a background thread relays messages from other replicas. When the
+    subscription drops, every cached tenant is invalidated on reconnect since
+    messages may have been missed in between.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        channel: str = "tenant-config-invalidate",
+        reconnect_delay: float = 1.0,
+    ) -> None:
+        super().__init__()
+        self._client = client
+        self._channel = channel
+        self._origin = uuid4().hex
+        self._reconnect_delay = reconnect_delay
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def publish(self, business_id: str | None) -> None:
+        self._deliver(business_id)
+        payload = json.dumps({"origin": self._origin, "business_id": business_id})
+        try:
+            self._client.publish(self._channel, payload)
+        except Exception:
+            # Other replicas will still converge once their TTL expires.
+            logger.warning(
+                "redis_invalidation_publish_failed",
+                exc_info=True,
+                extra={"business_id": business_id},
+            )
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run, daemon=True, name="invalidation-bus"
+        )
+        self._thread.start()
+        logger.info("invalidation_bus_started", extra={"channel": self._channel})
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=2.0)
+        logger.info("invalidation_bus_stopped")
+
+    def handle_message(self, data: Any) -> None:
+        """Apply one raw pub/sub payload from the channel."""
+        if isinstance(data, bytes):
+            data = data.decode("utf-8", errors="replace")
+        try:
+            message = json.loads(data)
+        except (TypeError, ValueError):
+            logger.warning("redis_invalidation_message_invalid")
+            return
+        if not isinstance(message, dict) or message.get("origin") == self._origin:
+            return
+        business_id = message.get("business_id")
+        self._deliver(str(business_id) if business_id else None)
+
+    def _run(self) -> None:
+        connected_once = False
+        while not self._stop_event.is_set():
+            pubsub = None
+            try:
+                pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self._channel)
+                if connected_once:
+                    self._deliver(None)
+                connected_once = True
+                while not self._stop_event.is_set():
+                    message = pubsub.get_message(timeout=1.0)
+                    if message and message.get("type") == "message":
+                        self.handle_message(message.get("data"))
+            except Exception:
+                logger.warning("redis_invalidation_subscribe_failed", exc_info=True)
+                self._stop_event.wait(self._reconnect_delay)
+            finally:
+                if pubsub is not None:
+                    try:
+                        pubsub.close()
+                    except Exception:  # pragma: no cover - defensive
+                        logger.debug("redis_invalidation_close_failed", exc_info=True)
+
+
+def _create_invalidation_bus() -> InvalidationBus:
+    backend = os.getenv("INVALIDATION_BUS_BACKEND", "memory").lower()
+    # Prefer Redis when REDIS_URL is present so every replica hears about
+    # tenant config changes without an extra config knob.
+    if backend == "memory" and os.getenv("REDIS_URL"):
+        backend = "redis"
+    if backend == "redis":
+        if redis is None:
+            logger.warning("invalidation_bus_backend_redis_unavailable_falling_back")
+        else:
+            try:
+                redis_url = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+                client = redis.from_url(redis_url)
+                channel = os.getenv(
+                    "INVALIDATION_BUS_CHANNEL", "tenant-config-invalidate"
+                )
+                return RedisInvalidationBus(client, channel=channel)
+            except Exception:
+                logger.warning(
+                    "invalidation_bus_backend_redis_init_failed_falling_back",
+                    exc_info=True,
+                )
+    return InMemoryInvalidationBus()
+
+
+invalidation_bus: InvalidationBus = _create_invalidation_bus()
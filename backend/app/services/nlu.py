@@ -1,10 +1,13 @@
 from __future__ import annotations
 
+import asyncio
+from collections import OrderedDict
 from typing import Optional
 import logging
 import httpx
 
 from ..config import get_settings
+from ..metrics import metrics
 
 logger = logging.getLogger(__name__)
 
@@ -196,11 +199,65 @@ async def _classify_with_llm(text: str, history: list[str] | None = None) -> str
     return None
 
 
+# Classifications started from partial transcripts before the caller has
+# finished speaking. A later classification of the same text, business and
+# history reuses the result instead of running again.
+_SPECULATIVE_INTENT_LIMIT = 64
+_speculative_intents: OrderedDict[
+    tuple[str | None, str, tuple[str, ...]], asyncio.Task
+] = OrderedDict()
+
+
+def _speculation_key(
+    text: str, business_id: str | None, history: list[str] | None
+) -> tuple[str | None, str, tuple[str, ...]]:
+    return (business_id, (text or "").strip(), tuple(history or ()))
+
+
+def speculate_intent(
+    text: str, business_id: str | None = None, history: list[str] | None = None
+) -> None:
+    """Start classifying ``text`` in the background for a matching later call."""
+    key = _speculation_key(text, business_id, history)
+    if not key[1] or key in _speculative_intents:
+        return
+    _speculative_intents[key] = asyncio.get_running_loop().create_task(
+        _classify_intent(text, business_id, history)
+    )
+    metrics.intent_speculations += 1
+    while len(_speculative_intents) > _SPECULATIVE_INTENT_LIMIT:
+        _, stale = _speculative_intents.popitem(last=False)
+        stale.cancel()
+
+
 async def classify_intent_with_metadata(
     text: str, business_id: str | None = None, history: list[str] | None = None
 ) -> dict:
     """Return intent label with confidence and provider metadata.
 
+    Reuses a matching ``speculate_intent`` result when one was started.
+    """
+    task = _speculative_intents.pop(_speculation_key(text, business_id, history), None)
+    if (
+        task is not None
+        and not task.cancelled()
+        and task.get_loop() is asyncio.get_running_loop()
+    ):
+        try:
+            meta = dict(await task)
+        except Exception:
+            logger.debug("intent_speculation_failed", exc_info=True)
+        else:
+            metrics.intent_speculation_hits += 1
+            return meta
+    return await _classify_intent(text, business_id, history)
+
+
+async def _classify_intent(
+    text: str, business_id: str | None = None, history: list[str] | None = None
+) -> dict:
+    """Classify ``text``; see ``classify_intent_with_metadata``.
+
     Guardrails:
     - Emergencies remain deterministic from heuristics.
     - LLM assists only when heuristic confidence is low; heuristic can still win.
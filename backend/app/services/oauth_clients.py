@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Tuple
+
+from ..config import get_settings
+from ..metrics import metrics
+from .oauth_tokens import oauth_store
+
+logger = logging.getLogger(__name__)
+
+# Cached clients whose token expires sooner than this are rebuilt on the
+# call path, matching the 60s margin the token refresh helpers already use.
+MIN_TOKEN_TTL_SECONDS = 60.0
+
+
+@dataclass(frozen=True)
+class PooledClient:
+    """A built API client (or bare token) and the expiry of its access token."""
+
+    client: Any
+    expires_at: float  # epoch seconds
+    access_token: str
+
+
+# Called by the background refresher for entries close to expiry. Returns
+# the rebuilt entry, or None to leave the current one in place.
+Refresher = Callable[[str], PooledClient | None]
+
+
+class OAuthClientPool:
+    """Per-tenant pool of OAuth-backed Google clients.
+
+    Building a client can mean a DB token read, a token refresh and a
+    discovery build, so built clients are kept in memory until shortly
+    before their access token expires. A background thread refreshes
+    tokens ahead of expiry. An entry is dropped when its tokens are revoked
+    or when the token store holds a different access token (e.g. after a
+    reconnect).
+    """
+
+    def __init__(
+        self,
+        refresh_ahead_seconds: float = 300.0,
+        interval_seconds: float = 60.0,
+    ) -> None:
+        self._lock = threading.Lock()
+        self._entries: Dict[Tuple[str, str], PooledClient] = {}
+        self._refreshers: Dict[str, Refresher] = {}
+        self._refresh_ahead_seconds = refresh_ahead_seconds
+        self._interval_seconds = interval_seconds
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def register(self, provider: str, refresher: Refresher) -> None:
+        with self._lock:
+            self._refreshers[provider] = refresher
+
+    def get(self, provider: str, business_id: str) -> PooledClient | None:
+        key = (provider, business_id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                metrics.oauth_client_pool_misses += 1
+                return None
+            current = oauth_store.get_tokens(provider, business_id)
+            stale = current is not None and current.access_token != entry.access_token
+            if stale or entry.expires_at - time.time() <= MIN_TOKEN_TTL_SECONDS:
+                self._entries.pop(key, None)
+                metrics.oauth_client_pool_misses += 1
+                return None
+            metrics.oauth_client_pool_hits += 1
+            return entry
+
+    def put(self, provider: str, business_id: str, entry: PooledClient) -> None:
+        with self._lock:
+            self._entries[(provider, business_id)] = entry
+
+    def drop(self, provider: str, business_id: str) -> None:
+        with self._lock:
+            self._entries.pop((provider, business_id), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def refresh_due(self) -> int:
+        """Refresh entries expiring within the look-ahead; returns the count."""
+        deadline = time.time() + self._refresh_ahead_seconds
+        with self._lock:
+            due = [
+                (key, self._refreshers.get(key[0]))
+                for key, entry in self._entries.items()
+                if entry.expires_at <= deadline
+            ]
+        refreshed = 0
+        for (provider, business_id), refresher in due:
+            if refresher is None:
+                continue
+            try:
+                entry = refresher(business_id)
+            except Exception:
+                metrics.oauth_client_refresh_failures += 1
+                logger.warning(
+                    "oauth_client_refresh_failed",
+                    exc_info=True,
+                    extra={"provider": provider, "business_id": business_id},
+                )
+                continue
+            if entry is None:
+                continue
+            with self._lock:
+                # Skip tenants revoked while the refresh was running.
+                if (provider, business_id) in self._entries:
+                    self._entries[(provider, business_id)] = entry
+                    refreshed += 1
+        metrics.oauth_client_refreshes += refreshed
+        return refreshed
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run, daemon=True, name="oauth-client-refresh"
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=2.0)
+        self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop_event.wait(self._interval_seconds):
+            try:
+                self.refresh_due()
+            except Exception:
+                metrics.background_job_errors += 1
+                logger.exception("oauth_client_refresh_loop_failed")
+
+
+def _create_oauth_client_pool() -> OAuthClientPool:
+    settings = get_settings().oauth
+    return OAuthClientPool(
+        refresh_ahead_seconds=getattr(settings, "client_refresh_ahead_seconds", 300.0),
+        interval_seconds=getattr(settings, "client_refresh_interval_seconds", 60.0),
+    )
+
+
+oauth_client_pool = _create_oauth_client_pool()
+oauth_store.add_revoke_listener(oauth_client_pool.drop)
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import time
 from dataclasses import dataclass
-from typing import Dict, Optional
+from typing import Callable, Dict, List, Optional
 
 
 @dataclass
@@ -17,6 +17,12 @@ class InMemoryOAuthStore:
 
     def __init__(self) -> None:
         self._tokens: Dict[tuple[str, str], OAuthToken] = {}
+        self._revoke_listeners: List[Callable[[str, str], None]] = []
+
+    def add_revoke_listener(self, listener: Callable[[str, str], None]) -> None:
+        """Call ``listener(provider, business_id)`` whenever tokens are revoked."""
+        if listener not in self._revoke_listeners:
+            self._revoke_listeners.append(listener)
 
     def save_tokens(
         self,
@@ -53,6 +59,8 @@ class InMemoryOAuthStore:
 
     def revoke(self, provider: str, business_id: str) -> None:
         self._tokens.pop((provider, business_id), None)
+        for listener in list(self._revoke_listeners):
+            listener(provider, business_id)
 
 
 oauth_store = InMemoryOAuthStore()
@@ -47,6 +47,7 @@ def run_retention_purge(
         appointments_deleted = 0
         conversations_deleted = 0
         messages_deleted = 0
+        purged_business_ids: list[str] = []
 
         businesses = session.query(BusinessDB).all()
         for row in businesses:
@@ -66,6 +67,8 @@ def run_retention_purge(
                     .delete(synchronize_session=False)
                 )
                 appointments_deleted += int(result or 0)
+                if result:
+                    purged_business_ids.append(row.id)
 
             conv_ret = getattr(row, "conversation_retention_days", None)
             if conv_ret is not None and conv_ret > 0:
@@ -96,6 +99,18 @@ def run_retention_purge(
         # Persist deletions before attempting to log so cleanup isn't lost if logging fails.
         session.commit()
 
+        if purged_business_ids:
+            from ..repositories import appointments_repo  # avoid import cycle
+
+            # Rewrite the stored rows so every worker stops counting the
+            # purged appointments, not just this process.
+            for business_id in purged_business_ids:
+                try:
+                    appointments_repo.daily_rollup.rebuild(business_id)
+                except Exception:
+                    logger.exception("retention_purge_rollup_rebuild_failed")
+                    appointments_repo.daily_rollup.invalidate(business_id)
+
         log_id: int | None = None
         try:
             log = RetentionPurgeLogDB(  # type: ignore[arg-type]
@@ -37,6 +37,9 @@ class CallSession:
     channel: str = "phone"
     lead_source: str | None = None
     no_input_count: int = 0
+    # Candidate slots from the last availability search; the first entry is
+    # the one currently proposed. Each is {"start", "end", "technician_id"}.
+    slot_alternatives: list[dict[str, Any]] = field(default_factory=list)
     created_at: datetime = field(default_factory=lambda: datetime.now(UTC))
     updated_at: datetime = field(default_factory=lambda: datetime.now(UTC))
 
@@ -179,6 +182,9 @@ class RedisSessionStore:
             no_input_count = int(no_input_count_raw or 0)
         except Exception:
             no_input_count = 0
+        slot_alternatives = data.get("slot_alternatives")
+        if not isinstance(slot_alternatives, list):
+            slot_alternatives = []
         return CallSession(
             id=data.get("id", session_id),
             caller_phone=data.get("caller_phone"),
@@ -200,6 +206,9 @@ class RedisSessionStore:
             channel=data.get("channel", "phone"),
             lead_source=data.get("lead_source"),
             no_input_count=no_input_count,
+            slot_alternatives=[
+                item for item in slot_alternatives if isinstance(item, dict)
+            ],
             created_at=created_at or datetime.now(UTC),
             updated_at=updated_at or datetime.now(UTC),
         )
@@ -236,6 +245,7 @@ class RedisSessionStore:
             "channel": session.channel,
             "lead_source": session.lead_source,
             "no_input_count": session.no_input_count,
+            "slot_alternatives": session.slot_alternatives,
             "created_at": session.created_at.isoformat(),
             "updated_at": session.updated_at.isoformat(),
         }
@@ -2,14 +2,19 @@ from __future__ import annotations
 
 import base64
 from abc import ABC, abstractmethod
+from collections import deque
+from dataclasses import dataclass
+import json
 import logging
 import time
-from typing import Any
+from typing import Any, AsyncIterator, Iterable, Protocol, runtime_checkable
 
 import anyio
 import httpx
 
 from ..config import SpeechSettings, get_settings
+from .audio_pipeline import pcm_to_wav_bytes
+from .tts_cache import TtsCache, tts_cache, tts_cache_key
 
 logger = logging.getLogger(__name__)
 
@@ -22,9 +27,57 @@ class SpeechProvider(ABC):
     @abstractmethod
     async def transcribe(self, audio: str | None) -> str: ...
 
+    async def transcribe_bytes(self, pcm: bytes | memoryview, sample_rate: int) -> str:
+        """Transcribe raw 16-bit mono PCM.
+
+        Providers that can take PCM directly override this; the default wraps
+        it in a base64 WAV for ``transcribe``.
+        """
+        if not len(pcm):
+            return ""
+        wav_bytes = pcm_to_wav_bytes(pcm, sample_rate)
+        return await self.transcribe(base64.b64encode(wav_bytes).decode("ascii"))
+
     @abstractmethod
     async def synthesize(self, text: str, voice: str | None = None) -> str: ...
 
+    def tts_cache_scope(self, voice: str | None) -> tuple[str, str, str]:
+        """``(provider, voice, language)`` that, with the text, fix the audio."""
+        return (self.name, voice or "", "")
+
+
+@dataclass(frozen=True)
+class SpeechResult:
+    """One streaming recognition result.
+
+    Partial results are revised as more audio arrives. Final results cover a
+    finished segment and are not revised; an utterance may have several.
+    """
+
+    text: str
+    is_final: bool = False
+    stability: float | None = None
+
+
+@runtime_checkable
+class StreamingSpeechProvider(Protocol):
+    """A provider that transcribes audio while it is still arriving."""
+
+    name: str
+
+    def stream_transcribe(
+        self, chunks: AsyncIterator[bytes], sample_rate: int
+    ) -> AsyncIterator[SpeechResult]:
+        """Consume 16-bit mono PCM chunks and yield partial and final results."""
+        ...
+
+
+async def _collect_pcm(chunks: AsyncIterator[bytes]) -> bytearray:
+    pcm = bytearray()
+    async for chunk in chunks:
+        pcm += chunk
+    return pcm
+
 
 class StubSpeechProvider(SpeechProvider):
     """No-op provider used for local dev and tests."""
@@ -36,6 +89,58 @@ class StubSpeechProvider(SpeechProvider):
             return ""
         return ""
 
+    async def transcribe_bytes(self, pcm: bytes | memoryview, sample_rate: int) -> str:
+        return ""
+
+    async def synthesize(self, text: str, voice: str | None = None) -> str:
+        return "audio://placeholder"
+
+
+class ReplaySpeechProvider(SpeechProvider):
+    """Offline provider that replays fixture transcripts, one per utterance.
+
+    Streaming calls reveal the transcript a word per audio chunk as partial
+    results, then yield it as a final result when the audio ends, which
+    mimics a streaming recognizer without network access. Once the
+    fixtures run out every utterance transcribes to "".
+    """
+
+    name = "replay"
+
+    def __init__(self, transcripts: Iterable[str] = ()) -> None:
+        self._transcripts: deque[str] = deque(transcripts)
+
+    @classmethod
+    def from_file(cls, path: str) -> "ReplaySpeechProvider":
+        """Load a JSON list of transcripts (or ``{"transcripts": [...]}``)."""
+        with open(path, encoding="utf-8") as handle:
+            data = json.load(handle)
+        if isinstance(data, dict):
+            data = data.get("transcripts") or []
+        return cls(str(item) for item in data)
+
+    def _next(self) -> str:
+        return self._transcripts.popleft().strip() if self._transcripts else ""
+
+    async def transcribe(self, audio: str | None) -> str:
+        return self._next()
+
+    async def transcribe_bytes(self, pcm: bytes | memoryview, sample_rate: int) -> str:
+        return self._next()
+
+    async def stream_transcribe(
+        self, chunks: AsyncIterator[bytes], sample_rate: int
+    ) -> AsyncIterator[SpeechResult]:
+        transcript = self._next()
+        words = transcript.split()
+        shown = 0
+        async for _chunk in chunks:
+            if shown < len(words):
+                shown += 1
+                yield SpeechResult(" ".join(words[:shown]))
+        if transcript:
+            yield SpeechResult(transcript, is_final=True)
+
     async def synthesize(self, text: str, voice: str | None = None) -> str:
         return "audio://placeholder"
 
@@ -57,7 +162,14 @@ class OpenAISpeechProvider(SpeechProvider):
         except Exception:
             # If decoding fails, fall back silently.
             return ""
+        return await self._post_transcription(audio_bytes)
+
+    async def transcribe_bytes(self, pcm: bytes | memoryview, sample_rate: int) -> str:
+        if not len(pcm):
+            return ""
+        return await self._post_transcription(pcm_to_wav_bytes(pcm, sample_rate))
 
+    async def _post_transcription(self, audio_bytes: bytes) -> str:
         url = f"{self._settings.openai_api_base}/audio/transcriptions"
         headers = {
             "Authorization": f"Bearer {self._settings.openai_api_key}",
@@ -74,6 +186,11 @@ class OpenAISpeechProvider(SpeechProvider):
         text = data.get("text")
         return text or ""
 
+    def tts_cache_scope(self, voice: str | None) -> tuple[str, str, str]:
+        # The model infers the language from the text.
+        provider = f"{self.name}:{self._settings.openai_tts_model}"
+        return (provider, voice or self._settings.openai_tts_voice, "")
+
     async def synthesize(self, text: str, voice: str | None = None) -> str:
         # Stub behaviour.
         if self._settings.provider != "openai" or not self._settings.openai_api_key:
@@ -287,10 +404,73 @@ class GoogleCloudSpeechProvider(SpeechProvider):
             audio_bytes = base64.b64decode(audio, validate=True)
         except Exception:
             return ""
+        encoding, sample_rate = self._detect_audio_encoding(audio_bytes)
+        return await self._recognize(audio, encoding, sample_rate)
+
+    async def transcribe_bytes(self, pcm: bytes | memoryview, sample_rate: int) -> str:
+        if not len(pcm):
+            return ""
+        # Raw PCM is sent as LINEAR16; the REST API only needs it base64'd.
+        content = base64.b64encode(pcm).decode("ascii")
+        return await self._recognize(content, "LINEAR16", sample_rate)
+
+    async def stream_transcribe(
+        self, chunks: AsyncIterator[bytes], sample_rate: int
+    ) -> AsyncIterator[SpeechResult]:
+        """Stream PCM to ``StreamingRecognize`` and yield interim and final results."""
+        try:
+            from google.cloud import speech_v1 as gcp_speech
+        except Exception:  # pragma: no cover - optional dependency
+            gcp_speech = None
+        if gcp_speech is None:
+            # Streaming recognize is gRPC-only; without the client library
+            # send the finished utterance to the REST recognize endpoint.
+            text = await self.transcribe_bytes(await _collect_pcm(chunks), sample_rate)
+            if text:
+                yield SpeechResult(text, is_final=True)
+            return
+
+        self._ensure_credentials()
+        client = gcp_speech.SpeechAsyncClient(credentials=self._credentials)
+        streaming_config = gcp_speech.StreamingRecognitionConfig(
+            config=gcp_speech.RecognitionConfig(
+                encoding=gcp_speech.RecognitionConfig.AudioEncoding.LINEAR16,
+                sample_rate_hertz=int(sample_rate),
+                language_code=self._stt_language_code(),
+                enable_automatic_punctuation=True,
+                model=(self._settings.gcp_stt_model or "default"),
+            ),
+            interim_results=True,
+        )
+
+        async def _requests() -> AsyncIterator[Any]:
+            yield gcp_speech.StreamingRecognizeRequest(
+                streaming_config=streaming_config
+            )
+            async for chunk in chunks:
+                if chunk:
+                    yield gcp_speech.StreamingRecognizeRequest(
+                        audio_content=bytes(chunk)
+                    )
+
+        responses = await client.streaming_recognize(requests=_requests())
+        async for response in responses:
+            for result in response.results:
+                if not result.alternatives:
+                    continue
+                text = (result.alternatives[0].transcript or "").strip()
+                if text:
+                    yield SpeechResult(
+                        text,
+                        is_final=bool(result.is_final),
+                        stability=result.stability or None,
+                    )
 
+    async def _recognize(
+        self, content: str, encoding: str, sample_rate: int | None
+    ) -> str:
         token = await self._access_token()
         url = "https://speech.googleapis.com/v1/speech:recognize"
-        encoding, sample_rate = self._detect_audio_encoding(audio_bytes)
         config: dict[str, Any] = {
             "encoding": encoding,
             "languageCode": self._stt_language_code(),
@@ -301,7 +481,7 @@ class GoogleCloudSpeechProvider(SpeechProvider):
             config["sampleRateHertz"] = int(sample_rate)
         payload = {
             "config": config,
-            "audio": {"content": audio},
+            "audio": {"content": content},
         }
         headers = self._auth_headers(token)
         headers["Content-Type"] = "application/json"
@@ -322,6 +502,11 @@ class GoogleCloudSpeechProvider(SpeechProvider):
                 transcripts.append(text)
         return " ".join(transcripts).strip()
 
+    def tts_cache_scope(self, voice: str | None) -> tuple[str, str, str]:
+        provider = f"{self.name}:{self._settings.gcp_tts_audio_encoding}"
+        voice_name = (voice or self._settings.gcp_tts_voice or "").strip()
+        return (provider, voice_name, self._tts_language_code())
+
     async def synthesize(self, text: str, voice: str | None = None) -> str:
         cleaned = (text or "").strip()
         if not cleaned:
@@ -394,13 +579,16 @@ class SpeechService:
         self,
         settings: SpeechSettings | None = None,
         provider: SpeechProvider | None = None,
+        cache: TtsCache | None = None,
     ) -> None:
         self._settings = settings or get_settings().speech
         self._provider_override = provider
+        self._tts_cache = cache if cache is not None else tts_cache
         self._circuit_open_until: float | None = None
         self._last_error: str | None = None
         self._last_provider: str | None = None
         self._last_used_fallback: bool = False
+        self._replay_provider: ReplaySpeechProvider | None = None
 
     def _circuit_open(self) -> bool:
         if self._circuit_open_until is None:
@@ -420,6 +608,13 @@ class SpeechService:
             return OpenAISpeechProvider(self._settings)
         if self._settings.provider == "gcp":
             return GoogleCloudSpeechProvider(self._settings)
+        if self._settings.provider == "replay" and self._settings.replay_fixture_path:
+            # Kept so the fixture advances across utterances and calls.
+            if self._replay_provider is None:
+                self._replay_provider = ReplaySpeechProvider.from_file(
+                    self._settings.replay_fixture_path
+                )
+            return self._replay_provider
         return StubSpeechProvider()
 
     def _fallback_provider(self) -> SpeechProvider:
@@ -462,15 +657,90 @@ class SpeechService:
             self._trip_circuit()
             return ""
 
+    async def transcribe_bytes(self, pcm: bytes | memoryview, sample_rate: int) -> str:
+        """Transcribe raw 16-bit mono PCM via the configured provider."""
+        if self._circuit_open():
+            return ""
+
+        provider = self._select_provider()
+        self._last_provider = provider.name
+        try:
+            return await provider.transcribe_bytes(pcm, sample_rate)
+        except Exception as exc:
+            self._record_error(provider.name, "transcribe", exc)
+            if not isinstance(provider, StubSpeechProvider):
+                fallback = self._fallback_provider()
+                self._last_used_fallback = True
+                try:
+                    result = await fallback.transcribe_bytes(pcm, sample_rate)
+                    self._trip_circuit()
+                    return result
+                except Exception:
+                    logger.warning(
+                        "speech_fallback_transcribe_failed",
+                        exc_info=True,
+                        extra={"provider": provider.name, "fallback": fallback.name},
+                    )
+            self._trip_circuit()
+            return ""
+
+    def supports_streaming(self) -> bool:
+        """Whether the configured provider can transcribe while audio arrives."""
+        if self._circuit_open():
+            return False
+        return isinstance(self._select_provider(), StreamingSpeechProvider)
+
+    async def stream_transcribe(
+        self, chunks: AsyncIterator[bytes], sample_rate: int
+    ) -> AsyncIterator[SpeechResult]:
+        """Transcribe streamed PCM, yielding partial and final results.
+
+        Providers without streaming support get the whole utterance through
+        ``transcribe_bytes`` once ``chunks`` ends and yield one final result.
+        A provider error ends the stream early and trips the circuit.
+        """
+        provider = self._select_provider()
+        if self._circuit_open() or not isinstance(provider, StreamingSpeechProvider):
+            text = await self.transcribe_bytes(await _collect_pcm(chunks), sample_rate)
+            if text.strip():
+                yield SpeechResult(text.strip(), is_final=True)
+            return
+
+        self._last_provider = provider.name
+        try:
+            async for result in provider.stream_transcribe(chunks, sample_rate):
+                yield result
+        except Exception as exc:
+            self._record_error(provider.name, "stream_transcribe", exc)
+            logger.warning(
+                "speech_stream_transcribe_failed",
+                exc_info=True,
+                extra={"provider": provider.name},
+            )
+            self._trip_circuit()
+
     async def synthesize(self, text: str, voice: str | None = None) -> str:
-        """Convert text to speech via the configured provider."""
+        """Convert text to speech via the configured provider.
+
+        Replies are cached by provider, voice, language and normalized text,
+        so templated prompts are synthesized once. Fallback output is never
+        cached.
+        """
         if self._circuit_open():
             return "audio://placeholder"
 
         provider = self._select_provider()
         self._last_provider = provider.name
         try:
-            return await provider.synthesize(text, voice=voice)
+            if isinstance(provider, StubSpeechProvider):
+                return await provider.synthesize(text, voice=voice)
+            key = tts_cache_key(*provider.tts_cache_scope(voice), text)
+            return await self._tts_cache.get_or_synthesize(
+                key,
+                lambda: provider.synthesize(text, voice=voice),
+                cacheable=lambda audio: bool(audio)
+                and not audio.startswith("audio://"),
+            )
         except Exception as exc:
             self._record_error(provider.name, "synthesize", exc)
             if not isinstance(provider, StubSpeechProvider):
@@ -7,6 +7,7 @@ from typing import Dict, Optional
 
 from fastapi import HTTPException, status
 
+from ..business_config import get_tenant_config
 from ..config import get_settings
 from ..db import SQLALCHEMY_AVAILABLE, SessionLocal
 from ..db_models import BusinessDB
@@ -121,35 +122,30 @@ def compute_state(business_id: str) -> SubscriptionState:
     if not (SQLALCHEMY_AVAILABLE and SessionLocal is not None):
         return state
 
-    session = SessionLocal()
-    try:
-        row = session.get(BusinessDB, business_id)
-        if row:
-            state.plan = getattr(row, "service_tier", None)
-            state.status = getattr(row, "subscription_status", None) or "active"
-            period_end = getattr(row, "subscription_current_period_end", None)
-            if period_end and period_end.tzinfo is None:
-                period_end = period_end.replace(tzinfo=UTC)
-            state.current_period_end = period_end
-            limits = _plan_limits(state.plan)
-            if state.usage:
-                state.usage.call_limit = limits.get("monthly_calls")
-                state.usage.appointment_limit = limits.get("monthly_appointments")
-                state.usage_warnings = _collect_usage_warnings(state.usage, limits)
-            if state.status not in {"active", "trialing"}:
-                if state.current_period_end:
-                    grace_end = state.current_period_end + timedelta(days=_grace_days())
-                    if grace_end > datetime.now(UTC):
-                        state.in_grace = True
-                        state.grace_remaining_days = max(
-                            0, (grace_end - datetime.now(UTC)).days
-                        )
-                state.blocked = (
-                    getattr(settings, "enforce_subscription", False)
-                    and not state.in_grace
-                )
-    finally:
-        session.close()
+    config = get_tenant_config(business_id)
+    if config is not None:
+        state.plan = config.service_tier
+        state.status = config.subscription_status or "active"
+        period_end = config.subscription_current_period_end
+        if period_end and period_end.tzinfo is None:
+            period_end = period_end.replace(tzinfo=UTC)
+        state.current_period_end = period_end
+        limits = _plan_limits(state.plan)
+        if state.usage:
+            state.usage.call_limit = limits.get("monthly_calls")
+            state.usage.appointment_limit = limits.get("monthly_appointments")
+            state.usage_warnings = _collect_usage_warnings(state.usage, limits)
+        if state.status not in {"active", "trialing"}:
+            if state.current_period_end:
+                grace_end = state.current_period_end + timedelta(days=_grace_days())
+                if grace_end > datetime.now(UTC):
+                    state.in_grace = True
+                    state.grace_remaining_days = max(
+                        0, (grace_end - datetime.now(UTC)).days
+                    )
+            state.blocked = (
+                getattr(settings, "enforce_subscription", False) and not state.in_grace
+            )
 
     return state
 
@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import UTC, datetime
+import hashlib
+import logging
+import threading
+import time
+from typing import Any, Callable
+
+from ..config import get_settings
+from ..db_models import BusinessDB
+from .invalidation_bus import invalidation_bus
+
+logger = logging.getLogger(__name__)
+
+CREDENTIAL_API_KEY = "api_key"
+CREDENTIAL_WIDGET_TOKEN = "widget_token"  # nosec B105 - credential name
+
+# Minimum spacing between *_last_used_at writes for the same credential so
+# hot widget/Twilio traffic does not commit on every request.
+LAST_USED_WRITE_INTERVAL_SECONDS = 60.0
+
+_REQUEST_STATE_ATTR = "tenant_credentials"
+
+
+@dataclass(frozen=True)
+class CredentialMatch:
+    """Tenant resolved from an API key or widget token."""
+
+    business_id: str
+    widget_token_expires_at: datetime | None = None
+
+
+class _CredentialCache:
+    """Thread-safe LRU of credential hash -> CredentialMatch with a TTL.
+
+    Misses are cached as ``None`` so repeated requests with a bad key do not
+    hit the database either; any tenant invalidation drops those entries so a
+    newly issued credential is never shadowed by an earlier miss.
+    """
+
+    def __init__(self, max_entries: int = 4096) -> None:
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, tuple[float, CredentialMatch | None]] = (
+            OrderedDict()
+        )
+        self._max_entries = max_entries
+        self._generation = 0
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def get(self, key: str) -> tuple[bool, CredentialMatch | None]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            expires_at, match = entry
+            if expires_at <= now:
+                self._entries.pop(key, None)
+                return False, None
+            self._entries.move_to_end(key)
+            return True, match
+
+    def set(
+        self,
+        key: str,
+        match: CredentialMatch | None,
+        ttl_seconds: float,
+        generation: int,
+    ) -> None:
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._entries[key] = (time.monotonic() + ttl_seconds, match)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, business_id: str | None = None) -> None:
+        with self._lock:
+            self._generation += 1
+            if business_id is None:
+                self._entries.clear()
+                return
+            stale = [
+                key
+                for key, (_, match) in self._entries.items()
+                if match is None or match.business_id == business_id
+            ]
+            for key in stale:
+                self._entries.pop(key, None)
+
+
+_cache = _CredentialCache()
+invalidation_bus.subscribe(_cache.invalidate)
+
+_last_used_lock = threading.Lock()
+_last_used_writes: dict[str, float] = {}
+
+
+def _credential_key(kind: str, value: str) -> str:
+    digest = hashlib.sha256(value.encode("utf-8")).hexdigest()
+    return f"{kind}:{digest}"
+
+
+def _ttl_seconds() -> float:
+    try:
+        return float(
+            getattr(get_settings(), "tenant_credential_cache_ttl_seconds", 60.0)
+        )
+    except Exception:
+        return 0.0
+
+
+def _lookup(
+    kind: str, value: str, session_factory: Callable[[], Any]
+) -> CredentialMatch | None:
+    column = (
+        BusinessDB.api_key if kind == CREDENTIAL_API_KEY else BusinessDB.widget_token
+    )
+    session = session_factory()
+    try:
+        business = session.query(BusinessDB).filter(column == value).one_or_none()
+        if business is None:
+            return None
+        expires_at = getattr(business, "widget_token_expires_at", None)
+        if expires_at is not None and expires_at.tzinfo is None:
+            expires_at = expires_at.replace(tzinfo=UTC)
+        return CredentialMatch(
+            business_id=str(business.id),
+            widget_token_expires_at=expires_at,
+        )
+    finally:
+        session.close()
+
+
+def resolve_credential(
+    kind: str,
+    value: str,
+    *,
+    session_factory: Callable[[], Any],
+    request: Any | None = None,
+) -> CredentialMatch | None:
+    """Resolve an API key or widget token to its tenant.
+
+    Results are memoised on the request (so middleware, dependencies and
+    audit logging share one lookup) and in a process-wide LRU keyed by the
+    credential hash. Returns None for unknown credentials.
+    """
+    key = _credential_key(kind, value)
+    per_request: dict[str, CredentialMatch | None] | None = None
+    state = getattr(request, "state", None)
+    if state is not None:
+        per_request = getattr(state, _REQUEST_STATE_ATTR, None)
+        if per_request is None:
+            per_request = {}
+            try:
+                setattr(state, _REQUEST_STATE_ATTR, per_request)
+            except Exception:
+                per_request = None
+        elif key in per_request:
+            return per_request[key]
+
+    hit, match = _cache.get(key)
+    if not hit:
+        generation = _cache.generation
+        match = _lookup(kind, value, session_factory)
+        ttl = _ttl_seconds()
+        if ttl > 0:
+            _cache.set(key, match, ttl, generation)
+
+    if per_request is not None:
+        per_request[key] = match
+    return match
+
+
+def record_credential_use(
+    kind: str,
+    value: str,
+    business_id: str,
+    *,
+    session_factory: Callable[[], Any],
+) -> None:
+    """Update ``<kind>_last_used_at`` at most once per write interval."""
+    key = _credential_key(kind, value)
+    now = time.monotonic()
+    with _last_used_lock:
+        last = _last_used_writes.get(key)
+        if last is not None and now - last < LAST_USED_WRITE_INTERVAL_SECONDS:
+            return
+        _last_used_writes[key] = now
+
+    column = f"{kind}_last_used_at"
+    session = session_factory()
+    try:
+        business = session.get(BusinessDB, business_id)
+        if business is None:
+            return
+        setattr(business, column, datetime.now(UTC))
+        session.add(business)
+        session.commit()
+    except Exception:
+        session.rollback()
+        logger.warning(
+            "credential_last_used_update_failed",
+            exc_info=True,
+            extra={"business_id": business_id, "credential_type": kind},
+        )
+    finally:
+        session.close()
@@ -0,0 +1,254 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+import hashlib
+import logging
+import os
+from pathlib import Path
+import threading
+import unicodedata
+from typing import Awaitable, Callable, Dict, Protocol
+
+import anyio
+
+from ..config import get_settings
+from ..metrics import metrics
+
+try:  # Optional dependency; the GCS tier is unavailable without it.
+    from google.api_core.exceptions import NotFound as _GcsNotFound
+    from google.cloud import storage
+except Exception:  # pragma: no cover - library not installed
+    storage = None
+
+    class _GcsNotFound(Exception):  # type: ignore[no-redef]
+        pass
+
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_tts_text(text: str | None) -> str:
+    """Cache key text: NFC-normalized with whitespace collapsed.
+
+    Case and punctuation are kept because both change how a reply is spoken.
+    """
+    return " ".join(unicodedata.normalize("NFC", text or "").split())
+
+
+def tts_cache_key(
+    provider: str, voice: str | None, language: str | None, text: str | None
+) -> str:
+    """Content address of one synthesized reply."""
+    parts = [provider, voice or "", language or "", normalize_tts_text(text)]
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+class TtsAudioStore(Protocol):
+    """Persistent tier behind the in-memory cache; the cache logs its errors."""
+
+    def get(self, key: str) -> str | None: ...
+
+    def put(self, key: str, audio: str) -> None: ...
+
+
+class FileTtsStore:
+    """Synthesized audio stored as one file per key under ``directory``."""
+
+    def __init__(self, directory: str) -> None:
+        self._root = Path(directory)
+
+    def _path(self, key: str) -> Path:
+        return self._root / key[:2] / f"{key}.txt"
+
+    def get(self, key: str) -> str | None:
+        try:
+            return self._path(key).read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return None
+
+    def put(self, key: str, audio: str) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write then rename so concurrent readers never see a partial file.
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}")
+        tmp.write_text(audio, encoding="utf-8")
+        os.replace(tmp, path)
+
+
+class GcsTtsStore:
+    """Synthesized audio stored as objects under ``prefix`` in a GCS bucket."""
+
+    def __init__(
+        self, bucket_name: str, prefix: str = "tts-cache/", client=None
+    ) -> None:
+        if client is None:
+            if storage is None:
+                raise RuntimeError("google-cloud-storage library is not installed")
+            client = storage.Client()
+        self._bucket = client.bucket(bucket_name)
+        self._prefix = prefix
+
+    def get(self, key: str) -> str | None:
+        blob = self._bucket.blob(self._prefix + key)
+        try:
+            return blob.download_as_text()
+        except _GcsNotFound:
+            return None
+
+    def put(self, key: str, audio: str) -> None:
+        blob = self._bucket.blob(self._prefix + key)
+        blob.upload_from_string(audio, content_type="text/plain")
+
+
+class _Inflight:
+    def __init__(self) -> None:
+        self.done = anyio.Event()
+        self.audio: str | None = None
+        self.error: Exception | None = None
+
+
+class TtsCache:
+    """Content-addressed cache of synthesized replies.
+
+    Lookups go to an in-memory LRU bounded by ``max_bytes`` of audio, then
+    the optional persistent store (local disk or GCS), then the provider.
+    Concurrent requests for the same key share one synthesis.
+    """
+
+    def __init__(
+        self, max_bytes: int = 16 * 1024 * 1024, store: TtsAudioStore | None = None
+    ) -> None:
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, str] = OrderedDict()
+        self._bytes = 0
+        self.max_bytes = max(0, max_bytes)
+        self._store = store
+        self._inflight: Dict[str, _Inflight] = {}
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> str | None:
+        with self._lock:
+            audio = self._entries.get(key)
+            if audio is not None:
+                self._entries.move_to_end(key)
+            return audio
+
+    def put(self, key: str, audio: str) -> None:
+        size = len(audio)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= len(previous)
+            self._entries[key] = audio
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+                metrics.tts_cache_evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    async def get_or_synthesize(
+        self,
+        key: str,
+        synthesize: Callable[[], Awaitable[str]],
+        *,
+        cacheable: Callable[[str], bool] = bool,
+    ) -> str:
+        """Return cached audio for ``key`` or store what ``synthesize`` returns.
+
+        Results rejected by ``cacheable`` (e.g. placeholders) are returned
+        but not stored.
+        """
+        audio = self.get(key)
+        if audio is not None:
+            metrics.tts_cache_hits += 1
+            return audio
+        with self._lock:
+            inflight = self._inflight.get(key)
+            owner = inflight is None
+            if inflight is None:
+                inflight = self._inflight[key] = _Inflight()
+        if not owner:
+            metrics.tts_cache_coalesced += 1
+            await inflight.done.wait()
+            if inflight.error is not None:
+                raise inflight.error
+            if inflight.audio is None:
+                # The owner was cancelled; synthesize independently.
+                return await self.get_or_synthesize(
+                    key, synthesize, cacheable=cacheable
+                )
+            return inflight.audio
+        try:
+            audio = await self._load(key)
+            if audio is not None:
+                metrics.tts_cache_store_hits += 1
+            else:
+                metrics.tts_cache_misses += 1
+                audio = await synthesize()
+                if cacheable(audio):
+                    await self._save(key, audio)
+            if cacheable(audio):
+                self.put(key, audio)
+            inflight.audio = audio
+            return audio
+        except Exception as exc:
+            inflight.error = exc
+            raise
+        finally:
+            with self._lock:
+                if self._inflight.get(key) is inflight:
+                    self._inflight.pop(key, None)
+            inflight.done.set()
+
+    async def _load(self, key: str) -> str | None:
+        if self._store is None:
+            return None
+        try:
+            return await anyio.to_thread.run_sync(self._store.get, key)
+        except Exception:
+            logger.warning("tts_cache_read_failed", exc_info=True)
+            return None
+
+    async def _save(self, key: str, audio: str) -> None:
+        if self._store is None:
+            return
+        try:
+            await anyio.to_thread.run_sync(self._store.put, key, audio)
+        except Exception:
+            logger.warning("tts_cache_write_failed", exc_info=True)
+
+
+def _create_tts_cache() -> TtsCache:
+    settings = get_settings().speech
+    store: TtsAudioStore | None = None
+    bucket = getattr(settings, "tts_cache_gcs_bucket", None)
+    directory = getattr(settings, "tts_cache_dir", None)
+    if bucket:
+        try:
+            store = GcsTtsStore(
+                bucket, prefix=getattr(settings, "tts_cache_gcs_prefix", "tts-cache/")
+            )
+        except Exception:
+            logger.warning("tts_cache_gcs_unavailable", exc_info=True)
+    elif directory:
+        store = FileTtsStore(directory)
+    return TtsCache(
+        max_bytes=getattr(settings, "tts_cache_max_bytes", 16 * 1024 * 1024),
+        store=store,
+    )
+
+
+tts_cache = _create_tts_cache()
@@ -1,15 +1,36 @@
 from __future__ import annotations
 
+import csv
 from dataclasses import dataclass
-from datetime import UTC, datetime
+from datetime import UTC, datetime, timedelta
 import logging
 import os
+import re
+import threading
+from typing import Any, Dict, Iterable, List
 
+import anyio
 import httpx
 
+from ..config import get_settings
+from ..db import SQLALCHEMY_AVAILABLE, SessionLocal
+from ..db_models import ZipIncomeProfileDB
+from ..metrics import metrics
+from .job_queue import job_queue
+
 
 logger = logging.getLogger(__name__)
 
+# Use ACS 5-year estimates; 2022 is a reasonable recent default.
+ACS_BASE_URL = "https://api.census.gov/data/2022/acs/acs5"
+ACS_SOURCE = "census_acs_2022"
+ACS_INCOME_FIELD = "B19013_001E"
+ZCTA_FIELD = "zip code tabulation area"
+# ZCTAs per Census API request; the API accepts comma-separated lists.
+FETCH_CHUNK_SIZE = 50
+FETCH_MAX_CONCURRENCY = 4
+_ZIP_CODE_RE = re.compile(r"(\d{5})$")
+
 
 @dataclass
 class ZipIncomeProfile:
@@ -38,11 +59,10 @@ def fetch_zip_income(zip_code: str, timeout_seconds: float = 3.0) -> ZipIncomePr
             error="Invalid or empty ZIP code",
         )
 
-    # Use ACS 5-year estimates; 2022 is a reasonable recent default.
-    base_url = "https://api.census.gov/data/2022/acs/acs5"
+    base_url = ACS_BASE_URL
     params = {
-        "get": "NAME,B19013_001E",
-        "for": f"zip code tabulation area:{zip_code}",
+        "get": f"NAME,{ACS_INCOME_FIELD}",
+        "for": f"{ZCTA_FIELD}:{zip_code}",
     }
     api_key = os.getenv("CENSUS_API_KEY")
     if api_key:
@@ -61,7 +81,7 @@ def fetch_zip_income(zip_code: str, timeout_seconds: float = 3.0) -> ZipIncomePr
         return ZipIncomeProfile(
             zip_code=zip_code,
             median_household_income=None,
-            source="census_acs_2022",
+            source=ACS_SOURCE,
             fetched_at=now,
             error=str(exc),
         )
@@ -73,12 +93,11 @@ def fetch_zip_income(zip_code: str, timeout_seconds: float = 3.0) -> ZipIncomePr
         # Example: [["NAME","B19013_001E","state","zip code tabulation area"],
         #           ["ZCTA5 66202","60000","20","66202"]]
         row = data[1]
-        median_raw = row[1]
-        income = int(median_raw) if median_raw not in (None, "", "-666666666") else None
+        income = _parse_income(row[1])
         return ZipIncomeProfile(
             zip_code=zip_code,
             median_household_income=income,
-            source="census_acs_2022",
+            source=ACS_SOURCE,
             fetched_at=now,
             error=None,
         )
@@ -90,7 +109,288 @@ def fetch_zip_income(zip_code: str, timeout_seconds: float = 3.0) -> ZipIncomePr
         return ZipIncomeProfile(
             zip_code=zip_code,
             median_household_income=None,
-            source="census_acs_2022",
+            source=ACS_SOURCE,
             fetched_at=now,
             error="parse_error",
         )
+
+
+def _parse_income(raw: Any) -> int | None:
+    """Parse an ACS estimate; blanks and negative sentinels mean no data."""
+    if raw in (None, ""):
+        return None
+    value = int(float(raw))
+    # The ACS uses large negative codes (e.g. -666666666) for missing values.
+    return value if value >= 0 else None
+
+
+def load_acs_csv(
+    path: str, fetched_at: datetime | None = None
+) -> List[ZipIncomeProfile]:
+    """Read ZIP median incomes from an ACS B19013 CSV export.
+
+    Accepts the data.census.gov download (``GEO_ID``/``NAME`` plus a label
+    row) and the API's own table shape (a ``zip code tabulation area``
+    column). Rows without a recognisable ZIP or estimate are skipped.
+    """
+    fetched_at = fetched_at or datetime.now(UTC)
+    profiles: List[ZipIncomeProfile] = []
+    with open(path, newline="", encoding="utf-8-sig") as handle:
+        for row in csv.DictReader(handle):
+            code = (row.get(ZCTA_FIELD) or "").strip()
+            if not code:
+                for field in ("GEO_ID", "NAME"):
+                    match = _ZIP_CODE_RE.search((row.get(field) or "").strip())
+                    if match:
+                        code = match.group(1)
+                        break
+            if len(code) != 5 or not code.isdigit():
+                continue
+            try:
+                income = _parse_income((row.get(ACS_INCOME_FIELD) or "").strip())
+            except ValueError:
+                # The export's second row repeats the column labels.
+                continue
+            profiles.append(
+                ZipIncomeProfile(
+                    zip_code=code,
+                    median_household_income=income,
+                    source=ACS_SOURCE,
+                    fetched_at=fetched_at,
+                )
+            )
+    return profiles
+
+
+class ZipIncomeStore:
+    """Local store of ZIP income profiles for neighborhood analytics.
+
+    Dashboard reads only consult memory and, when enabled, the
+    ``zip_income_profiles`` table. Missing or expired ZIPs are refreshed
+    from the Census API in the background, in concurrent batched requests.
+    Rows can also be bulk-loaded from an ACS CSV export (see
+    ``scripts/load_zip_income.py``).
+    """
+
+    def __init__(self, refresh_after_days: int = 180, persistent: bool = False) -> None:
+        self._lock = threading.Lock()
+        self._profiles: Dict[str, ZipIncomeProfile] = {}
+        self._refreshing: set[str] = set()
+        self._refresh_after = timedelta(days=refresh_after_days)
+        self._persistent = persistent
+
+    def is_stale(self, profile: ZipIncomeProfile) -> bool:
+        fetched_at = profile.fetched_at
+        if fetched_at.tzinfo is None:
+            fetched_at = fetched_at.replace(tzinfo=UTC)
+        return datetime.now(UTC) - fetched_at > self._refresh_after
+
+    def get_many(self, zip_codes: Iterable[str]) -> Dict[str, ZipIncomeProfile]:
+        """Return stored profiles (fresh or stale) without any network I/O."""
+        wanted = list(dict.fromkeys(zip_codes))
+        with self._lock:
+            found = {
+                code: self._profiles[code] for code in wanted if code in self._profiles
+            }
+        missing = [code for code in wanted if code not in found]
+        if missing and self._persistent:
+            try:
+                loaded = self._load_rows(missing)
+            except Exception:
+                logger.warning("zip_income_store_read_failed", exc_info=True)
+                loaded = {}
+            with self._lock:
+                self._profiles.update(loaded)
+            found.update(loaded)
+        metrics.zip_income_local_hits += len(found)
+        metrics.zip_income_local_misses += len(wanted) - len(found)
+        return found
+
+    def read_local(self, zip_codes: Iterable[str]) -> Dict[str, ZipIncomeProfile]:
+        """``get_many`` plus a background refresh of missing or stale ZIPs."""
+        wanted = list(dict.fromkeys(zip_codes))
+        found = self.get_many(wanted)
+        due = [
+            code for code in wanted if code not in found or self.is_stale(found[code])
+        ]
+        if due:
+            self.schedule_refresh(due)
+        return found
+
+    def put_many(self, profiles: Iterable[ZipIncomeProfile]) -> int:
+        """Store profiles in memory and, when enabled, in the table."""
+        batch = {profile.zip_code: profile for profile in profiles}
+        if not batch:
+            return 0
+        with self._lock:
+            self._profiles.update(batch)
+        if self._persistent:
+            self._save_rows(list(batch.values()))
+        return len(batch)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._profiles.clear()
+            self._refreshing.clear()
+
+    def schedule_refresh(self, zip_codes: Iterable[str]) -> None:
+        """Queue a background refresh, skipping ZIPs already being refreshed."""
+        with self._lock:
+            pending = [code for code in zip_codes if code not in self._refreshing]
+            self._refreshing.update(pending)
+        if not pending:
+            return
+
+        def _job() -> None:
+            try:
+                anyio.run(self.refresh, pending)
+            finally:
+                with self._lock:
+                    self._refreshing.difference_update(pending)
+
+        job_queue.enqueue("zip_income_refresh", _job)
+
+    async def refresh(self, zip_codes: Iterable[str]) -> Dict[str, ZipIncomeProfile]:
+        fetched = await self.fetch_many(zip_codes)
+        if fetched:
+            await anyio.to_thread.run_sync(self.put_many, list(fetched.values()))
+        return fetched
+
+    async def fetch_many(
+        self, zip_codes: Iterable[str], timeout_seconds: float = 10.0
+    ) -> Dict[str, ZipIncomeProfile]:
+        """Fetch profiles from the Census API in concurrent batched requests.
+
+        ZIPs in a failed request are left out so they are retried later;
+        ZIPs the API has no row for come back with no income.
+        """
+        wanted = [
+            code
+            for code in dict.fromkeys(zip_codes)
+            if len(code) == 5 and code.isdigit()
+        ]
+        results: Dict[str, ZipIncomeProfile] = {}
+        if not wanted:
+            return results
+        limiter = anyio.CapacityLimiter(FETCH_MAX_CONCURRENCY)
+        async with httpx.AsyncClient(timeout=timeout_seconds) as client:
+            async with anyio.create_task_group() as tg:
+                for offset in range(0, len(wanted), FETCH_CHUNK_SIZE):
+                    tg.start_soon(
+                        self._fetch_chunk,
+                        client,
+                        limiter,
+                        wanted[offset : offset + FETCH_CHUNK_SIZE],
+                        results,
+                    )
+        return results
+
+    async def _fetch_chunk(
+        self,
+        client: httpx.AsyncClient,
+        limiter: anyio.CapacityLimiter,
+        zip_codes: List[str],
+        results: Dict[str, ZipIncomeProfile],
+    ) -> None:
+        params = {
+            "get": f"NAME,{ACS_INCOME_FIELD}",
+            "for": f"{ZCTA_FIELD}:{','.join(zip_codes)}",
+        }
+        api_key = os.getenv("CENSUS_API_KEY")
+        if api_key:
+            params["key"] = api_key
+        metrics.zip_income_fetches += 1
+        try:
+            async with limiter:
+                resp = await client.get(ACS_BASE_URL, params=params)
+            resp.raise_for_status()
+            # The API answers 204 when none of the ZCTAs exist.
+            rows = _rows_by_zip(resp.json() if resp.status_code != 204 else [])
+        except Exception as exc:
+            metrics.zip_income_fetch_failures += 1
+            logger.warning(
+                "zip_income_enrichment_failed",
+                extra={"zip_codes": len(zip_codes), "error": str(exc)},
+            )
+            return
+        now = datetime.now(UTC)
+        for code in zip_codes:
+            results[code] = ZipIncomeProfile(
+                zip_code=code,
+                median_household_income=rows.get(code),
+                source=ACS_SOURCE,
+                fetched_at=now,
+            )
+
+    def _load_rows(self, zip_codes: List[str]) -> Dict[str, ZipIncomeProfile]:
+        if SessionLocal is None:
+            raise RuntimeError("Database session factory is not available")
+        session = SessionLocal()
+        try:
+            rows = (
+                session.query(ZipIncomeProfileDB)
+                .filter(ZipIncomeProfileDB.zip_code.in_(zip_codes))
+                .all()
+            )
+            return {
+                row.zip_code: ZipIncomeProfile(
+                    zip_code=row.zip_code,
+                    median_household_income=row.median_household_income,
+                    source=row.source,
+                    fetched_at=row.fetched_at.replace(tzinfo=UTC),
+                )
+                for row in rows
+            }
+        finally:
+            session.close()
+
+    def _save_rows(self, profiles: List[ZipIncomeProfile]) -> None:
+        if SessionLocal is None:
+            raise RuntimeError("Database session factory is not available")
+        session = SessionLocal()
+        try:
+            for profile in profiles:
+                session.merge(
+                    ZipIncomeProfileDB(
+                        zip_code=profile.zip_code,
+                        median_household_income=profile.median_household_income,
+                        source=profile.source,
+                        fetched_at=profile.fetched_at.astimezone(UTC).replace(
+                            tzinfo=None
+                        ),
+                    )
+                )
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+
+def _rows_by_zip(data: Any) -> Dict[str, int | None]:
+    """Map ZCTA to income from a Census API table (header row first)."""
+    if not isinstance(data, list):
+        raise ValueError("Unexpected response shape")
+    if not data:
+        return {}
+    header = data[0]
+    income_col = header.index(ACS_INCOME_FIELD)
+    zip_col = header.index(ZCTA_FIELD)
+    return {str(row[zip_col]): _parse_income(row[income_col]) for row in data[1:]}
+
+
+USE_DB_ZIP_INCOME = os.getenv("USE_DB_ZIP_INCOME", "false").lower() == "true"
+
+
+def _create_zip_income_store() -> ZipIncomeStore:
+    settings = get_settings()
+    return ZipIncomeStore(
+        refresh_after_days=getattr(settings, "zip_income_refresh_days", 180),
+        persistent=USE_DB_ZIP_INCOME
+        and SQLALCHEMY_AVAILABLE
+        and SessionLocal is not None,
+    )
+
+
+zip_income_store = _create_zip_income_store()
@@ -0,0 +1,377 @@
+"""Benchmark the hot tenant queries with and without the composite indexes.
+
+Seeds one large tenant (the demo data from seed_demo_data.py plus synthetic
+history) alongside a handful of noise tenants, then reports the query plan
+and median latency of each hot query shape twice: once with only the
+single-column indexes, and once after creating the composite/partial
+indexes added in alembic revision 0007.
+
+By default a throwaway SQLite file is used. Point --database-url at a
+scratch Postgres database to get EXPLAIN ANALYZE output instead; the
+script creates its own tables and never touches other tenants' rows, but
+it does drop and recreate the 0007 indexes, so do not aim it at a shared
+database.
+
+Examples (from repo root):
+  python backend/scripts/benchmark_query_indexes.py
+  python backend/scripts/benchmark_query_indexes.py --appointments 200000 --runs 20
+  python backend/scripts/benchmark_query_indexes.py --database-url postgresql+psycopg2://...
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Any
+from uuid import uuid4
+
+
+def _ensure_backend_on_path() -> None:
+    backend_dir = Path(__file__).resolve().parents[1]
+    if str(backend_dir) not in sys.path:
+        sys.path.insert(0, str(backend_dir))
+
+
+def _configure_env(database_url: str) -> None:
+    # Must run before any app module is imported: db.py binds its engine and
+    # repositories.py picks DB vs in-memory backends at import time.
+    os.environ["DATABASE_URL"] = database_url
+    os.environ["USE_DB_CUSTOMERS"] = "true"
+    os.environ["USE_DB_APPOINTMENTS"] = "true"
+    os.environ["USE_DB_CONVERSATIONS"] = "true"
+
+
+COMPOSITE_INDEXES = {
+    "customers": ["ix_customers_business_phone", "ix_customers_business_created_at"],
+    "appointments": [
+        "ix_appointments_business_start",
+        "ix_appointments_customer_business_start",
+        "ix_appointments_business_active_start",
+    ],
+    "conversations": [
+        "ix_conversations_business_created_at",
+        "ix_conversations_customer_business",
+    ],
+    "conversation_messages": ["ix_conversation_messages_conversation_timestamp"],
+}
+
+STATUSES = ["SCHEDULED"] * 6 + ["CONFIRMED"] * 2 + ["CANCELLED", "COMPLETED"]
+SERVICE_TYPES = ["Leak", "Drain", "Water heater", "Inspection", "Remodel"]
+LEAD_SOURCES = ["google", "referral", "yelp", "repeat", None]
+
+
+def _table_indexes(tables: dict[str, Any]) -> dict[str, Any]:
+    indexes: dict[str, Any] = {}
+    for table_name, names in COMPOSITE_INDEXES.items():
+        for index in tables[table_name].indexes:
+            if index.name in names:
+                indexes[index.name] = index
+    return indexes
+
+
+def _set_composite_indexes(engine: Any, indexes: dict[str, Any], enabled: bool) -> None:
+    from sqlalchemy import inspect
+
+    for index in indexes.values():
+        existing = {
+            idx["name"] for idx in inspect(engine).get_indexes(index.table.name)
+        }
+        if enabled and index.name not in existing:
+            index.create(bind=engine)
+        elif not enabled and index.name in existing:
+            index.drop(bind=engine)
+    with engine.begin() as conn:
+        conn.exec_driver_sql("ANALYZE")
+
+
+def _bulk_seed(
+    session_factory: Any,
+    business_id: str,
+    *,
+    customers: int,
+    appointments: int,
+    conversations: int,
+    messages_per_conversation: int,
+    now: datetime,
+) -> dict[str, Any]:
+    from app.db_models import (
+        AppointmentDB,
+        ConversationDB,
+        ConversationMessageDB,
+        CustomerDB,
+    )
+
+    rng = random.Random(f"benchmark:{business_id}")
+    naive_now = now.replace(tzinfo=None)
+    session = session_factory()
+    try:
+        customer_rows = [
+            {
+                "id": str(uuid4()),
+                "name": f"Customer {i}",
+                "phone": f"+1555{i:07d}",
+                "business_id": business_id,
+                "created_at": naive_now - timedelta(days=rng.randint(0, 730)),
+                "sms_opt_out": False,
+            }
+            for i in range(customers)
+        ]
+        session.bulk_insert_mappings(CustomerDB, customer_rows)
+        customer_ids = [row["id"] for row in customer_rows]
+
+        appointment_rows = []
+        for _ in range(appointments):
+            start = naive_now - timedelta(
+                minutes=rng.randint(-60 * 24 * 60, 730 * 1440)
+            )
+            appointment_rows.append(
+                {
+                    "id": str(uuid4()),
+                    "customer_id": rng.choice(customer_ids),
+                    "business_id": business_id,
+                    "start_time": start,
+                    "end_time": start + timedelta(hours=1),
+                    "service_type": rng.choice(SERVICE_TYPES),
+                    "is_emergency": rng.random() < 0.1,
+                    "status": rng.choice(STATUSES),
+                    "lead_source": rng.choice(LEAD_SOURCES),
+                    "estimated_value": rng.randint(100, 5000),
+                    "job_stage": rng.choice(["Lead", "Quoted", "Booked", "Completed"]),
+                    "created_at": start - timedelta(days=1),
+                    "reminder_sent": False,
+                }
+            )
+        session.bulk_insert_mappings(AppointmentDB, appointment_rows)
+
+        conversation_rows = []
+        message_rows = []
+        for _ in range(conversations):
+            created = naive_now - timedelta(minutes=rng.randint(0, 730 * 1440))
+            conv_id = str(uuid4())
+            conversation_rows.append(
+                {
+                    "id": conv_id,
+                    "channel": rng.choice(["phone", "sms", "web"]),
+                    "customer_id": rng.choice(customer_ids),
+                    "business_id": business_id,
+                    "created_at": created,
+                }
+            )
+            for n in range(messages_per_conversation):
+                message_rows.append(
+                    {
+                        "id": str(uuid4()),
+                        "conversation_id": conv_id,
+                        "role": "user" if n % 2 == 0 else "assistant",
+                        "text": f"message {n}",
+                        "timestamp": created + timedelta(seconds=n),
+                    }
+                )
+        session.bulk_insert_mappings(ConversationDB, conversation_rows)
+        session.bulk_insert_mappings(ConversationMessageDB, message_rows)
+        session.commit()
+    finally:
+        session.close()
+
+    sample_customer = rng.choice(customer_rows)
+    return {
+        "customer_id": sample_customer["id"],
+        "phone": sample_customer["phone"],
+        "conversation_ids": [row["id"] for row in conversation_rows[:50]],
+    }
+
+
+def _query_shapes(
+    tables: dict[str, Any], business_id: str, sample: dict[str, Any], now: datetime
+) -> list[tuple[str, Any]]:
+    from sqlalchemy import and_, or_, select
+
+    appts = tables["appointments"]
+    convs = tables["conversations"]
+    custs = tables["customers"]
+    msgs = tables["conversation_messages"]
+    naive_now = now.replace(tzinfo=None)
+    window_start = naive_now - timedelta(days=30)
+    cursor_start = naive_now - timedelta(days=90)
+
+    return [
+        (
+            "appointments: active 30d window (owner analytics)",
+            select(appts.c.service_type, appts.c.estimated_value).where(
+                appts.c.business_id == business_id,
+                appts.c.start_time >= window_start,
+                appts.c.start_time <= naive_now,
+                appts.c.status.in_(["SCHEDULED", "CONFIRMED"]),
+            ),
+        ),
+        (
+            "appointments: keyset page (crm list)",
+            select(appts)
+            .where(
+                appts.c.business_id == business_id,
+                or_(
+                    appts.c.start_time > cursor_start,
+                    and_(appts.c.start_time == cursor_start, appts.c.id > ""),
+                ),
+            )
+            .order_by(appts.c.start_time, appts.c.id)
+            .limit(51),
+        ),
+        (
+            "appointments: one customer in tenant",
+            select(appts).where(
+                appts.c.customer_id == sample["customer_id"],
+                appts.c.business_id == business_id,
+            ),
+        ),
+        (
+            "customers: lookup by phone",
+            select(custs).where(
+                custs.c.business_id == business_id,
+                custs.c.phone == sample["phone"],
+            ),
+        ),
+        (
+            "conversations: 30d window",
+            select(convs).where(
+                convs.c.business_id == business_id,
+                convs.c.created_at >= window_start,
+            ),
+        ),
+        (
+            "conversation_messages: bulk load for a page",
+            select(msgs)
+            .where(msgs.c.conversation_id.in_(sample["conversation_ids"]))
+            .order_by(msgs.c.conversation_id, msgs.c.timestamp),
+        ),
+    ]
+
+
+def _explain(conn: Any, statement: Any) -> str:
+    compiled = statement.compile(
+        dialect=conn.dialect, compile_kwargs={"literal_binds": True}
+    )
+    if conn.dialect.name == "sqlite":
+        rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}").fetchall()
+        return "\n".join(f"    {row[-1]}" for row in rows)
+    rows = conn.exec_driver_sql(f"EXPLAIN ANALYZE {compiled}").fetchall()
+    return "\n".join(f"    {row[0]}" for row in rows)
+
+
+def _time(conn: Any, statement: Any, runs: int) -> float:
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        conn.execute(statement).fetchall()
+        samples.append((time.perf_counter() - started) * 1000.0)
+    return statistics.median(samples)
+
+
+def _run_shapes(
+    engine: Any, shapes: list[tuple[str, Any]], runs: int, label: str
+) -> dict[str, float]:
+    print(f"\n=== {label} ===")
+    timings: dict[str, float] = {}
+    with engine.connect() as conn:
+        for name, statement in shapes:
+            median_ms = _time(conn, statement, runs)
+            timings[name] = median_ms
+            print(f"\n{name}: median {median_ms:.2f} ms")
+            print(_explain(conn, statement))
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare hot query plans/timings before and after 0007 indexes."
+    )
+    parser.add_argument(
+        "--database-url",
+        default=None,
+        help="Scratch database URL (default: temporary SQLite file).",
+    )
+    parser.add_argument("--business-id", default="benchmark_large_tenant")
+    parser.add_argument("--customers", type=int, default=5000)
+    parser.add_argument("--appointments", type=int, default=50000)
+    parser.add_argument("--conversations", type=int, default=20000)
+    parser.add_argument("--messages-per-conversation", type=int, default=4)
+    parser.add_argument(
+        "--noise-tenants",
+        type=int,
+        default=4,
+        help="Other tenants seeded with the same volume to make filters selective.",
+    )
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    tmpdir = None
+    database_url = args.database_url
+    if not database_url:
+        tmpdir = tempfile.TemporaryDirectory(prefix="query-bench-")
+        database_url = f"sqlite:///{Path(tmpdir.name) / 'bench.db'}"
+    _configure_env(database_url)
+    _ensure_backend_on_path()
+
+    from app.db import Base, SessionLocal, engine  # noqa: E402
+    from app import db_models  # noqa: F401,E402 - register tables
+    import seed_demo_data  # noqa: E402
+
+    if engine is None or SessionLocal is None:
+        raise SystemExit("SQLAlchemy is required to run this benchmark.")
+
+    Base.metadata.create_all(bind=engine)
+    tables = Base.metadata.tables
+    indexes = _table_indexes(tables)
+
+    now = datetime.now(UTC)
+    print(f"Seeding {args.business_id} via seed_demo_data.py ...")
+    seed_demo_data._reset_db(args.business_id)
+    seed_demo_data.seed_demo_data(args.business_id, anonymize=True)
+
+    volume = dict(
+        customers=args.customers,
+        appointments=args.appointments,
+        conversations=args.conversations,
+        messages_per_conversation=args.messages_per_conversation,
+        now=now,
+    )
+    print(
+        f"Adding {args.appointments} appointments / {args.conversations} "
+        f"conversations of history to {args.business_id} and "
+        f"{args.noise_tenants} noise tenants ..."
+    )
+    sample = _bulk_seed(SessionLocal, args.business_id, **volume)
+    for n in range(args.noise_tenants):
+        _bulk_seed(SessionLocal, f"{args.business_id}_noise_{n}", **volume)
+
+    shapes = _query_shapes(tables, args.business_id, sample, now)
+
+    _set_composite_indexes(engine, indexes, enabled=False)
+    before = _run_shapes(engine, shapes, args.runs, "before (single-column indexes)")
+    _set_composite_indexes(engine, indexes, enabled=True)
+    after = _run_shapes(engine, shapes, args.runs, "after (0007 composite indexes)")
+
+    print("\n=== summary (median ms) ===")
+    width = max(len(name) for name, _ in shapes)
+    print(f"{'query'.ljust(width)}  {'before':>9}  {'after':>9}  {'speedup':>8}")
+    for name, _ in shapes:
+        speedup = before[name] / after[name] if after[name] > 0 else float("inf")
+        print(
+            f"{name.ljust(width)}  {before[name]:9.2f}  {after[name]:9.2f}  "
+            f"{speedup:7.1f}x"
+        )
+
+    if tmpdir is not None:
+        engine.dispose()
+        tmpdir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Bulk-load ZIP median household incomes from an ACS CSV export.
+
+Reads table B19013 as downloaded from data.census.gov (or saved from the
+Census API) and upserts one row per ZCTA into zip_income_profiles, so the
+owner neighborhoods card has income data without calling the Census API.
+
+Examples (from repo root):
+  python backend/scripts/load_zip_income.py ACSDT5Y2022.B19013-Data.csv
+  python backend/scripts/load_zip_income.py acs.csv --database-url postgresql+psycopg2://...
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+
+def _ensure_backend_on_path() -> None:
+    backend_dir = Path(__file__).resolve().parents[1]
+    if str(backend_dir) not in sys.path:
+        sys.path.insert(0, str(backend_dir))
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Load ACS ZIP income profiles")
+    parser.add_argument("csv_path", help="ACS B19013 CSV export")
+    parser.add_argument(
+        "--database-url",
+        default=None,
+        help="Target database (defaults to DATABASE_URL / the app default)",
+    )
+    args = parser.parse_args(argv)
+
+    # Must run before any app module is imported: db.py binds its engine and
+    # zip_enrichment.py picks the persistent store at import time.
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+    os.environ["USE_DB_ZIP_INCOME"] = "true"
+    _ensure_backend_on_path()
+
+    from app.db import init_db
+    from app.services.zip_enrichment import load_acs_csv, zip_income_store
+
+    init_db()
+    profiles = load_acs_csv(args.csv_path)
+    loaded = zip_income_store.put_many(profiles)
+    print(f"Loaded {loaded} ZIP income profiles from {args.csv_path}")
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover - manual entrypoint
+    raise SystemExit(main())
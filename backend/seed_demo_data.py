@@ -52,17 +52,22 @@ def _reset_in_memory(business_id: str | None = None) -> None:
         if business_id:
             customer_ids = list(customers_repo._by_business.get(business_id, []))
             customers_repo._by_business.pop(business_id, None)
+            getattr(customers_repo, "_search", {}).pop(business_id, None)
             for customer_id in customer_ids:
                 customer = customers_repo._by_id.pop(customer_id, None)
                 if not customer:
                     continue
-                for phone, cid in list(customers_repo._by_phone.items()):
-                    if cid == customer_id:
-                        customers_repo._by_phone.pop(phone, None)
+                if customers_repo._by_phone.get(customer.phone) == customer_id:
+                    customers_repo._by_phone.pop(customer.phone, None)
+                getattr(customers_repo, "_by_business_phone", {}).pop(
+                    (business_id, customer.phone), None
+                )
         else:
             customers_repo._by_id.clear()
             customers_repo._by_phone.clear()
             customers_repo._by_business.clear()
+            getattr(customers_repo, "_by_business_phone", {}).clear()
+            getattr(customers_repo, "_search", {}).clear()
 
     if hasattr(appointments_repo, "_by_id") and hasattr(
         appointments_repo, "_by_business"
@@ -70,6 +75,7 @@ def _reset_in_memory(business_id: str | None = None) -> None:
         if business_id:
             appt_ids = list(appointments_repo._by_business.get(business_id, []))
             appointments_repo._by_business.pop(business_id, None)
+            getattr(appointments_repo, "_by_business_start", {}).pop(business_id, None)
             for appt_id in appt_ids:
                 appt = appointments_repo._by_id.pop(appt_id, None)
                 if not appt:
@@ -86,6 +92,7 @@ def _reset_in_memory(business_id: str | None = None) -> None:
             appointments_repo._by_id.clear()
             appointments_repo._by_customer.clear()
             appointments_repo._by_business.clear()
+            getattr(appointments_repo, "_by_business_start", {}).clear()
 
     if hasattr(conversations_repo, "_by_id") and hasattr(
         conversations_repo, "_by_business"
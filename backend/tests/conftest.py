@@ -5,7 +5,12 @@ import pytest
 from app.db import SQLALCHEMY_AVAILABLE, SessionLocal
 from app.db_models import BusinessDB
 from app.deps import DEFAULT_BUSINESS_ID
+from app.services.freebusy_cache import freebusy_cache
+from app.services.geocoding import geocoding_service
+from app.services.oauth_clients import oauth_client_pool
 from app.services.oauth_tokens import oauth_store
+from app.services.tts_cache import tts_cache
+from app.services.zip_enrichment import zip_income_store
 
 
 def _reset_default_business_schedule_settings() -> None:
@@ -32,7 +37,13 @@ def _reset_default_business_schedule_settings() -> None:
 @pytest.fixture(autouse=True)
 def _isolate_global_state():
     oauth_store._tokens.clear()  # type: ignore[attr-defined]
+    freebusy_cache.clear()
+    oauth_client_pool.clear()
+    geocoding_service.clear()
+    zip_income_store.clear()
+    tts_cache.clear()
     _reset_default_business_schedule_settings()
     yield
     oauth_store._tokens.clear()  # type: ignore[attr-defined]
+    oauth_client_pool.clear()
     _reset_default_business_schedule_settings()
@@ -0,0 +1,122 @@
+import base64
+import io
+import struct
+import wave
+
+import pytest
+
+from app.services.audio_pipeline import (
+    MULAW_DECODE_TABLE,
+    VAD_DISCARD,
+    VAD_END,
+    VAD_SPLIT,
+    VAD_START,
+    PcmRingBuffer,
+    VoiceActivityDetector,
+    mulaw_to_pcm,
+)
+from app.services.stt_tts import SpeechProvider, SpeechService
+
+
+def test_mulaw_decoder_matches_reference_samples() -> None:
+    payload = bytes(range(256))
+    expected = b"".join(struct.pack("<h", MULAW_DECODE_TABLE[b]) for b in payload)
+    assert mulaw_to_pcm(payload) == expected
+    # 0xFF is mu-law silence; 0x00 is the largest negative sample.
+    assert struct.unpack("<h", mulaw_to_pcm(b"\xff")) == (0,)
+    assert struct.unpack("<h", mulaw_to_pcm(b"\x00")) == (-32124,)
+
+
+def test_ring_buffer_keeps_newest_audio_when_full() -> None:
+    ring = PcmRingBuffer(8)
+    ring.write(b"\x01\x00\x02\x00\x03\x00")
+    ring.write(b"\x04\x00\x05\x00")
+    assert len(ring) == 8
+    assert ring.dropped_bytes == 2
+    assert bytes(ring.view()) == b"\x02\x00\x03\x00\x04\x00\x05\x00"
+
+    ring.clear()
+    ring.write_mulaw(b"\xff" * 3)
+    ring.write_mulaw(b"\x00\xff")
+    assert bytes(ring.view()) == mulaw_to_pcm(b"\xff\xff\x00\xff")
+    assert ring.dropped_bytes == 4
+
+    # A single frame larger than the ring keeps only its tail.
+    ring.write_mulaw(bytes(range(10)))
+    assert bytes(ring.view()) == mulaw_to_pcm(bytes(range(6, 10)))
+
+
+def test_ring_buffer_tail_and_trim_across_wrap() -> None:
+    ring = PcmRingBuffer(8)
+    ring.write(b"\x01\x00\x02\x00\x03\x00")
+    ring.write(b"\x04\x00\x05\x00")
+    # Storage now wraps; the tail is still the newest audio.
+    assert bytes(ring.tail(2)) == b"\x05\x00"
+    assert bytes(ring.tail(6)) == b"\x03\x00\x04\x00\x05\x00"
+
+    ring.drop_newest(2)
+    ring.keep_newest(4)
+    assert bytes(ring.view()) == b"\x03\x00\x04\x00"
+
+
+_SPEECH = mulaw_to_pcm((b"\x20" * 4 + b"\xa0" * 4) * 20)
+_SILENCE = bytes(320)
+
+
+def _events(vad: VoiceActivityDetector, frames: list[bytes]) -> list[tuple[int, str]]:
+    return [
+        (index, event)
+        for index, frame in enumerate(frames)
+        if (event := vad.process(frame)) is not None
+    ]
+
+
+def test_vad_ends_utterance_after_hangover() -> None:
+    vad = VoiceActivityDetector(8000, hangover_ms=100)
+    frames = [_SILENCE] * 3 + [_SPEECH] * 10 + [_SILENCE] * 2 + [_SPEECH] * 2
+    frames += [_SILENCE] * 6
+
+    # The two-frame pause is shorter than the hangover and stays inside one
+    # utterance; five silent frames (100 ms) close it.
+    assert _events(vad, frames) == [(3, VAD_START), (21, VAD_END)]
+    assert not vad.in_utterance
+    assert vad.finish() is None
+
+
+def test_vad_splits_long_utterances_and_discards_clicks() -> None:
+    vad = VoiceActivityDetector(8000, hangover_ms=100, max_utterance_ms=200)
+    assert _events(vad, [_SPEECH] * 12) == [(0, VAD_START), (9, VAD_SPLIT)]
+    assert vad.in_utterance
+    assert vad.finish() == VAD_DISCARD  # only 40 ms of speech after the split
+
+    vad = VoiceActivityDetector(8000, hangover_ms=100)
+    assert _events(vad, [_SPEECH] + [_SILENCE] * 5) == [
+        (0, VAD_START),
+        (5, VAD_DISCARD),
+    ]
+
+
+@pytest.mark.anyio
+async def test_transcribe_bytes_wraps_pcm_for_legacy_providers() -> None:
+    received: dict = {}
+
+    class LegacyProvider(SpeechProvider):
+        name = "legacy"
+
+        async def transcribe(self, audio: str | None) -> str:
+            received["audio"] = audio
+            return "hello"
+
+        async def synthesize(self, text: str, voice: str | None = None) -> str:
+            return "audio://placeholder"
+
+    service = SpeechService(provider=LegacyProvider())
+    pcm = mulaw_to_pcm(b"\x10\x20" * 80)
+
+    assert await service.transcribe_bytes(memoryview(pcm), 8000) == "hello"
+    with wave.open(io.BytesIO(base64.b64decode(received["audio"]))) as wav_file:
+        assert wav_file.getframerate() == 8000
+        assert wav_file.readframes(wav_file.getnframes()) == pcm
+    received.clear()
+    assert await service.transcribe_bytes(b"", 8000) == ""
+    assert received == {}
@@ -163,3 +163,55 @@ def test_record_audit_event_handles_db_errors_gracefully(
     assert any(
         "audit_event_persist_failed" in r.message for r in caplog.records
     ), "Expected a log entry when audit event persistence fails"
+
+
+def test_audit_writer_buffers_drops_when_full_and_flushes_on_stop(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    from datetime import UTC, datetime
+
+    from app.db_models import AuditEventDB
+    from app.metrics import metrics
+
+    if not audit_module.SQLALCHEMY_AVAILABLE or audit_module.SessionLocal is None:
+        pytest.skip("audit writer persistence requires database support")
+
+    path = "/audit-writer-buffer-test"
+    writer = audit_module.AuditEventWriter(
+        max_events=2, batch_size=100, flush_interval_ms=60_000
+    )
+    dropped_before = metrics.audit_events_dropped
+
+    def _row() -> Dict[str, Any]:
+        return {
+            "created_at": datetime.now(UTC),
+            "actor_type": "anonymous",
+            "business_id": None,
+            "path": path,
+            "method": "GET",
+            "status_code": 200,
+        }
+
+    def _count() -> int:
+        session = audit_module.SessionLocal()
+        try:
+            return session.query(AuditEventDB).filter(AuditEventDB.path == path).count()
+        finally:
+            session.close()
+
+    baseline = _count()
+    writer.start()
+    try:
+        assert writer.submit("audit_event", _row()) is True
+        assert writer.submit("audit_event", _row()) is True
+        # The buffer is full: the third event is dropped rather than blocking.
+        assert writer.submit("audit_event", _row()) is False
+        assert metrics.audit_events_dropped == dropped_before + 1
+        assert writer.pending() == 2
+        assert _count() == baseline
+    finally:
+        writer.stop()
+
+    # Stopping flushes the buffered rows in one batch.
+    assert writer.pending() == 0
+    assert _count() == baseline + 2
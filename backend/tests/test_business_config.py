@@ -107,3 +107,74 @@ def test_language_vertical_and_voice_overrides_and_defaults() -> None:
     )
     assert business_config.get_voice_for_business(None) == default_voice
     assert business_config.get_voice_for_business("unknown-business") == default_voice
+
+
+@pytest.mark.skipif(
+    not SQLALCHEMY_AVAILABLE or SessionLocal is None,
+    reason="Business configuration tests require database support",
+)
+def test_tenant_config_is_cached_and_invalidated_on_commit(monkeypatch) -> None:
+    biz_id = "config_snapshot_cache"
+    session = SessionLocal()
+    try:
+        row = session.get(BusinessDB, biz_id)
+        if row is None:
+            row = BusinessDB(  # type: ignore[call-arg]
+                id=biz_id,
+                name="Snapshot Cache",
+                language_code="en",
+                created_at=datetime.now(UTC),
+            )
+            session.add(row)
+        else:
+            row.language_code = "en"
+        session.commit()
+    finally:
+        session.close()
+
+    config = business_config.get_tenant_config(biz_id)
+    assert config is not None
+    assert config.business_id == biz_id
+    assert config.language_code == "en"
+
+    # Cached snapshots are served without opening a new session.
+    calls = {"count": 0}
+    real_session_local = business_config.SessionLocal
+
+    def counting_session_local():  # type: ignore[no-untyped-def]
+        calls["count"] += 1
+        return real_session_local()
+
+    monkeypatch.setattr(business_config, "SessionLocal", counting_session_local)
+    for _ in range(5):
+        business_config.get_language_for_business(biz_id)
+        business_config.get_vertical_for_business(biz_id)
+        business_config.get_voice_for_business(biz_id)
+        business_config.get_calendar_id_for_business(biz_id)
+    assert calls["count"] == 0
+
+    # Bookkeeping-only writes do not evict the snapshot.
+    session = real_session_local()
+    try:
+        row = session.get(BusinessDB, biz_id)
+        row.api_key_last_used_at = datetime.now(UTC)
+        session.commit()
+    finally:
+        session.close()
+    business_config.get_language_for_business(biz_id)
+    assert calls["count"] == 0
+
+    # Committing a change to a snapshot field invalidates it immediately.
+    session = real_session_local()
+    try:
+        row = session.get(BusinessDB, biz_id)
+        row.language_code = "es"
+        session.commit()
+    finally:
+        session.close()
+    assert business_config.get_language_for_business(biz_id) == "es"
+    assert calls["count"] == 1
+
+    business_config.invalidate_tenant_config(biz_id)
+    business_config.get_language_for_business(biz_id)
+    assert calls["count"] == 2
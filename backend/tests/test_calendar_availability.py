@@ -0,0 +1,224 @@
+from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+import app.services.calendar as calendar_mod
+from app.repositories import appointments_repo
+from app.services.calendar import RANK_ROUTE, RANK_TRAVEL, calendar_service
+from app.services.geocoding import geocoding_service, normalize_address
+
+
+DAY = datetime(2025, 1, 7, tzinfo=UTC)  # Tuesday
+
+
+def _at(hour: int, minute: int = 0) -> datetime:
+    return DAY.replace(hour=hour, minute=minute)
+
+
+def _appt(start: datetime, end: datetime, technician_id=None, address=None):
+    return SimpleNamespace(
+        start_time=start,
+        end_time=end,
+        status="SCHEDULED",
+        technician_id=technician_id,
+        address=address,
+    )
+
+
+def _rules(**overrides) -> calendar_mod._SlotRules:
+    values = dict(
+        open_hour=8,
+        close_hour=17,
+        closed_days=frozenset(),
+        max_jobs_per_day=None,
+        reserve_mornings_for_emergencies=False,
+        travel_buffer_minutes=0,
+    )
+    values.update(overrides)
+    return calendar_mod._SlotRules(**values)
+
+
+def _index(with_addresses: bool = False) -> calendar_mod._BusyIndex:
+    return calendar_mod._BusyIndex(
+        [
+            _appt(_at(8), _at(12), "tech-a", "A" if with_addresses else None),
+            _appt(_at(8), _at(9), "tech-b", "B" if with_addresses else None),
+            _appt(_at(13), _at(14), None, "U" if with_addresses else None),
+        ]
+    )
+
+
+def _search(index, rules, **kwargs):  # type: ignore[no-untyped-def]
+    kwargs.setdefault("duration", timedelta(hours=1))
+    return calendar_mod._search_slots(
+        index,
+        rules,
+        search_start=_at(8),
+        technicians=["tech-a", "tech-b"],
+        include_unassigned=True,
+        limit=3,
+        days=1,
+        **kwargs,
+    )
+
+
+def test_search_slots_merges_technicians_earliest_first():
+    slots = _search(_index(), _rules())
+    assert [(s.start, s.technician_id) for s in slots] == [
+        (_at(9), "tech-b"),
+        (_at(12), "tech-a"),
+        (_at(14), "tech-a"),
+    ]
+
+
+def test_search_slots_applies_daily_capacity_per_technician():
+    # Each technician already has two jobs once unassigned work is counted.
+    assert _search(_index(), _rules(max_jobs_per_day=2)) == []
+
+
+def test_search_slots_ranks_by_least_travel(monkeypatch):
+    travel = {"A": 5, "B": 30, "U": 20}
+    monkeypatch.setattr(
+        calendar_mod,
+        "_estimate_travel_minutes",
+        lambda origin, destination: travel.get(origin) if destination else None,
+    )
+    kwargs = dict(address="Job site", duration=timedelta(minutes=30))
+
+    earliest = _search(_index(with_addresses=True), _rules(), **kwargs)
+    # Travel buffers pad each busy block before gaps are measured.
+    assert [s.start for s in earliest] == [_at(9, 30), _at(12, 5), _at(14, 20)]
+
+    by_travel = _search(
+        _index(with_addresses=True), _rules(), rank_by=RANK_TRAVEL, **kwargs
+    )
+    assert [(s.start, s.travel_minutes) for s in by_travel] == [
+        (_at(12, 5), 5),
+        (_at(14, 20), 20),
+        (_at(9, 30), 30),
+    ]
+
+
+def test_search_slots_ranks_by_least_route_detour():
+    # Jobs at X then Y along one road; the new site lies just past Y.
+    for label, coords in {
+        "X": (0.0, 0.0),
+        "Y": (0.0, 0.1),
+        "Site": (0.0, 0.13),
+    }.items():
+        geocoding_service.memory.put(normalize_address(label), coords)
+    index = calendar_mod._BusyIndex(
+        [
+            _appt(_at(8), _at(9), "tech-a", "X"),
+            _appt(_at(12), _at(13), "tech-a", "Y"),
+        ]
+    )
+    kwargs = dict(address="Site", technicians=["tech-a"], limit=2, days=1)
+
+    earliest = calendar_mod._search_slots(
+        index, _rules(), search_start=_at(8), duration=timedelta(hours=1), **kwargs
+    )
+    assert earliest[0].start < _at(12) < earliest[1].start
+
+    by_route = calendar_mod._search_slots(
+        index,
+        _rules(),
+        search_start=_at(8),
+        duration=timedelta(hours=1),
+        rank_by=RANK_ROUTE,
+        **kwargs,
+    )
+    # After Y costs only the Y->site leg; between X and Y is a longer detour.
+    assert [s.start for s in by_route] == [earliest[1].start, earliest[0].start]
+    assert [s.detour_minutes for s in by_route] == [5, 10]
+
+
+def test_route_ranking_charges_base_legs_on_empty_days():
+    # X is far from the site; Y is 3 km away and keeps the tech until 14:00.
+    for label, coords in {
+        "X": (0.0, 0.0),
+        "Y": (0.0, 0.27),
+        "Site": (0.0, 0.297),
+    }.items():
+        geocoding_service.memory.put(normalize_address(label), coords)
+    index = calendar_mod._BusyIndex(
+        [
+            _appt(_at(8), _at(9), "tech-a", "X"),
+            _appt(_at(9), _at(14), "tech-a", "Y"),
+        ]
+    )
+
+    by_route = calendar_mod._search_slots(
+        index,
+        _rules(),
+        search_start=_at(14, 15),
+        duration=timedelta(hours=1),
+        technicians=["tech-a"],
+        address="Site",
+        rank_by=RANK_ROUTE,
+        limit=3,
+        days=3,
+    )
+    # Following Y beats a trip out to the site and back on an empty day.
+    assert [(s.start, s.detour_minutes) for s in by_route] == [
+        (_at(14, 15), 5),
+        (_at(8) + timedelta(days=1), 2 * calendar_mod.ROUTE_BASE_LEG_MINUTES),
+        (_at(8) + timedelta(days=2), 2 * calendar_mod.ROUTE_BASE_LEG_MINUTES),
+    ]
+
+
+@pytest.mark.anyio
+async def test_find_availability_blocks_unassigned_work_for_every_technician():
+    business_id = "availability_biz"
+    technicians = ["tech-a", "tech-b"]
+    first = (
+        await calendar_service.find_availability(
+            60, business_id=business_id, technician_ids=technicians, limit=1
+        )
+    )[0]
+    appointments_repo.create(
+        customer_id="c1",
+        start_time=first.start,
+        end_time=first.end,
+        service_type="repair",
+        business_id=business_id,
+        is_emergency=False,
+    )
+
+    slots = await calendar_service.find_availability(
+        60, business_id=business_id, technician_ids=technicians, limit=3
+    )
+    assert len(slots) == 3
+    assert [s.start for s in slots] == sorted({s.start for s in slots})
+    assert all(s.start >= first.end or s.end <= first.start for s in slots)
+    assert {s.technician_id for s in slots} <= set(technicians)
+
+    with pytest.raises(ValueError):
+        await calendar_service.find_availability(
+            60, business_id=business_id, rank_by="cheapest"
+        )
+
+
+def test_has_conflict_blocks_unassigned_work_for_every_technician():
+    business_id = "conflict_unassigned_biz"
+    appointments_repo.create(
+        customer_id="c1",
+        start_time=_at(10),
+        end_time=_at(11),
+        service_type="repair",
+        business_id=business_id,
+        is_emergency=False,
+    )
+
+    def _conflict(technician_id):  # type: ignore[no-untyped-def]
+        return calendar_service.has_conflict(
+            business_id=business_id,
+            start=_at(10, 30),
+            end=_at(11, 30),
+            technician_id=technician_id,
+        )
+
+    assert _conflict("tech-a") is True
+    assert _conflict("tech-b") is True
+    assert _conflict(None) is True
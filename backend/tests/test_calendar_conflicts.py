@@ -106,3 +106,78 @@ def test_has_conflict_blocks_closed_days_and_hours():
         )
         is False
     )
+
+
+def _fail_full_scan(*_args, **_kwargs):  # type: ignore[no-untyped-def]
+    raise AssertionError("slot checks must not load the tenant's full history")
+
+
+def test_has_conflict_is_scoped_to_technician_and_day(monkeypatch):
+    _reset_appts()
+    business_id = "busy_index_biz"
+    monkeypatch.setattr(appointments_repo, "list_for_business", _fail_full_scan)
+
+    start = datetime(2025, 1, 7, 10, 0, tzinfo=UTC)
+    appointments_repo.create(
+        customer_id="c1",
+        start_time=start,
+        end_time=start + timedelta(hours=1),
+        service_type="repair",
+        business_id=business_id,
+        is_emergency=False,
+        technician_id="tech-a",
+    )
+    cancelled = appointments_repo.create(
+        customer_id="c2",
+        start_time=start + timedelta(hours=2),
+        end_time=start + timedelta(hours=3),
+        service_type="repair",
+        business_id=business_id,
+        is_emergency=False,
+        technician_id="tech-a",
+    )
+    appointments_repo.update(cancelled.id, status="CANCELLED")
+
+    def _conflict(slot_start, technician_id=None):  # type: ignore[no-untyped-def]
+        return calendar_service.has_conflict(
+            business_id=business_id,
+            start=slot_start,
+            end=slot_start + timedelta(minutes=30),
+            technician_id=technician_id,
+        )
+
+    assert _conflict(start, "tech-a") is True
+    assert _conflict(start) is True
+    assert _conflict(start, "tech-b") is False
+    assert _conflict(start + timedelta(days=1), "tech-a") is False
+    assert _conflict(start + timedelta(hours=2), "tech-a") is False
+
+
+@pytest.mark.anyio
+async def test_find_slots_skips_busy_technician_without_full_scan(monkeypatch):
+    _reset_appts()
+    business_id = "busy_index_slots_biz"
+    slots = await calendar_service.find_slots(
+        duration_minutes=60, business_id=business_id, technician_id="tech-a"
+    )
+    first = slots[0]
+    appointments_repo.create(
+        customer_id="c1",
+        start_time=first.start,
+        end_time=first.end,
+        service_type="repair",
+        business_id=business_id,
+        is_emergency=False,
+        technician_id="tech-a",
+    )
+    monkeypatch.setattr(appointments_repo, "list_for_business", _fail_full_scan)
+
+    busy = await calendar_service.find_slots(
+        duration_minutes=60, business_id=business_id, technician_id="tech-a"
+    )
+    free = await calendar_service.find_slots(
+        duration_minutes=60, business_id=business_id, technician_id="tech-b"
+    )
+    assert busy[0].start >= first.end
+    # Slots may start at "now + 1h", so allow for the clock moving on.
+    assert abs((free[0].start - first.start).total_seconds()) < 60
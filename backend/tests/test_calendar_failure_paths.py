@@ -2,6 +2,7 @@ from datetime import UTC, datetime, timedelta
 
 import pytest
 
+from app.business_config import TenantConfig
 from app.services.calendar import HttpError, TimeSlot, calendar_service
 import app.services.calendar as calendar_mod
 
@@ -39,20 +40,13 @@ def test_parse_closed_days_and_invalid_hours(monkeypatch):
 
 
 def test_get_business_capacity_handles_invalid_values(monkeypatch):
-    class DummyRow:
-        max_jobs_per_day = "not-an-int"
-        reserve_mornings_for_emergencies = "yes"
-        travel_buffer_minutes = "NaN"
-
-    class DummySession:
-        def get(self, model, key):
-            return DummyRow()
-
-        def close(self):
-            return None
-
-    monkeypatch.setattr(calendar_mod, "SQLALCHEMY_AVAILABLE", True)
-    monkeypatch.setattr(calendar_mod, "SessionLocal", lambda: DummySession())
+    config = TenantConfig(
+        id="biz-capacity",
+        max_jobs_per_day="not-an-int",  # type: ignore[arg-type]
+        reserve_mornings_for_emergencies="yes",  # type: ignore[arg-type]
+        travel_buffer_minutes="NaN",  # type: ignore[arg-type]
+    )
+    monkeypatch.setattr(calendar_mod, "get_tenant_config", lambda business_id: config)
 
     max_jobs, reserve_mornings, buffer_minutes, service_durations = (
         calendar_mod._get_business_capacity("biz-capacity")
@@ -2,8 +2,10 @@ from datetime import UTC, datetime, timedelta
 
 import pytest
 
+from app import business_config
 from app.db import SQLALCHEMY_AVAILABLE, SessionLocal
 from app.db_models import BusinessDB
+import app.services.calendar as calendar_mod
 from app.services.calendar import (
     TimeSlot,
     _align_to_business_hours,
@@ -116,6 +118,59 @@ def test_get_business_capacity_reads_business_fields() -> None:
     assert service_durations == {}
 
 
+@pytest.mark.skipif(
+    not SQLALCHEMY_AVAILABLE or SessionLocal is None,
+    reason="Business configuration lookups require database support",
+)
+def test_business_rule_lookups_share_cached_tenant_config(monkeypatch) -> None:
+    biz_id = "calendar_cached_rules"
+    session = SessionLocal()
+    try:
+        row = session.get(BusinessDB, biz_id)
+        if row is None:
+            row = BusinessDB(  # type: ignore[call-arg]
+                id=biz_id,
+                name="Calendar Cached Rules",
+                calendar_id="cached-calendar",
+                time_zone="America/Chicago",
+                open_hour=7,
+                close_hour=15,
+                max_jobs_per_day=4,
+            )
+            session.add(row)
+        else:
+            row.calendar_id = "cached-calendar"
+            row.time_zone = "America/Chicago"
+            row.open_hour = 7
+            row.close_hour = 15
+            row.max_jobs_per_day = 4
+        session.commit()
+    finally:
+        session.close()
+    business_config.invalidate_tenant_config(biz_id)
+
+    calls = {"count": 0}
+    real_session_local = business_config.SessionLocal
+
+    def counting_session_local():  # type: ignore[no-untyped-def]
+        calls["count"] += 1
+        return real_session_local()
+
+    monkeypatch.setattr(business_config, "SessionLocal", counting_session_local)
+    monkeypatch.setattr(calendar_mod, "SessionLocal", counting_session_local)
+
+    # A slot-proposal turn reads hours, capacity, time zone and calendar id;
+    # only the first lookup should reach the database.
+    for _ in range(3):
+        rules = calendar_mod._load_slot_rules(biz_id)
+        tz = calendar_mod._get_business_timezone(biz_id)
+        cal_id = calendar_service._resolve_calendar_id(biz_id, None)
+    assert calls["count"] == 1
+    assert (rules.open_hour, rules.close_hour, rules.max_jobs_per_day) == (7, 15, 4)
+    assert str(tz) == "America/Chicago"
+    assert cal_id == "cached-calendar"
+
+
 def test_align_to_business_hours_skips_closed_days_and_respects_duration() -> None:
     # Sunday start with Sunday closed should move to Monday at open_hour.
     start = datetime(2025, 1, 5, 7, 0, tzinfo=UTC)  # Sunday
@@ -0,0 +1,93 @@
+import asyncio
+
+import pytest
+
+from app.metrics import metrics
+from app.services.calendar_sync import CalendarSyncScheduler
+
+
+class _FakeSync:
+    """Records sync calls; each call blocks until released."""
+
+    def __init__(self) -> None:
+        self.calls: list[tuple[str, bool]] = []
+        self.active = 0
+        self.peak = 0
+        self.release = asyncio.Event()
+
+    async def __call__(self, *, business_id: str, force_full: bool = False) -> dict:
+        self.calls.append((business_id, force_full))
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await self.release.wait()
+        finally:
+            self.active -= 1
+        return {"synced": True, "processed": 1}
+
+
+@pytest.mark.asyncio
+async def test_duplicate_notifications_coalesce_into_one_sync() -> None:
+    fake = _FakeSync()
+    scheduler = CalendarSyncScheduler(sync_fn=fake)
+    coalesced_before = metrics.calendar_sync_coalesced
+
+    futures = [scheduler.submit("biz-a") for _ in range(3)]
+    futures.append(scheduler.submit("biz-a", force_full=True))
+    fake.release.set()
+    results = await asyncio.gather(*futures)
+
+    assert fake.calls == [("biz-a", True)]
+    assert all(result["synced"] for result in results)
+    assert metrics.calendar_sync_coalesced - coalesced_before == 3
+    assert "biz-a" in metrics.calendar_sync_lag_seconds
+
+
+@pytest.mark.asyncio
+async def test_notification_during_running_sync_queues_one_rerun() -> None:
+    fake = _FakeSync()
+    scheduler = CalendarSyncScheduler(sync_fn=fake)
+
+    first = scheduler.submit("biz-b")
+    await asyncio.sleep(0)
+    assert fake.active == 1
+    # Both arrive mid-sync and share a single follow-up run.
+    second = scheduler.submit("biz-b")
+    third = scheduler.submit("biz-b")
+    assert second is third and second is not first
+
+    fake.release.set()
+    await asyncio.gather(first, second)
+    await scheduler.drain()
+    assert fake.calls == [("biz-b", False), ("biz-b", False)]
+
+
+@pytest.mark.asyncio
+async def test_tenants_sync_concurrently_up_to_the_limit() -> None:
+    fake = _FakeSync()
+    scheduler = CalendarSyncScheduler(max_concurrency=2, sync_fn=fake)
+
+    swept = asyncio.create_task(scheduler.sweep([f"biz-{i}" for i in range(5)]))
+    for _ in range(5):
+        await asyncio.sleep(0)
+    assert fake.active == 2
+
+    fake.release.set()
+    assert await swept == 5
+    assert fake.peak == 2
+    assert sorted(call[0] for call in fake.calls) == [f"biz-{i}" for i in range(5)]
+
+
+@pytest.mark.asyncio
+async def test_failed_sync_is_reported_to_waiters() -> None:
+    async def failing(*, business_id: str, force_full: bool = False) -> dict:
+        raise RuntimeError("google down")
+
+    scheduler = CalendarSyncScheduler(sync_fn=failing)
+    failures_before = metrics.calendar_sync_failures
+
+    with pytest.raises(RuntimeError):
+        await scheduler.submit("biz-fail")
+    assert metrics.calendar_sync_failures == failures_before + 1
+    # Sweeps swallow per-tenant failures.
+    assert await scheduler.sweep(["biz-fail"]) == 1
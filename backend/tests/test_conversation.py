@@ -19,7 +19,7 @@ from app.services.email_service import EmailResult
 from app.services.calendar import TimeSlot
 from app.services.sessions import CallSession
 from app.metrics import metrics
-from app.repositories import customers_repo
+from app.repositories import appointments_repo, customers_repo
 
 
 def run(coro):
@@ -221,7 +221,7 @@ def test_conversation_sends_email_confirmation_when_customer_has_email(monkeypat
             body=None,
             business_id=None,
             from_email=None,
-            **_
+            **_,
         ):
             sent.append(
                 {
@@ -424,6 +424,7 @@ def test_conversation_requires_address_before_searching_slots(monkeypatch):
     async def fail_find_slots(*args, **kwargs):
         raise AssertionError("find_slots should not be called without address")
 
+    monkeypatch.setattr(calendar_service, "find_availability", fail_find_slots)
     monkeypatch.setattr(calendar_service, "find_slots", fail_find_slots)
 
     manager = ConversationManager()
@@ -468,6 +469,7 @@ def test_conversation_no_slots_available_fallback(monkeypatch):
     async def fake_find_slots(*args, **kwargs):
         return []
 
+    monkeypatch.setattr(calendar_service, "find_availability", fake_find_slots)
     monkeypatch.setattr(calendar_service, "find_slots", fake_find_slots)
 
     manager = ConversationManager()
@@ -509,3 +511,65 @@ def test_conversation_confirm_slot_fallback_when_no_requested_time(monkeypatch):
     result = run(manager.handle_input(session, "yes"))
     assert result.new_state["status"] == "PENDING_FOLLOWUP"
     assert result.new_state["stage"] == "COMPLETED"
+
+
+def test_conversation_declined_slot_offers_cached_alternative(monkeypatch):
+    session = CallSession(
+        id="alt-slots",
+        caller_phone="555-4545",
+        stage="ASK_SCHEDULE",
+        business_id="biz-alt-slots",
+    )
+    session.problem_summary = "leak under sink"
+    session.address = "10 Elm St"
+    base = (datetime.now(UTC) + timedelta(days=2)).replace(
+        hour=13, minute=0, second=0, microsecond=0
+    )
+    searches = []
+
+    async def fake_find_availability(*args, **kwargs):
+        searches.append(kwargs)
+        return [
+            TimeSlot(
+                start=base + timedelta(hours=i),
+                end=base + timedelta(hours=i, minutes=30),
+                technician_id=f"tech-{i}",
+            )
+            for i in range(3)
+        ]
+
+    async def fail_find_slots(*args, **kwargs):
+        raise AssertionError("declining must reuse the cached alternatives")
+
+    monkeypatch.setattr(calendar_service, "find_availability", fake_find_availability)
+    monkeypatch.setattr(calendar_service, "find_slots", fail_find_slots)
+    # The second alternative has been taken since the search ran.
+    monkeypatch.setattr(
+        calendar_service,
+        "has_conflict",
+        lambda **kwargs: kwargs["technician_id"] == "tech-1",
+    )
+
+    manager = ConversationManager()
+    result = run(manager.handle_input(session, "yes"))
+    assert result.new_state["stage"] == "CONFIRM_SLOT"
+    assert result.new_state["proposed_slot"]["technician_id"] == "tech-0"
+    assert len(result.new_state["alternative_slots"]) == 2
+
+    result = run(manager.handle_input(session, "no, later please"))
+    assert result.new_state["stage"] == "CONFIRM_SLOT"
+    assert (
+        result.new_state["proposed_slot"]["start"]
+        == (base + timedelta(hours=2)).isoformat()
+    )
+    assert len(searches) == 1
+
+    result = run(manager.handle_input(session, "yes"))
+    assert result.new_state["status"] == "SCHEDULED"
+    booked = [
+        a
+        for a in appointments_repo.list_for_business("biz-alt-slots")
+        if a.start_time == base + timedelta(hours=2)
+    ]
+    assert booked and booked[0].technician_id == "tech-2"
+    assert session.slot_alternatives == []
@@ -215,3 +215,55 @@ def test_crm_appointments_support_basic_filters():
     assert status_filtered.status_code == 200
     status_items = status_filtered.json()
     assert all(a["status"] == "SCHEDULED" for a in status_items)
+
+
+def test_crm_appointments_keyset_pagination_with_cursor():
+    resp = client.post(
+        "/v1/crm/customers",
+        json={"name": "Cursor Customer", "phone": "555-7711"},
+    )
+    assert resp.status_code == 200
+    customer_id = resp.json()["id"]
+
+    now = datetime.now(UTC)
+    created: list[str] = []
+    # Create out of order so the listing has to sort by start time.
+    for days in (44, 41, 43, 40, 42):
+        start = (now + timedelta(days=days)).replace(
+            hour=9, minute=0, second=0, microsecond=0
+        )
+        resp = client.post(
+            "/v1/crm/appointments",
+            json={
+                "customer_id": customer_id,
+                "start_time": start.isoformat(),
+                "end_time": (start + timedelta(hours=1)).isoformat(),
+                "service_type": "CursorPaged",
+                "is_emergency": False,
+            },
+        )
+        assert resp.status_code == 200
+        created.append(resp.json()["id"])
+
+    seen: list[dict] = []
+    cursor = None
+    pages = 0
+    while True:
+        params = {"service_type": "CursorPaged", "limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        page = client.get("/v1/crm/appointments", params=params)
+        assert page.status_code == 200
+        pages += 1
+        seen.extend(page.json())
+        cursor = page.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+
+    assert pages == 3
+    assert sorted(a["id"] for a in seen) == sorted(created)
+    starts = [a["start_time"] for a in seen]
+    assert starts == sorted(starts)
+
+    bad = client.get("/v1/crm/appointments", params={"cursor": "not-a-cursor"})
+    assert bad.status_code == 400
@@ -0,0 +1,48 @@
+from app.services.customer_search import (
+    CustomerSearchIndex,
+    name_trigrams,
+    normalize_phone,
+)
+
+
+def test_normalize_phone_infers_e164() -> None:
+    assert normalize_phone("(512) 555-0101") == "+15125550101"
+    assert normalize_phone("1-512-555-0101") == "+15125550101"
+    assert normalize_phone("+44 20 7946 0958") == "+442079460958"
+    assert normalize_phone("555-0001") == "5550001"
+    assert normalize_phone(None) == ""
+
+
+def test_name_trigrams_match_pg_trgm_padding() -> None:
+    assert name_trigrams("Cat") == {"  c", " ca", "cat", "at "}
+
+
+def test_index_replaces_and_removes_entries() -> None:
+    index = CustomerSearchIndex()
+    index.add("c1", "Alpha Plumbing", "555-0001")
+    index.add("c2", "Beta Electric", "555-0002")
+    assert index.search("alpha") == ["c1"]
+    assert index.search("555-0002") == ["c2"]
+
+    index.add("c1", "Gamma Roofing", "555-0003")
+    assert index.search("alpha") == []
+    assert index.search("gam") == ["c1"]
+    assert index.search("0001") == []
+
+    index.remove("c1")
+    assert len(index) == 1
+    assert index.search("gamma") == []
+    assert index.search("5550", limit=1) == ["c2"]
+
+
+def test_index_matches_short_and_cross_word_substrings() -> None:
+    index = CustomerSearchIndex()
+    index.add("c1", "John Smith", "555-0001")
+    index.add("c2", "Alan Brown", "555-0002")
+    index.add("c3", "Maria Lopez", "555-0003")
+
+    # Match mid-word and across words like a plain substring scan, including
+    # queries whose words are too short to have trigrams.
+    assert index.search("mi") == ["c1"]
+    assert index.search("hn sm") == ["c1"]
+    assert index.search("ria lo") == ["c3"]
@@ -5,11 +5,16 @@ import pytest
 
 from app.db import SQLALCHEMY_AVAILABLE, SessionLocal
 from app.db_models import ConversationDB
+from app.metrics import metrics
+from app.models import AppointmentQuery
 from app.repositories import (
     DbAppointmentRepository,
     DbConversationRepository,
     DbCustomerRepository,
+    InMemoryAppointmentRepository,
+    InMemoryCustomerRepository,
 )
+from app.services.appointment_rollup import AppointmentDailyRollup
 
 
 pytestmark = pytest.mark.skipif(
@@ -157,3 +162,453 @@ def test_db_conversation_repository_create_append_and_get() -> None:
 
     all_convs = repo.list_all()
     assert any(c.id == conv.id for c in all_convs)
+
+
+def test_db_conversation_repository_lists_without_per_row_queries() -> None:
+    from sqlalchemy import event
+
+    repo = DbConversationRepository()
+    business_id = f"db_conv_list_{uuid4().hex[:8]}"
+    convs = [
+        repo.create(channel="sms", customer_id=f"cust-{i}", business_id=business_id)
+        for i in range(5)
+    ]
+    for i, conv in enumerate(convs):
+        for n in range(i):
+            repo.append_message(conv.id, role="user", text=f"message {n}")
+
+    statements: list[str] = []
+
+    def _record(conn, cursor, statement, *args):  # type: ignore[no-untyped-def]
+        statements.append(statement)
+
+    engine = SessionLocal.kw["bind"]
+    event.listen(engine, "before_cursor_execute", _record)
+    try:
+        full = repo.list_for_business(business_id)
+        full_queries = len(statements)
+        statements.clear()
+        counted = repo.list_for_business(business_id, with_messages=False)
+        counted_queries = len(statements)
+    finally:
+        event.remove(engine, "before_cursor_execute", _record)
+
+    assert full_queries == 2
+    assert counted_queries == 2
+    by_id = {c.id: c for c in full}
+    for i, conv in enumerate(convs):
+        assert [m.text for m in by_id[conv.id].messages] == [
+            f"message {n}" for n in range(i)
+        ]
+    counts = {c.id: c.message_count for c in counted}
+    assert counts == {conv.id: i for i, conv in enumerate(convs)}
+    assert all(c.messages == [] for c in counted)
+
+
+@pytest.mark.parametrize(
+    "repo_factory",
+    [InMemoryAppointmentRepository, DbAppointmentRepository],
+    ids=["memory", "db"],
+)
+def test_appointment_repository_aggregates_window(repo_factory) -> None:
+    repo = repo_factory()
+    business_id = f"agg_biz_{uuid4().hex[:8]}"
+    now = datetime.now(UTC)
+
+    def _create(customer_id, offset_days, **kwargs):  # type: ignore[no-untyped-def]
+        start = now - timedelta(days=offset_days)
+        return repo.create(
+            customer_id=customer_id,
+            start_time=start,
+            end_time=start + timedelta(hours=1),
+            service_type=kwargs.pop("service_type", "Repair"),
+            is_emergency=kwargs.pop("is_emergency", False),
+            business_id=business_id,
+            **kwargs,
+        )
+
+    _create("c1", 1, estimated_value=100, lead_source="web", job_stage="Quote")
+    _create("c1", 2, estimated_value=50, quoted_value=80, is_emergency=True)
+    _create("c2", 3, service_type="Install", job_stage="Booked")
+    cancelled = _create("c2", 4, estimated_value=999)
+    repo.update(cancelled.id, status="CANCELLED")
+    _create("c3", 40, estimated_value=500)
+
+    groups = repo.aggregate_for_business(
+        business_id,
+        group_by=("service_type",),
+        start=now - timedelta(days=30),
+        end=now,
+        statuses={"SCHEDULED", "CONFIRMED"},
+    )
+    by_service = {g.group["service_type"]: g for g in groups}
+    assert set(by_service) == {"Repair", "Install"}
+    repair = by_service["Repair"]
+    assert repair.count == 2
+    assert repair.emergency_count == 1
+    assert repair.estimated_value_total == 150
+    assert repair.quoted_or_estimated_total == 180
+    assert by_service["Install"].estimated_value_total == 0
+
+    (overall,) = repo.aggregate_for_business(
+        business_id, start=now - timedelta(days=30), end=now
+    )
+    assert overall.count == 4
+    assert overall.with_estimated_value == 3
+    assert overall.with_lead_source == 1
+    assert overall.complete == 1
+
+    with pytest.raises(ValueError):
+        repo.aggregate_for_business(business_id, group_by=("description",))
+
+    first = repo.first_appointment_after(
+        business_id,
+        {"c1": now - timedelta(days=5), "c2": now - timedelta(days=3), "c9": now},
+        end=now,
+        statuses={"SCHEDULED", "CONFIRMED"},
+    )
+    assert set(first) == {"c1"}
+    assert abs((first["c1"] - (now - timedelta(days=2))).total_seconds()) < 1
+
+
+@pytest.mark.parametrize(
+    "repo_factory",
+    [InMemoryAppointmentRepository, DbAppointmentRepository],
+    ids=["memory", "db"],
+)
+def test_appointment_repository_query_pages_by_start_time(repo_factory) -> None:
+    repo = repo_factory()
+    business_id = f"page_biz_{uuid4().hex[:8]}"
+    base = datetime.now(UTC).replace(microsecond=0) + timedelta(days=1)
+    ids = []
+    for hours in (3, 0, 2, 1, 4):
+        appt = repo.create(
+            customer_id="cust-page",
+            start_time=base + timedelta(hours=hours),
+            end_time=base + timedelta(hours=hours, minutes=30),
+            service_type="Repair",
+            is_emergency=hours % 2 == 0,
+            business_id=business_id,
+            tags=["vip"] if hours != 2 else ["vip_plus"],
+        )
+        ids.append((hours, appt.id))
+    expected = [appt_id for _, appt_id in sorted(ids)]
+
+    collected = []
+    query = AppointmentQuery(limit=2)
+    while True:
+        page = repo.query_for_business(business_id, query)
+        collected.extend(a.id for a in page.items)
+        if page.next_after is None:
+            break
+        query = AppointmentQuery(limit=2, after=page.next_after)
+    assert collected == expected
+
+    tagged = repo.query_for_business(
+        business_id, AppointmentQuery(tag="vip", is_emergency=True)
+    )
+    assert [a.id for a in tagged.items] == [expected[0], expected[4]]
+
+    offset_page = repo.query_for_business(
+        business_id, AppointmentQuery(offset=1, limit=2, service_type="repair")
+    )
+    assert [a.id for a in offset_page.items] == expected[1:3]
+    assert offset_page.next_after is not None
+
+
+@pytest.mark.parametrize(
+    "repo_factory",
+    [InMemoryAppointmentRepository, DbAppointmentRepository],
+    ids=["memory", "db"],
+)
+def test_appointment_status_is_stored_upper_case(repo_factory) -> None:
+    repo = repo_factory()
+    business_id = f"status_biz_{uuid4().hex[:8]}"
+    now = datetime.now(UTC)
+    appt = repo.create(
+        customer_id="cust-status",
+        start_time=now - timedelta(hours=2),
+        end_time=now - timedelta(hours=1),
+        service_type="Repair",
+        is_emergency=False,
+        business_id=business_id,
+    )
+    updated = repo.update(appt.id, status="confirmed")
+    assert updated is not None and updated.status == "CONFIRMED"
+
+    (agg,) = repo.aggregate_for_business(
+        business_id, end=now, statuses={"SCHEDULED", "CONFIRMED"}
+    )
+    assert agg.count == 1
+
+
+def test_db_rollup_is_built_once_and_invalidated_across_workers(
+    monkeypatch,
+) -> None:
+    # Two repositories share the table, like two worker processes.
+    worker_a, worker_b = DbAppointmentRepository(), DbAppointmentRepository()
+    business_id = f"rollup_shared_biz_{uuid4().hex[:8]}"
+    start = datetime.now(UTC).replace(microsecond=0) + timedelta(days=5)
+    day = start.date()
+
+    def _create(customer_id: str):  # type: ignore[no-untyped-def]
+        return worker_a.create(
+            customer_id=customer_id,
+            start_time=start,
+            end_time=start + timedelta(hours=1),
+            service_type="Repair",
+            business_id=business_id,
+            is_emergency=False,
+        )
+
+    _create("cust-a")
+    rebuilds = metrics.appointment_rollup_rebuilds
+    assert worker_a.daily_rollup.read_range(business_id, day, day)[day].total == 1
+    assert worker_b.daily_rollup.read_range(business_id, day, day)[day].total == 1
+    assert metrics.appointment_rollup_rebuilds == rebuilds + 1
+
+    # A refresh that fails in one worker must not leave the other serving
+    # the stale persisted day.
+    def _fail(*_args, **_kwargs):  # type: ignore[no-untyped-def]
+        raise RuntimeError("rollup write conflict")
+
+    monkeypatch.setattr(worker_a.daily_rollup, "refresh", _fail)
+    _create("cust-b")
+    monkeypatch.undo()
+    assert worker_b.daily_rollup.read_range(business_id, day, day)[day].total == 2
+    assert metrics.appointment_rollup_rebuilds == rebuilds + 2
+
+
+@pytest.mark.parametrize(
+    "repo_factory",
+    [InMemoryCustomerRepository, DbCustomerRepository],
+    ids=["memory", "db"],
+)
+def test_customer_repository_search_ranks_and_pages(repo_factory) -> None:
+    repo = repo_factory()
+    business_id = f"search_biz_{uuid4().hex[:8]}"
+    other_business = f"search_other_{uuid4().hex[:8]}"
+    jon = repo.upsert("Jon Smith", "(512) 555-0101", business_id=business_id)
+    jonas = repo.upsert("Jonas Brown", "512-555-0102", business_id=business_id)
+    smithers = repo.upsert("Ann Smithers", "512-555-0199", business_id=business_id)
+    repo.upsert("Jon Smith", "512-555-0101", business_id=other_business)
+
+    assert [c.id for c in repo.search(business_id, "+1 512 555 0101")] == [jon.id]
+    assert [c.id for c in repo.search(business_id, "0199")] == [smithers.id]
+
+    assert [c.id for c in repo.search(business_id, "jon smith")] == [jon.id]
+    assert [c.id for c in repo.search(business_id, "jon")] == [jon.id, jonas.id]
+    # Equal-rank prefix matches are ordered by name.
+    assert [c.id for c in repo.search(business_id, "smith")] == [
+        smithers.id,
+        jon.id,
+    ]
+    # Typo tolerance via trigram similarity.
+    assert jonas.id in [c.id for c in repo.search(business_id, "jonaz brown")]
+
+    first = repo.search(business_id, "555-01", limit=2)
+    second = repo.search(business_id, "555-01", limit=2, offset=2)
+    assert len(first) == 2 and len(second) == 1
+    assert {c.id for c in first + second} == {jon.id, jonas.id, smithers.id}
+
+    repo.delete(jonas.id)
+    assert [c.id for c in repo.search(business_id, "jon")] == [jon.id]
+    assert repo.search(business_id, "   ") == []
+
+
+@pytest.mark.parametrize(
+    "repo_factory",
+    [InMemoryAppointmentRepository, DbAppointmentRepository],
+    ids=["memory", "db"],
+)
+def test_appointment_repository_lists_window_by_start(repo_factory) -> None:
+    repo = repo_factory()
+    business_id = f"window_biz_{uuid4().hex[:8]}"
+    day = datetime(2025, 3, 4, tzinfo=UTC)
+    created = {}
+    for hours in (30, 9, -1, 13):
+        appt = repo.create(
+            customer_id="cust-window",
+            start_time=day + timedelta(hours=hours),
+            end_time=day + timedelta(hours=hours, minutes=45),
+            service_type="Repair",
+            is_emergency=False,
+            business_id=business_id,
+        )
+        created[hours] = appt.id
+    repo.update(created[13], status="CANCELLED")
+
+    window = repo.list_for_business_window(
+        business_id, day, day + timedelta(days=1) - timedelta(microseconds=1)
+    )
+    assert [a.id for a in window] == [created[9], created[13]]
+
+    active = repo.list_for_business_window(
+        business_id, day, day + timedelta(days=2), statuses=("SCHEDULED",)
+    )
+    assert [a.id for a in active] == [created[9], created[30]]
+
+
+@pytest.mark.parametrize(
+    "repo_factory",
+    [InMemoryAppointmentRepository, DbAppointmentRepository],
+    ids=["memory", "db"],
+)
+def test_appointment_repository_bulk_updates_by_calendar_event(repo_factory) -> None:
+    repo = repo_factory()
+    business_id = f"sync_biz_{uuid4().hex[:8]}"
+    now = datetime.now(UTC).replace(microsecond=0)
+    appts = [
+        repo.create(
+            customer_id=f"cust-{i}",
+            start_time=now + timedelta(hours=i),
+            end_time=now + timedelta(hours=i + 1),
+            service_type="Repair",
+            is_emergency=False,
+            business_id=business_id,
+            calendar_event_id=f"evt-{business_id}-{i}",
+        )
+        for i in range(3)
+    ]
+
+    found = repo.find_by_calendar_events(
+        [f"evt-{business_id}-0", f"evt-{business_id}-2", "evt-missing"],
+        business_id=business_id,
+    )
+    assert {event_id: appt.id for event_id, appt in found.items()} == {
+        f"evt-{business_id}-0": appts[0].id,
+        f"evt-{business_id}-2": appts[2].id,
+    }
+    assert (
+        repo.find_by_calendar_events([appts[1].calendar_event_id], business_id="other")
+        == {}
+    )
+
+    moved = now + timedelta(days=1)
+    changed = repo.bulk_update(
+        [
+            (appts[0].id, {"status": "cancelled"}),
+            (
+                appts[2].id,
+                {"start_time": moved, "end_time": moved + timedelta(hours=1)},
+            ),
+            ("missing-appointment", {"status": "cancelled"}),
+        ]
+    )
+    assert changed == 2
+    first = repo.get(appts[0].id)
+    third = repo.get(appts[2].id)
+    assert first is not None and first.status == "CANCELLED"
+    assert third is not None
+    assert third.start_time.replace(tzinfo=UTC) == moved
+    untouched = repo.get(appts[1].id)
+    assert untouched is not None and untouched.status == appts[1].status
+
+
+@pytest.mark.parametrize(
+    "repo_factory",
+    [InMemoryAppointmentRepository, DbAppointmentRepository],
+    ids=["memory", "db"],
+)
+def test_appointment_daily_rollup_tracks_writes(repo_factory) -> None:
+    repo = repo_factory()
+    business_id = f"rollup_biz_{uuid4().hex[:8]}"
+    base = datetime.now(UTC).replace(hour=12, minute=0, second=0, microsecond=0)
+    base += timedelta(days=10)
+    first_day, last_day = base.date(), (base + timedelta(days=3)).date()
+
+    def _create(customer_id: str, days: int, **fields):  # type: ignore[no-untyped-def]
+        start = base + timedelta(days=days)
+        fields.setdefault("service_type", "Repair")
+        fields.setdefault("is_emergency", False)
+        return repo.create(
+            customer_id=customer_id,
+            start_time=start,
+            end_time=start + timedelta(hours=1),
+            business_id=business_id,
+            **fields,
+        )
+
+    def _assert_matches_full_scan() -> None:
+        fresh = AppointmentDailyRollup(repo)
+        assert repo.daily_rollup.read_range(
+            business_id, first_day, last_day
+        ) == fresh.read_range(business_id, first_day, last_day)
+
+    tune_up = _create("cust-a", 2, service_type="Tune-up", estimated_value=100)
+    rows = repo.daily_rollup.read_range(business_id, first_day, last_day)
+    assert rows[tune_up.start_time.date()].tag_counts["maintenance"] == 1
+    assert rows[tune_up.start_time.date()].new_customers == 1
+
+    # An earlier visit moves cust-a's new-client day.
+    _create("cust-a", 0, is_emergency=True, estimated_value=300)
+    rows = repo.daily_rollup.read_range(business_id, first_day, last_day)
+    assert rows[first_day].new_customers == 1
+    assert rows[first_day].tag_counts["emergency"] == 1
+    assert rows[tune_up.start_time.date()].new_customers == 0
+    _assert_matches_full_scan()
+
+    other = _create("cust-b", 2, estimated_value=50)
+    repo.update(tune_up.id, start_time=base + timedelta(days=1))
+    repo.bulk_update([(other.id, {"status": "cancelled"})])
+    rows = repo.daily_rollup.read_range(business_id, first_day, last_day)
+    assert (base + timedelta(days=2)).date() not in rows
+    assert rows[(base + timedelta(days=1)).date()].value_average == 100.0
+    _assert_matches_full_scan()
+
+    repo.delete_for_customer("cust-a")
+    assert repo.daily_rollup.read_range(business_id, first_day, last_day) == {}
+    _assert_matches_full_scan()
+
+
+@pytest.mark.parametrize(
+    "repo_factory",
+    [InMemoryAppointmentRepository, DbAppointmentRepository],
+    ids=["memory", "db"],
+)
+def test_appointment_write_survives_rollup_refresh_failure(
+    repo_factory, monkeypatch
+) -> None:
+    repo = repo_factory()
+    business_id = f"rollup_fail_biz_{uuid4().hex[:8]}"
+    start = datetime.now(UTC).replace(microsecond=0) + timedelta(days=5)
+    day = start.date()
+    repo.daily_rollup.read_range(business_id, day, day)
+
+    def _fail(*_args, **_kwargs):  # type: ignore[no-untyped-def]
+        raise RuntimeError("rollup write conflict")
+
+    monkeypatch.setattr(repo.daily_rollup, "refresh", _fail)
+    appt = repo.create(
+        customer_id="cust-a",
+        start_time=start,
+        end_time=start + timedelta(hours=1),
+        service_type="Repair",
+        business_id=business_id,
+        is_emergency=False,
+    )
+    assert repo.get(appt.id) is not None
+
+    monkeypatch.undo()
+    rows = repo.daily_rollup.read_range(business_id, day, day)
+    assert rows[day].total == 1
+
+
+@pytest.mark.parametrize(
+    "repo_factory",
+    [InMemoryCustomerRepository, DbCustomerRepository],
+    ids=["memory", "db"],
+)
+def test_customer_phone_lookup_matches_across_repositories(repo_factory) -> None:
+    repo = repo_factory()
+    business_id = f"phone_parity_biz_{uuid4().hex[:8]}"
+    customer = repo.upsert(
+        name="Parity", phone="(555) 010-3000", business_id=business_id
+    )
+
+    found = repo.get_by_phone("(555) 010-3000", business_id=business_id)
+    assert found is not None and found.id == customer.id
+    # Both backends match the stored phone string exactly.
+    assert repo.get_by_phone("+15550103000", business_id=business_id) is None
+    other = repo.upsert(name="Other", phone="+15550103000", business_id=business_id)
+    assert other.id != customer.id
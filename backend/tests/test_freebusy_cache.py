@@ -0,0 +1,198 @@
+import asyncio
+import threading
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from app.services.calendar import calendar_service
+from app.services.freebusy_cache import FreeBusyCache, freebusy_cache, freebusy_key
+
+
+DAY = datetime(2030, 1, 8, tzinfo=UTC)  # Tuesday
+
+
+def _at(hour: int) -> datetime:
+    return DAY.replace(hour=hour)
+
+
+class _FreeBusyClient:
+    """Fake Google client that counts FreeBusy queries."""
+
+    def __init__(self, busy: list[tuple[datetime, datetime]]) -> None:
+        self.busy = busy
+        self.queries = 0
+        self.list_payloads: list[dict] = []
+        self._lock = threading.Lock()
+
+    def freebusy(self):
+        client = self
+
+        class _Query:
+            def __init__(self, body: dict) -> None:
+                self._cal_id = body["items"][0]["id"]
+
+            def execute(self) -> dict:
+                with client._lock:
+                    client.queries += 1
+                busy = [
+                    {"start": s.isoformat(), "end": e.isoformat()}
+                    for s, e in client.busy
+                ]
+                return {"calendars": {self._cal_id: {"busy": busy}}}
+
+        class _FreeBusy:
+            def query(self, body):  # type: ignore[no-untyped-def]
+                return _Query(body)
+
+        return _FreeBusy()
+
+    def events(self):
+        client = self
+
+        class _List:
+            def execute(self) -> dict:
+                return client.list_payloads.pop(0)
+
+        class _Events:
+            def list(self, **kwargs):  # type: ignore[no-untyped-def]
+                return _List()
+
+        return _Events()
+
+
+def test_cache_patches_known_events_and_drops_on_unknown_removal() -> None:
+    cache = FreeBusyCache(ttl_seconds=60)
+    key = freebusy_key("biz", "primary")
+    cache.store(
+        key,
+        _at(0),
+        _at(23),
+        [(_at(9), _at(10))],
+        generation=cache.generation("biz"),
+    )
+
+    cache.apply_change(key, "evt-new", _at(13), _at(14), created=True)
+    assert cache.lookup(key, _at(8), _at(17)) == [
+        (_at(9), _at(10)),
+        (_at(13), _at(14)),
+    ]
+
+    # A known event moves in place.
+    cache.apply_change(key, "evt-new", _at(15), _at(16))
+    assert cache.lookup(key, _at(8), _at(17)) == [
+        (_at(9), _at(10)),
+        (_at(15), _at(16)),
+    ]
+
+    # Outside the cached window is a miss.
+    assert cache.lookup(key, _at(8), _at(23) + timedelta(hours=2)) is None
+
+    # Cancelling an event we cannot locate drops the whole window.
+    cache.apply_change(key, "evt-old", removed=True)
+    assert cache.lookup(key, _at(8), _at(17)) is None
+
+
+def test_cache_discards_fill_that_raced_an_invalidation() -> None:
+    cache = FreeBusyCache(ttl_seconds=60)
+    key = freebusy_key("biz", "primary")
+    generation = cache.generation("biz")
+    cache.invalidate("biz")
+    cache.store(key, _at(0), _at(23), [(_at(9), _at(10))], generation=generation)
+    assert cache.lookup(key, _at(8), _at(17)) is None
+
+
+@pytest.mark.asyncio
+async def test_concurrent_find_slots_share_one_freebusy_query(monkeypatch) -> None:
+    now = datetime.now(UTC)
+    fake = _FreeBusyClient([(now + timedelta(hours=30), now + timedelta(hours=31))])
+    monkeypatch.setattr(calendar_service._settings, "use_stub", False)
+    monkeypatch.setattr(calendar_service, "_client", fake)
+
+    results = await asyncio.gather(
+        *(calendar_service.find_slots(60, calendar_id="primary") for _ in range(5))
+    )
+    assert all(slots for slots in results)
+    assert fake.queries == 1
+
+    # Later turns are served from the cache as well.
+    await calendar_service.find_slots(60, calendar_id="primary")
+    assert fake.queries == 1
+
+
+@pytest.mark.asyncio
+async def test_incremental_sync_keeps_cached_window_current(monkeypatch) -> None:
+    business_id = "freebusy_sync_biz"
+    now = datetime.now(UTC)
+    fake = _FreeBusyClient([])
+    monkeypatch.setattr(calendar_service._settings, "use_stub", False)
+    monkeypatch.setattr(calendar_service, "_client", fake)
+    monkeypatch.setattr(
+        calendar_service, "_load_gcalendar_sync_token", lambda _biz: "sync-1"
+    )
+    monkeypatch.setattr(
+        calendar_service, "_store_gcalendar_sync_state", lambda *a, **k: None
+    )
+
+    ranges = await calendar_service._google_busy_ranges(
+        fake, business_id, "primary", now, 7
+    )
+    assert ranges == []
+
+    new_start = (now + timedelta(days=1)).replace(microsecond=0)
+    stamp = now.isoformat()
+    fake.list_payloads.append(
+        {
+            "items": [
+                {
+                    "id": "evt-new",
+                    "status": "confirmed",
+                    "created": stamp,
+                    "updated": stamp,
+                    "start": {"dateTime": new_start.isoformat()},
+                    "end": {"dateTime": (new_start + timedelta(hours=1)).isoformat()},
+                }
+            ],
+            "nextSyncToken": "sync-2",
+        }
+    )
+    await calendar_service.sync_google_calendar_events(business_id=business_id)
+
+    ranges = await calendar_service._google_busy_ranges(
+        fake, business_id, "primary", now, 7
+    )
+    assert ranges == [(new_start, new_start + timedelta(hours=1))]
+    assert fake.queries == 1
+
+    # Cancelling an event that predates the fill forces a refetch.
+    fake.list_payloads.append(
+        {
+            "items": [{"id": "evt-older", "status": "cancelled"}],
+            "nextSyncToken": "sync-3",
+        }
+    )
+    await calendar_service.sync_google_calendar_events(business_id=business_id)
+    await calendar_service._google_busy_ranges(fake, business_id, "primary", now, 7)
+    assert fake.queries == 2
+
+
+def test_has_conflict_reads_cached_google_busy_blocks(monkeypatch) -> None:
+    business_id = "freebusy_conflict_biz"
+    monkeypatch.setattr(calendar_service._settings, "use_stub", False)
+    assert not calendar_service.has_conflict(
+        business_id=business_id, start=_at(13), end=_at(14)
+    )
+
+    key = freebusy_key(business_id, calendar_service._settings.calendar_id)
+    freebusy_cache.store(
+        key,
+        _at(0),
+        _at(23),
+        [(_at(13), _at(14))],
+        generation=freebusy_cache.generation(business_id),
+    )
+    assert calendar_service.has_conflict(
+        business_id=business_id, start=_at(13), end=_at(14)
+    )
+    assert not calendar_service.has_conflict(
+        business_id=business_id, start=_at(15), end=_at(16)
+    )
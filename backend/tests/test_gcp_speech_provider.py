@@ -271,3 +271,47 @@ async def test_gcp_healthcheck_success(monkeypatch: pytest.MonkeyPatch) -> None:
     result = await provider.healthcheck()
     assert result["healthy"] is True
     assert result["provider"] == "gcp"
+
+
+@pytest.mark.anyio
+async def test_gcp_transcribe_bytes_sends_linear16_pcm(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    provider = GoogleCloudSpeechProvider(SpeechSettings(provider="gcp"))
+    provider._credentials = FakeCreds(
+        token="existing-token",
+        expiry=datetime.now(UTC) + timedelta(hours=1),
+    )
+
+    captured: dict = {}
+
+    class FakeResp:
+        def raise_for_status(self) -> None:  # pragma: no cover - trivial
+            return None
+
+        def json(self) -> dict:
+            return {"results": [{"alternatives": [{"transcript": "leaky faucet"}]}]}
+
+    class FakeClient:
+        def __init__(self, *args, **kwargs) -> None:
+            pass
+
+        async def __aenter__(self) -> "FakeClient":
+            return self
+
+        async def __aexit__(self, exc_type, exc, tb) -> None:
+            return None
+
+        async def post(self, url: str, headers=None, json=None):
+            captured["json"] = json
+            return FakeResp()
+
+    monkeypatch.setattr("app.services.stt_tts.httpx.AsyncClient", FakeClient)
+
+    pcm = b"\x01\x00\xff\xff" * 40
+    text = await provider.transcribe_bytes(memoryview(pcm), 8000)
+    assert text == "leaky faucet"
+    config = captured["json"]["config"]
+    assert config["encoding"] == "LINEAR16"
+    assert config["sampleRateHertz"] == 8000
+    assert base64.b64decode(captured["json"]["audio"]["content"]) == pcm
@@ -1,3 +1,6 @@
+from datetime import UTC, datetime, timedelta
+
+import anyio
 import httpx
 
 from app.services import geo_utils, zip_enrichment
@@ -108,11 +111,127 @@ def test_fetch_zip_income_handles_parse_errors(monkeypatch) -> None:
     assert profile.error == "parse_error"
 
 
+def test_load_acs_csv_reads_census_export(tmp_path) -> None:
+    export = tmp_path / "acs.csv"
+    export.write_text(
+        '"GEO_ID","NAME","B19013_001E","B19013_001M"\n'
+        '"Geography","Geographic Area Name","Estimate!!Median income","Margin"\n'
+        '"860Z200US66210","ZCTA5 66210","98765","4321"\n'
+        '"860Z200US00601","ZCTA5 00601","-666666666","**"\n'
+    )
+    profiles = {p.zip_code: p for p in zip_enrichment.load_acs_csv(str(export))}
+    assert set(profiles) == {"66210", "00601"}
+    assert profiles["66210"].median_household_income == 98765
+    assert profiles["00601"].median_household_income is None
+
+
+def test_zip_income_store_batches_concurrent_fetches(monkeypatch) -> None:
+    requested: list[list[str]] = []
+
+    class DummyResponse:
+        status_code = 200
+
+        def __init__(self, zips: list[str]) -> None:
+            self._zips = zips
+
+        def raise_for_status(self) -> None:
+            return None
+
+        def json(self) -> list[list[str]]:
+            header = ["NAME", "B19013_001E", "zip code tabulation area"]
+            # The API omits ZCTAs it has no row for.
+            return [header] + [[f"ZCTA5 {z}", "50000", z] for z in self._zips[1:]]
+
+    class DummyAsyncClient:
+        def __init__(self, *args, **kwargs) -> None:  # type: ignore[no-untyped-def]
+            pass
+
+        async def __aenter__(self) -> "DummyAsyncClient":
+            return self
+
+        async def __aexit__(self, *exc) -> None:  # type: ignore[no-untyped-def]
+            return None
+
+        async def get(self, url, params=None):  # type: ignore[no-untyped-def]
+            zips = params["for"].split(":", 1)[1].split(",")
+            requested.append(zips)
+            return DummyResponse(zips)
+
+    monkeypatch.setattr(httpx, "AsyncClient", DummyAsyncClient)
+    monkeypatch.setattr(zip_enrichment, "FETCH_CHUNK_SIZE", 2)
+
+    store = zip_enrichment.ZipIncomeStore()
+    codes = ["66210", "64112", "64108", "bad"]
+    fetched = anyio.run(store.refresh, codes)
+
+    assert sorted(len(chunk) for chunk in requested) == [1, 2]
+    assert set(fetched) == {"66210", "64112", "64108"}
+    assert [fetched[z].median_household_income for z in ("66210", "64112")].count(
+        None
+    ) == 1
+    assert set(store.get_many(codes)) == {"66210", "64112", "64108"}
+
+
+def test_zip_income_store_reads_locally_and_refreshes_in_background(
+    monkeypatch,
+) -> None:
+    queued: list = []
+    monkeypatch.setattr(
+        zip_enrichment.job_queue,
+        "enqueue",
+        lambda name, fn: queued.append(fn),
+    )
+
+    def _no_network(*args, **kwargs):  # type: ignore[no-untyped-def]
+        raise AssertionError("dashboard reads must not call the Census API")
+
+    monkeypatch.setattr(httpx, "Client", _no_network)
+
+    store = zip_enrichment.ZipIncomeStore(refresh_after_days=30)
+    store.put_many(
+        [
+            zip_enrichment.ZipIncomeProfile(
+                zip_code="66210",
+                median_household_income=90000,
+                source="census_acs_2022",
+                fetched_at=datetime.now(UTC),
+            ),
+            zip_enrichment.ZipIncomeProfile(
+                zip_code="64112",
+                median_household_income=70000,
+                source="census_acs_2022",
+                fetched_at=datetime.now(UTC) - timedelta(days=45),
+            ),
+        ]
+    )
+
+    local = store.read_local(["66210", "64112", "64108"])
+    # Stale profiles are still served while they refresh.
+    assert {z: p.median_household_income for z, p in local.items()} == {
+        "66210": 90000,
+        "64112": 70000,
+    }
+    assert len(queued) == 1
+
+    # A refresh already queued for these ZIPs is not queued again.
+    store.read_local(["64112", "64108"])
+    assert len(queued) == 1
+
+
 def test_haversine_km_basic() -> None:
     km = geo_utils.haversine_km((39.0997, -94.5786), (38.6270, -90.1994))  # KC to STL
     assert 350 <= km <= 420
 
 
+def test_haversine_matrix_matches_pairwise_distances() -> None:
+    points = [(39.0997, -94.5786), (38.6270, -90.1994), (41.8781, -87.6298)]
+    matrix = geo_utils.haversine_matrix_km(points)
+    for i, a in enumerate(points):
+        assert matrix[i][i] == 0.0
+        for j, b in enumerate(points):
+            assert abs(matrix[i][j] - geo_utils.haversine_km(a, b)) < 1e-6
+
+
 def test_geocode_address_success_and_cache(monkeypatch):
     calls = {"count": 0}
     geo_utils._GEOCODE_CACHE.clear()  # type: ignore[attr-defined]
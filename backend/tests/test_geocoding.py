@@ -0,0 +1,193 @@
+import asyncio
+from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
+from uuid import uuid4
+
+import anyio
+import pytest
+
+import app.services.calendar as calendar_mod
+from app.db import SQLALCHEMY_AVAILABLE, SessionLocal, init_db
+from app.repositories import appointments_repo
+from app.services import appointment_actions, geo_utils, geocoding
+from app.services.geocoding import DbGeocodeStore, GeocodingService, geocoding_service
+
+
+class _FakeAsyncClient:
+    """Stands in for httpx.AsyncClient and counts geocoding requests."""
+
+    calls: list[str] = []
+    coords: dict[str, tuple[float, float]] = {}
+
+    def __init__(self, *args, **kwargs) -> None:  # type: ignore[no-untyped-def]
+        pass
+
+    async def __aenter__(self) -> "_FakeAsyncClient":
+        return self
+
+    async def __aexit__(self, *exc) -> None:  # type: ignore[no-untyped-def]
+        return None
+
+    async def get(self, url, params=None):  # type: ignore[no-untyped-def]
+        address = params["address"]
+        type(self).calls.append(address)
+        await anyio.sleep(0.01)
+        coords = self.coords.get(address.lower())
+
+        class _Response:
+            def raise_for_status(self) -> None:
+                return None
+
+            def json(self) -> dict:
+                if coords is None:
+                    return {"status": "ZERO_RESULTS", "results": []}
+                location = {"lat": coords[0], "lng": coords[1]}
+                return {
+                    "status": "OK",
+                    "results": [{"geometry": {"location": location}}],
+                }
+
+        return _Response()
+
+
+@pytest.fixture
+def fake_geocoder(monkeypatch):
+    _FakeAsyncClient.calls = []
+    _FakeAsyncClient.coords = {"1 main st": (1.0, 2.0), "2 oak ave": (3.0, 4.0)}
+    monkeypatch.setenv("GOOGLE_MAPS_API_KEY", "demo-key")
+    monkeypatch.setattr(geocoding.httpx, "AsyncClient", _FakeAsyncClient)
+    return _FakeAsyncClient
+
+
+@pytest.mark.asyncio
+async def test_prefetch_coalesces_concurrent_lookups(fake_geocoder) -> None:
+    service = GeocodingService()
+
+    first, second = await asyncio.gather(
+        service.prefetch(["1 Main St", "2 Oak Ave", "1 main st"]),
+        service.prefetch(["1 Main St", "Nowhere"]),
+    )
+
+    assert first["1 Main St"] == (1.0, 2.0)
+    assert first["1 main st"] == (1.0, 2.0)
+    assert first["2 Oak Ave"] == (3.0, 4.0)
+    assert second["Nowhere"] is None
+    assert sorted(fake_geocoder.calls) == ["1 Main St", "2 Oak Ave", "Nowhere"]
+
+    # Matches and misses are both served from memory afterwards.
+    assert await service.geocode("  1 MAIN   st ") == (1.0, 2.0)
+    assert await service.geocode("Nowhere") is None
+    assert len(fake_geocoder.calls) == 3
+
+
+def test_unresolved_addresses_fall_back_to_zip_centroids(tmp_path, monkeypatch):
+    gazetteer = tmp_path / "zcta.txt"
+    gazetteer.write_text(
+        "GEOID\tALAND\tINTPTLAT\tINTPTLONG       \n"
+        "64108\t1\t39.0840\t-94.5830\n"
+        "01001\t1\t42.0625\t-72.6259\n"
+    )
+    service = GeocodingService(zip_centroids_path=str(gazetteer))
+    monkeypatch.setenv("GOOGLE_MAPS_API_KEY", "")
+
+    # The street number is not mistaken for the ZIP code.
+    assert service.resolve_offline("64109 Main St, Kansas City, MO 64108") == (
+        39.0840,
+        -94.5830,
+    )
+    assert service.resolve_offline("1 Elm St, Agawam, MA 01001-1234") == (
+        42.0625,
+        -72.6259,
+    )
+    assert service.resolve_offline("1 Elm St") is None
+
+    results = anyio.run(service.prefetch, ["9 Grand Blvd, Kansas City, MO 64108"])
+    assert results["9 Grand Blvd, Kansas City, MO 64108"] == (39.0840, -94.5830)
+
+
+@pytest.mark.asyncio
+async def test_travel_estimates_only_read_prefetched_coordinates(
+    fake_geocoder, monkeypatch
+) -> None:
+    def _no_sync_requests(*args, **kwargs):  # type: ignore[no-untyped-def]
+        raise AssertionError("slot search must not geocode synchronously")
+
+    monkeypatch.setattr(geo_utils.httpx, "get", _no_sync_requests)
+
+    assert calendar_mod._estimate_travel_minutes("1 Main St", "2 Oak Ave") is None
+    assert fake_geocoder.calls == []
+
+    await geocoding_service.prefetch(["1 Main St", "2 Oak Ave"])
+    minutes = calendar_mod._estimate_travel_minutes("1 Main St", "2 Oak Ave")
+    assert minutes is not None and minutes > 10
+    assert len(fake_geocoder.calls) == 2
+
+
+@pytest.mark.skipif(
+    not SQLALCHEMY_AVAILABLE or SessionLocal is None,
+    reason="persistent geocode cache requires database support",
+)
+def test_persistent_cache_survives_a_new_service(fake_geocoder) -> None:
+    init_db()
+    address = f"{uuid4().hex[:8]} Main St"
+    fake_geocoder.coords[address.lower()] = (5.0, 6.0)
+
+    first = GeocodingService(store=DbGeocodeStore())
+    assert anyio.run(first.geocode, address) == (5.0, 6.0)
+
+    # A fresh process starts with an empty LRU but reads the table.
+    second = GeocodingService(store=DbGeocodeStore())
+    assert anyio.run(second.geocode, address) == (5.0, 6.0)
+    assert second.lookup(address) == (True, (5.0, 6.0))
+    assert fake_geocoder.calls == [address]
+
+
+@pytest.mark.asyncio
+async def test_reschedule_conflict_check_sees_prefetched_addresses(
+    fake_geocoder, monkeypatch
+) -> None:
+    geocoding_service.clear()
+    business_id = f"geo_reschedule_{uuid4().hex[:8]}"
+    start = datetime(2032, 3, 2, 10, 0, tzinfo=UTC)
+    appt = appointments_repo.create(
+        customer_id="c1",
+        start_time=start + timedelta(hours=3),
+        end_time=start + timedelta(hours=4),
+        service_type="repair",
+        business_id=business_id,
+        is_emergency=False,
+    )
+    booked = SimpleNamespace(
+        start_time=start,
+        end_time=start + timedelta(hours=1),
+        status="SCHEDULED",
+        technician_id=None,
+        address="1 Main St",
+    )
+    monkeypatch.setattr(
+        calendar_mod,
+        "_load_busy_index",
+        lambda *_args: calendar_mod._BusyIndex([booked]),
+    )
+    warm: list[bool] = []
+
+    def fake_has_conflict(**_kwargs) -> bool:
+        warm.extend(
+            geocoding_service.lookup(address)[0]
+            for address in ("1 Main St", "2 Oak Ave")
+        )
+        return True
+
+    monkeypatch.setattr(
+        appointment_actions.calendar_service, "has_conflict", fake_has_conflict
+    )
+    result = await appointment_actions.reschedule_appointment(
+        appointment_id=appt.id,
+        business_id=business_id,
+        new_start=start + timedelta(hours=1, minutes=5),
+        new_end=start + timedelta(hours=2, minutes=5),
+        actor="owner",
+        address="2 Oak Ave",
+    )
+    assert result.code == "conflict"
+    assert warm == [True, True]
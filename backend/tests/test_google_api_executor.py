@@ -0,0 +1,122 @@
+import asyncio
+import threading
+import time
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from app.metrics import metrics
+from app.services.calendar import TimeSlot, calendar_service
+from app.services.google_api import (
+    GoogleApiExecutor,
+    GoogleApiTimeout,
+    google_api_executor,
+)
+
+
+@pytest.mark.asyncio
+async def test_executor_times_out_without_blocking_event_loop() -> None:
+    executor = GoogleApiExecutor(max_workers=2, timeout_seconds=0.05)
+    release = threading.Event()
+    ticks = 0
+
+    async def _ticker() -> None:
+        nonlocal ticks
+        while not release.is_set():
+            ticks += 1
+            await asyncio.sleep(0.005)
+
+    ticker = asyncio.create_task(_ticker())
+    timeouts_before = metrics.google_api_timeouts
+    try:
+        with pytest.raises(GoogleApiTimeout):
+            await executor.run(release.wait, 2.0, operation="test.slow")
+    finally:
+        release.set()
+        await ticker
+        executor.shutdown()
+
+    # The loop kept running while the worker thread was blocked.
+    assert ticks >= 3
+    assert metrics.google_api_timeouts == timeouts_before + 1
+    assert metrics.google_api_calls_by_operation.get("test.slow", 0) >= 1
+
+
+@pytest.mark.asyncio
+async def test_executor_propagates_errors_and_records_them() -> None:
+    executor = GoogleApiExecutor(max_workers=1, timeout_seconds=1.0)
+
+    def _boom() -> None:
+        raise ValueError("boom")
+
+    errors_before = metrics.google_api_errors
+    try:
+        with pytest.raises(ValueError):
+            await executor.run(_boom, operation="test.error")
+    finally:
+        executor.shutdown()
+    assert metrics.google_api_errors == errors_before + 1
+
+
+@pytest.mark.asyncio
+async def test_calendar_create_event_runs_on_executor_thread(monkeypatch) -> None:
+    seen_threads: list[str] = []
+
+    class SlowInsert:
+        def execute(self) -> dict:
+            seen_threads.append(threading.current_thread().name)
+            time.sleep(0.01)
+            return {"id": "evt-threaded"}
+
+    class DummyEvents:
+        def insert(self, calendarId, body):  # type: ignore[no-untyped-def]
+            return SlowInsert()
+
+    class DummyClient:
+        def events(self) -> DummyEvents:
+            return DummyEvents()
+
+    monkeypatch.setattr(calendar_service, "_client", DummyClient())
+    monkeypatch.setattr(calendar_service._settings, "use_stub", False)
+
+    now = datetime.now(UTC)
+    event_id = await calendar_service.create_event(
+        summary="Threaded",
+        slot=TimeSlot(start=now, end=now + timedelta(minutes=30)),
+        calendar_id="primary",
+    )
+    assert event_id == "evt-threaded"
+    assert seen_threads and seen_threads[0].startswith("google-api")
+    assert seen_threads[0] != threading.current_thread().name
+
+
+@pytest.mark.asyncio
+async def test_calendar_update_event_timeout_returns_false(monkeypatch) -> None:
+    release = threading.Event()
+
+    class HangingPatch:
+        def execute(self) -> None:
+            release.wait(2.0)
+
+    class DummyEvents:
+        def patch(self, calendarId, eventId, body):  # type: ignore[no-untyped-def]
+            return HangingPatch()
+
+    class DummyClient:
+        def events(self) -> DummyEvents:
+            return DummyEvents()
+
+    monkeypatch.setattr(calendar_service, "_client", DummyClient())
+    monkeypatch.setattr(calendar_service._settings, "use_stub", False)
+    monkeypatch.setattr(google_api_executor, "_timeout_seconds", 0.05)
+
+    now = datetime.now(UTC)
+    try:
+        ok = await calendar_service.update_event(
+            event_id="evt-1",
+            slot=TimeSlot(start=now, end=now + timedelta(minutes=30)),
+            calendar_id="primary",
+        )
+    finally:
+        release.set()
+    assert ok is False
@@ -27,3 +27,27 @@ def test_inmemory_customers_are_tenant_scoped_by_phone():
 
     assert lookup_a is not None and lookup_a.id == c1.id
     assert lookup_b is not None and lookup_b.id == c2.id
+
+
+def test_inmemory_phone_index_survives_delete():
+    from app.repositories import InMemoryCustomerRepository
+
+    repo = InMemoryCustomerRepository()
+    a = repo.upsert(name="A", phone="+15550102000", business_id="tenant_a")
+    b = repo.upsert(name="B", phone="+15550102000", business_id="tenant_b")
+
+    assert repo.get_by_phone("+15550102000", business_id="tenant_a") == a
+    assert repo.upsert(name="A2", phone="+15550102000", business_id="tenant_a") == a
+    assert repo.list_for_business("tenant_a") == [a]
+
+    repo.delete(a.id)
+    assert repo.get_by_phone("+15550102000", business_id="tenant_a") is None
+    assert repo.get_by_phone("+15550102000", business_id="tenant_b") == b
+    assert repo.list_for_business("tenant_a") == []
+
+    repo.set_sms_opt_out("+15550102000", business_id="tenant_b")
+    assert b.sms_opt_out is True
+
+    again = repo.upsert(name="A3", phone="+15550102000", business_id="tenant_a")
+    assert again.id != a.id
+    assert repo.get_by_phone("+15550102000", business_id="tenant_a") == again
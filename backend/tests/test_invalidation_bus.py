@@ -0,0 +1,80 @@
+import json
+
+from app import business_config
+from app.services import invalidation_bus
+
+
+def test_invalidation_bus_defaults_to_inmemory_without_redis_url(monkeypatch) -> None:
+    monkeypatch.delenv("REDIS_URL", raising=False)
+    monkeypatch.delenv("INVALIDATION_BUS_BACKEND", raising=False)
+
+    bus = invalidation_bus._create_invalidation_bus()
+    assert isinstance(bus, invalidation_bus.InMemoryInvalidationBus)
+    assert not isinstance(bus, invalidation_bus.RedisInvalidationBus)
+
+
+def test_invalidation_bus_falls_back_when_redis_init_fails(monkeypatch) -> None:
+    class FailingRedisModule:
+        def from_url(self, url: str):
+            raise RuntimeError("redis down")
+
+    monkeypatch.setenv("REDIS_URL", "redis://test-redis:6379/0")
+    monkeypatch.setattr(invalidation_bus, "redis", FailingRedisModule())
+
+    bus = invalidation_bus._create_invalidation_bus()
+    assert not isinstance(bus, invalidation_bus.RedisInvalidationBus)
+
+
+class _DummyRedisClient:
+    def __init__(self) -> None:
+        self.published: list[tuple[str, str]] = []
+
+    def publish(self, channel: str, payload: str) -> None:
+        self.published.append((channel, payload))
+
+
+def test_redis_bus_publishes_and_relays_remote_messages(monkeypatch) -> None:
+    client = _DummyRedisClient()
+    monkeypatch.setenv("REDIS_URL", "redis://test-redis:6379/0")
+    monkeypatch.setattr(
+        invalidation_bus,
+        "redis",
+        type("DummyRedisModule", (), {"from_url": lambda self, url: client})(),
+    )
+    bus = invalidation_bus._create_invalidation_bus()
+    assert isinstance(bus, invalidation_bus.RedisInvalidationBus)
+
+    received: list[str | None] = []
+    bus.subscribe(received.append)
+
+    # Local publishes notify listeners immediately and broadcast on the channel.
+    bus.publish("biz-1")
+    assert received == ["biz-1"]
+    channel, payload = client.published[0]
+    assert channel == "tenant-config-invalidate"
+    assert json.loads(payload)["business_id"] == "biz-1"
+
+    # Our own broadcast echoed back by Redis is ignored.
+    bus.handle_message(payload.encode("utf-8"))
+    assert received == ["biz-1"]
+
+    # Messages from another replica are delivered; malformed ones are dropped.
+    remote = json.dumps({"origin": "other-replica", "business_id": "biz-2"})
+    bus.handle_message(remote)
+    bus.handle_message(json.dumps({"origin": "other-replica", "business_id": None}))
+    bus.handle_message("not-json")
+    assert received == ["biz-1", "biz-2", None]
+
+
+def test_remote_invalidation_drops_cached_tenant_config(monkeypatch) -> None:
+    bus = invalidation_bus.RedisInvalidationBus(_DummyRedisClient())
+    bus.subscribe(business_config._cache.invalidate)
+
+    snapshot = business_config.TenantConfig(id="bus-tenant", lockdown_mode=False)
+    business_config._cache.set(
+        "bus-tenant", snapshot, 60.0, business_config._cache.generation
+    )
+    assert business_config._cache.get("bus-tenant") == (True, snapshot)
+
+    bus.handle_message(json.dumps({"origin": "other", "business_id": "bus-tenant"}))
+    assert business_config._cache.get("bus-tenant") == (False, None)
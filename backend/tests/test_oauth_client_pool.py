@@ -0,0 +1,86 @@
+import asyncio
+import time
+
+from app.services.calendar import calendar_service
+from app.services.email_service import email_service
+from app.services.oauth_clients import OAuthClientPool, PooledClient, oauth_client_pool
+from app.services.oauth_tokens import oauth_store
+
+
+def _entry(client: object, token: str = "tok", ttl: float = 3600.0) -> PooledClient:
+    return PooledClient(client=client, expires_at=time.time() + ttl, access_token=token)
+
+
+def test_calendar_user_client_is_built_once_per_tenant(monkeypatch) -> None:
+    built: list[str] = []
+
+    def fake_create(business_id: str) -> PooledClient:
+        built.append(business_id)
+        return _entry(object())
+
+    monkeypatch.setattr(calendar_service, "_create_user_client", fake_create)
+
+    first = calendar_service._build_user_client("biz-pool")
+    second = calendar_service._build_user_client("biz-pool")
+    other = calendar_service._build_user_client("biz-other")
+
+    assert first is second
+    assert other is not first
+    assert built == ["biz-pool", "biz-other"]
+
+
+def test_pool_drops_entries_on_revoke_and_token_change() -> None:
+    oauth_store.save_tokens("gcalendar", "biz-revoke", "tok", "refresh")
+    oauth_client_pool.put("gcalendar", "biz-revoke", _entry("client", token="tok"))
+    assert oauth_client_pool.get("gcalendar", "biz-revoke") is not None
+
+    oauth_store.revoke("gcalendar", "biz-revoke")
+    assert oauth_client_pool.get("gcalendar", "biz-revoke") is None
+
+    # Reconnecting stores a new access token; the old client is discarded.
+    oauth_client_pool.put("gcalendar", "biz-revoke", _entry("client", token="tok"))
+    oauth_store.save_tokens("gcalendar", "biz-revoke", "tok-2", "refresh")
+    assert oauth_client_pool.get("gcalendar", "biz-revoke") is None
+
+
+def test_pool_expires_entries_close_to_token_expiry() -> None:
+    pool = OAuthClientPool()
+    pool.put("gmail", "biz", _entry("client", ttl=30))
+    assert pool.get("gmail", "biz") is None
+
+
+def test_refresh_due_rebuilds_only_entries_near_expiry() -> None:
+    pool = OAuthClientPool(refresh_ahead_seconds=300)
+    refreshed: list[str] = []
+
+    def refresher(business_id: str) -> PooledClient:
+        refreshed.append(business_id)
+        return _entry(f"new-{business_id}")
+
+    pool.register("gcalendar", refresher)
+    pool.put("gcalendar", "soon", _entry("old", ttl=120))
+    pool.put("gcalendar", "later", _entry("old", ttl=3600))
+
+    assert pool.refresh_due() == 1
+    assert refreshed == ["soon"]
+    entry = pool.get("gcalendar", "soon")
+    assert entry is not None and entry.client == "new-soon"
+
+
+def test_gmail_token_served_from_pool_without_db_reads(monkeypatch) -> None:
+    loads: list[str] = []
+
+    def fake_load(business_id: str):
+        loads.append(business_id)
+        return oauth_store.save_tokens("gmail", business_id, "gmail_access", "r")
+
+    monkeypatch.setattr(email_service, "_load_gmail_tokens_from_db", fake_load)
+
+    async def _twice():
+        first = await email_service._refresh_token_if_needed("biz-gmail", None, None)
+        second = await email_service._refresh_token_if_needed("biz-gmail", None, None)
+        return first, second
+
+    first, second = asyncio.run(_twice())
+    assert first is not None and second is first
+    assert loads == ["biz-gmail"]
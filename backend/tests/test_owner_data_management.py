@@ -5,13 +5,18 @@ from fastapi.testclient import TestClient
 
 from app.db import SQLALCHEMY_AVAILABLE, SessionLocal
 from app.db_models import (
+    AppointmentDailyRollupDB,
     AppointmentDB,
     BusinessDB,
     ConversationDB,
     ConversationMessageDB,
     CustomerDB,
 )
-from app.repositories import appointments_repo, customers_repo
+from app.repositories import (
+    DbAppointmentRepository,
+    appointments_repo,
+    customers_repo,
+)
 from app.main import app
 
 
@@ -114,6 +119,31 @@ def test_delete_tenant_data_removes_rows() -> None:
     assert body["conversation_messages_deleted"] >= 1
 
 
+def _rollup_row_count(business_id: str) -> int:
+    session = SessionLocal()
+    try:
+        return (
+            session.query(AppointmentDailyRollupDB)
+            .filter(AppointmentDailyRollupDB.business_id == business_id)
+            .count()
+        )
+    finally:
+        session.close()
+
+
+def test_delete_tenant_data_removes_persisted_rollup_rows(monkeypatch) -> None:
+    _seed_db_data()
+    rollup = DbAppointmentRepository().daily_rollup
+    monkeypatch.setattr(appointments_repo, "daily_rollup", rollup)
+    today = datetime.now(UTC).date()
+    assert rollup.read_range("default_business", today - timedelta(days=2), today)
+    assert _rollup_row_count("default_business") >= 1
+
+    resp = client.delete("/v1/owner/tenant-data", params={"confirm": "DELETE"})
+    assert resp.status_code == 200
+    assert _rollup_row_count("default_business") == 0
+
+
 def test_owner_onboarding_integrations_updates_flags() -> None:
     session = SessionLocal()
     try:
@@ -4,6 +4,7 @@ from fastapi.testclient import TestClient
 
 from app import deps
 from app.main import app
+from app.routers import owner
 from app.repositories import appointments_repo, customers_repo
 
 
@@ -50,10 +51,14 @@ def test_owner_geo_markers_returns_markers(monkeypatch) -> None:
     monkeypatch.setattr(deps, "get_settings", lambda: _DummySettings())
     _seed_data()
 
-    # Avoid real geocoding; return fixed coordinates.
-    monkeypatch.setattr(
-        "app.routers.owner.geocode_address", lambda addr: (39.0997, -94.5786)
-    )
+    # Avoid real geocoding; resolve every address in one batch.
+    batches: list[set[str]] = []
+
+    async def fake_prefetch(addresses, *, timeout=None):  # type: ignore[no-untyped-def]
+        batches.append(set(addresses))
+        return {address: (39.0997, -94.5786) for address in addresses}
+
+    monkeypatch.setattr(owner.geocoding_service, "prefetch", fake_prefetch)
 
     try:
         resp = client.get(
@@ -67,6 +72,7 @@ def test_owner_geo_markers_returns_markers(monkeypatch) -> None:
         marker = data["markers"][0]
         assert marker["lat"] == 39.0997
         assert marker["is_emergency"] is True
+        assert batches == [{"123 Main St, Kansas City, MO 64108"}]
     finally:
         app.dependency_overrides.clear()
 
@@ -12,7 +12,7 @@ def test_multitenant_context_perf():
         # Clear per-tenant data if the in-memory repos expose it.
         try:
             appointments_repo._by_business[biz] = []  # type: ignore[attr-defined]
-            customers_repo._by_business[biz] = []  # type: ignore[attr-defined]
+            customers_repo._by_business[biz] = {}  # type: ignore[attr-defined]
         except Exception:
             pass
         base_day = datetime.now(UTC) + timedelta(days=2)
@@ -1,6 +1,12 @@
 import asyncio
 
-from app.services.stt_tts import SpeechProvider, speech_service, StubSpeechProvider
+from app.services.stt_tts import (
+    ReplaySpeechProvider,
+    SpeechProvider,
+    SpeechResult,
+    speech_service,
+    StubSpeechProvider,
+)
 
 
 class FailingProvider(SpeechProvider):
@@ -46,3 +52,62 @@ def test_speech_service_health_stub_provider():
         assert health["provider"] == "stub"
     finally:
         speech_service.override_provider(None)
+
+
+async def _chunks(count: int):
+    for _ in range(count):
+        yield b"\x00\x00" * 160
+
+
+async def _collect(service, count: int):
+    return [result async for result in service.stream_transcribe(_chunks(count), 8000)]
+
+
+def test_replay_provider_streams_partials_then_final(monkeypatch):
+    monkeypatch.setattr(speech_service, "_circuit_open_until", None)
+    speech_service.override_provider(
+        ReplaySpeechProvider(["book a visit tomorrow", "thanks"])
+    )
+    try:
+        results = asyncio.run(_collect(speech_service, 3))
+        assert [(r.text, r.is_final) for r in results] == [
+            ("book", False),
+            ("book a", False),
+            ("book a visit", False),
+            ("book a visit tomorrow", True),
+        ]
+        # Each utterance replays the next fixture; then they run dry.
+        assert [r.text for r in asyncio.run(_collect(speech_service, 1))] == [
+            "thanks",
+            "thanks",
+        ]
+        assert asyncio.run(_collect(speech_service, 2)) == []
+    finally:
+        speech_service.override_provider(None)
+
+
+def test_stream_transcribe_buffers_for_request_response_providers(monkeypatch):
+    monkeypatch.setattr(speech_service, "_circuit_open_until", None)
+    received: list[int] = []
+
+    class BatchProvider(SpeechProvider):
+        name = "batch"
+
+        async def transcribe(self, audio: str | None) -> str:
+            return ""
+
+        async def transcribe_bytes(self, pcm, sample_rate: int) -> str:
+            received.append(len(pcm))
+            return " all at once "
+
+        async def synthesize(self, text: str, voice: str | None = None) -> str:
+            return "audio://placeholder"
+
+    speech_service.override_provider(BatchProvider())
+    try:
+        assert speech_service.supports_streaming() is False
+        results = asyncio.run(_collect(speech_service, 4))
+        assert results == [SpeechResult("all at once", is_final=True)]
+        assert received == [4 * 320]
+    finally:
+        speech_service.override_provider(None)
@@ -0,0 +1,125 @@
+from datetime import UTC, datetime
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.db import SQLALCHEMY_AVAILABLE, SessionLocal
+from app.db_models import BusinessDB
+from app.main import app
+from app.services import tenant_credentials
+
+
+client = TestClient(app)
+
+pytestmark = pytest.mark.skipif(
+    not SQLALCHEMY_AVAILABLE or SessionLocal is None,
+    reason="Credential resolver tests require database support",
+)
+
+BIZ_ID = "credential_cache_biz"
+
+
+def _ensure_business(api_key: str) -> None:
+    session = SessionLocal()
+    try:
+        row = session.get(BusinessDB, BIZ_ID)
+        if row is None:
+            row = BusinessDB(  # type: ignore[call-arg]
+                id=BIZ_ID,
+                name="Credential Cache",
+                api_key=api_key,
+                status="ACTIVE",
+                created_at=datetime.now(UTC),
+            )
+            session.add(row)
+        else:
+            row.api_key = api_key
+        session.commit()
+    finally:
+        session.close()
+
+
+def _counting_factory():  # type: ignore[no-untyped-def]
+    calls = {"count": 0}
+
+    def factory():  # type: ignore[no-untyped-def]
+        calls["count"] += 1
+        return SessionLocal()
+
+    return factory, calls
+
+
+def test_resolver_memoises_hits_and_misses() -> None:
+    _ensure_business("cred-cache-key-1")
+    factory, calls = _counting_factory()
+
+    for _ in range(3):
+        match = tenant_credentials.resolve_credential(
+            tenant_credentials.CREDENTIAL_API_KEY,
+            "cred-cache-key-1",
+            session_factory=factory,
+        )
+        assert match is not None and match.business_id == BIZ_ID
+    assert calls["count"] == 1
+
+    for _ in range(3):
+        assert (
+            tenant_credentials.resolve_credential(
+                tenant_credentials.CREDENTIAL_API_KEY,
+                "cred-cache-missing-key",
+                session_factory=factory,
+            )
+            is None
+        )
+    assert calls["count"] == 2
+
+
+def test_resolver_shares_lookup_within_a_request() -> None:
+    _ensure_business("cred-cache-key-2")
+    tenant_credentials._cache.invalidate()
+    factory, calls = _counting_factory()
+    request = SimpleNamespace(state=SimpleNamespace())
+
+    first = tenant_credentials.resolve_credential(
+        tenant_credentials.CREDENTIAL_API_KEY,
+        "cred-cache-key-2",
+        session_factory=factory,
+        request=request,
+    )
+    # Even with the process cache cleared, the request keeps its answer.
+    tenant_credentials._cache.invalidate()
+    second = tenant_credentials.resolve_credential(
+        tenant_credentials.CREDENTIAL_API_KEY,
+        "cred-cache-key-2",
+        session_factory=factory,
+        request=request,
+    )
+    assert first == second
+    assert calls["count"] == 1
+
+
+def test_rotating_api_key_invalidates_cached_credential() -> None:
+    _ensure_business("cred-cache-key-3")
+    ok = client.get("/v1/crm/customers", headers={"X-API-Key": "cred-cache-key-3"})
+    assert ok.status_code == 200
+
+    rotated = client.post(f"/v1/admin/businesses/{BIZ_ID}/rotate-key")
+    assert rotated.status_code == 200
+    new_key = rotated.json()["api_key"]
+    assert new_key != "cred-cache-key-3"
+
+    assert (
+        tenant_credentials.resolve_credential(
+            tenant_credentials.CREDENTIAL_API_KEY,
+            "cred-cache-key-3",
+            session_factory=SessionLocal,
+        )
+        is None
+    )
+    match = tenant_credentials.resolve_credential(
+        tenant_credentials.CREDENTIAL_API_KEY,
+        new_key,
+        session_factory=SessionLocal,
+    )
+    assert match is not None and match.business_id == BIZ_ID
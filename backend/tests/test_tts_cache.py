@@ -0,0 +1,105 @@
+import anyio
+import pytest
+
+from app.metrics import metrics
+from app.services.stt_tts import SpeechProvider, SpeechService
+from app.services.tts_cache import (
+    FileTtsStore,
+    TtsCache,
+    normalize_tts_text,
+    tts_cache_key,
+)
+
+
+class CountingProvider(SpeechProvider):
+    name = "counting"
+
+    def __init__(self, *, fail: bool = False) -> None:
+        self.calls: list[tuple[str, str | None]] = []
+        self.fail = fail
+
+    async def transcribe(self, audio: str | None) -> str:
+        return ""
+
+    async def synthesize(self, text: str, voice: str | None = None) -> str:
+        self.calls.append((text, voice))
+        await anyio.sleep(0.01)
+        if self.fail:
+            raise RuntimeError("tts down")
+        return f"audio:{voice}:{text}"
+
+
+def test_tts_cache_key_normalizes_text_only() -> None:
+    assert normalize_tts_text("  Hi,\n  how can I   help? ") == "Hi, how can I help?"
+    base = tts_cache_key("gcp:MP3", "en-US-Neural2-F", "en-US", "Hello there")
+    assert tts_cache_key("gcp:MP3", "en-US-Neural2-F", "en-US", " Hello  there ") == (
+        base
+    )
+    assert tts_cache_key("gcp:MP3", "en-US-Neural2-C", "en-US", "Hello there") != base
+    assert tts_cache_key("gcp:MP3", "en-US-Neural2-F", "es-US", "Hello there") != base
+    assert tts_cache_key("gcp:MP3", "en-US-Neural2-F", "en-US", "hello there") != base
+
+
+def test_tts_cache_evicts_least_recently_used_within_byte_budget() -> None:
+    cache = TtsCache(max_bytes=10)
+    cache.put("a", "aaaa")
+    cache.put("b", "bbbb")
+    assert cache.get("a") == "aaaa"  # "b" is now the oldest
+    cache.put("c", "cccc")
+    assert cache.get("b") is None
+    assert cache.size_bytes == 8 and len(cache) == 2
+    cache.put("huge", "x" * 11)  # larger than the budget; never stored
+    assert cache.get("huge") is None and cache.get("a") == "aaaa"
+
+
+@pytest.mark.anyio
+async def test_speech_service_synthesizes_repeated_replies_once() -> None:
+    provider = CountingProvider()
+    service = SpeechService(provider=provider, cache=TtsCache())
+    metrics.tts_cache_hits = metrics.tts_cache_misses = 0
+    metrics.tts_cache_coalesced = 0
+
+    results: list[str] = []
+
+    async def _request() -> None:
+        results.append(await service.synthesize("Thanks for calling.", voice="v1"))
+
+    async with anyio.create_task_group() as tg:
+        for _ in range(5):
+            tg.start_soon(_request)
+    assert set(results) == {"audio:v1:Thanks for calling."}
+    assert await service.synthesize(" Thanks for calling. ", voice="v1") == results[0]
+    assert provider.calls == [("Thanks for calling.", "v1")]
+    assert metrics.tts_cache_misses == 1
+    assert metrics.tts_cache_coalesced == 4
+    assert metrics.tts_cache_hits == 1
+
+    await service.synthesize("Thanks for calling.", voice="v2")
+    assert len(provider.calls) == 2
+
+
+@pytest.mark.anyio
+async def test_tts_fallback_audio_is_not_cached() -> None:
+    provider = CountingProvider(fail=True)
+    cache = TtsCache()
+    service = SpeechService(provider=provider, cache=cache)
+
+    assert await service.synthesize("Hello") == "audio://placeholder"
+    assert len(cache) == 0
+
+
+@pytest.mark.anyio
+async def test_tts_disk_tier_survives_restarts(tmp_path) -> None:
+    provider = CountingProvider()
+    first = SpeechService(
+        provider=provider, cache=TtsCache(store=FileTtsStore(str(tmp_path)))
+    )
+    audio = await first.synthesize("What is the service address?")
+
+    metrics.tts_cache_store_hits = 0
+    restarted = SpeechService(
+        provider=provider, cache=TtsCache(store=FileTtsStore(str(tmp_path)))
+    )
+    assert await restarted.synthesize("What is the service address?") == audio
+    assert len(provider.calls) == 1
+    assert metrics.tts_cache_store_hits == 1
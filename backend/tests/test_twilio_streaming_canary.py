@@ -1,4 +1,7 @@
+import asyncio
 import base64
+import sys
+import threading
 import time
 
 import pytest
@@ -9,13 +12,19 @@ from app.main import app
 from app import config, deps
 from app.repositories import conversations_repo
 from app.metrics import metrics
+from app.routers import twilio_integration
+from app.services import conversation
 from app.deps import DEFAULT_BUSINESS_ID
-from app.services.stt_tts import speech_service
+from app.services.stt_tts import ReplaySpeechProvider, speech_service
 from app.services.twilio_state import twilio_state_store
 
 
 client = TestClient(app)
 
+# 20 ms mu-law frames: a loud 1 kHz square wave ("speech") and silence.
+_SPEECH_FRAME = (b"\x20" * 4 + b"\xa0" * 4) * 20
+_SILENCE_FRAME = b"\xff" * 160
+
 
 def test_twilio_streaming_canary(monkeypatch):
     monkeypatch.setenv("TWILIO_STREAMING_ENABLED", "true")
@@ -162,11 +171,13 @@ def test_twilio_streaming_websocket_ingest(monkeypatch):
 
     called = {"count": 0}
 
-    async def fake_transcribe(_: str | None) -> str:
+    async def fake_transcribe_bytes(pcm, sample_rate: int) -> str:
         called["count"] += 1
+        called["pcm_bytes"] = len(pcm)
+        called["sample_rate"] = sample_rate
         return "I need service tomorrow morning"
 
-    monkeypatch.setattr(speech_service, "transcribe", fake_transcribe)
+    monkeypatch.setattr(speech_service, "transcribe_bytes", fake_transcribe_bytes)
 
     with client.websocket_connect(
         "/v1/twilio/voice-stream?call_sid=CS_WS1&business_id=default_business"
@@ -185,16 +196,17 @@ def test_twilio_streaming_websocket_ingest(monkeypatch):
                 },
             }
         )
-        payload = base64.b64encode(b"\xff" * 160).decode("ascii")
-        ws.send_json(
-            {
-                "event": "media",
-                "media": {
-                    "track": "inbound",
-                    "payload": payload,
-                },
-            }
-        )
+        payload = base64.b64encode(_SPEECH_FRAME).decode("ascii")
+        for _ in range(10):
+            ws.send_json(
+                {
+                    "event": "media",
+                    "media": {
+                        "track": "inbound",
+                        "payload": payload,
+                    },
+                }
+            )
 
         link = twilio_state_store.get_call_session("CS_WS1")
         assert link is not None
@@ -205,6 +217,9 @@ def test_twilio_streaming_websocket_ingest(monkeypatch):
                 break
             time.sleep(0.01)
         assert called["count"] > 0
+        # Ten 160-byte mu-law frames arrive as 1600 16-bit PCM samples.
+        assert called["pcm_bytes"] == 3200
+        assert called["sample_rate"] == 8000
 
 
 def test_twilio_streaming_websocket_requires_token(monkeypatch):
@@ -219,3 +234,255 @@ def test_twilio_streaming_websocket_requires_token(monkeypatch):
         with pytest.raises(WebSocketDisconnect) as exc:
             ws.receive_text()
     assert exc.value.code == 1008
+
+
+def _stream_start(ws, call_sid: str) -> None:
+    ws.send_json(
+        {
+            "event": "start",
+            "start": {
+                "callSid": call_sid,
+                "streamSid": f"SS_{call_sid}",
+                "mediaFormat": {"encoding": "audio/x-mulaw", "sampleRate": 8000},
+            },
+        }
+    )
+
+
+def _stream_media(ws, frame: bytes = _SILENCE_FRAME) -> None:
+    payload = base64.b64encode(frame).decode("ascii")
+    ws.send_json({"event": "media", "media": {"track": "inbound", "payload": payload}})
+
+
+def _wait_until(predicate, attempts: int = 200) -> None:
+    for _ in range(attempts):
+        if predicate():
+            return
+        time.sleep(0.01)
+    raise AssertionError("condition not reached")
+
+
+def test_twilio_streaming_reads_frames_while_transcription_is_slow(monkeypatch):
+    monkeypatch.setenv("TWILIO_STREAMING_ENABLED", "true")
+    monkeypatch.setenv("TWILIO_STREAM_MIN_SECONDS", "0.01")
+    monkeypatch.setenv("TWILIO_STREAM_QUEUE_SIZE", "1")
+    monkeypatch.setenv("TWILIO_STREAM_VAD_ENABLED", "false")
+    monkeypatch.delenv("TWILIO_STREAM_TOKEN", raising=False)
+    config.get_settings.cache_clear()
+    deps.get_settings.cache_clear()
+    metrics.twilio_stream_flushes_deferred = 0
+
+    release = threading.Event()
+    transcribed: list[int] = []
+
+    async def slow_transcribe_bytes(pcm, sample_rate: int) -> str:
+        while not release.is_set():
+            await asyncio.sleep(0.005)
+        transcribed.append(len(pcm))
+        return ""
+
+    monkeypatch.setattr(speech_service, "transcribe_bytes", slow_transcribe_bytes)
+
+    with client.websocket_connect(
+        "/v1/twilio/voice-stream?call_sid=CS_WS_SLOW&business_id=default_business"
+    ) as ws:
+        _stream_start(ws, "CS_WS_SLOW")
+        # 20 ms frames; each 100 ms of audio (the minimum flush) is five frames.
+        for _ in range(20):
+            _stream_media(ws)
+        # STT is stuck on the first utterance, yet later frames are still read
+        # and buffered instead of waiting behind it.
+        _wait_until(lambda: metrics.twilio_stream_flushes_deferred > 0)
+        assert transcribed == []
+
+        release.set()
+        ws.send_json({"event": "stop"})
+        _wait_until(lambda: sum(transcribed) == 20 * 320)
+
+
+def test_twilio_streaming_cancels_worker_on_disconnect(monkeypatch):
+    monkeypatch.setenv("TWILIO_STREAMING_ENABLED", "true")
+    monkeypatch.setenv("TWILIO_STREAM_MIN_SECONDS", "0.01")
+    monkeypatch.setenv("TWILIO_STREAM_VAD_ENABLED", "false")
+    monkeypatch.delenv("TWILIO_STREAM_TOKEN", raising=False)
+    config.get_settings.cache_clear()
+    deps.get_settings.cache_clear()
+    metrics.twilio_stream_worker_cancellations = 0
+    started = threading.Event()
+
+    async def stuck_transcribe_bytes(pcm, sample_rate: int) -> str:
+        started.set()
+        await asyncio.sleep(60)
+        return "never"
+
+    monkeypatch.setattr(speech_service, "transcribe_bytes", stuck_transcribe_bytes)
+
+    with client.websocket_connect(
+        "/v1/twilio/voice-stream?call_sid=CS_WS_DROP&business_id=default_business"
+    ) as ws:
+        _stream_start(ws, "CS_WS_DROP")
+        for _ in range(5):
+            _stream_media(ws)
+        _wait_until(started.is_set)
+
+    _wait_until(lambda: metrics.twilio_stream_worker_cancellations == 1)
+
+
+def test_twilio_streaming_vad_sends_only_utterances(monkeypatch):
+    monkeypatch.setenv("TWILIO_STREAMING_ENABLED", "true")
+    monkeypatch.setenv("TWILIO_STREAM_VAD_HANGOVER_MS", "600")
+    monkeypatch.delenv("TWILIO_STREAM_TOKEN", raising=False)
+    config.get_settings.cache_clear()
+    deps.get_settings.cache_clear()
+    metrics.twilio_stream_vad_utterances = 0
+    transcribed: list[int] = []
+
+    async def fake_transcribe_bytes(pcm, sample_rate: int) -> str:
+        transcribed.append(len(pcm))
+        return ""
+
+    monkeypatch.setattr(speech_service, "transcribe_bytes", fake_transcribe_bytes)
+
+    with client.websocket_connect(
+        "/v1/twilio/voice-stream?call_sid=CS_WS_VAD&business_id=default_business"
+    ) as ws:
+        _stream_start(ws, "CS_WS_VAD")
+        for frames, frame in (
+            (50, _SILENCE_FRAME),
+            (10, _SPEECH_FRAME),
+            (35, _SILENCE_FRAME),
+            (10, _SPEECH_FRAME),
+            (10, _SILENCE_FRAME),
+        ):
+            for _ in range(frames):
+                _stream_media(ws, frame)
+        ws.send_json({"event": "stop"})
+        _wait_until(lambda: len(transcribed) == 2)
+
+    # 200 ms of pre-roll, 200 ms of speech and 100 ms of tail, then 100 ms of
+    # pre-roll (all that was left of the pause), speech and the 200 ms still
+    # buffered at stop. The rest of the silence never reaches STT.
+    assert transcribed == [8000, 8000]
+    assert metrics.twilio_stream_vad_utterances == 2
+
+
+def test_twilio_streaming_vad_skips_silent_calls(monkeypatch):
+    monkeypatch.setenv("TWILIO_STREAMING_ENABLED", "true")
+    monkeypatch.delenv("TWILIO_STREAM_TOKEN", raising=False)
+    config.get_settings.cache_clear()
+    deps.get_settings.cache_clear()
+    calls: list[int] = []
+
+    async def fake_transcribe_bytes(pcm, sample_rate: int) -> str:
+        calls.append(len(pcm))
+        return ""
+
+    monkeypatch.setattr(speech_service, "transcribe_bytes", fake_transcribe_bytes)
+
+    with client.websocket_connect(
+        "/v1/twilio/voice-stream?call_sid=CS_WS_QUIET&business_id=default_business"
+    ) as ws:
+        _stream_start(ws, "CS_WS_QUIET")
+        for _ in range(100):
+            _stream_media(ws)
+        # A single loud frame is a click, not speech.
+        _stream_media(ws, _SPEECH_FRAME)
+        for _ in range(40):
+            _stream_media(ws)
+        ws.send_json({"event": "stop"})
+
+    assert calls == []
+
+
+def test_twilio_streaming_uses_partials_from_streaming_provider(monkeypatch):
+    monkeypatch.setenv("TWILIO_STREAMING_ENABLED", "true")
+    monkeypatch.delenv("TWILIO_STREAM_TOKEN", raising=False)
+    config.get_settings.cache_clear()
+    deps.get_settings.cache_clear()
+    metrics.twilio_stream_partial_transcripts = 0
+    metrics.intent_speculation_hits = 0
+    transcript = "I need to book an appointment tomorrow morning"
+    monkeypatch.setattr(speech_service, "_circuit_open_until", None)
+    speech_service.override_provider(ReplaySpeechProvider([transcript]))
+
+    try:
+        with client.websocket_connect(
+            "/v1/twilio/voice-stream?call_sid=CS_WS_LIVE&business_id=default_business"
+        ) as ws:
+            _stream_start(ws, "CS_WS_LIVE")
+            for _ in range(20):
+                _stream_media(ws, _SPEECH_FRAME)
+            # The recognizer is fed while the caller is still talking.
+            _wait_until(lambda: metrics.twilio_stream_partial_transcripts >= 5)
+            link = twilio_state_store.get_call_session("CS_WS_LIVE")
+            assert link is not None
+            for _ in range(35):
+                _stream_media(ws)
+            ws.send_json({"event": "stop"})
+            _wait_until(
+                lambda: any(
+                    m.role == "user" and m.text == transcript
+                    for m in conversations_repo.get_by_session(link.session_id).messages
+                )
+            )
+    finally:
+        speech_service.override_provider(None)
+
+    # The final transcript matched the last hypothesis, so the turn reused the
+    # intent classification started from the partials.
+    assert metrics.intent_speculation_hits == 1
+
+
+def test_twilio_streaming_bounds_intent_speculation_per_utterance(monkeypatch):
+    monkeypatch.setenv("TWILIO_STREAMING_ENABLED", "true")
+    monkeypatch.delenv("TWILIO_STREAM_TOKEN", raising=False)
+    config.get_settings.cache_clear()
+    deps.get_settings.cache_clear()
+    metrics.twilio_stream_partial_transcripts = 0
+    metrics.intent_speculations = 0
+    metrics.intent_speculation_hits = 0
+    transcript = "hi I would like to book a furnace tune up for next tuesday"
+    monkeypatch.setattr(speech_service, "_circuit_open_until", None)
+    monkeypatch.setattr(
+        twilio_integration, "_STREAM_SPECULATION_DEBOUNCE_SECONDS", 60.0
+    )
+    history_reads: list[str] = []
+    real_recent_messages = conversation.recent_messages
+
+    def counting_recent_messages(session_id: str):  # type: ignore[no-untyped-def]
+        # Count the websocket's reads, not the conversation manager's.
+        if sys._getframe(1).f_code.co_name == "on_result":
+            history_reads.append(session_id)
+        return real_recent_messages(session_id)
+
+    monkeypatch.setattr(conversation, "recent_messages", counting_recent_messages)
+    speech_service.override_provider(ReplaySpeechProvider([transcript]))
+
+    try:
+        with client.websocket_connect(
+            "/v1/twilio/voice-stream?call_sid=CS_WS_SPEC&business_id=default_business"
+        ) as ws:
+            _stream_start(ws, "CS_WS_SPEC")
+            for _ in range(20):
+                _stream_media(ws, _SPEECH_FRAME)
+            _wait_until(lambda: metrics.twilio_stream_partial_transcripts >= 10)
+            link = twilio_state_store.get_call_session("CS_WS_SPEC")
+            assert link is not None
+            for _ in range(35):
+                _stream_media(ws)
+            ws.send_json({"event": "stop"})
+            _wait_until(
+                lambda: any(
+                    m.role == "user" and m.text == transcript
+                    for m in conversations_repo.get_by_session(link.session_id).messages
+                )
+            )
+    finally:
+        speech_service.override_provider(None)
+
+    # Unstable partials are debounced: the first one and the final segment
+    # are classified, not every word, and the history is read once.
+    assert metrics.twilio_stream_partial_transcripts >= 10
+    assert metrics.intent_speculations == 2
+    assert metrics.intent_speculation_hits == 1
+    assert history_reads == [link.session_id]